@@ -0,0 +1,140 @@
+"""
+Modul: Startzeit-Messung für TimeArch.
+
+Dieses Modul misst die Importzeit der Einstiegsmodule mit `python -X importtime` und prüft sie gegen ein
+Zeitbudget. Zusätzlich wird geprüft, dass schwere Bibliotheken (Matplotlib, openpyxl, tkcalendar) nicht beim
+Programmstart geladen werden, sondern erst, wenn ein Diagramm gezeichnet, ein Export gestartet oder der
+Kalender angezeigt wird.
+
+Konstanten:
+-----------
+- STARTUP_BUDGETS: Einstiegsmodul -> maximale kumulierte Importzeit in Millisekunden.
+- DEFERRED_MODULES: Module, die beim Import der Einstiegsmodule nicht geladen werden dürfen.
+- REPEATS: Anzahl Messungen pro Modul; gewertet wird die schnellste (geringster Einfluss von Dateicache und Last).
+
+Funktionen:
+-----------
+- measure_imports(module): Importiert ein Modul in einem neuen Prozess und gibt die Importzeiten zurück.
+- check_startup(budgets=STARTUP_BUDGETS, repeats=REPEATS, top=0): Misst alle Einstiegsmodule und gibt die Verstösse zurück.
+
+Verwendung:
+-----------
+    python benchmark_startup.py             # Aus dem Verzeichnis src; Exit-Code 1 bei Überschreitung
+    python benchmark_startup.py --top 20    # Zeigt zusätzlich die 20 langsamsten Importe
+
+Hinweis:
+--------
+- Gemessen wird nur der Import, nicht der Aufbau der Fenster oder die Datenbankverbindung.
+- Die Budgets gelten für einen üblichen Entwicklungsrechner; auf langsamen Rechnern können sie über
+  `--scale` angepasst werden (z.B. `--scale 2` verdoppelt alle Budgets).
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+STARTUP_BUDGETS = {
+    "main": 600,
+    "gui.admin.gui_admin": 600,
+    "gui.user.gui_users": 600,
+}
+
+DEFERRED_MODULES = ("matplotlib", "openpyxl", "tkcalendar", "pandas")
+
+REPEATS = 3
+
+def measure_imports(module):
+    """
+    Importiert ein Modul in einem neuen Prozess und gibt die Importzeiten zurück.
+
+    Args:
+        module (str): Der Modulname (z.B. "main").
+
+    Returns:
+        dict: Importiertes Modul -> (eigene Zeit in ms, kumulierte Zeit in ms, Verschachtelungstiefe).
+
+    Fehlerbehandlung:
+    ------------------
+    - Wirft einen `RuntimeError` mit der Fehlermeldung des Prozesses, falls der Import fehlschlägt.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        capture_output=True,
+        text=True,
+    )
+    timings = {}
+    errors = []
+    for line in result.stderr.splitlines():
+        # Format: "import time: self [us] | cumulative | imported package"
+        if not line.startswith("import time:"):
+            errors.append(line)
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue
+        name = parts[2].rstrip()
+        # Eine Einrückung von zwei Leerzeichen pro Verschachtelungsebene (nach dem ersten Leerzeichen)
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        timings[name.strip()] = (int(parts[0]) / 1000, int(parts[1]) / 1000, depth)
+
+    if result.returncode != 0:
+        raise RuntimeError("\n".join(errors) or f"Import von {module} fehlgeschlagen")
+    return timings
+
+def check_startup(budgets=STARTUP_BUDGETS, repeats=REPEATS, top=0):
+    """
+    Misst alle Einstiegsmodule und gibt die Verstösse zurück.
+
+    Args:
+        budgets (dict): Einstiegsmodul -> Budget in Millisekunden.
+        repeats (int): Anzahl Messungen pro Modul.
+        top (int): Anzahl der langsamsten Importe, die pro Modul ausgegeben werden.
+
+    Returns:
+        list: Die Meldungen zu überschrittenen Budgets und zu früh geladenen Modulen (leer, wenn alles stimmt).
+    """
+    violations = []
+    for module, budget in budgets.items():
+        runs = [measure_imports(module) for _ in range(max(1, repeats))]
+        # Summe der kumulierten Zeiten der obersten Ebene = Gesamtzeit des Imports
+        totals = [sum(cumulative for _, cumulative, depth in run.values() if depth == 0) for run in runs]
+        timings = runs[totals.index(min(totals))]
+        total = min(totals)
+
+        status = "OK" if total <= budget else "ZU LANGSAM"
+        print(f"{module:<28} {total:8.1f} ms  (Budget {budget:.0f} ms)  {status}")
+        if total > budget:
+            violations.append(f"{module}: {total:.1f} ms > {budget:.0f} ms")
+
+        loaded = sorted({name.split(".")[0] for name in timings} & set(DEFERRED_MODULES))
+        for name in loaded:
+            violations.append(f"{module}: '{name}' wird beim Start importiert")
+
+        if top:
+            slowest = sorted(timings.items(), key=lambda item: item[1][0], reverse=True)[:top]
+            for name, (own, cumulative, _) in slowest:
+                print(f"    {own:8.1f} ms  {cumulative:8.1f} ms  {name}")
+    return violations
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Importzeit der Einstiegsmodule gegen ein Budget prüfen.")
+    parser.add_argument("--scale", type=float, default=1.0, help="Faktor für alle Budgets (Standard: 1)")
+    parser.add_argument("--repeats", type=int, default=REPEATS, help="Messungen pro Modul (Standard: %(default)s)")
+    parser.add_argument("--top", type=int, default=0, help="Anzahl der langsamsten Importe pro Modul anzeigen")
+    args = parser.parse_args()
+
+    budgets = {module: budget * args.scale for module, budget in STARTUP_BUDGETS.items()}
+    try:
+        violations = check_startup(budgets, args.repeats, args.top)
+    except RuntimeError as e:
+        print(f"Fehler beim Messen der Startzeit: {e}")
+        sys.exit(2)
+
+    if violations:
+        print("\nStartzeit-Budget verletzt:")
+        for violation in violations:
+            print(f"- {violation}")
+        sys.exit(1)
+    print("\nStartzeit innerhalb des Budgets")
@@ -0,0 +1,236 @@
+"""
+Modul: Stundenbilanz für TimeArch.
+
+Dieses Modul stellt die Stundenbilanz (Soll-, Ist-Stunden, Saldo, effektive Stellenprozente und Ferien) aller
+Diagramme und Exporte über eine gemeinsame SQL-Funktion `user_balance` bereit. Die Arbeitstage stammen aus
+dem Arbeitstagekalender `work_calendar` (zwei Zeilen pro Benutzer), die Ist-Stunden und Ferien aus
+`user_daily_totals`. Ist ein Monatsabschluss vorhanden (`db_monthly_closing`), werden nur die Tage nach dem
+letzten abgeschlossenen Monat summiert. So liefern alle Ansichten dieselben Zahlen mit einer einzigen Abfrage,
+für einen oder für viele Benutzer, unabhängig von der Länge der Historie.
+
+Klassen:
+--------
+- Balance: Ergebnis der Stundenbilanz eines Benutzers.
+
+Funktionen:
+-----------
+- create_balance_function(cursor): Erstellt bzw. ersetzt die SQL-Funktion `user_balance`.
+- fetch_balances(user_ids=None, until=None): Liest die Stundenbilanz mehrerer (oder aller) Benutzer.
+- fetch_balance(user_id, until=None): Liest die Stundenbilanz eines Benutzers.
+
+Verwendung:
+-----------
+    python -m db.db_balance
+
+    from db.db_balance import fetch_balance
+
+    balance = fetch_balance(user_id)
+    print(balance.balance, balance.effective_percentage)
+
+Hinweis:
+--------
+- Der Zeitraum beginnt am Startdatum des Benutzers (ohne Startdatum am 1. Januar des Stichtags) und endet
+  am Stichtag (inklusive, Standard: heute).
+- Sollstunden: Arbeitstage (Mo-Fr ohne Feiertage, siehe `db_work_calendar`) * Stunden pro Tag * Stellenprozent / 100.
+- Liegt der Zeitraum ausserhalb des Kalenders, werden ersatzweise die Werktage Mo-Fr (ohne Feiertage) gezählt.
+  Der Kalender wird beim Programmstart, beim Import und beim Speichern eines Startdatums ergänzt.
+- Ist-Stunden: Stunden an Werktagen im Zeitraum.
+- Effektive Stellenprozente: Ist-Stunden im Verhältnis zu einem 100%-Pensum im selben Zeitraum.
+- Ferien: Zugewiesene Ferienstunden aus `user_settings`, bezogen werden alle als "Ferien" gebuchten Stunden.
+- Benutzer ohne Einstellungen sind im Ergebnis nicht enthalten.
+"""
+
+from collections import namedtuple
+from db.db_connection import connection
+
+Balance = namedtuple("Balance", [
+    "user_id",
+    "start_date",
+    "default_hours_per_day",
+    "employment_percentage",
+    "work_days",
+    "expected_hours",
+    "actual_hours",
+    "balance",
+    "effective_percentage",
+    "vacation_hours",
+    "vacation_used_hours",
+    "vacation_remaining_hours",
+])
+
+def create_balance_function(cursor):
+    """
+    Erstellt bzw. ersetzt die SQL-Funktion `user_balance(p_user_ids, p_until)`.
+
+    Args:
+        cursor (psycopg2.extensions.cursor): Der Datenbank-Cursor, der für die Abfragen verwendet wird.
+
+    Details:
+    --------
+    - `p_user_ids` (INTEGER[]): Die Benutzer; NULL liefert alle Benutzer mit Einstellungen.
+    - `p_until` (DATE): Der Stichtag; Standard ist das aktuelle Datum.
+    - Die Spalten entsprechen den Feldern von `Balance`.
+
+    Hinweis:
+    --------
+    - Die Tabellen `user_settings`, `user_daily_totals`, `work_calendar` und `monthly_closings` müssen bereits existieren.
+    """
+    cursor.execute('''
+        CREATE OR REPLACE FUNCTION user_balance(p_user_ids INTEGER[] DEFAULT NULL, p_until DATE DEFAULT CURRENT_DATE)
+        RETURNS TABLE (
+            user_id INTEGER,
+            start_date DATE,
+            default_hours_per_day NUMERIC,
+            employment_percentage NUMERIC,
+            work_days INTEGER,
+            expected_hours NUMERIC,
+            actual_hours NUMERIC,
+            balance NUMERIC,
+            effective_percentage NUMERIC,
+            vacation_hours NUMERIC,
+            vacation_used_hours NUMERIC,
+            vacation_remaining_hours NUMERIC
+        ) AS $$
+            WITH settings AS (
+                SELECT DISTINCT ON (us.user_id)
+                       us.user_id,
+                       COALESCE(us.start_date, date_trunc('year', p_until)::date) AS start_date,
+                       us.default_hours_per_day,
+                       us.employment_percentage,
+                       COALESCE(us.vacation_hours, 0) AS vacation_hours
+                FROM user_settings us
+                WHERE p_user_ids IS NULL OR us.user_id = ANY(p_user_ids)
+                ORDER BY us.user_id, us.id
+            ),
+            closings AS (
+                SELECT DISTINCT ON (mc.user_id)
+                       mc.user_id,
+                       (mc.closing_month + interval '1 month')::date AS open_start,
+                       mc.expected_total,
+                       mc.actual_total,
+                       mc.vacation_total
+                FROM monthly_closings mc
+                WHERE (p_user_ids IS NULL OR mc.user_id = ANY(p_user_ids))
+                  AND mc.closing_month + interval '1 month' <= p_until + 1
+                ORDER BY mc.user_id, mc.closing_month DESC
+            ),
+            periods AS (
+                SELECT s.*,
+                       c.open_start,
+                       COALESCE(c.open_start, s.start_date) AS period_start,
+                       COALESCE(c.expected_total, 0) AS closed_expected,
+                       COALESCE(c.actual_total, 0) AS closed_actual,
+                       COALESCE(c.vacation_total, 0) AS closed_vacation
+                FROM settings s
+                LEFT JOIN closings c ON c.user_id = s.user_id
+            ),
+            days AS (
+                -- Fehlt ein Tag im Kalender, werden die Werktage Mo-Fr gezählt (COALESCE wertet das nur dann aus)
+                SELECT p.user_id,
+                       GREATEST(COALESCE(
+                           e.workdays_before - b.workdays_before,
+                           (SELECT COUNT(*) FROM generate_series(p.start_date, p_until, interval '1 day') AS d
+                            WHERE EXTRACT(ISODOW FROM d) < 6)
+                       ), 0)::int AS work_days,
+                       GREATEST(COALESCE(
+                           e.workdays_before - o.workdays_before,
+                           (SELECT COUNT(*) FROM generate_series(p.period_start, p_until, interval '1 day') AS d
+                            WHERE EXTRACT(ISODOW FROM d) < 6)
+                       ), 0)::int AS open_work_days
+                FROM periods p
+                LEFT JOIN work_calendar b ON b.calendar_date = p.start_date
+                LEFT JOIN work_calendar o ON o.calendar_date = p.period_start
+                LEFT JOIN work_calendar e ON e.calendar_date = p_until + 1
+            ),
+            totals AS (
+                SELECT p.user_id,
+                       COALESCE(SUM(t.hours) FILTER (
+                           WHERE t.entry_date >= p.period_start
+                             AND t.entry_date <= p_until
+                             AND EXTRACT(ISODOW FROM t.entry_date) < 6
+                       ), 0) AS open_actual,
+                       COALESCE(SUM(t.vacation_hours), 0) AS open_vacation
+                FROM periods p
+                LEFT JOIN user_daily_totals t
+                    ON t.user_id = p.user_id
+                   AND (p.open_start IS NULL OR t.entry_date >= p.open_start)
+                GROUP BY p.user_id
+            ),
+            balance AS (
+                SELECT p.user_id,
+                       p.start_date,
+                       p.default_hours_per_day,
+                       p.employment_percentage,
+                       d.work_days,
+                       p.closed_expected
+                           + p.default_hours_per_day * p.employment_percentage / 100 * d.open_work_days AS expected_hours,
+                       p.closed_actual + t.open_actual AS actual_hours,
+                       p.vacation_hours,
+                       p.closed_vacation + t.open_vacation AS vacation_used_hours
+                FROM periods p
+                JOIN days d ON d.user_id = p.user_id
+                JOIN totals t ON t.user_id = p.user_id
+            )
+            SELECT b.user_id,
+                   b.start_date,
+                   b.default_hours_per_day,
+                   b.employment_percentage,
+                   b.work_days,
+                   ROUND(b.expected_hours, 2),
+                   b.actual_hours,
+                   ROUND(b.actual_hours - b.expected_hours, 2),
+                   CASE WHEN b.work_days > 0 AND b.default_hours_per_day > 0
+                        THEN ROUND(b.actual_hours / (b.default_hours_per_day * b.work_days) * 100, 1)
+                        ELSE 0
+                   END,
+                   b.vacation_hours,
+                   b.vacation_used_hours,
+                   b.vacation_hours - b.vacation_used_hours
+            FROM balance b
+            ORDER BY b.user_id;
+        $$ LANGUAGE sql STABLE;
+    ''')
+    print("Stundenbilanz-Funktion erfolgreich eingerichtet")
+
+def fetch_balances(user_ids=None, until=None):
+    """
+    Liest die Stundenbilanz mehrerer Benutzer mit einer Abfrage.
+
+    Args:
+        user_ids (iterable, optional): Die Benutzer-IDs. Ohne Angabe werden alle Benutzer mit Einstellungen gelesen.
+        until (datetime.date, optional): Der Stichtag. Standard ist das aktuelle Datum.
+
+    Returns:
+        dict: Benutzer-ID -> `Balance`.
+    """
+    user_ids = None if user_ids is None else [int(user_id) for user_id in user_ids]
+    with connection() as cursor:
+        cursor.execute(
+            "SELECT * FROM user_balance(%s::integer[], COALESCE(%s::date, CURRENT_DATE))",
+            (user_ids, until),
+        )
+        return {row[0]: Balance(*row) for row in cursor.fetchall()}
+
+def fetch_balance(user_id, until=None):
+    """
+    Liest die Stundenbilanz eines Benutzers.
+
+    Args:
+        user_id (int): Die Benutzer-ID.
+        until (datetime.date, optional): Der Stichtag. Standard ist das aktuelle Datum.
+
+    Returns:
+        Balance: Die Stundenbilanz oder None, falls für den Benutzer keine Einstellungen vorhanden sind.
+
+    Hinweis:
+    --------
+    - Kann über `db_executor.submit` in einem Worker-Thread ausgeführt werden.
+    """
+    return fetch_balances([user_id], until).get(int(user_id))
+
+if __name__ == "__main__":
+    try:
+        with connection() as cursor:
+            create_balance_function(cursor)
+    except Exception as e:
+        print(f"Fehler beim Einrichten der Stundenbilanz-Funktion: {e}")
@@ -7,6 +7,7 @@ Die Parameter umfassen Benutzername, Passwort, Host, Port und den Datenbanknamen
 Hinweis:
 - Die Konfigurationsparameter sind als Python-Dictionary definiert.
 - Ändern Sie die Werte nach Bedarf entsprechend Ihrer Umgebung.
+- `DB_POOL_CONFIG` ist optional. Fehlende Werte werden durch die Standardwerte aus `db_connection.POOL_DEFAULTS` ersetzt.
 
 Beispiel:
 --------
@@ -20,4 +21,14 @@ DB_CONFIG = {
     'host': 'your_host',
     'port': 'your_port',
     'database': 'your_database'
-}
\ No newline at end of file
+}
+
+DB_POOL_CONFIG = {
+    'minconn': 1,
+    'maxconn': 10,
+    'health_check_interval': 30,
+    'max_retries': 5,
+    'backoff_base': 0.2,
+    'backoff_max': 5.0,
+    'acquire_timeout': 30
+}
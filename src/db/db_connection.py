@@ -2,29 +2,68 @@
 Datenbankverbindung für TimeArch.
 
 Dieses Modul stellt die Verbindung zur PostgreSQL-Datenbank her, basierend auf den Konfigurationsparametern in `db_config.py`.
+Für den laufenden Betrieb verwaltet es einen prozessweiten Verbindungspool, damit nicht jede Abfrage
+einen neuen TCP-Verbindungsaufbau und eine neue Authentifizierung bezahlen muss.
 
 Module:
 --------
 - psycopg2: Zum Herstellen einer Verbindung zur PostgreSQL-Datenbank.
-- db_config: Enthält die Konfigurationsparameter für die Verbindung.
+- db_config: Enthält die Konfigurationsparameter für die Verbindung und optional `DB_POOL_CONFIG` für den Pool.
 
 Funktionen:
 ------------
-- create_connection(): Erstellt und gibt eine Verbindung zur Datenbank zurück.
+- create_connection(): Erstellt und gibt eine einzelne, nicht gepoolte Verbindung zur Datenbank zurück (z.B. für DDL-Skripte).
+- init_pool(**settings): Erstellt den Verbindungspool (wird sonst beim ersten Zugriff automatisch erstellt).
+- close_pool(): Schliesst alle Verbindungen des Pools.
+- pooled_connection(commit=True): Kontextmanager, der eine geprüfte Verbindung aus dem Pool ausleiht.
+- connection(commit=True, cursor_factory=None): Kontextmanager, der einen Cursor auf einer gepoolten Verbindung liefert.
 
 Verwendung:
 ------------
-    from db_connection import create_connection
+    from db.db_connection import connection
 
-    connection = create_connection()
-    if connection:
-        print("Verbindung erfolgreich!")
-        connection.close()
+    with connection() as cursor:
+        cursor.execute("SELECT 1")
+        print(cursor.fetchone())
+
+Hinweis:
+--------
+- Beim Verlassen des Kontexts wird committet (bzw. bei einer Ausnahme ein Rollback ausgeführt)
+  und die Verbindung an den Pool zurückgegeben.
+- Verbindungen, die länger als `health_check_interval` Sekunden unbenutzt waren, werden vor der
+  Ausgabe mit `SELECT 1` geprüft und bei Bedarf ersetzt.
 """
 
+import atexit
+import threading
+import time
+from contextlib import contextmanager
+
 import psycopg2
+from psycopg2 import pool
 from db.db_config import DB_CONFIG
 
+try:
+    from db.db_config import DB_POOL_CONFIG
+except ImportError:
+    DB_POOL_CONFIG = {}
+
+POOL_DEFAULTS = {
+    "minconn": 1,                   # Verbindungen, die offen gehalten werden
+    "maxconn": 10,                  # Maximale Anzahl gleichzeitiger Verbindungen
+    "health_check_interval": 30,    # Leerlauf in Sekunden, ab dem eine Verbindung geprüft wird
+    "max_retries": 5,               # Verbindungsversuche, bevor ein Fehler weitergegeben wird
+    "backoff_base": 0.2,            # Wartezeit in Sekunden vor dem zweiten Versuch
+    "backoff_max": 5.0,             # Maximale Wartezeit zwischen zwei Versuchen
+    "acquire_timeout": 30,          # Sekunden, die auf eine freie Verbindung gewartet wird
+}
+
+_pool = None
+_pool_slots = None
+_pool_lock = threading.Lock()
+_pool_settings = dict(POOL_DEFAULTS)
+_last_used = {}
+
 def create_connection():
     """
     Stellt eine Verbindung zur PostgreSQL-Datenbank her.
@@ -37,10 +76,240 @@ def create_connection():
 
     Fehler:
         - Zeigt eine Fehlermeldung an, wenn die Verbindung nicht hergestellt werden kann.
+
+    Hinweis:
+        - Für normale Abfragen `connection()` verwenden; diese Funktion ist für Skripte gedacht,
+          die eine eigene Verbindung benötigen (z.B. `autocommit` für DDL).
     """
     try:
         connection = psycopg2.connect(**DB_CONFIG)
         return connection
     except (Exception, psycopg2.Error) as error:
         print("Fehler bei der Verbindung:", error)
-        return None
\ No newline at end of file
+        return None
+
+def init_pool(**settings):
+    """
+    Erstellt den prozessweiten Verbindungspool.
+
+    Args:
+        **settings: Überschreibt einzelne Werte aus `POOL_DEFAULTS` bzw. `DB_POOL_CONFIG`
+                    (z.B. `minconn=2, maxconn=20`).
+
+    Returns:
+        psycopg2.pool.ThreadedConnectionPool: Der erstellte (oder bereits vorhandene) Pool.
+
+    Hinweis:
+        - Ein bereits bestehender Pool wird zuerst geschlossen, wenn neue Einstellungen übergeben werden.
+    """
+    global _pool, _pool_slots, _pool_settings
+
+    with _pool_lock:
+        if _pool is not None and not settings:
+            return _pool
+        if _pool is not None:
+            _close_pool_locked()
+
+        _pool_settings = {**POOL_DEFAULTS, **DB_POOL_CONFIG, **settings}
+        minconn = int(_pool_settings["minconn"])
+        maxconn = max(int(_pool_settings["maxconn"]), minconn, 1)
+
+        _pool = _with_backoff(lambda: pool.ThreadedConnectionPool(minconn, maxconn, **DB_CONFIG))
+        _pool_slots = threading.BoundedSemaphore(maxconn)
+        return _pool
+
+def close_pool():
+    """
+    Schliesst alle Verbindungen des Pools.
+
+    Hinweis:
+        - Wird beim Beenden des Programms automatisch aufgerufen.
+        - Ein späterer Zugriff über `connection()` erstellt einen neuen Pool.
+    """
+    with _pool_lock:
+        _close_pool_locked()
+
+def _close_pool_locked():
+    """
+    Schliesst den Pool, während `_pool_lock` bereits gehalten wird.
+    """
+    global _pool, _pool_slots
+
+    if _pool is not None:
+        try:
+            _pool.closeall()
+        except pool.PoolError:
+            pass
+    _pool = None
+    _pool_slots = None
+    _last_used.clear()
+
+def _get_pool():
+    """
+    Gibt den Pool zurück und erstellt ihn beim ersten Aufruf.
+    """
+    if _pool is None:
+        return init_pool()
+    return _pool
+
+def _with_backoff(connect):
+    """
+    Führt einen Verbindungsaufbau mit exponentiellem Backoff aus.
+
+    Args:
+        connect (callable): Funktion, die den Verbindungsaufbau ausführt.
+
+    Returns:
+        Das Ergebnis von `connect`.
+
+    Fehlerbehandlung:
+    ------------------
+    - Gibt den letzten `psycopg2.OperationalError` weiter, wenn alle Versuche fehlschlagen.
+    """
+    retries = max(int(_pool_settings["max_retries"]), 1)
+    for attempt in range(retries):
+        try:
+            return connect()
+        except psycopg2.OperationalError as error:
+            if attempt == retries - 1:
+                raise
+            delay = min(_pool_settings["backoff_base"] * (2 ** attempt), _pool_settings["backoff_max"])
+            print(f"Verbindung fehlgeschlagen ({error}), neuer Versuch in {delay:.1f}s")
+            time.sleep(delay)
+
+def _is_healthy(conn):
+    """
+    Prüft, ob eine Verbindung aus dem Pool noch verwendbar ist.
+
+    Args:
+        conn (psycopg2.extensions.connection): Die zu prüfende Verbindung.
+
+    Returns:
+        bool: True, wenn die Verbindung offen ist und (falls nötig) auf `SELECT 1` antwortet.
+    """
+    if conn.closed:
+        return False
+    last_used = _last_used.get(id(conn))
+    if last_used is None or time.monotonic() - last_used < _pool_settings["health_check_interval"]:
+        return True
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute("SELECT 1")
+        conn.rollback()
+        return True
+    except psycopg2.Error:
+        return False
+
+def _acquire():
+    """
+    Leiht eine geprüfte Verbindung aus dem Pool aus.
+
+    Returns:
+        tuple: Der Pool und die ausgeliehene Verbindung.
+
+    Fehlerbehandlung:
+    ------------------
+    - Wirft `pool.PoolError`, wenn innerhalb von `acquire_timeout` keine Verbindung frei wird.
+    - Defekte Verbindungen werden verworfen und mit Backoff neu aufgebaut.
+    """
+    conn_pool = _get_pool()
+    slots = _pool_slots
+    if not slots.acquire(timeout=_pool_settings["acquire_timeout"]):
+        raise pool.PoolError("Keine freie Datenbankverbindung verfügbar.")
+
+    try:
+        retries = max(int(_pool_settings["max_retries"]), 1)
+        for attempt in range(retries):
+            conn = _with_backoff(conn_pool.getconn)
+            if _is_healthy(conn):
+                return conn_pool, conn
+            _last_used.pop(id(conn), None)
+            conn_pool.putconn(conn, close=True)
+            print("Defekte Verbindung verworfen, baue neue Verbindung auf.")
+        raise psycopg2.OperationalError("Keine gesunde Datenbankverbindung verfügbar.")
+    except Exception:
+        slots.release()
+        raise
+
+def _release(conn_pool, conn, discard=False):
+    """
+    Gibt eine Verbindung an den Pool zurück.
+
+    Args:
+        conn_pool (psycopg2.pool.ThreadedConnectionPool): Der Pool, aus dem die Verbindung stammt.
+        conn (psycopg2.extensions.connection): Die Verbindung.
+        discard (bool): True, um die Verbindung zu schliessen statt sie wiederzuverwenden.
+    """
+    discard = discard or conn.closed
+    if discard:
+        _last_used.pop(id(conn), None)
+    else:
+        _last_used[id(conn)] = time.monotonic()
+    try:
+        conn_pool.putconn(conn, close=discard)
+    except pool.PoolError:
+        # Pool wurde zwischenzeitlich geschlossen
+        if not conn.closed:
+            conn.close()
+    finally:
+        slots = _pool_slots
+        if slots is not None and conn_pool is _pool:
+            slots.release()
+
+@contextmanager
+def pooled_connection(commit=True):
+    """
+    Leiht eine Verbindung aus dem Pool aus.
+
+    Args:
+        commit (bool): True, um beim Verlassen des Kontexts zu committen. Bei False wird ein Rollback ausgeführt.
+
+    Yields:
+        psycopg2.extensions.connection: Eine geprüfte Datenbankverbindung.
+
+    Fehlerbehandlung:
+    ------------------
+    - Bei einer Ausnahme wird ein Rollback ausgeführt und die Ausnahme weitergegeben.
+    - Verbindungsfehler führen dazu, dass die Verbindung verworfen statt wiederverwendet wird.
+    """
+    conn_pool, conn = _acquire()
+    discard = False
+    try:
+        yield conn
+        if commit:
+            conn.commit()
+        else:
+            conn.rollback()
+    except (psycopg2.OperationalError, psycopg2.InterfaceError):
+        discard = True
+        raise
+    except Exception:
+        if not conn.closed:
+            conn.rollback()
+        raise
+    finally:
+        _release(conn_pool, conn, discard=discard)
+
+@contextmanager
+def connection(commit=True, cursor_factory=None):
+    """
+    Liefert einen Cursor auf einer gepoolten Verbindung.
+
+    Args:
+        commit (bool): True, um beim Verlassen des Kontexts zu committen.
+        cursor_factory (optional): Eine psycopg2-Cursor-Klasse, z.B. `psycopg2.extras.DictCursor`.
+
+    Yields:
+        psycopg2.extensions.cursor: Ein Cursor, der nach dem Kontext automatisch geschlossen wird.
+
+    Beispiel:
+    ---------
+        with connection() as cursor:
+            cursor.execute("SELECT username FROM users WHERE user_id = %s", (1,))
+            username = cursor.fetchone()[0]
+    """
+    with pooled_connection(commit=commit) as conn:
+        with conn.cursor(cursor_factory=cursor_factory) as cursor:
+            yield cursor
+
+atexit.register(close_pool)
@@ -0,0 +1,172 @@
+"""
+Tagessummen pro Benutzer für TimeArch.
+
+Dieses Modul verwaltet die Tabelle `user_daily_totals`, die für jeden Benutzer und Tag die erfassten
+Stunden und die davon als Ferien gebuchten Stunden enthält. Die Tabelle wird durch Trigger auf
+`time_entries` laufend aktuell gehalten, sodass Diagramme nicht bei jeder Aktualisierung alle
+Zeiteinträge neu summieren müssen.
+
+Funktionen:
+-----------
+- create_daily_totals(cursor): Erstellt Tabelle, Triggerfunktion und Trigger.
+- backfill_daily_totals(): Berechnet die Tabelle einmalig vollständig aus `time_entries` neu.
+
+Verwendung:
+-----------
+    python -m db.db_daily_totals
+
+Hinweis:
+--------
+- Die Trigger arbeiten pro Anweisung mit Übergangstabellen, damit auch Massenimporte
+  nur eine Aktualisierung pro Benutzer und Tag auslösen.
+- `TRUNCATE time_entries` wird nicht nachgeführt; danach muss der Backfill ausgeführt werden.
+"""
+
+from db.db_connection import connection
+
+def create_daily_totals(cursor):
+    """
+    Erstellt die Tabelle `user_daily_totals` sowie die Trigger auf `time_entries`.
+
+    Args:
+        cursor (psycopg2.extensions.cursor): Der Datenbank-Cursor, der für die Abfragen verwendet wird.
+
+    Details:
+    --------
+    - Wird die Tabelle neu angelegt, werden bestehende Zeiteinträge direkt übernommen.
+    - Die Funktion kann mehrfach ausgeführt werden; Funktion und Trigger werden ersetzt.
+
+    Hinweis:
+    --------
+    - Die Tabelle `time_entries` muss bereits existieren.
+    """
+    cursor.execute("SELECT to_regclass('user_daily_totals') IS NULL")
+    is_new = cursor.fetchone()[0]
+
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS user_daily_totals (
+            user_id INTEGER REFERENCES users(user_id) ON DELETE CASCADE,
+            entry_date DATE NOT NULL,
+            hours DECIMAL(7, 2) NOT NULL DEFAULT 0,
+            vacation_hours DECIMAL(7, 2) NOT NULL DEFAULT 0,
+            PRIMARY KEY (user_id, entry_date)
+        );
+    ''')
+
+    # Triggerfunktion: zieht alte Zeilen ab und addiert neue Zeilen, gruppiert pro Benutzer und Tag
+    cursor.execute('''
+        CREATE OR REPLACE FUNCTION apply_user_daily_totals() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                INSERT INTO user_daily_totals (user_id, entry_date, hours, vacation_hours)
+                SELECT user_id,
+                       entry_date,
+                       -SUM(COALESCE(hours, 0)),
+                       -SUM(CASE WHEN activity = 'Ferien' THEN COALESCE(hours, 0) ELSE 0 END)
+                FROM old_rows
+                WHERE user_id IS NOT NULL AND entry_date IS NOT NULL
+                GROUP BY user_id, entry_date
+                ON CONFLICT (user_id, entry_date) DO UPDATE
+                SET hours = user_daily_totals.hours + EXCLUDED.hours,
+                    vacation_hours = user_daily_totals.vacation_hours + EXCLUDED.vacation_hours;
+            END IF;
+
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                INSERT INTO user_daily_totals (user_id, entry_date, hours, vacation_hours)
+                SELECT user_id,
+                       entry_date,
+                       SUM(COALESCE(hours, 0)),
+                       SUM(CASE WHEN activity = 'Ferien' THEN COALESCE(hours, 0) ELSE 0 END)
+                FROM new_rows
+                WHERE user_id IS NOT NULL AND entry_date IS NOT NULL
+                GROUP BY user_id, entry_date
+                ON CONFLICT (user_id, entry_date) DO UPDATE
+                SET hours = user_daily_totals.hours + EXCLUDED.hours,
+                    vacation_hours = user_daily_totals.vacation_hours + EXCLUDED.vacation_hours;
+            END IF;
+
+            IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                DELETE FROM user_daily_totals d
+                USING (SELECT DISTINCT user_id, entry_date FROM old_rows) o
+                WHERE d.user_id = o.user_id
+                  AND d.entry_date = o.entry_date
+                  AND d.hours = 0
+                  AND d.vacation_hours = 0;
+            END IF;
+
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+    ''')
+
+    cursor.execute('''
+        DROP TRIGGER IF EXISTS trg_user_daily_totals_insert ON time_entries;
+        CREATE TRIGGER trg_user_daily_totals_insert
+            AFTER INSERT ON time_entries
+            REFERENCING NEW TABLE AS new_rows
+            FOR EACH STATEMENT EXECUTE FUNCTION apply_user_daily_totals();
+
+        DROP TRIGGER IF EXISTS trg_user_daily_totals_update ON time_entries;
+        CREATE TRIGGER trg_user_daily_totals_update
+            AFTER UPDATE ON time_entries
+            REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+            FOR EACH STATEMENT EXECUTE FUNCTION apply_user_daily_totals();
+
+        DROP TRIGGER IF EXISTS trg_user_daily_totals_delete ON time_entries;
+        CREATE TRIGGER trg_user_daily_totals_delete
+            AFTER DELETE ON time_entries
+            REFERENCING OLD TABLE AS old_rows
+            FOR EACH STATEMENT EXECUTE FUNCTION apply_user_daily_totals();
+    ''')
+
+    if is_new:
+        _rebuild_daily_totals(cursor)
+    print("Tagessummen erfolgreich eingerichtet")
+
+def _rebuild_daily_totals(cursor):
+    """
+    Berechnet `user_daily_totals` vollständig aus `time_entries` neu.
+
+    Args:
+        cursor (psycopg2.extensions.cursor): Der Datenbank-Cursor, der für die Abfragen verwendet wird.
+    """
+    # Schreibzugriffe auf time_entries bis zum Ende der Transaktion sperren (nur innerhalb einer Transaktion möglich)
+    if not cursor.connection.autocommit:
+        cursor.execute("LOCK TABLE time_entries IN SHARE MODE")
+    cursor.execute("DELETE FROM user_daily_totals")
+    cursor.execute('''
+        INSERT INTO user_daily_totals (user_id, entry_date, hours, vacation_hours)
+        SELECT user_id,
+               entry_date,
+               SUM(COALESCE(hours, 0)),
+               SUM(CASE WHEN activity = 'Ferien' THEN COALESCE(hours, 0) ELSE 0 END)
+        FROM time_entries
+        WHERE user_id IS NOT NULL AND entry_date IS NOT NULL
+        GROUP BY user_id, entry_date;
+    ''')
+    cursor.execute("ANALYZE user_daily_totals")
+
+def backfill_daily_totals():
+    """
+    Berechnet die Tagessummen einmalig vollständig aus `time_entries` neu.
+
+    Returns:
+        bool: True, wenn der Backfill erfolgreich war, andernfalls False.
+
+    Fehlerbehandlung:
+    ------------------
+    - Gibt eine Fehlermeldung aus; die Transaktion wird zurückgerollt und die bisherigen Summen bleiben erhalten.
+    """
+    try:
+        with connection() as cursor:
+            _rebuild_daily_totals(cursor)
+            cursor.execute("SELECT COUNT(*) FROM user_daily_totals")
+            row_count = cursor.fetchone()[0]
+        print(f"Tagessummen neu berechnet: {row_count} Einträge")
+        return True
+    except Exception as e:
+        print(f"Fehler beim Berechnen der Tagessummen: {e}")
+        return False
+
+if __name__ == "__main__":
+    backfill_daily_totals()
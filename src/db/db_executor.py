@@ -0,0 +1,256 @@
+"""
+Modul: Hintergrund-Ausführung von Datenbankabfragen für TimeArch.
+
+Dieses Modul stellt einen gemeinsamen Thread-Pool bereit, an den die GUI Datenbankabfragen übergibt.
+Die Abfragen laufen ausserhalb des Tk-Hauptthreads; ihre Ergebnisse werden über eine Queue gesammelt
+und mit `after()` im Hauptthread an die Callbacks übergeben. Latenz zur Datenbank friert das Fenster
+dadurch nicht mehr ein.
+
+Klassen:
+--------
+- DBExecutor: Thread-Pool mit Futures, Auslieferung im Tk-Thread und Verwerfen veralteter Ergebnisse.
+
+Funktionen:
+-----------
+- init_executor(root): Erstellt den gemeinsamen Executor bzw. bindet ihn an ein neues Hauptfenster.
+- submit(func, *args, key=None, on_success=None, on_error=None, **kwargs): Übergibt eine Abfrage an den gemeinsamen Executor.
+- discard(key): Verwirft die laufende Anfrage eines Schlüssels.
+- shutdown_executor(): Beendet den gemeinsamen Executor.
+
+Verwendung:
+-----------
+    from db.db_executor import submit
+
+    self.label.configure(text="Lädt...")
+    submit(fetch_entries, user_id, day, key=("time_entries", id(self)), on_success=self.show_entries)
+
+Hinweis:
+--------
+- `func` läuft in einem Worker-Thread und darf keine Tk-Objekte verwenden; nur die Callbacks laufen im Tk-Thread.
+- Anfragen mit demselben `key` ersetzen sich: Nur das Ergebnis der neuesten Anfrage wird ausgeliefert,
+  ältere werden verworfen (bzw. abgebrochen, falls sie noch nicht gestartet sind).
+- Ohne `init_executor` (z.B. in Skripten) wird `func` direkt im aufrufenden Thread ausgeführt.
+"""
+
+import itertools
+import queue
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+
+EXECUTOR_WORKERS = 4        # Anzahl Worker-Threads (kleiner als die maximale Poolgrösse in db_connection)
+POLL_INTERVAL_MS = 30       # Intervall, in dem der Tk-Thread fertige Ergebnisse abholt
+
+class DBExecutor:
+    """
+    Thread-Pool für Datenbankabfragen mit Auslieferung der Ergebnisse im Tk-Thread.
+
+    Funktionen:
+    - Futures-API über `submit`
+    - Verwerfen veralteter Ergebnisse pro Schlüssel
+    - Auslieferung über eine mit `after()` abgefragte Queue
+    """
+    def __init__(self, root, max_workers=EXECUTOR_WORKERS):
+        """
+        Initialisiert den Executor und startet die Abfrage der Ergebnis-Queue.
+
+        Args:
+            root (tk.Misc): Ein Tk-Widget (in der Regel das Hauptfenster), über dessen `after()` ausgeliefert wird.
+            max_workers (int): Anzahl Worker-Threads.
+        """
+        self.root = root
+        self.pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="timearch-db")
+        self.results = queue.Queue()
+        self.lock = threading.Lock()
+        self.tokens = itertools.count(1)
+        self.latest = {}            # key -> (token, future) der neuesten Anfrage
+        self.poll_job = None
+        self.closed = False
+        self.poll()
+
+    def submit(self, func, *args, key=None, on_success=None, on_error=None, **kwargs):
+        """
+        Führt `func(*args, **kwargs)` in einem Worker-Thread aus.
+
+        Args:
+            func (callable): Die auszuführende Funktion (ohne Tk-Zugriffe).
+            key (hashable, optional): Schlüssel der Anfrage; neuere Anfragen mit demselben Schlüssel ersetzen ältere.
+            on_success (callable, optional): Wird im Tk-Thread mit dem Ergebnis aufgerufen.
+            on_error (callable, optional): Wird im Tk-Thread mit der Ausnahme aufgerufen.
+
+        Returns:
+            concurrent.futures.Future: Das Future der Anfrage.
+        """
+        token = next(self.tokens)
+        future = self.pool.submit(func, *args, **kwargs)
+        if key is not None:
+            with self.lock:
+                previous = self.latest.get(key)
+                self.latest[key] = (token, future)
+            if previous:
+                previous[1].cancel()
+        future.add_done_callback(lambda done: self.results.put((key, token, done, on_success, on_error)))
+        return future
+
+    def discard(self, key):
+        """
+        Verwirft die laufende Anfrage eines Schlüssels; ihr Ergebnis wird nicht mehr ausgeliefert.
+
+        Args:
+            key (hashable): Der Schlüssel der Anfrage.
+        """
+        with self.lock:
+            latest = self.latest.pop(key, None)
+        if latest:
+            latest[1].cancel()
+
+    def is_current(self, key, token):
+        """
+        Prüft, ob eine Anfrage die neueste für ihren Schlüssel ist.
+        """
+        if key is None:
+            return True
+        with self.lock:
+            latest = self.latest.get(key)
+            if latest is None or latest[0] != token:
+                return False
+            del self.latest[key]
+            return True
+
+    def poll(self):
+        """
+        Liefert fertige Ergebnisse im Tk-Thread aus und plant die nächste Abfrage.
+
+        Fehlerbehandlung:
+        ------------------
+        - Fehler in Callbacks (z.B. weil das Widget inzwischen zerstört wurde) werden ausgegeben
+          und unterbrechen die Auslieferung nicht.
+        """
+        while True:
+            try:
+                key, token, future, on_success, on_error = self.results.get_nowait()
+            except queue.Empty:
+                break
+            if future.cancelled() or not self.is_current(key, token):
+                continue  # Veraltetes Ergebnis verwerfen
+            _deliver(future, on_success, on_error)
+
+        if not self.closed:
+            self.poll_job = self.root.after(POLL_INTERVAL_MS, self.poll)
+
+    def attach(self, root):
+        """
+        Bindet die Auslieferung an ein neues Hauptfenster.
+
+        Args:
+            root (tk.Misc): Das neue Hauptfenster (z.B. nachdem das Login-Fenster zerstört wurde).
+        """
+        if self.poll_job is not None:
+            try:
+                self.root.after_cancel(self.poll_job)
+            except Exception:
+                pass
+        self.root = root
+        self.poll()
+
+    def shutdown(self):
+        """
+        Beendet die Abfrage der Queue und den Thread-Pool; noch nicht gestartete Anfragen werden abgebrochen.
+        """
+        self.closed = True
+        if self.poll_job is not None:
+            try:
+                self.root.after_cancel(self.poll_job)
+            except Exception:
+                pass
+        self.pool.shutdown(wait=False, cancel_futures=True)
+
+def _deliver(future, on_success, on_error):
+    """
+    Ruft den passenden Callback für ein fertiges Future auf.
+    """
+    try:
+        error = future.exception()
+        if error is None:
+            if on_success:
+                on_success(future.result())
+        elif on_error:
+            on_error(error)
+        else:
+            print(f"Fehler bei der Datenbankabfrage: {error}")
+    except Exception as e:
+        print(f"Fehler beim Verarbeiten des Abfrageergebnisses: {e}")
+
+_executor = None
+
+def init_executor(root, max_workers=EXECUTOR_WORKERS):
+    """
+    Erstellt den gemeinsamen Executor und startet die Auslieferung im Tk-Thread.
+
+    Args:
+        root (tk.Misc): Das Hauptfenster.
+        max_workers (int): Anzahl Worker-Threads.
+
+    Returns:
+        DBExecutor: Der gemeinsame Executor.
+
+    Hinweis:
+    --------
+    - Existiert der Executor bereits, wird die Auslieferung an `root` gebunden (z.B. nach dem Login).
+    """
+    global _executor
+    if _executor is None:
+        _executor = DBExecutor(root, max_workers)
+    elif _executor.root is not root:
+        _executor.attach(root)
+    return _executor
+
+def submit(func, *args, key=None, on_success=None, on_error=None, **kwargs):
+    """
+    Übergibt eine Abfrage an den gemeinsamen Executor.
+
+    Args:
+        func (callable): Die auszuführende Funktion (ohne Tk-Zugriffe).
+        key (hashable, optional): Schlüssel der Anfrage; neuere Anfragen mit demselben Schlüssel ersetzen ältere.
+        on_success (callable, optional): Wird im Tk-Thread mit dem Ergebnis aufgerufen.
+        on_error (callable, optional): Wird im Tk-Thread mit der Ausnahme aufgerufen.
+
+    Returns:
+        concurrent.futures.Future: Das Future der Anfrage.
+
+    Hinweis:
+    --------
+    - Ist kein Executor initialisiert, wird `func` direkt ausgeführt und die Callbacks sofort aufgerufen.
+    """
+    if _executor is not None and not _executor.closed:
+        return _executor.submit(func, *args, key=key, on_success=on_success, on_error=on_error, **kwargs)
+
+    future = Future()
+    try:
+        future.set_result(func(*args, **kwargs))
+    except Exception as e:
+        future.set_exception(e)
+    _deliver(future, on_success, on_error)
+    return future
+
+def discard(key):
+    """
+    Verwirft die laufende Anfrage eines Schlüssels im gemeinsamen Executor.
+
+    Args:
+        key (hashable): Der Schlüssel der Anfrage.
+
+    Hinweis:
+    --------
+    - Wird verwendet, wenn die Anzeige inzwischen aus einer anderen Quelle (z.B. einem Cache) befüllt wurde.
+    """
+    if _executor is not None:
+        _executor.discard(key)
+
+def shutdown_executor():
+    """
+    Beendet den gemeinsamen Executor.
+    """
+    global _executor
+    if _executor is not None:
+        _executor.shutdown()
+        _executor = None
@@ -0,0 +1,162 @@
+"""
+Indexverwaltung für TimeArch.
+
+Dieses Modul definiert die Sekundärindizes, die die häufigsten Abfragen der Anwendung unterstützen,
+und stellt Funktionen bereit, um sie anzulegen oder auf einer bestehenden Datenbank zu prüfen.
+
+Indizes:
+--------
+- idx_time_entries_user_date: Tagessummen pro Benutzer (`WHERE user_id = %s AND entry_date = %s`),
+  mit `INCLUDE (hours)` für Index-Only-Scans.
+- idx_time_entries_project_phase_date: Projekt- und Phasenübersichten sowie Projektdiagramme.
+- idx_time_entries_project_keyset / idx_time_entries_user_keyset: Seitenweises Lesen der Stundenübersichten
+  (`ORDER BY entry_date, entry_id` mit `(entry_date, entry_id) > (...)`, siehe `feature_virtual_treeview`).
+- idx_time_entries_vacation: Teilindex auf `activity = 'Ferien'` für das Feriendiagramm.
+- idx_user_projects_user_project: Eindeutige Zuordnung Benutzer ↔ Projekt.
+- idx_user_projects_project: Benutzer eines Projekts (`load_project_users`).
+- idx_user_settings_user: Benutzereinstellungen pro Benutzer.
+
+Funktionen:
+-----------
+- create_indexes(cursor): Legt alle erwarteten Indizes an, falls sie noch nicht existieren.
+- find_missing_indexes(cursor): Gibt die Namen der erwarteten, aber fehlenden Indizes zurück.
+- check_indexes(): Prüft die Datenbank und gibt einen Bericht über fehlende Indizes aus.
+
+Verwendung:
+-----------
+    python -m db.db_indexes
+"""
+
+import sys
+from db.db_connection import connection
+
+EXPECTED_INDEXES = [
+    (
+        "idx_time_entries_user_date",
+        "time_entries",
+        "CREATE INDEX IF NOT EXISTS idx_time_entries_user_date "
+        "ON time_entries (user_id, entry_date) INCLUDE (hours)",
+    ),
+    (
+        "idx_time_entries_project_phase_date",
+        "time_entries",
+        "CREATE INDEX IF NOT EXISTS idx_time_entries_project_phase_date "
+        "ON time_entries (project_number, phase_id, entry_date)",
+    ),
+    (
+        "idx_time_entries_project_keyset",
+        "time_entries",
+        "CREATE INDEX IF NOT EXISTS idx_time_entries_project_keyset "
+        "ON time_entries (project_number, entry_date, entry_id)",
+    ),
+    (
+        "idx_time_entries_user_keyset",
+        "time_entries",
+        "CREATE INDEX IF NOT EXISTS idx_time_entries_user_keyset "
+        "ON time_entries (user_id, entry_date, entry_id)",
+    ),
+    (
+        "idx_time_entries_vacation",
+        "time_entries",
+        "CREATE INDEX IF NOT EXISTS idx_time_entries_vacation "
+        "ON time_entries (user_id, entry_date) INCLUDE (hours) WHERE activity = 'Ferien'",
+    ),
+    (
+        "idx_user_projects_user_project",
+        "user_projects",
+        "CREATE UNIQUE INDEX IF NOT EXISTS idx_user_projects_user_project "
+        "ON user_projects (user_id, project_number)",
+    ),
+    (
+        "idx_user_projects_project",
+        "user_projects",
+        "CREATE INDEX IF NOT EXISTS idx_user_projects_project "
+        "ON user_projects (project_number, user_id)",
+    ),
+    (
+        "idx_user_settings_user",
+        "user_settings",
+        "CREATE INDEX IF NOT EXISTS idx_user_settings_user "
+        "ON user_settings (user_id)",
+    ),
+]
+
+def create_indexes(cursor):
+    """
+    Legt alle erwarteten Indizes an, falls sie noch nicht existieren.
+
+    Args:
+        cursor (psycopg2.extensions.cursor): Der Datenbank-Cursor, der für die Abfragen verwendet wird.
+
+    Details:
+    --------
+    - Entfernt vor dem eindeutigen Index auf `user_projects` doppelte Zuordnungen (die älteste bleibt erhalten).
+    - Aktualisiert anschliessend die Planerstatistiken der betroffenen Tabellen mit `ANALYZE`.
+
+    Hinweis:
+    --------
+    - Diese Funktion setzt voraus, dass die Tabellen bereits existieren.
+    """
+    cursor.execute('''
+        DELETE FROM user_projects a
+        USING user_projects b
+        WHERE a.user_id = b.user_id
+          AND a.project_number = b.project_number
+          AND a.id > b.id;
+    ''')
+
+    for index_name, table, statement in EXPECTED_INDEXES:
+        cursor.execute(statement)
+
+    for table in sorted({table for _, table, _ in EXPECTED_INDEXES}):
+        cursor.execute(f"ANALYZE {table}")
+    print("Indizes erfolgreich erstellt")
+
+def find_missing_indexes(cursor):
+    """
+    Ermittelt, welche erwarteten Indizes in der Datenbank fehlen.
+
+    Args:
+        cursor (psycopg2.extensions.cursor): Der Datenbank-Cursor, der für die Abfrage verwendet wird.
+
+    Returns:
+        list: Eine Liste von Tupeln (Indexname, Tabelle) der fehlenden Indizes.
+    """
+    cursor.execute('''
+        SELECT indexname
+        FROM pg_indexes
+        WHERE schemaname = current_schema()
+    ''')
+    existing = {row[0] for row in cursor.fetchall()}
+    return [(index_name, table) for index_name, table, _ in EXPECTED_INDEXES if index_name not in existing]
+
+def check_indexes():
+    """
+    Prüft die Datenbank auf fehlende Indizes und gibt einen Bericht aus.
+
+    Returns:
+        bool: True, wenn alle erwarteten Indizes vorhanden sind, andernfalls False.
+
+    Fehlerbehandlung:
+    ------------------
+    - Gibt eine Fehlermeldung aus und liefert False, falls die Datenbankabfrage fehlschlägt.
+    """
+    try:
+        with connection(commit=False) as cursor:
+            missing = find_missing_indexes(cursor)
+    except Exception as e:
+        print(f"Fehler beim Prüfen der Indizes: {e}")
+        return False
+
+    if not missing:
+        print(f"Alle {len(EXPECTED_INDEXES)} erwarteten Indizes sind vorhanden.")
+        return True
+
+    print(f"{len(missing)} von {len(EXPECTED_INDEXES)} erwarteten Indizes fehlen:")
+    for index_name, table in missing:
+        print(f"  - {index_name} (Tabelle {table})")
+    print("Mit `python -m db.db_setup` können die fehlenden Indizes angelegt werden.")
+    return False
+
+if __name__ == "__main__":
+    sys.exit(0 if check_indexes() else 1)
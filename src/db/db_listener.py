@@ -0,0 +1,335 @@
+"""
+Modul: Live-Benachrichtigung über Datenbankänderungen für TimeArch.
+
+Dieses Modul hält pro Client eine einzelne Verbindung, die mit `LISTEN` auf den Kanal aus `db_notify` hört.
+Eingehende Änderungen werden zuerst an die registrierten Hooks (z.B. den Referenzdaten-Cache) übergeben und
+danach im Tk-Thread an die geöffneten Frames verteilt, die sich für die betroffene Tabelle angemeldet haben.
+So sehen alle Clients die Änderungen eines anderen Clients, ohne die Datenbank regelmässig abzufragen.
+
+Klassen:
+--------
+- Change: Eine Änderung (table, op, keys); `keys` ordnet jeder Schlüsselspalte die betroffenen Werte zu
+  und ist None, wenn die betroffenen Schlüssel unbekannt sind.
+- ChangeListener: Hintergrund-Thread mit der `LISTEN`-Verbindung inklusive automatischem Neuverbinden.
+
+Funktionen:
+-----------
+- add_change_hook(hook): Registriert eine Funktion, die im Listener-Thread jede Änderung erhält.
+- subscribe(widget, tables, callback, **filters): Meldet ein Widget für Änderungen an Tabellen an.
+- unsubscribe(subscription): Meldet eine Anmeldung wieder ab.
+- start_listener(root): Startet den Listener-Thread bzw. bindet die Verteilung an ein neues Hauptfenster.
+- stop_listener(): Beendet den Listener.
+
+Verwendung:
+-----------
+    from db.db_listener import subscribe
+
+    subscribe(self, ["time_entries"], self.load_hours, user_id=lambda: self.user_id)
+
+Hinweis:
+--------
+- Hooks laufen im Listener-Thread und dürfen keine Tk-Objekte verwenden; Callbacks von `subscribe` laufen im Tk-Thread.
+- Alle Änderungen, die bis zur nächsten Verteilung eintreffen, werden pro Tabelle zusammengefasst: Jeder Callback
+  wird pro Verteilung höchstens einmal aufgerufen.
+- Nach einem Verbindungsabbruch können Benachrichtigungen verloren gegangen sein. Nach dem Neuverbinden wird
+  deshalb eine Änderung mit `table == ALL_TABLES` verteilt, die alle Hooks und Anmeldungen betrifft.
+- Anmeldungen zerstörter Widgets werden bei der nächsten Verteilung automatisch entfernt.
+"""
+
+import json
+import queue
+import select
+import threading
+from collections import namedtuple
+from db.db_connection import create_connection
+from db.db_notify import NOTIFY_CHANNEL
+
+DISPATCH_INTERVAL_MS = 250  # Intervall, in dem der Tk-Thread eingegangene Änderungen verteilt
+SELECT_TIMEOUT = 1.0        # Maximale Wartezeit pro select()-Aufruf in Sekunden (bestimmt die Reaktionszeit auf stop)
+RECONNECT_DELAYS = [1, 2, 5, 10, 30]    # Wartezeiten in Sekunden zwischen Verbindungsversuchen
+
+ALL_TABLES = "*"
+
+Change = namedtuple("Change", "table op keys")
+Subscription = namedtuple("Subscription", "widget tables callback filters")
+
+def parse_change(payload):
+    """
+    Wandelt eine NOTIFY-Nachricht in eine `Change` um.
+
+    Args:
+        payload (str): Die JSON-Nachricht aus `notify_timearch_change`.
+
+    Returns:
+        Change: Die Änderung oder None, falls die Nachricht ungültig ist.
+    """
+    try:
+        data = json.loads(payload)
+        keys = data.get("keys")
+        if keys is not None:
+            keys = {
+                column: None if values is None else frozenset(str(value) for value in values)
+                for column, values in keys.items()
+            }
+        return Change(data["table"], data.get("op"), keys)
+    except (ValueError, KeyError, TypeError):
+        print(f"Ungültige Änderungsnachricht: {payload}")
+        return None
+
+def merge_changes(changes):
+    """
+    Fasst mehrere Änderungen pro Tabelle zusammen.
+
+    Args:
+        changes (list): `Change`-Tupel in der Reihenfolge ihres Eintreffens.
+
+    Returns:
+        dict: Tabelle -> {Spalte: vereinigte Werte}; None steht jeweils für unbekannte Schlüssel.
+    """
+    merged = {}
+    for change in changes:
+        if change.table in merged and merged[change.table] is None:
+            continue
+        if change.keys is None:
+            merged[change.table] = None
+            continue
+        table_keys = merged.setdefault(change.table, {})
+        for column, values in change.keys.items():
+            if values is None or (column in table_keys and table_keys[column] is None):
+                table_keys[column] = None
+            else:
+                table_keys[column] = table_keys.get(column, frozenset()) | values
+    return merged
+
+class ChangeListener(threading.Thread):
+    """
+    Hintergrund-Thread, der auf `NOTIFY_CHANNEL` hört.
+
+    Funktionen:
+    - Eigene Verbindung im Autocommit-Modus (nicht aus dem Pool)
+    - Automatisches Neuverbinden mit zunehmender Wartezeit
+    - Übergabe der Änderungen an die Hooks und an die Queue für den Tk-Thread
+    """
+    def __init__(self, hooks, changes):
+        """
+        Initialisiert den Listener.
+
+        Args:
+            hooks (list): Funktionen, die im Listener-Thread mit jeder `Change` aufgerufen werden.
+            changes (queue.Queue): Queue, über die Änderungen an den Tk-Thread übergeben werden.
+        """
+        super().__init__(name="timearch-listener", daemon=True)
+        self.hooks = hooks
+        self.changes = changes
+        self.stop_event = threading.Event()
+
+    def run(self):
+        """
+        Hält die `LISTEN`-Verbindung offen und verbindet sich nach Fehlern neu.
+        """
+        attempt = 0
+        connected_before = False
+        while not self.stop_event.is_set():
+            conn = create_connection()
+            if conn is None:
+                self.stop_event.wait(RECONNECT_DELAYS[min(attempt, len(RECONNECT_DELAYS) - 1)])
+                attempt += 1
+                continue
+
+            try:
+                conn.autocommit = True
+                with conn.cursor() as cursor:
+                    cursor.execute(f"LISTEN {NOTIFY_CHANNEL}")
+                attempt = 0
+                if connected_before:
+                    # Während der Unterbrechung verpasste Änderungen sind unbekannt
+                    self.publish(Change(ALL_TABLES, "RECONNECT", None))
+                connected_before = True
+                self.listen(conn)
+            except Exception as e:
+                print(f"Verbindung für Änderungsbenachrichtigungen unterbrochen: {e}")
+                self.stop_event.wait(RECONNECT_DELAYS[min(attempt, len(RECONNECT_DELAYS) - 1)])
+                attempt += 1
+            finally:
+                conn.close()
+
+    def listen(self, conn):
+        """
+        Wartet auf Benachrichtigungen, bis der Listener beendet wird.
+
+        Args:
+            conn (psycopg2.extensions.connection): Die Verbindung, auf der `LISTEN` ausgeführt wurde.
+        """
+        while not self.stop_event.is_set():
+            readable, _, _ = select.select([conn], [], [], SELECT_TIMEOUT)
+            if not readable:
+                continue
+            conn.poll()
+            while conn.notifies:
+                change = parse_change(conn.notifies.pop(0).payload)
+                if change:
+                    self.publish(change)
+
+    def publish(self, change):
+        """
+        Übergibt eine Änderung an die Hooks und an die Queue für den Tk-Thread.
+
+        Fehlerbehandlung:
+        ------------------
+        - Fehler in Hooks werden ausgegeben und unterbrechen den Listener nicht.
+        """
+        for hook in list(self.hooks):
+            try:
+                hook(change)
+            except Exception as e:
+                print(f"Fehler beim Verarbeiten der Änderung {change}: {e}")
+        self.changes.put(change)
+
+    def stop(self):
+        """
+        Beendet den Listener nach dem aktuellen select()-Aufruf.
+        """
+        self.stop_event.set()
+
+_hooks = []
+_subscriptions = []
+_changes = queue.Queue()
+_listener = None
+_root = None
+_dispatch_job = None
+
+def add_change_hook(hook):
+    """
+    Registriert eine Funktion, die im Listener-Thread jede Änderung erhält.
+
+    Args:
+        hook (callable): Wird mit einer `Change` aufgerufen; darf keine Tk-Objekte verwenden.
+    """
+    if hook not in _hooks:
+        _hooks.append(hook)
+
+def subscribe(widget, tables, callback, **filters):
+    """
+    Meldet ein Widget für Änderungen an Tabellen an.
+
+    Args:
+        widget (tk.Misc): Das Widget, dessen Lebensdauer die Anmeldung begrenzt.
+        tables (iterable): Die Tabellen aus `db_notify.NOTIFY_TABLES`, deren Änderungen relevant sind.
+        callback (callable): Wird im Tk-Thread ohne Argumente aufgerufen, wenn eine relevante Änderung eintrifft.
+        **filters: Schlüsselspalte -> Wert (bzw. Funktion, die den aktuellen Wert liefert), z.B.
+                   `user_id=lambda: self.user_id`. Ohne Filter löst jede Änderung der Tabellen den Callback aus.
+
+    Returns:
+        Subscription: Die Anmeldung, z.B. für `unsubscribe`.
+
+    Hinweis:
+    --------
+    - Filter auf Spalten, die eine Tabelle nicht mitsendet, werden für diese Tabelle ignoriert.
+    - Liefert ein Filter None, wird er ignoriert.
+    """
+    subscription = Subscription(widget, frozenset(tables), callback, filters)
+    _subscriptions.append(subscription)
+    return subscription
+
+def unsubscribe(subscription):
+    """
+    Meldet eine Anmeldung wieder ab.
+    """
+    if subscription in _subscriptions:
+        _subscriptions.remove(subscription)
+
+def _widget_exists(widget):
+    try:
+        return bool(widget.winfo_exists())
+    except Exception:
+        return False
+
+def _is_affected(subscription, merged):
+    """
+    Prüft, ob zusammengefasste Änderungen eine Anmeldung betreffen.
+    """
+    if ALL_TABLES in merged:
+        return True
+    filters = {
+        column: value() if callable(value) else value
+        for column, value in subscription.filters.items()
+    }
+    for table in subscription.tables & merged.keys():
+        table_keys = merged[table]
+        if table_keys is None:
+            return True
+        if all(
+            value is None or table_keys.get(column) is None or str(value) in table_keys[column]
+            for column, value in filters.items()
+        ):
+            return True
+    return False
+
+def dispatch():
+    """
+    Verteilt die eingegangenen Änderungen im Tk-Thread und plant die nächste Verteilung.
+
+    Fehlerbehandlung:
+    ------------------
+    - Fehler in Callbacks werden ausgegeben und unterbrechen die Verteilung nicht.
+    """
+    global _dispatch_job
+    changes = []
+    while True:
+        try:
+            changes.append(_changes.get_nowait())
+        except queue.Empty:
+            break
+
+    if changes:
+        merged = merge_changes(changes)
+        for subscription in list(_subscriptions):
+            if not _widget_exists(subscription.widget):
+                unsubscribe(subscription)
+                continue
+            try:
+                if _is_affected(subscription, merged):
+                    subscription.callback()
+            except Exception as e:
+                print(f"Fehler beim Aktualisieren nach einer Datenbankänderung: {e}")
+
+    _dispatch_job = _root.after(DISPATCH_INTERVAL_MS, dispatch) if _root is not None else None
+
+def start_listener(root):
+    """
+    Startet den Listener-Thread und die Verteilung im Tk-Thread.
+
+    Args:
+        root (tk.Misc): Das Hauptfenster, über dessen `after()` verteilt wird.
+
+    Hinweis:
+    --------
+    - Läuft der Listener bereits, wird nur die Verteilung an `root` gebunden (z.B. nach dem Login).
+    """
+    global _listener, _root, _dispatch_job
+    if _dispatch_job is not None:
+        try:
+            _root.after_cancel(_dispatch_job)
+        except Exception:
+            pass
+    _root = root
+    if _listener is None:
+        _listener = ChangeListener(_hooks, _changes)
+        _listener.start()
+    dispatch()
+
+def stop_listener():
+    """
+    Beendet den Listener und die Verteilung.
+    """
+    global _listener, _root, _dispatch_job
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+    if _dispatch_job is not None:
+        try:
+            _root.after_cancel(_dispatch_job)
+        except Exception:
+            pass
+        _dispatch_job = None
+    _root = None
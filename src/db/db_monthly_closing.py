@@ -0,0 +1,304 @@
+"""
+Modul: Monatsabschlüsse für TimeArch.
+
+Dieses Modul verwaltet die Tabelle `monthly_closings`, die pro Benutzer und abgeschlossenem Monat die Soll-,
+Ist- und Ferienstunden sowie die bis Monatsende aufgelaufenen Summen und den Saldo festhält. Die Stundenbilanz
+(`db_balance`) liest den letzten Abschluss und summiert nur die Tage danach, statt die gesamte Historie seit dem
+Startdatum neu zu berechnen.
+
+Funktionen:
+-----------
+- create_monthly_closings(cursor): Erstellt die Tabelle sowie die Trigger, die veraltete Abschlüsse verwerfen.
+- close_months(cursor, until_month=None, user_ids=None): Schliesst alle offenen Monate bis und mit `until_month` ab.
+- reopen_months(cursor, user_ids=None, from_month=None): Verwirft Abschlüsse ab einem Monat.
+- last_closed_month(until=None): Gibt den letzten Monat zurück, der abgeschlossen werden kann.
+
+Verwendung:
+-----------
+    python -m db.db_monthly_closing     # Erstellt Tabelle und Trigger
+
+    from db.db_monthly_closing import close_months
+
+    with connection() as cursor:
+        closed = close_months(cursor)
+
+Hinweis:
+--------
+- Abgeschlossen werden nur Benutzer mit Startdatum; ohne Startdatum beginnt die Stundenbilanz jedes Jahr neu.
+- Ändern sich Tagessummen eines abgeschlossenen Monats (nachträgliche Buchungen) oder die Einstellungen
+  (Startdatum, Stunden pro Tag, Stellenprozent) eines Benutzers, werden die betroffenen Abschlüsse durch Trigger
+  verworfen. Die Stundenbilanz bleibt damit immer gleich wie ohne Abschlüsse; der nächste Abschluss holt die
+  Monate wieder nach.
+- Die Feriensumme des ersten Monats enthält auch Ferienstunden vor dem Startdatum (wie `user_balance`).
+"""
+
+import datetime
+from db.db_connection import connection
+
+def last_closed_month(until=None):
+    """
+    Gibt den letzten Monat zurück, der abgeschlossen werden kann (der Vormonat).
+
+    Args:
+        until (datetime.date, optional): Das Bezugsdatum. Standard ist das aktuelle Datum.
+
+    Returns:
+        datetime.date: Der erste Tag des Vormonats.
+    """
+    until = until or datetime.date.today()
+    return (until.replace(day=1) - datetime.timedelta(days=1)).replace(day=1)
+
+def create_monthly_closings(cursor):
+    """
+    Erstellt die Tabelle `monthly_closings` sowie die Trigger auf `user_daily_totals` und `user_settings`.
+
+    Args:
+        cursor (psycopg2.extensions.cursor): Der Datenbank-Cursor, der für die Abfragen verwendet wird.
+
+    Details:
+    --------
+    - `closing_month`: Erster Tag des abgeschlossenen Monats.
+    - `expected_hours`, `actual_hours`, `vacation_hours`: Werte des Monats.
+    - `expected_total`, `actual_total`, `vacation_total`: Aufgelaufene Werte bis Monatsende.
+    - `carried_balance`: Saldo bis Monatsende (`actual_total - expected_total`).
+    - Die Funktion kann mehrfach ausgeführt werden; Funktionen und Trigger werden ersetzt.
+
+    Hinweis:
+    --------
+    - Die Tabellen `user_settings` und `user_daily_totals` müssen bereits existieren.
+    """
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS monthly_closings (
+            user_id INTEGER REFERENCES users(user_id) ON DELETE CASCADE,
+            closing_month DATE NOT NULL,
+            expected_hours NUMERIC NOT NULL,
+            actual_hours NUMERIC NOT NULL,
+            vacation_hours NUMERIC NOT NULL,
+            expected_total NUMERIC NOT NULL,
+            actual_total NUMERIC NOT NULL,
+            vacation_total NUMERIC NOT NULL,
+            carried_balance NUMERIC NOT NULL,
+            closed_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (user_id, closing_month)
+        );
+    ''')
+
+    # Geänderte Tagessummen: Abschlüsse ab dem Monat der frühesten Änderung pro Benutzer verwerfen
+    cursor.execute('''
+        CREATE OR REPLACE FUNCTION reopen_monthly_closings_for_totals() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP = 'TRUNCATE' THEN
+                DELETE FROM monthly_closings;
+                RETURN NULL;
+            END IF;
+
+            IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                DELETE FROM monthly_closings mc
+                USING (SELECT user_id, MIN(entry_date) AS first_date FROM old_rows GROUP BY user_id) o
+                WHERE mc.user_id = o.user_id
+                  AND mc.closing_month >= date_trunc('month', o.first_date)::date;
+            END IF;
+
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                DELETE FROM monthly_closings mc
+                USING (SELECT user_id, MIN(entry_date) AS first_date FROM new_rows GROUP BY user_id) n
+                WHERE mc.user_id = n.user_id
+                  AND mc.closing_month >= date_trunc('month', n.first_date)::date;
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+    ''')
+
+    cursor.execute('''
+        DROP TRIGGER IF EXISTS trg_monthly_closings_totals_insert ON user_daily_totals;
+        CREATE TRIGGER trg_monthly_closings_totals_insert
+            AFTER INSERT ON user_daily_totals
+            REFERENCING NEW TABLE AS new_rows
+            FOR EACH STATEMENT EXECUTE FUNCTION reopen_monthly_closings_for_totals();
+
+        DROP TRIGGER IF EXISTS trg_monthly_closings_totals_update ON user_daily_totals;
+        CREATE TRIGGER trg_monthly_closings_totals_update
+            AFTER UPDATE ON user_daily_totals
+            REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+            FOR EACH STATEMENT EXECUTE FUNCTION reopen_monthly_closings_for_totals();
+
+        DROP TRIGGER IF EXISTS trg_monthly_closings_totals_delete ON user_daily_totals;
+        CREATE TRIGGER trg_monthly_closings_totals_delete
+            AFTER DELETE ON user_daily_totals
+            REFERENCING OLD TABLE AS old_rows
+            FOR EACH STATEMENT EXECUTE FUNCTION reopen_monthly_closings_for_totals();
+
+        DROP TRIGGER IF EXISTS trg_monthly_closings_totals_truncate ON user_daily_totals;
+        CREATE TRIGGER trg_monthly_closings_totals_truncate
+            AFTER TRUNCATE ON user_daily_totals
+            FOR EACH STATEMENT EXECUTE FUNCTION reopen_monthly_closings_for_totals();
+    ''')
+
+    # Geänderte Einstellungen: alle Abschlüsse des Benutzers verwerfen
+    cursor.execute('''
+        CREATE OR REPLACE FUNCTION reopen_monthly_closings_for_settings() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                DELETE FROM monthly_closings WHERE user_id = OLD.user_id;
+            END IF;
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                DELETE FROM monthly_closings WHERE user_id = NEW.user_id;
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+    ''')
+
+    cursor.execute('''
+        DROP TRIGGER IF EXISTS trg_monthly_closings_settings_update ON user_settings;
+        CREATE TRIGGER trg_monthly_closings_settings_update
+            AFTER UPDATE ON user_settings
+            FOR EACH ROW
+            WHEN ((OLD.user_id, OLD.start_date, OLD.default_hours_per_day, OLD.employment_percentage)
+                  IS DISTINCT FROM (NEW.user_id, NEW.start_date, NEW.default_hours_per_day, NEW.employment_percentage))
+            EXECUTE FUNCTION reopen_monthly_closings_for_settings();
+
+        DROP TRIGGER IF EXISTS trg_monthly_closings_settings_change ON user_settings;
+        CREATE TRIGGER trg_monthly_closings_settings_change
+            AFTER INSERT OR DELETE ON user_settings
+            FOR EACH ROW EXECUTE FUNCTION reopen_monthly_closings_for_settings();
+    ''')
+    print("Monatsabschlüsse erfolgreich eingerichtet")
+
+def close_months(cursor, until_month=None, user_ids=None):
+    """
+    Schliesst alle offenen Monate bis und mit `until_month` ab.
+
+    Args:
+        cursor (psycopg2.extensions.cursor): Der Datenbank-Cursor, der für die Abfragen verwendet wird.
+        until_month (datetime.date, optional): Ein Tag im letzten abzuschliessenden Monat.
+                                               Standard und Maximum ist der Vormonat (`last_closed_month`).
+        user_ids (iterable, optional): Die Benutzer-IDs. Ohne Angabe werden alle Benutzer abgeschlossen.
+
+    Returns:
+        int: Die Anzahl neu abgeschlossener Monate (über alle Benutzer).
+
+    Details:
+    --------
+    - Pro Benutzer wird ab dem Monat nach dem letzten Abschluss (bzw. ab dem Monat des Startdatums) abgeschlossen.
+    - Sollstunden stammen aus `work_calendar`, Ist- und Ferienstunden aus `user_daily_totals`; die Berechnung
+      entspricht `user_balance`.
+    - Alle Monate und Benutzer werden mit einer einzigen Anweisung berechnet und eingefügt.
+    - Eine Advisory-Sperre verhindert, dass zwei Abschlüsse gleichzeitig laufen.
+    """
+    latest = last_closed_month()
+    until_month = latest if until_month is None else min(until_month.replace(day=1), latest)
+    user_ids = None if user_ids is None else [int(user_id) for user_id in user_ids]
+
+    cursor.execute("SELECT pg_advisory_xact_lock(hashtext('monthly_closings'))")
+    cursor.execute('''
+        WITH settings AS (
+            SELECT DISTINCT ON (us.user_id)
+                   us.user_id,
+                   us.start_date,
+                   us.default_hours_per_day,
+                   us.employment_percentage
+            FROM user_settings us
+            WHERE %(user_ids)s::integer[] IS NULL OR us.user_id = ANY(%(user_ids)s::integer[])
+            ORDER BY us.user_id, us.id
+        ),
+        last_closings AS (
+            SELECT DISTINCT ON (mc.user_id)
+                   mc.user_id, mc.closing_month, mc.expected_total, mc.actual_total, mc.vacation_total
+            FROM monthly_closings mc
+            ORDER BY mc.user_id, mc.closing_month DESC
+        ),
+        months AS (
+            SELECT s.user_id,
+                   s.start_date,
+                   s.default_hours_per_day,
+                   s.employment_percentage,
+                   m::date AS closing_month,
+                   GREATEST(m::date, s.start_date) AS period_start,
+                   (m + interval '1 month')::date AS period_end,
+                   COALESCE(lc.expected_total, 0) AS previous_expected,
+                   COALESCE(lc.actual_total, 0) AS previous_actual,
+                   COALESCE(lc.vacation_total, 0) AS previous_vacation
+            FROM settings s
+            LEFT JOIN last_closings lc ON lc.user_id = s.user_id
+            CROSS JOIN LATERAL generate_series(
+                COALESCE(lc.closing_month + interval '1 month', date_trunc('month', s.start_date)),
+                %(until_month)s::date,
+                interval '1 month'
+            ) AS m
+            WHERE s.start_date IS NOT NULL
+        ),
+        month_values AS (
+            SELECT m.*,
+                   m.default_hours_per_day * m.employment_percentage / 100
+                       * GREATEST(COALESCE(e.workdays_before - b.workdays_before, 0), 0) AS expected_hours,
+                   COALESCE((
+                       SELECT SUM(t.hours)
+                       FROM user_daily_totals t
+                       WHERE t.user_id = m.user_id
+                         AND t.entry_date >= m.period_start
+                         AND t.entry_date < m.period_end
+                         AND EXTRACT(ISODOW FROM t.entry_date) < 6
+                   ), 0) AS actual_hours,
+                   COALESCE((
+                       SELECT SUM(t.vacation_hours)
+                       FROM user_daily_totals t
+                       WHERE t.user_id = m.user_id
+                         AND t.entry_date < m.period_end
+                         AND (m.closing_month = date_trunc('month', m.start_date)::date OR t.entry_date >= m.closing_month)
+                   ), 0) AS vacation_hours
+            FROM months m
+            LEFT JOIN work_calendar b ON b.calendar_date = m.period_start
+            LEFT JOIN work_calendar e ON e.calendar_date = m.period_end
+        ),
+        running AS (
+            SELECT v.user_id,
+                   v.closing_month,
+                   v.expected_hours,
+                   v.actual_hours,
+                   v.vacation_hours,
+                   v.previous_expected + SUM(v.expected_hours) OVER w AS expected_total,
+                   v.previous_actual + SUM(v.actual_hours) OVER w AS actual_total,
+                   v.previous_vacation + SUM(v.vacation_hours) OVER w AS vacation_total
+            FROM month_values v
+            WINDOW w AS (PARTITION BY v.user_id ORDER BY v.closing_month)
+        )
+        INSERT INTO monthly_closings (
+            user_id, closing_month, expected_hours, actual_hours, vacation_hours,
+            expected_total, actual_total, vacation_total, carried_balance
+        )
+        SELECT user_id, closing_month, expected_hours, actual_hours, vacation_hours,
+               expected_total, actual_total, vacation_total, actual_total - expected_total
+        FROM running
+        ON CONFLICT (user_id, closing_month) DO NOTHING
+    ''', {"user_ids": user_ids, "until_month": until_month})
+    return cursor.rowcount
+
+def reopen_months(cursor, user_ids=None, from_month=None):
+    """
+    Verwirft Abschlüsse ab einem Monat.
+
+    Args:
+        cursor (psycopg2.extensions.cursor): Der Datenbank-Cursor, der für die Abfragen verwendet wird.
+        user_ids (iterable, optional): Die Benutzer-IDs. Ohne Angabe werden alle Benutzer berücksichtigt.
+        from_month (datetime.date, optional): Ein Tag im ersten zu verwerfenden Monat. Ohne Angabe werden alle
+                                              Abschlüsse verworfen.
+
+    Returns:
+        int: Die Anzahl verworfener Abschlüsse.
+    """
+    user_ids = None if user_ids is None else [int(user_id) for user_id in user_ids]
+    cursor.execute('''
+        DELETE FROM monthly_closings
+        WHERE (%(user_ids)s::integer[] IS NULL OR user_id = ANY(%(user_ids)s::integer[]))
+          AND (%(from_month)s::date IS NULL OR closing_month >= date_trunc('month', %(from_month)s::date)::date)
+    ''', {"user_ids": user_ids, "from_month": from_month})
+    return cursor.rowcount
+
+if __name__ == "__main__":
+    try:
+        with connection() as cursor:
+            create_monthly_closings(cursor)
+    except Exception as e:
+        print(f"Fehler beim Einrichten der Monatsabschlüsse: {e}")
@@ -0,0 +1,146 @@
+"""
+Änderungsbenachrichtigungen für TimeArch.
+
+Dieses Modul legt Trigger an, die bei Änderungen an den Stammdaten und Zeiteinträgen ein `NOTIFY` auf dem
+Kanal `NOTIFY_CHANNEL` senden. Laufende Clients hören über `db_listener` auf diesen Kanal und verwerfen bzw.
+aktualisieren nur die betroffenen Caches und Ansichten.
+
+Konstanten:
+-----------
+- NOTIFY_CHANNEL: Name des Kanals für `LISTEN`/`NOTIFY`.
+- NOTIFY_TABLES: Überwachte Tabellen und die Spalten, deren Werte als betroffene Schlüssel mitgesendet werden.
+- NOTIFY_KEY_LIMIT: Maximale Anzahl mitgesendeter Schlüssel pro Spalte; bei mehr Schlüsseln wird die Spalte auf null gesetzt.
+
+Funktionen:
+-----------
+- create_notify_triggers(cursor): Erstellt die Triggerfunktion und die Trigger auf allen überwachten Tabellen.
+
+Verwendung:
+-----------
+    python -m db.db_notify
+
+Hinweis:
+--------
+- Die Nachricht ist ein JSON-Objekt, z.B.
+  `{"table": "time_entries", "op": "INSERT", "keys": {"user_id": [3, 7], "project_number": ["0000"]}}`.
+  `keys` ist null, wenn die betroffenen Schlüssel unbekannt sind (TRUNCATE); eine einzelne Spalte ist null,
+  wenn ihre Schlüssel `NOTIFY_KEY_LIMIT` übersteigen.
+- Die Trigger sind Statement-Trigger: Ein Import mit tausenden Zeilen sendet pro Anweisung eine Nachricht.
+- PostgreSQL stellt Benachrichtigungen erst beim Commit zu und fasst identische Nachrichten einer Transaktion zusammen.
+"""
+
+from db.db_connection import connection
+
+NOTIFY_CHANNEL = "timearch_changes"
+NOTIFY_KEY_LIMIT = 100
+
+NOTIFY_TABLES = {
+    "time_entries": ("user_id", "project_number"),
+    "projects": ("project_number",),
+    "users": ("user_id",),
+    "user_settings": ("user_id",),
+    "project_sia_phases": ("project_number",),
+    "user_projects": ("user_id", "project_number"),
+}
+
+def create_notify_triggers(cursor):
+    """
+    Erstellt die Triggerfunktion `notify_timearch_change` und die Trigger auf allen Tabellen in `NOTIFY_TABLES`.
+
+    Args:
+        cursor (psycopg2.extensions.cursor): Der Datenbank-Cursor, der für die Abfragen verwendet wird.
+
+    Details:
+    --------
+    - INSERT, UPDATE und DELETE verwenden Transition-Tabellen, um die betroffenen Schlüssel pro Spalte zu ermitteln.
+    - TRUNCATE sendet eine Nachricht ohne Schlüssel.
+    - Anweisungen ohne betroffene Zeilen senden keine Nachricht.
+    - Die Funktion kann mehrfach ausgeführt werden; Funktion und Trigger werden ersetzt.
+
+    Hinweis:
+    --------
+    - Alle Tabellen in `NOTIFY_TABLES` müssen bereits existieren.
+    """
+    # Triggerfunktion: TG_ARGV enthält die Schlüsselspalten der Tabelle
+    cursor.execute(f'''
+        CREATE OR REPLACE FUNCTION notify_timearch_change() RETURNS trigger AS $$
+        DECLARE
+            key_column TEXT;
+            key_source TEXT;
+            key_count INTEGER;
+            column_keys JSONB;
+            row_count BIGINT;
+            changed_keys JSONB := '{{}}'::jsonb;
+        BEGIN
+            IF TG_OP = 'TRUNCATE' THEN
+                changed_keys := NULL;
+            ELSE
+                IF TG_OP = 'INSERT' THEN
+                    SELECT COUNT(*) INTO row_count FROM new_rows;
+                ELSE
+                    SELECT COUNT(*) INTO row_count FROM old_rows;
+                END IF;
+                IF row_count = 0 THEN
+                    RETURN NULL;
+                END IF;
+
+                FOREACH key_column IN ARRAY TG_ARGV LOOP
+                    key_source := CASE TG_OP
+                        WHEN 'INSERT' THEN format('SELECT %1$I AS k FROM new_rows', key_column)
+                        WHEN 'DELETE' THEN format('SELECT %1$I AS k FROM old_rows', key_column)
+                        ELSE format('SELECT %1$I AS k FROM old_rows UNION ALL SELECT %1$I FROM new_rows', key_column)
+                    END;
+                    EXECUTE format(
+                        'SELECT COUNT(DISTINCT k), jsonb_agg(DISTINCT k) FROM (%s) s WHERE k IS NOT NULL', key_source
+                    ) INTO key_count, column_keys;
+
+                    changed_keys := changed_keys || jsonb_build_object(
+                        key_column,
+                        CASE WHEN key_count > {NOTIFY_KEY_LIMIT} THEN NULL ELSE COALESCE(column_keys, '[]'::jsonb) END
+                    );
+                END LOOP;
+            END IF;
+
+            PERFORM pg_notify(
+                '{NOTIFY_CHANNEL}',
+                jsonb_build_object('table', TG_TABLE_NAME, 'op', TG_OP, 'keys', changed_keys)::text
+            );
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+    ''')
+
+    for table, key_columns in NOTIFY_TABLES.items():
+        trigger_args = ", ".join(f"'{column}'" for column in key_columns)
+        cursor.execute(f'''
+            DROP TRIGGER IF EXISTS trg_notify_{table}_insert ON {table};
+            CREATE TRIGGER trg_notify_{table}_insert
+                AFTER INSERT ON {table}
+                REFERENCING NEW TABLE AS new_rows
+                FOR EACH STATEMENT EXECUTE FUNCTION notify_timearch_change({trigger_args});
+
+            DROP TRIGGER IF EXISTS trg_notify_{table}_update ON {table};
+            CREATE TRIGGER trg_notify_{table}_update
+                AFTER UPDATE ON {table}
+                REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+                FOR EACH STATEMENT EXECUTE FUNCTION notify_timearch_change({trigger_args});
+
+            DROP TRIGGER IF EXISTS trg_notify_{table}_delete ON {table};
+            CREATE TRIGGER trg_notify_{table}_delete
+                AFTER DELETE ON {table}
+                REFERENCING OLD TABLE AS old_rows
+                FOR EACH STATEMENT EXECUTE FUNCTION notify_timearch_change({trigger_args});
+
+            DROP TRIGGER IF EXISTS trg_notify_{table}_truncate ON {table};
+            CREATE TRIGGER trg_notify_{table}_truncate
+                AFTER TRUNCATE ON {table}
+                FOR EACH STATEMENT EXECUTE FUNCTION notify_timearch_change({trigger_args});
+        ''')
+    print("Änderungsbenachrichtigungen erfolgreich eingerichtet")
+
+if __name__ == "__main__":
+    try:
+        with connection() as cursor:
+            create_notify_triggers(cursor)
+    except Exception as e:
+        print(f"Fehler beim Einrichten der Änderungsbenachrichtigungen: {e}")
@@ -0,0 +1,277 @@
+"""
+Partitionierung der Zeiteinträge für TimeArch.
+
+Dieses Modul legt `time_entries` als nach `entry_date` partitionierte Tabelle an (eine Partition pro Jahr),
+erstellt die Partitionen für kommende Jahre und migriert eine bestehende, nicht partitionierte Tabelle.
+Abfragen mit Jahres-, Monats- oder Tagesfilter lesen dadurch nur die betroffene Partition, und alte Jahre
+können unabhängig gewartet, archiviert oder abgehängt werden.
+
+Funktionen:
+-----------
+- setup_time_entries(): Erstellt bzw. migriert `time_entries` und legt die benötigten Partitionen an.
+- is_partitioned(cursor): Prüft, ob `time_entries` bereits partitioniert ist.
+- ensure_partitions(cursor, years_ahead=PARTITION_YEARS_AHEAD, extra_years=()): Legt fehlende Jahrespartitionen an.
+- ensure_upcoming_partitions(): Wie `ensure_partitions`, mit eigener Verbindung und Fehlerbehandlung (Programmstart).
+- migrate_time_entries(cursor): Überführt eine bestehende, nicht partitionierte Tabelle.
+
+Verwendung:
+-----------
+    python -m db.db_partitions      # Migriert bei Bedarf und stellt Partitionen, Indizes und Trigger sicher
+
+Hinweis:
+--------
+- Partitionen heissen `time_entries_y<Jahr>`. Einträge ausserhalb aller Jahrespartitionen landen in
+  `time_entries_default` und werden beim Anlegen der passenden Jahrespartition dorthin verschoben.
+- Der Primärschlüssel ist `(entry_id, entry_date)`, da PostgreSQL den Partitionsschlüssel im Schlüssel verlangt.
+- Indizes und Trigger werden auf der Haupttabelle definiert und gelten für alle Partitionen.
+"""
+
+import datetime
+from db.db_connection import connection
+from db.db_indexes import create_indexes
+from db.db_daily_totals import create_daily_totals
+from db.db_project_rollup import create_project_rollup
+from db.db_notify import create_notify_triggers
+from features.feature_date_range import year_range
+
+PARTITION_YEARS_AHEAD = 1       # Anzahl künftiger Jahre, für die bereits eine Partition besteht
+DEFAULT_PARTITION = "time_entries_default"
+
+def _partition_name(year):
+    """
+    Gibt den Namen der Partition für ein Jahr zurück.
+    """
+    return f"time_entries_y{int(year)}"
+
+def _create_partitioned_table(cursor):
+    """
+    Erstellt die partitionierte Tabelle `time_entries` samt Default-Partition.
+
+    Args:
+        cursor (psycopg2.extensions.cursor): Der Datenbank-Cursor, der für die Abfragen verwendet wird.
+    """
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS time_entries (
+            entry_id SERIAL,
+            user_id INTEGER REFERENCES users(user_id),
+            project_number VARCHAR(50) REFERENCES projects(project_number),
+            phase_id INTEGER REFERENCES sia_phases(phase_id),
+            hours DECIMAL(5, 2),
+            entry_date DATE NOT NULL DEFAULT CURRENT_DATE,
+            activity VARCHAR(100) NOT NULL,
+            note TEXT,
+            PRIMARY KEY (entry_id, entry_date)
+        ) PARTITION BY RANGE (entry_date);
+    ''')
+    cursor.execute(f"CREATE TABLE IF NOT EXISTS {DEFAULT_PARTITION} PARTITION OF time_entries DEFAULT")
+
+def _create_year_partition(cursor, year):
+    """
+    Legt die Partition für ein Jahr an.
+
+    Args:
+        cursor (psycopg2.extensions.cursor): Der Datenbank-Cursor, der für die Abfragen verwendet wird.
+        year (int): Das Jahr der Partition.
+
+    Details:
+    --------
+    - Liegen in der Default-Partition bereits Einträge dieses Jahres, werden sie in die neue Partition
+      verschoben, bevor diese angehängt wird. Die Trigger auf `time_entries` feuern dabei nicht,
+      da die Summen unverändert bleiben.
+    """
+    name = _partition_name(year)
+    start, end = year_range(int(year))
+    bounds = f"FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+
+    cursor.execute(
+        f"SELECT COUNT(*) FROM {DEFAULT_PARTITION} WHERE entry_date >= %s AND entry_date < %s",
+        (start, end),
+    )
+    if cursor.fetchone()[0] == 0:
+        cursor.execute(f"CREATE TABLE {name} PARTITION OF time_entries FOR VALUES {bounds}")
+        return
+
+    cursor.execute(f"CREATE TABLE {name} (LIKE time_entries INCLUDING DEFAULTS INCLUDING CONSTRAINTS)")
+    cursor.execute(f'''
+        WITH moved AS (
+            DELETE FROM {DEFAULT_PARTITION}
+            WHERE entry_date >= %s AND entry_date < %s
+            RETURNING *
+        )
+        INSERT INTO {name} SELECT * FROM moved
+    ''', (start, end))
+    cursor.execute(f"ALTER TABLE time_entries ATTACH PARTITION {name} FOR VALUES {bounds}")
+
+def is_partitioned(cursor):
+    """
+    Prüft, ob `time_entries` als partitionierte Tabelle existiert.
+
+    Args:
+        cursor (psycopg2.extensions.cursor): Der Datenbank-Cursor, der für die Abfragen verwendet wird.
+
+    Returns:
+        bool: True, wenn `time_entries` partitioniert ist.
+    """
+    cursor.execute("SELECT relkind FROM pg_class WHERE oid = to_regclass('time_entries')")
+    result = cursor.fetchone()
+    return result is not None and result[0] == "p"
+
+def ensure_partitions(cursor, years_ahead=PARTITION_YEARS_AHEAD, extra_years=()):
+    """
+    Legt fehlende Jahrespartitionen an.
+
+    Args:
+        cursor (psycopg2.extensions.cursor): Der Datenbank-Cursor, der für die Abfragen verwendet wird.
+        years_ahead (int): Anzahl künftiger Jahre, für die eine Partition bestehen soll.
+        extra_years (iterable): Weitere Jahre, die benötigt werden (z.B. bei einem Import historischer Daten).
+
+    Returns:
+        list: Die Jahre, für die eine Partition angelegt wurde.
+
+    Details:
+    --------
+    - Berücksichtigt das aktuelle Jahr, die kommenden `years_ahead` Jahre und alle Jahre,
+      die in der Default-Partition vorkommen.
+    - Eine Advisory-Sperre verhindert, dass mehrere Clients gleichzeitig dieselbe Partition anlegen.
+
+    Hinweis:
+    --------
+    - Muss innerhalb einer Transaktion aufgerufen werden.
+    """
+    cursor.execute("SELECT pg_advisory_xact_lock(hashtext('time_entries_partitions'))")
+
+    cursor.execute('''
+        SELECT c.relname
+        FROM pg_inherits i
+        JOIN pg_class c ON c.oid = i.inhrelid
+        WHERE i.inhparent = 'time_entries'::regclass
+    ''')
+    existing = {row[0] for row in cursor.fetchall()}
+
+    current_year = datetime.date.today().year
+    years = set(range(current_year, current_year + years_ahead + 1))
+    years.update(int(year) for year in extra_years)
+    cursor.execute(f"SELECT DISTINCT EXTRACT(YEAR FROM entry_date)::int FROM {DEFAULT_PARTITION}")
+    years.update(row[0] for row in cursor.fetchall())
+
+    created = []
+    for year in sorted(years):
+        if _partition_name(year) not in existing:
+            _create_year_partition(cursor, year)
+            created.append(year)
+    if created:
+        print(f"Partitionen für time_entries erstellt: {', '.join(str(year) for year in created)}")
+    return created
+
+def migrate_time_entries(cursor):
+    """
+    Überführt eine bestehende, nicht partitionierte Tabelle `time_entries` in die partitionierte Struktur.
+
+    Args:
+        cursor (psycopg2.extensions.cursor): Der Datenbank-Cursor, der für die Abfragen verwendet wird.
+
+    Details:
+    --------
+    - Benennt die alte Tabelle (inklusive Sequenz und Primärschlüssel) um, erstellt die partitionierte Tabelle
+      mit allen benötigten Jahrespartitionen, kopiert die Einträge mit unveränderter `entry_id` und löscht
+      anschliessend die alte Tabelle.
+    - Einträge ohne Datum erhalten das aktuelle Datum, da `entry_date` Teil des Primärschlüssels ist.
+    - Die Trigger der alten Tabelle werden mit ihr gelöscht; `db_setup` legt sie auf der neuen Tabelle neu an.
+
+    Hinweis:
+    --------
+    - Muss innerhalb einer Transaktion aufgerufen werden, damit bei einem Fehler nichts verloren geht.
+    """
+    cursor.execute("LOCK TABLE time_entries IN ACCESS EXCLUSIVE MODE")
+    cursor.execute("ALTER TABLE time_entries RENAME TO time_entries_legacy")
+    cursor.execute("SELECT pg_get_serial_sequence('time_entries_legacy', 'entry_id')")
+    legacy_sequence = cursor.fetchone()[0]
+    if legacy_sequence:
+        cursor.execute(f"ALTER SEQUENCE {legacy_sequence} RENAME TO time_entries_legacy_entry_id_seq")
+    cursor.execute('''
+        SELECT conname
+        FROM pg_constraint
+        WHERE conrelid = 'time_entries_legacy'::regclass AND contype = 'p'
+    ''')
+    primary_key = cursor.fetchone()
+    if primary_key:
+        cursor.execute(f"ALTER TABLE time_entries_legacy RENAME CONSTRAINT {primary_key[0]} TO time_entries_legacy_pkey")
+
+    _create_partitioned_table(cursor)
+
+    cursor.execute('''
+        SELECT DISTINCT EXTRACT(YEAR FROM COALESCE(entry_date, CURRENT_DATE))::int
+        FROM time_entries_legacy
+    ''')
+    for (year,) in cursor.fetchall():
+        _create_year_partition(cursor, year)
+
+    cursor.execute('''
+        INSERT INTO time_entries (entry_id, user_id, project_number, phase_id, hours, entry_date, activity, note)
+        SELECT entry_id, user_id, project_number, phase_id, hours, COALESCE(entry_date, CURRENT_DATE), activity, note
+        FROM time_entries_legacy
+    ''')
+    migrated = cursor.rowcount
+
+    cursor.execute('''
+        SELECT setval(
+            pg_get_serial_sequence('time_entries', 'entry_id'),
+            COALESCE((SELECT MAX(entry_id) FROM time_entries), 0) + 1,
+            false
+        )
+    ''')
+    cursor.execute("DROP TABLE time_entries_legacy")
+    print(f"time_entries in partitionierte Tabelle migriert: {migrated} Einträge")
+
+def setup_time_entries():
+    """
+    Erstellt bzw. migriert die Tabelle `time_entries` und legt die benötigten Partitionen an.
+
+    Details:
+    --------
+    - Existiert die Tabelle nicht, wird sie partitioniert erstellt.
+    - Existiert sie als normale Tabelle, wird sie mit `migrate_time_entries` überführt.
+    - Alles geschieht in einer Transaktion.
+
+    Fehlerbehandlung:
+    ------------------
+    - Fehler werden weitergegeben; die Transaktion wird zurückgerollt und die bestehende Tabelle bleibt unverändert.
+    """
+    with connection() as cursor:
+        cursor.execute("SELECT relkind FROM pg_class WHERE oid = to_regclass('time_entries')")
+        result = cursor.fetchone()
+
+        if result is None:
+            _create_partitioned_table(cursor)
+        elif result[0] == "r":
+            migrate_time_entries(cursor)
+
+        ensure_partitions(cursor)
+
+def ensure_upcoming_partitions():
+    """
+    Stellt beim Programmstart sicher, dass die Partitionen für das aktuelle und die kommenden Jahre existieren.
+
+    Fehlerbehandlung:
+    ------------------
+    - Gibt eine Fehlermeldung aus, ohne den Programmstart zu verhindern. Einträge ohne passende
+      Partition landen in diesem Fall in der Default-Partition.
+    """
+    try:
+        with connection() as cursor:
+            if not is_partitioned(cursor):
+                print("time_entries ist nicht partitioniert. Migration mit `python -m db.db_partitions` ausführen.")
+                return
+            ensure_partitions(cursor)
+    except Exception as e:
+        print(f"Fehler beim Erstellen der Partitionen: {e}")
+
+if __name__ == "__main__":
+    setup_time_entries()
+
+    # Indizes und Trigger auf der (ggf. neu erstellten) Haupttabelle sicherstellen
+    with connection() as cursor:
+        create_indexes(cursor)
+        create_daily_totals(cursor)
+        create_project_rollup(cursor)
+        create_notify_triggers(cursor)
@@ -0,0 +1,192 @@
+"""
+Projekt-Phasen-Rollup für TimeArch.
+
+Dieses Modul verwaltet die Tabelle `project_phase_user_hours`, die die erfassten Stunden pro Projekt,
+SIA-Phase, Benutzer und Monat enthält. Die Tabelle wird durch Trigger auf `time_entries` inkrementell
+nachgeführt, sodass die Projektdiagramme unabhängig von der Anzahl Buchungen nur noch wenige Zeilen lesen.
+
+Funktionen:
+-----------
+- create_project_rollup(cursor): Erstellt Tabelle, Triggerfunktion und Trigger.
+- backfill_project_rollup(): Berechnet die Tabelle einmalig vollständig aus `time_entries` neu.
+
+Verwendung:
+-----------
+    python -m db.db_project_rollup
+
+Hinweis:
+--------
+- `month` enthält jeweils den ersten Tag des Monats.
+- Einträge ohne Phase (`phase_id IS NULL`) werden nicht aufgenommen, da die Diagramme pro Phase auswerten.
+- `TRUNCATE time_entries` wird nicht nachgeführt; danach muss der Backfill ausgeführt werden.
+"""
+
+from db.db_connection import connection
+
+def create_project_rollup(cursor):
+    """
+    Erstellt die Tabelle `project_phase_user_hours` sowie die Trigger auf `time_entries`.
+
+    Args:
+        cursor (psycopg2.extensions.cursor): Der Datenbank-Cursor, der für die Abfragen verwendet wird.
+
+    Details:
+    --------
+    - Wird die Tabelle neu angelegt, werden bestehende Zeiteinträge direkt übernommen.
+    - Die Funktion kann mehrfach ausgeführt werden; Funktion und Trigger werden ersetzt.
+
+    Hinweis:
+    --------
+    - Die Tabelle `time_entries` muss bereits existieren.
+    """
+    cursor.execute("SELECT to_regclass('project_phase_user_hours') IS NULL")
+    is_new = cursor.fetchone()[0]
+
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS project_phase_user_hours (
+            project_number VARCHAR(50) REFERENCES projects(project_number) ON DELETE CASCADE,
+            phase_id INTEGER REFERENCES sia_phases(phase_id) ON DELETE CASCADE,
+            user_id INTEGER REFERENCES users(user_id) ON DELETE CASCADE,
+            month DATE NOT NULL,
+            hours DECIMAL(10, 2) NOT NULL DEFAULT 0,
+            PRIMARY KEY (project_number, phase_id, user_id, month)
+        );
+    ''')
+
+    # Monatssummen eines Benutzers (gruppierte Stundenübersicht pro Benutzer)
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_project_phase_user_hours_user
+        ON project_phase_user_hours (user_id, month)
+    ''')
+
+    # Triggerfunktion: zieht alte Zeilen ab und addiert neue Zeilen, gruppiert pro Projekt, Phase, Benutzer und Monat
+    cursor.execute('''
+        CREATE OR REPLACE FUNCTION apply_project_phase_user_hours() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                INSERT INTO project_phase_user_hours (project_number, phase_id, user_id, month, hours)
+                SELECT project_number,
+                       phase_id,
+                       user_id,
+                       date_trunc('month', entry_date)::date,
+                       -SUM(COALESCE(hours, 0))
+                FROM old_rows
+                WHERE project_number IS NOT NULL
+                  AND phase_id IS NOT NULL
+                  AND user_id IS NOT NULL
+                  AND entry_date IS NOT NULL
+                GROUP BY 1, 2, 3, 4
+                ON CONFLICT (project_number, phase_id, user_id, month) DO UPDATE
+                SET hours = project_phase_user_hours.hours + EXCLUDED.hours;
+            END IF;
+
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                INSERT INTO project_phase_user_hours (project_number, phase_id, user_id, month, hours)
+                SELECT project_number,
+                       phase_id,
+                       user_id,
+                       date_trunc('month', entry_date)::date,
+                       SUM(COALESCE(hours, 0))
+                FROM new_rows
+                WHERE project_number IS NOT NULL
+                  AND phase_id IS NOT NULL
+                  AND user_id IS NOT NULL
+                  AND entry_date IS NOT NULL
+                GROUP BY 1, 2, 3, 4
+                ON CONFLICT (project_number, phase_id, user_id, month) DO UPDATE
+                SET hours = project_phase_user_hours.hours + EXCLUDED.hours;
+            END IF;
+
+            IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                DELETE FROM project_phase_user_hours r
+                USING (
+                    SELECT DISTINCT project_number, phase_id, user_id, date_trunc('month', entry_date)::date AS month
+                    FROM old_rows
+                ) o
+                WHERE r.project_number = o.project_number
+                  AND r.phase_id = o.phase_id
+                  AND r.user_id = o.user_id
+                  AND r.month = o.month
+                  AND r.hours = 0;
+            END IF;
+
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+    ''')
+
+    cursor.execute('''
+        DROP TRIGGER IF EXISTS trg_project_phase_user_hours_insert ON time_entries;
+        CREATE TRIGGER trg_project_phase_user_hours_insert
+            AFTER INSERT ON time_entries
+            REFERENCING NEW TABLE AS new_rows
+            FOR EACH STATEMENT EXECUTE FUNCTION apply_project_phase_user_hours();
+
+        DROP TRIGGER IF EXISTS trg_project_phase_user_hours_update ON time_entries;
+        CREATE TRIGGER trg_project_phase_user_hours_update
+            AFTER UPDATE ON time_entries
+            REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+            FOR EACH STATEMENT EXECUTE FUNCTION apply_project_phase_user_hours();
+
+        DROP TRIGGER IF EXISTS trg_project_phase_user_hours_delete ON time_entries;
+        CREATE TRIGGER trg_project_phase_user_hours_delete
+            AFTER DELETE ON time_entries
+            REFERENCING OLD TABLE AS old_rows
+            FOR EACH STATEMENT EXECUTE FUNCTION apply_project_phase_user_hours();
+    ''')
+
+    if is_new:
+        _rebuild_project_rollup(cursor)
+    print("Projekt-Rollup erfolgreich eingerichtet")
+
+def _rebuild_project_rollup(cursor):
+    """
+    Berechnet `project_phase_user_hours` vollständig aus `time_entries` neu.
+
+    Args:
+        cursor (psycopg2.extensions.cursor): Der Datenbank-Cursor, der für die Abfragen verwendet wird.
+    """
+    # Schreibzugriffe auf time_entries bis zum Ende der Transaktion sperren (nur innerhalb einer Transaktion möglich)
+    if not cursor.connection.autocommit:
+        cursor.execute("LOCK TABLE time_entries IN SHARE MODE")
+    cursor.execute("DELETE FROM project_phase_user_hours")
+    cursor.execute('''
+        INSERT INTO project_phase_user_hours (project_number, phase_id, user_id, month, hours)
+        SELECT project_number,
+               phase_id,
+               user_id,
+               date_trunc('month', entry_date)::date,
+               SUM(COALESCE(hours, 0))
+        FROM time_entries
+        WHERE project_number IS NOT NULL
+          AND phase_id IS NOT NULL
+          AND user_id IS NOT NULL
+          AND entry_date IS NOT NULL
+        GROUP BY 1, 2, 3, 4;
+    ''')
+    cursor.execute("ANALYZE project_phase_user_hours")
+
+def backfill_project_rollup():
+    """
+    Berechnet das Projekt-Rollup einmalig vollständig aus `time_entries` neu.
+
+    Returns:
+        bool: True, wenn der Backfill erfolgreich war, andernfalls False.
+
+    Fehlerbehandlung:
+    ------------------
+    - Gibt eine Fehlermeldung aus; die Transaktion wird zurückgerollt und das bisherige Rollup bleibt erhalten.
+    """
+    try:
+        with connection() as cursor:
+            _rebuild_project_rollup(cursor)
+            cursor.execute("SELECT COUNT(*) FROM project_phase_user_hours")
+            row_count = cursor.fetchone()[0]
+        print(f"Projekt-Rollup neu berechnet: {row_count} Einträge")
+        return True
+    except Exception as e:
+        print(f"Fehler beim Berechnen des Projekt-Rollups: {e}")
+        return False
+
+if __name__ == "__main__":
+    backfill_project_rollup()
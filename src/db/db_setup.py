@@ -7,11 +7,18 @@ um sicherzustellen, dass die Struktur und Standardwerte gemäß den Anforderunge
 
 Funktionen:
 ------------
-- setup_database(): Erstellt alle Tabellen und fügt Standardwerte ein.
+- setup_database(): Erstellt alle Tabellen, Indizes und fügt Standardwerte ein.
 
 Verwendung:
 ------------
     python db_setup.py
+    python -m db.db_indexes         # Prüft eine bestehende Datenbank auf fehlende Indizes
+    python -m db.db_daily_totals    # Berechnet die Tagessummen einmalig neu
+    python -m db.db_project_rollup  # Berechnet das Projekt-Rollup einmalig neu
+    python -m db.db_balance         # Erstellt bzw. ersetzt die SQL-Funktion der Stundenbilanz
+    python -m db.db_work_calendar   # Erstellt den Arbeitstagekalender nach Änderung der Feiertage neu
+    python -m features.feature_monthly_closing  # Schliesst alle offenen Monate bis zum Vormonat ab
+    python -m db.db_partitions      # Migriert time_entries und legt fehlende Jahrespartitionen an
 
 Hinweis:
 --------
@@ -22,6 +29,14 @@ Hinweis:
 from db.db_connection import create_connection
 from features.feature_insert_sia_phases import insert_sia_phases
 from features.feature_insert_admin import insert_admin
+from db.db_indexes import create_indexes
+from db.db_partitions import setup_time_entries
+from db.db_daily_totals import create_daily_totals
+from db.db_work_calendar import create_work_calendar
+from db.db_monthly_closing import create_monthly_closings
+from db.db_balance import create_balance_function
+from db.db_project_rollup import create_project_rollup
+from db.db_notify import create_notify_triggers
 
 def setup_database():
     """
@@ -35,7 +50,23 @@ def setup_database():
     - `sia_phases`: Definiert Phasen gemäß SIA-Normen.
     - `user_projects`: Speichert Zuordnungen von Benutzern zu Projekten.
     - `project_sia_phases`: Speichert Sollstunden für spezifische Projektphasen.
-    - `time_entries`: Speichert Zeiteinträge für Benutzer.
+    - `time_entries`: Speichert Zeiteinträge für Benutzer, partitioniert nach Jahr (siehe `db_partitions`).
+    - `user_daily_totals`: Tagessummen pro Benutzer, durch Trigger auf `time_entries` nachgeführt.
+    - `project_phase_user_hours`: Monatsstunden pro Projekt, Phase und Benutzer, durch Trigger nachgeführt.
+    - `work_calendar`: Arbeitstagekalender mit Feiertagen und Arbeitstagezähler (siehe `db_work_calendar`).
+    - `monthly_closings`: Monatsabschlüsse pro Benutzer für die Stundenbilanz (siehe `db_monthly_closing`).
+
+    Funktionen:
+    ------------
+    - `user_balance`: Stundenbilanz (Soll, Ist, Saldo, Stellenprozente, Ferien) pro Benutzer (siehe `db_balance`).
+
+    Trigger:
+    ---------
+    - Legt über `create_notify_triggers` die NOTIFY-Trigger für laufende Clients an (siehe `db_notify`).
+
+    Indizes:
+    ---------
+    - Legt die in `db_indexes.EXPECTED_INDEXES` definierten Indizes über `create_indexes` an.
 
     Standardwerte:
     ---------------
@@ -126,22 +157,32 @@ def setup_database():
             );
         ''')
 
-        # Tabelle 'time_entries' erstellen, um Arbeitszeiteinträge zu speichern
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS time_entries (
-                entry_id SERIAL PRIMARY KEY,
-                user_id INTEGER REFERENCES users(user_id),
-                project_number VARCHAR(50) REFERENCES projects(project_number),
-                phase_id INTEGER REFERENCES sia_phases(phase_id),
-                hours DECIMAL(5, 2),
-                entry_date DATE DEFAULT CURRENT_DATE,
-                activity VARCHAR(100) NOT NULL,
-                note TEXT
-            );
-        ''')
-        
+        # Tabelle 'time_entries' nach Jahren partitioniert erstellen bzw. bestehende Tabelle migrieren
+        setup_time_entries()
+
         print("Tabellen erfolgreich erstellt")
-        
+
+        # Indizes für Tagessummen, Projektübersichten und Benutzer-Projekt-Zuordnungen
+        create_indexes(cursor)
+
+        # Tagessummen pro Benutzer inklusive Trigger
+        create_daily_totals(cursor)
+
+        # Arbeitstagekalender mit Feiertagen und Arbeitstagezähler
+        create_work_calendar(cursor)
+
+        # Monatsabschlüsse inklusive Trigger, die veraltete Abschlüsse verwerfen
+        create_monthly_closings(cursor)
+
+        # SQL-Funktion der Stundenbilanz (basiert auf Tagessummen, Arbeitstagekalender und Monatsabschlüssen)
+        create_balance_function(cursor)
+
+        # Monatsstunden pro Projekt, Phase und Benutzer inklusive Trigger
+        create_project_rollup(cursor)
+
+        # NOTIFY-Trigger für die Benachrichtigung laufender Clients
+        create_notify_triggers(cursor)
+
         #Cursor und Verbindung schliessen
         cursor.close()
         connection.close()
@@ -0,0 +1,291 @@
+"""
+Modul: Arbeitstagekalender für TimeArch.
+
+Dieses Modul legt die Tabelle `work_calendar` mit einer Zeile pro Kalendertag an. Jeder Tag ist als Arbeitstag
+oder arbeitsfreier Tag (Wochenende, Feiertag, Betriebsschliessung) markiert und enthält die Anzahl Arbeitstage
+vor diesem Tag. Die Arbeitstage eines Zeitraums ergeben sich damit aus der Differenz zweier Zeilen, statt Tag
+für Tag gezählt zu werden; die Stundenbilanz (`db_balance`) verwendet den Kalender für die Sollstunden.
+
+Konstanten:
+-----------
+- CALENDAR_YEARS_AHEAD: Anzahl künftiger Jahre, die der Kalender abdeckt.
+- HOLIDAY_DEFAULTS: Standard-Feiertage (Schweiz) und Betriebsschliessungen; einzelne Werte können über
+  `HOLIDAY_CONFIG` in `db_config` überschrieben werden.
+
+Funktionen:
+-----------
+- easter_sunday(year): Berechnet das Datum des Ostersonntags.
+- holidays_for_year(year): Gibt die konfigurierten arbeitsfreien Tage eines Jahres zurück.
+- create_work_calendar(cursor): Erstellt die Tabelle und füllt die benötigten Jahre.
+- ensure_work_calendar(cursor, years_ahead=CALENDAR_YEARS_AHEAD, extra_years=()): Ergänzt fehlende Jahre.
+- rebuild_work_calendar(cursor): Erstellt den Kalender neu (z.B. nach Änderung der Feiertage).
+- ensure_upcoming_work_calendar(): Wie `ensure_work_calendar`, mit eigener Verbindung und Fehlerbehandlung (Programmstart).
+
+Verwendung:
+-----------
+    python -m db.db_work_calendar   # Erstellt den Kalender mit den aktuell konfigurierten Feiertagen neu
+
+    -- Arbeitstage vom 1. März bis und mit 31. März 2025
+    SELECT e.workdays_before - b.workdays_before
+    FROM work_calendar b, work_calendar e
+    WHERE b.calendar_date = '2025-03-01' AND e.calendar_date = '2025-04-01';
+
+Hinweis:
+--------
+- Der Kalender beginnt im frühesten Jahr aus den Startdaten der Benutzer und den Zeiteinträgen und reicht
+  `CALENDAR_YEARS_AHEAD` Jahre über das aktuelle Jahr hinaus. Fehlende Jahre werden beim Programmstart ergänzt.
+  Ältere Zeiteinträge werden nur beim ersten Anlegen gesucht; danach ergänzt der Import seine Jahre selbst.
+- `workdays_before` zählt ab dem ersten Kalendertag. Nur Differenzen sind aussagekräftig; werden frühere Jahre
+  ergänzt, verschieben sich alle Werte, die Differenzen bleiben gleich.
+- Nach einer Änderung von `HOLIDAY_CONFIG` muss der Kalender mit `python -m db.db_work_calendar` neu erstellt werden.
+"""
+
+import datetime
+from db.db_connection import connection
+
+try:
+    from db.db_config import HOLIDAY_CONFIG
+except ImportError:
+    HOLIDAY_CONFIG = {}
+
+CALENDAR_YEARS_AHEAD = 1
+
+HOLIDAY_DEFAULTS = {
+    # (Monat, Tag, Name): Feiertage mit festem Datum
+    "fixed_holidays": [
+        (1, 1, "Neujahr"),
+        (1, 2, "Berchtoldstag"),
+        (8, 1, "Bundesfeier"),
+        (12, 25, "Weihnachten"),
+        (12, 26, "Stephanstag"),
+    ],
+    # (Tage ab Ostersonntag, Name): bewegliche Feiertage
+    "easter_holidays": [
+        (-2, "Karfreitag"),
+        (1, "Ostermontag"),
+        (39, "Auffahrt"),
+        (50, "Pfingstmontag"),
+    ],
+    # (Datum im Format JJJJ-MM-TT, Name): einmalige Betriebsschliessungen
+    "closures": [],
+}
+
+def _holiday_setting(name):
+    return HOLIDAY_CONFIG.get(name, HOLIDAY_DEFAULTS[name])
+
+def easter_sunday(year):
+    """
+    Berechnet das Datum des Ostersonntags (gregorianischer Kalender, Gauss/Meeus).
+
+    Args:
+        year (int): Das Jahr.
+
+    Returns:
+        datetime.date: Der Ostersonntag.
+    """
+    a = year % 19
+    b, c = divmod(year, 100)
+    d, e = divmod(b, 4)
+    f = (b + 8) // 25
+    g = (b - f + 1) // 3
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = divmod(c, 4)
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * l) // 451
+    month, day = divmod(h + l - 7 * m + 114, 31)
+    return datetime.date(year, month, day + 1)
+
+def holidays_for_year(year):
+    """
+    Gibt die konfigurierten arbeitsfreien Tage eines Jahres zurück.
+
+    Args:
+        year (int): Das Jahr.
+
+    Returns:
+        dict: Datum -> Name des Feiertags bzw. der Betriebsschliessung.
+    """
+    holidays = {}
+    for month, day, name in _holiday_setting("fixed_holidays"):
+        holidays[datetime.date(year, month, day)] = name
+
+    easter = easter_sunday(year)
+    for offset, name in _holiday_setting("easter_holidays"):
+        holidays[easter + datetime.timedelta(days=offset)] = name
+
+    for closure_date, name in _holiday_setting("closures"):
+        if isinstance(closure_date, str):
+            closure_date = datetime.date.fromisoformat(closure_date)
+        if closure_date.year == year:
+            holidays.setdefault(closure_date, name)
+    return holidays
+
+def _create_table(cursor):
+    """
+    Erstellt die Tabelle `work_calendar`, falls sie noch nicht existiert.
+    """
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS work_calendar (
+            calendar_date DATE PRIMARY KEY,
+            is_workday BOOLEAN NOT NULL,
+            holiday_name VARCHAR(100),
+            workdays_before INTEGER NOT NULL
+        );
+    ''')
+
+def _insert_year(cursor, year):
+    """
+    Fügt alle Tage eines Jahres in `work_calendar` ein.
+    """
+    holidays = holidays_for_year(year)
+    cursor.execute('''
+        INSERT INTO work_calendar (calendar_date, is_workday, holiday_name, workdays_before)
+        SELECT d::date,
+               EXTRACT(ISODOW FROM d) < 6 AND h.holiday_name IS NULL,
+               h.holiday_name,
+               0
+        FROM generate_series(%s::date, %s::date, interval '1 day') AS d
+        LEFT JOIN unnest(%s::date[], %s::text[]) AS h(holiday_date, holiday_name) ON h.holiday_date = d::date
+        ON CONFLICT (calendar_date) DO NOTHING
+    ''', (
+        datetime.date(year, 1, 1),
+        datetime.date(year, 12, 31),
+        list(holidays.keys()),
+        list(holidays.values()),
+    ))
+
+def _update_workday_counter(cursor):
+    """
+    Berechnet `workdays_before` für alle Tage neu (nur geänderte Zeilen werden geschrieben).
+    """
+    cursor.execute('''
+        UPDATE work_calendar wc
+        SET workdays_before = c.workdays_before
+        FROM (
+            SELECT calendar_date,
+                   (COUNT(*) FILTER (WHERE is_workday) OVER (ORDER BY calendar_date) - is_workday::int)::int AS workdays_before
+            FROM work_calendar
+        ) c
+        WHERE wc.calendar_date = c.calendar_date
+          AND wc.workdays_before IS DISTINCT FROM c.workdays_before
+    ''')
+
+def _required_years(cursor, years_ahead, extra_years, existing):
+    """
+    Gibt die Jahre zurück, die der Kalender abdecken muss.
+
+    - Ist der Kalender bereits angelegt, deckt er die Zeiteinträge ab; frühere Jahre kommen nur noch über
+      `extra_years` (Import) hinzu. Gelesen wird dann nur das früheste Startdatum der Benutzer.
+    - MIN wird vor EXTRACT gebildet, damit PostgreSQL das Minimum über einen Index bestimmen kann.
+    """
+    current_year = datetime.date.today().year
+    if existing:
+        cursor.execute("SELECT EXTRACT(YEAR FROM MIN(start_date))::int FROM user_settings")
+        first_year = min(cursor.fetchone()[0] or current_year, min(existing))
+    else:
+        cursor.execute('''
+            SELECT LEAST(
+                (SELECT EXTRACT(YEAR FROM MIN(start_date))::int FROM user_settings),
+                (SELECT EXTRACT(YEAR FROM MIN(entry_date))::int FROM time_entries)
+            )
+        ''')
+        first_year = cursor.fetchone()[0] or current_year
+    years = [min(first_year, current_year), current_year + years_ahead]
+    years.extend(int(year) for year in extra_years)
+    # Lückenlos, damit die Differenzen von `workdays_before` über Jahresgrenzen stimmen
+    return set(range(min(years), max(years) + 1))
+
+def create_work_calendar(cursor):
+    """
+    Erstellt die Tabelle `work_calendar` und füllt die benötigten Jahre.
+
+    Args:
+        cursor (psycopg2.extensions.cursor): Der Datenbank-Cursor, der für die Abfragen verwendet wird.
+
+    Details:
+    --------
+    - `calendar_date`: Der Kalendertag (Primärschlüssel).
+    - `is_workday`: Montag bis Freitag und weder Feiertag noch Betriebsschliessung.
+    - `holiday_name`: Name des Feiertags bzw. der Betriebsschliessung, sonst NULL.
+    - `workdays_before`: Anzahl Arbeitstage vor diesem Tag.
+
+    Hinweis:
+    --------
+    - Die Tabellen `user_settings` und `time_entries` müssen bereits existieren.
+    """
+    ensure_work_calendar(cursor)
+    print("Arbeitstagekalender erfolgreich eingerichtet")
+
+def ensure_work_calendar(cursor, years_ahead=CALENDAR_YEARS_AHEAD, extra_years=()):
+    """
+    Ergänzt fehlende Jahre im Arbeitstagekalender.
+
+    Args:
+        cursor (psycopg2.extensions.cursor): Der Datenbank-Cursor, der für die Abfragen verwendet wird.
+        years_ahead (int): Anzahl künftiger Jahre, die der Kalender abdecken soll.
+        extra_years (iterable): Weitere Jahre, die benötigt werden (z.B. bei einem Import historischer Daten).
+
+    Returns:
+        list: Die ergänzten Jahre.
+
+    Details:
+    --------
+    - Erstellt die Tabelle, falls sie noch nicht existiert (z.B. bei einer bestehenden Datenbank).
+    - Eine Advisory-Sperre verhindert, dass mehrere Clients gleichzeitig dieselben Jahre ergänzen.
+    - `workdays_before` wird nur neu berechnet, wenn Jahre ergänzt wurden.
+    """
+    cursor.execute("SELECT pg_advisory_xact_lock(hashtext('work_calendar'))")
+    _create_table(cursor)
+    cursor.execute("SELECT DISTINCT EXTRACT(YEAR FROM calendar_date)::int FROM work_calendar")
+    existing = {row[0] for row in cursor.fetchall()}
+
+    added = [year for year in sorted(_required_years(cursor, years_ahead, extra_years, existing)) if year not in existing]
+    for year in added:
+        _insert_year(cursor, year)
+    if added:
+        _update_workday_counter(cursor)
+        print(f"Arbeitstagekalender ergänzt: {', '.join(str(year) for year in added)}")
+    return added
+
+def rebuild_work_calendar(cursor):
+    """
+    Erstellt den Arbeitstagekalender mit den aktuell konfigurierten Feiertagen neu.
+
+    Args:
+        cursor (psycopg2.extensions.cursor): Der Datenbank-Cursor, der für die Abfragen verwendet wird.
+
+    Hinweis:
+    --------
+    - Verwirft alle Monatsabschlüsse (`db_monthly_closing`), da sich deren Sollstunden ändern können.
+    """
+    cursor.execute("SELECT pg_advisory_xact_lock(hashtext('work_calendar'))")
+    _create_table(cursor)
+    cursor.execute("DELETE FROM work_calendar")
+
+    # Monatsabschlüsse enthalten Sollstunden nach dem bisherigen Kalender
+    cursor.execute("SELECT to_regclass('monthly_closings') IS NOT NULL")
+    if cursor.fetchone()[0]:
+        cursor.execute("DELETE FROM monthly_closings")
+    ensure_work_calendar(cursor)
+
+def ensure_upcoming_work_calendar():
+    """
+    Stellt beim Programmstart sicher, dass der Arbeitstagekalender das aktuelle und die kommenden Jahre abdeckt.
+
+    Fehlerbehandlung:
+    ------------------
+    - Gibt eine Fehlermeldung aus, ohne den Programmstart zu verhindern.
+    """
+    try:
+        with connection() as cursor:
+            ensure_work_calendar(cursor)
+    except Exception as e:
+        print(f"Fehler beim Ergänzen des Arbeitstagekalenders: {e}")
+
+if __name__ == "__main__":
+    try:
+        with connection() as cursor:
+            rebuild_work_calendar(cursor)
+        print("Arbeitstagekalender erfolgreich neu erstellt")
+    except Exception as e:
+        print(f"Fehler beim Erstellen des Arbeitstagekalenders: {e}")
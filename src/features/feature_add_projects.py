@@ -22,7 +22,8 @@ Verwendung:
 import customtkinter as ctk
 from tkinter import messagebox
 from gui.gui_appearance_color import appearance_color, get_default_styles
-from db.db_connection import create_connection
+from db.db_connection import connection
+from features import feature_reference_cache as reference_cache
 
 def add_project(admin_window, refresh_callback):
     """
@@ -89,20 +90,15 @@ def add_project(admin_window, refresh_callback):
         project_number = project_number_entry.get()
         
         if project_number and project_name:
-            connection = create_connection()
-            if connection:
-                cursor = connection.cursor()
-                try:
+            try:
+                with connection() as cursor:
                     cursor.execute("INSERT INTO projects (project_number, project_name, description) VALUES (%s, %s, %s)", (project_number, project_name, description))
-                    connection.commit()
-                    messagebox.showinfo("Projekt erstellt", "Das Projekt wurde erfolgreich erstellt.")
-                    refresh_callback()
-                    project_window.destroy() # Fenster schließen, wenn das Projekt erfolgreich hinzugefügt wurde
-                except:
-                    messagebox.showerror("Fehler", "Ein Fehler ist aufgetreten. Bitte überprüfen!")
-                finally:
-                    cursor.close()
-                    connection.close()
+                reference_cache.invalidate(reference_cache.PROJECTS)
+                messagebox.showinfo("Projekt erstellt", "Das Projekt wurde erfolgreich erstellt.")
+                refresh_callback()
+                project_window.destroy() # Fenster schließen, wenn das Projekt erfolgreich hinzugefügt wurde
+            except:
+                messagebox.showerror("Fehler", "Ein Fehler ist aufgetreten. Bitte überprüfen!")
         else:
             messagebox.showerror("Fehler", "Bitte geben Sie einen Projektnamen ein.")
 
@@ -21,7 +21,8 @@ Verwendung:
 
 import customtkinter as ctk
 from tkinter import messagebox
-from db.db_connection import create_connection
+from db.db_connection import connection
+from features import feature_reference_cache as reference_cache
 from gui.gui_appearance_color import appearance_color, get_default_styles
 
 def add_user(admin_window, refresh_callback):
@@ -93,20 +94,15 @@ def add_user(admin_window, refresh_callback):
         user_role = role_var.get()
         
         if user_name:
-            connection = create_connection()
-            if connection:
-                cursor = connection.cursor()
-                try:
+            try:
+                with connection() as cursor:
                     cursor.execute("INSERT INTO users (username, password, role) VALUES (%s, %s, %s)",(user_name, user_password, user_role))
-                    connection.commit()
-                    messagebox.showinfo("User erstellt", "User wurde erfolgreich erstellt.")
-                    refresh_callback()
-                    user_window.destroy()   # Fenster schließen, wenn der User erfolgreich hinzugefügt wurde
-                except:
-                    messagebox.showerror("Fehler", "Fehler bei der Erstellung des Users.")
-                finally:
-                    cursor.close()
-                    connection.close()
+                reference_cache.invalidate(reference_cache.USERS)
+                messagebox.showinfo("User erstellt", "User wurde erfolgreich erstellt.")
+                refresh_callback()
+                user_window.destroy()   # Fenster schließen, wenn der User erfolgreich hinzugefügt wurde
+            except:
+                messagebox.showerror("Fehler", "Fehler bei der Erstellung des Users.")
         else:
             messagebox.showerror("Fehler", "Bitte geben Sie einen Benutzernamen ein.")
             
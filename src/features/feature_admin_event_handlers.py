@@ -22,7 +22,7 @@ Verwendung:
     admin_frame.project_frame.bind("<Double-1>", event_handler.on_project_double_click)
 """
 
-from db.db_connection import create_connection
+from db.db_connection import connection
 
 class EventHandlers:
     """
@@ -58,24 +58,19 @@ class EventHandlers:
         project_number, project_name = self.admin_frame.project_frame.get_selected_project_number()
         
         if project_number:
-            # Verbindung zur Datenbank herstellen, um zusätzliche Details abzurufen
-            connection = create_connection()
-            if connection:
-                cursor = connection.cursor()
-                try:
+            # Zusätzliche Details aus der Datenbank abrufen
+            try:
+                with connection() as cursor:
                     cursor.execute("SELECT project_number, project_name, description FROM projects WHERE project_number = %s", (project_number,))
                     project_details = cursor.fetchone()
-                    if project_details:
-                        project_number = project_details[0]
-                        project_name = project_details[1]
-                        description = project_details[2]
-                        # Den `SelectedFrame` mit den abgerufenen Details öffnen und aktualisieren
-                        self.admin_frame.open_selected_frame(project_number, project_name, description)
-                except Exception as e:
-                    print(f"Fehler beim Abrufen der Projektdetails: {e}")
-                finally:
-                    cursor.close()
-                    connection.close()
+                if project_details:
+                    project_number = project_details[0]
+                    project_name = project_details[1]
+                    description = project_details[2]
+                    # Den `SelectedFrame` mit den abgerufenen Details öffnen und aktualisieren
+                    self.admin_frame.open_selected_frame(project_number, project_name, description)
+            except Exception as e:
+                print(f"Fehler beim Abrufen der Projektdetails: {e}")
 
     def on_user_double_click(self, event):
         """
@@ -98,20 +93,15 @@ class EventHandlers:
             print("Fehler: Kein Benutzer ausgewählt.")
             return
 
-        # Verbindung zur Datenbank herstellen, um zusätzliche Details abzurufen
-        connection = create_connection()
-        if connection:
-            cursor = connection.cursor()
-            try:
+        # Zusätzliche Details aus der Datenbank abrufen
+        try:
+            with connection() as cursor:
                 cursor.execute("SELECT username FROM users WHERE user_id = %s", (user_id,))
                 user_details = cursor.fetchone()
-                if user_details:
-                    # Den `SelectedFrame` mit den abgerufenen Details öffnen und aktualisieren
-                    self.admin_frame.selected_frame.update_user_details(user_id, user_details[0])
-                else:
-                    print("Fehler: Keine Benutzerdaten gefunden.")
-            except Exception as e:
-                print(f"Fehler beim Abrufen der Benutzerdetails: {e}")
-            finally:
-                cursor.close()
-                connection.close()
\ No newline at end of file
+            if user_details:
+                # Den `SelectedFrame` mit den abgerufenen Details öffnen und aktualisieren
+                self.admin_frame.selected_frame.update_user_details(user_id, user_details[0])
+            else:
+                print("Fehler: Keine Benutzerdaten gefunden.")
+        except Exception as e:
+            print(f"Fehler beim Abrufen der Benutzerdetails: {e}")
\ No newline at end of file
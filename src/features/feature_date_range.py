@@ -0,0 +1,186 @@
+"""
+Modul: Datumsbereichsfilter für TimeArch.
+
+Dieses Modul übersetzt die Monats-, Jahres- und Von/Bis-Filter der Übersichten in halboffene
+Datumsbereiche (`entry_date >= %s AND entry_date < %s`). Im Gegensatz zu `EXTRACT(YEAR FROM ...)`
+kann PostgreSQL solche Bedingungen über einen Index auf `entry_date` als Bereichsscan auswerten.
+
+Funktionen:
+-----------
+- parse_date(value): Wandelt eine Benutzereingabe (YYYY-MM-DD oder DD.MM.YYYY) in ein Datum um.
+- year_range(year): Gibt den halboffenen Bereich eines Jahres zurück.
+- month_range(year, month): Gibt den halboffenen Bereich eines Monats zurück.
+- date_range_bounds(year="Alle", month="Alle", date_from="", date_to=""): Ermittelt Start, exklusives Ende und Monat ohne Jahr.
+- is_month_aligned(year="Alle", month="Alle", date_from="", date_to=""): Prüft, ob der Bereich nur ganze Monate umfasst.
+- date_range_clause(column, year="Alle", month="Alle", date_from="", date_to=""): Erstellt die SQL-Bedingung und die Parameter.
+
+Verwendung:
+-----------
+    from features.feature_date_range import date_range_clause
+
+    clause, params = date_range_clause("te.entry_date", "2024", "März")
+    query += clause
+    query_params.extend(params)
+
+Hinweis:
+--------
+- Monatsnamen werden über `calendar.month_name` aufgelöst, wie in den Filter-Comboboxen.
+- Ein Monat ohne Jahr ("Alle") lässt sich nicht als einzelner Bereich darstellen und wird
+  deshalb weiterhin mit `EXTRACT(MONTH ...)` gefiltert.
+"""
+
+import calendar
+import datetime
+
+ALL = "Alle"
+
+# Akzeptierte Eingabeformate (strptime, Bezeichnung wie im Platzhalter der Von/Bis-Felder)
+DATE_FORMATS = (("%Y-%m-%d", "YYYY-MM-DD"), ("%d.%m.%Y", "DD.MM.YYYY"))
+
+def parse_date(value):
+    """
+    Wandelt eine Benutzereingabe in ein Datum um.
+
+    Args:
+        value (str): Das Datum im Format YYYY-MM-DD oder DD.MM.YYYY. Leere Eingaben sind erlaubt.
+
+    Returns:
+        datetime.date: Das Datum oder None, falls die Eingabe leer ist.
+
+    Fehlerbehandlung:
+    ------------------
+    - Wirft einen `ValueError`, wenn die Eingabe keinem der Formate entspricht.
+    """
+    value = (value or "").strip()
+    if not value:
+        return None
+    for date_format, _ in DATE_FORMATS:
+        try:
+            return datetime.datetime.strptime(value, date_format).date()
+        except ValueError:
+            continue
+    expected = " oder ".join(label for _, label in DATE_FORMATS)
+    raise ValueError(f"Ungültiges Datum '{value}'. Erwartet wird {expected}.")
+
+def year_range(year):
+    """
+    Gibt den halboffenen Datumsbereich eines Jahres zurück.
+
+    Args:
+        year (int): Das Jahr.
+
+    Returns:
+        tuple: (erster Tag des Jahres, erster Tag des Folgejahres).
+    """
+    return datetime.date(year, 1, 1), datetime.date(year + 1, 1, 1)
+
+def month_range(year, month):
+    """
+    Gibt den halboffenen Datumsbereich eines Monats zurück.
+
+    Args:
+        year (int): Das Jahr.
+        month (int): Der Monat (1-12).
+
+    Returns:
+        tuple: (erster Tag des Monats, erster Tag des Folgemonats).
+    """
+    start = datetime.date(year, month, 1)
+    if month == 12:
+        return start, datetime.date(year + 1, 1, 1)
+    return start, datetime.date(year, month + 1, 1)
+
+def date_range_bounds(year=ALL, month=ALL, date_from="", date_to=""):
+    """
+    Ermittelt den halboffenen Datumsbereich für die gesetzten Datumsfilter.
+
+    Args:
+        year (str): Das gewählte Jahr oder "Alle".
+        month (str): Der gewählte Monatsname oder "Alle".
+        date_from (str): Optionales Startdatum (inklusive).
+        date_to (str): Optionales Enddatum (inklusive).
+
+    Returns:
+        tuple: (Start oder None, exklusives Ende oder None, Monatsnummer ohne Jahr oder None).
+
+    Details:
+    --------
+    - Jahr/Monat und Von/Bis werden zu einem einzigen Bereich geschnitten.
+    - Das Enddatum wird als exklusive Grenze (Folgetag) zurückgegeben.
+
+    Fehlerbehandlung:
+    ------------------
+    - Wirft einen `ValueError` bei ungültigen Datumseingaben.
+    """
+    start = end = None
+    month_index = list(calendar.month_name).index(month) if month != ALL else None
+
+    if year != ALL:
+        if month_index:
+            start, end = month_range(int(year), month_index)
+        else:
+            start, end = year_range(int(year))
+
+    from_date = parse_date(date_from)
+    to_date = parse_date(date_to)
+    if from_date:
+        start = max(start, from_date) if start else from_date
+    if to_date:
+        to_exclusive = to_date + datetime.timedelta(days=1)
+        end = min(end, to_exclusive) if end else to_exclusive
+
+    month_only = month_index if year == ALL else None
+    return start, end, month_only
+
+def is_month_aligned(year=ALL, month=ALL, date_from="", date_to=""):
+    """
+    Prüft, ob die Datumsfilter nur ganze Monate umfassen.
+
+    Args:
+        year (str): Das gewählte Jahr oder "Alle".
+        month (str): Der gewählte Monatsname oder "Alle".
+        date_from (str): Optionales Startdatum (inklusive).
+        date_to (str): Optionales Enddatum (inklusive).
+
+    Returns:
+        bool: True, wenn Start und Ende auf Monatsanfänge fallen (bzw. offen sind).
+
+    Hinweis:
+    --------
+    - Monatsweise Rollups (z.B. `project_phase_user_hours`) können nur dann verwendet werden.
+    """
+    start, end, _ = date_range_bounds(year, month, date_from, date_to)
+    return (start is None or start.day == 1) and (end is None or end.day == 1)
+
+def date_range_clause(column, year=ALL, month=ALL, date_from="", date_to=""):
+    """
+    Erstellt eine indexfähige SQL-Bedingung für die gesetzten Datumsfilter.
+
+    Args:
+        column (str): Die Datumsspalte, z.B. "te.entry_date".
+        year (str): Das gewählte Jahr oder "Alle".
+        month (str): Der gewählte Monatsname oder "Alle".
+        date_from (str): Optionales Startdatum (inklusive).
+        date_to (str): Optionales Enddatum (inklusive).
+
+    Returns:
+        tuple: Die SQL-Bedingung (beginnt mit " AND " oder ist leer) und die Liste der Parameter.
+
+    Fehlerbehandlung:
+    ------------------
+    - Wirft einen `ValueError` bei ungültigen Datumseingaben.
+    """
+    start, end, month_only = date_range_bounds(year, month, date_from, date_to)
+
+    clause = ""
+    params = []
+    if start:
+        clause += f" AND {column} >= %s"
+        params.append(start)
+    if end:
+        clause += f" AND {column} < %s"
+        params.append(end)
+    if month_only:
+        clause += f" AND EXTRACT(MONTH FROM {column}) = %s"
+        params.append(month_only)
+    return clause, params
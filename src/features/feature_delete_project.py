@@ -19,7 +19,8 @@ Verwendung:
 import customtkinter as ctk
 from tkinter import ttk
 from tkinter import messagebox
-from db.db_connection import create_connection
+from db.db_connection import connection
+from features import feature_reference_cache as reference_cache
 
 def get_selected_project_number(treeview):
     """
@@ -69,15 +70,11 @@ def delete_project(project_number, refresh_callback):
         messagebox.showerror("Fehler", "Das Büro Intern Projekt kann nicht gelöscht werden.")
         return
     
-    connection = create_connection()
-    if connection:
-        try:
-            with connection.cursor() as cursor:
-                cursor.execute("DELETE FROM projects WHERE project_number = %s", (project_number,))
-                connection.commit()
-                messagebox.showinfo("Erfolg", "Projekt erfolgreich gelöscht.")
-                refresh_callback()
-        except Exception as e:
-            messagebox.showerror("Fehler", str(e))
-        finally:
-            connection.close()
\ No newline at end of file
+    try:
+        with connection() as cursor:
+            cursor.execute("DELETE FROM projects WHERE project_number = %s", (project_number,))
+        reference_cache.invalidate(reference_cache.PROJECTS, reference_cache.PROJECT_USERS)
+        messagebox.showinfo("Erfolg", "Projekt erfolgreich gelöscht.")
+        refresh_callback()
+    except Exception as e:
+        messagebox.showerror("Fehler", str(e))
\ No newline at end of file
@@ -20,7 +20,8 @@ Verwendung:
 import customtkinter as ctk
 from tkinter import ttk
 from tkinter import messagebox
-from db.db_connection import create_connection
+from db.db_connection import connection
+from features import feature_reference_cache as reference_cache
 
 def get_selected_user_id(treeview):
     """
@@ -69,15 +70,11 @@ def delete_user(user_id, refresh_callback):
         - Verbindung wird nach Abschluss der Operation geschlossen.
         - Zeigt eine Erfolgsmeldung an, wenn der Benutzer erfolgreich gelöscht wurde.
     """
-    connection = create_connection()
-    if connection:
-        try:
-            with connection.cursor() as cursor:
-                cursor.execute("DELETE FROM users WHERE user_id = %s", (user_id,))
-                connection.commit()
-                messagebox.showinfo("Erfolg", "Benutzer erfolgreich gelöscht.")
-                refresh_callback()
-        except Exception as e:
-            messagebox.showerror("Fehler", str(e))
-        finally:
-            connection.close()
\ No newline at end of file
+    try:
+        with connection() as cursor:
+            cursor.execute("DELETE FROM users WHERE user_id = %s", (user_id,))
+        reference_cache.invalidate(reference_cache.USERS, reference_cache.USER_SETTINGS, reference_cache.PROJECT_USERS)
+        messagebox.showinfo("Erfolg", "Benutzer erfolgreich gelöscht.")
+        refresh_callback()
+    except Exception as e:
+        messagebox.showerror("Fehler", str(e))
\ No newline at end of file
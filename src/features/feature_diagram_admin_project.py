@@ -2,7 +2,10 @@
 Modul: Admin-Projektdiagramme für TimeArch.
 
 Dieses Modul erstellt Diagramme zur Visualisierung von Arbeitsstunden und Sollstunden für Projekte.
-Die Diagramme werden basierend auf den vom Benutzer ausgewählten Filtern generiert.
+Die Diagramme werden basierend auf den vom Benutzer ausgewählten Filtern generiert. Die Daten stammen aus dem
+gemeinsamen Datenmodell der Stundenübersicht (`feature_project_view`); das Diagramm stellt keine eigene Abfrage.
+Für Zeiträume aus ganzen Monaten rechnet das Datenmodell über die Monatssummen (`project_phase_user_hours`),
+nur taggenaue Von/Bis-Zeiträume lesen die einzelnen Zeiteinträge.
 
 Klassen:
 --------
@@ -11,10 +14,12 @@ Klassen:
 Funktionen innerhalb der Klasse:
 --------------------------------
 - __init__(self, master, project_number, filter_frame=None): Initialisiert die Diagrammklasse.
-- fetch_filtered_data(self): Ruft die Daten basierend auf den gesetzten Filtern ab.
-- update_chart(self): Aktualisiert das Diagramm basierend auf den abgerufenen Daten.
+- show_view(self, view): Zeichnet ein neues Ergebnis des Datenmodells, sofern es zum Projekt gehört.
+- update_chart(self, view=None): Aktualisiert das Diagramm basierend auf einem Ergebnis des Datenmodells.
 - create_widgets(self): Erstellt die initialen Diagrammelemente.
-- refresh_chart(self): Aktualisiert das Diagramm, um Änderungen widerzuspiegeln.
+- refresh_chart(self): Zeichnet das aktuelle Ergebnis des Datenmodells neu.
+- rebind(self, project_number): Zeigt das Diagramm für ein anderes Projekt an (gleiche Figur, neue Daten).
+- destroy(self): Schliesst die Matplotlib-Figur, bevor das Widget zerstört wird.
 
 Verwendung:
 -----------
@@ -22,12 +27,14 @@ Verwendung:
 
     diagram = AdminProjectDiagram(master, project_number, filter_frame)
     diagram.pack()
+
+Hinweis:
+--------
+- Matplotlib wird erst beim ersten Zeichnen eines Diagramms importiert (`update_chart`), nicht beim Import des Moduls.
+- Figur, Achsen und Zeichenfläche werden einmal erstellt; beim Aktualisieren werden nur die Achsen neu gezeichnet.
 """
 import customtkinter as ctk
-import calendar
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-from db.db_connection import create_connection
+from features.feature_project_view import phase_user_hours
 from gui.gui_appearance_color import appearance_color, get_default_styles
 
 class AdminProjectDiagram(ctk.CTkFrame):
@@ -44,131 +51,75 @@ class AdminProjectDiagram(ctk.CTkFrame):
         Args:
             master (ctk.CTk): Das übergeordnete Fenster.
             project_number (str): Die Projektnummer, für die das Diagramm erstellt wird.
-            filter_frame (ctk.CTkFrame, optional): Ein Frame mit Filteroptionen (Monat, Jahr, Benutzer, Phase).
+            filter_frame (ctk.CTkFrame, optional): Die Stundenübersicht des Projekts; ihr Datenmodell (`view_model`)
+                                                   liefert die gefilterten Daten.
         """
         self.colors = appearance_color()
         self.styles = get_default_styles()
         super().__init__(master, corner_radius=10, fg_color=self.colors["background"])
         self.project_number = project_number
         self.filter_frame = filter_frame  # Verbindung zum Filter
+        self.view_model = getattr(filter_frame, "view_model", None)
         self.canvas = None
+        self.figure = None
+        self.ax = None
         self.create_widgets()
+        # Neue Ergebnisse (Filteränderungen, Änderungen anderer Clients) kommen über das Datenmodell
+        if self.view_model:
+            self.view_model.add_listener(self.show_view)
+
+    def current_view(self):
+        """
+        Gibt das aktuelle Ergebnis des Datenmodells zurück, sofern es zum Projekt des Diagramms gehört.
+        """
+        view = self.view_model.view if self.view_model else None
+        if view is None or view.state.project_number != self.project_number:
+            return None
+        return view
+
+    def show_view(self, view):
+        """
+        Zeichnet ein neues Ergebnis des Datenmodells, sofern es zum Projekt des Diagramms gehört.
 
-    def fetch_filtered_data(self):
-        """
-        Ruft die gefilterten Daten basierend auf den Filteroptionen ab.
-
-        Returns:
-            list: Eine Liste mit den abgerufenen Datenzeilen aus der Datenbank.
-
-        Fehlerbehandlung:
-        ------------------
-        - Gibt eine leere Liste zurück, wenn keine Verbindung zur Datenbank hergestellt werden kann
-          oder die Filterung fehlschlägt.
-        """
-        if not self.filter_frame:
-            print("Keine Filterwerte vorhanden.")
-            return []
-
-        # Filterwerte abrufen
-        selected_month = self.filter_frame.month_combo.get()
-        selected_year = self.filter_frame.year_combo.get()
-        selected_user = self.filter_frame.user_combo.get()
-        selected_phase = self.filter_frame.phase_combo.get()
-
-        # SQL-Abfrage erstellen
-        connection = create_connection()
-        if connection:
-            cursor = connection.cursor()
-            try:
-                query = """
-                SELECT
-                    sp.phase_name,
-                    sp.phase_number,
-                    psp.soll_stunden,
-                    te.user_id,
-                    (SELECT username FROM users WHERE user_id = te.user_id) AS username,
-                    COALESCE(SUM(te.hours), 0) AS user_hours
-                FROM sia_phases sp
-                LEFT JOIN project_sia_phases psp
-                    ON sp.phase_name = psp.phase_name AND psp.project_number = %s
-                LEFT JOIN time_entries te
-                    ON sp.phase_id = te.phase_id AND te.project_number = %s
-                """
-                params = [self.project_number, self.project_number]
-                
-                if selected_year != "Alle":
-                    query += " AND EXTRACT(YEAR FROM te.entry_date) = %s"
-                    params.append(int(selected_year))
-
-                # Monat-Filter hinzufügen
-                if selected_month != "Alle":
-                    query += " AND EXTRACT(MONTH FROM te.entry_date) = %s"
-                    month_index = list(calendar.month_name).index(selected_month)
-                    params.append(month_index)
-
-                # Benutzername-Filter hinzufügen
-                if selected_user != "Alle":
-                    query += " AND te.user_id = (SELECT user_id FROM users WHERE username = %s)"
-                    params.append(selected_user)
-
-                # Phase-Filter hinzufügen
-                if selected_phase != "Alle":
-                    query += " AND sp.phase_name = %s"
-                    params.append(selected_phase)
-
-                query += """
-                GROUP BY sp.phase_name, sp.phase_number, psp.soll_stunden, te.user_id, username
-                ORDER BY sp.phase_number, te.user_id;
-                """
-                cursor.execute(query, params)
-                result = cursor.fetchall()
-                return result
-
-            except Exception as e:
-                print(f"Fehler beim Abrufen der gefilterten Daten: {e}")
-                return []
-            finally:
-                cursor.close()
-                connection.close()
-        else:
-            print("Keine Verbindung zur Datenbank.")
-            return []
-
-    def update_chart(self):
-        """
-        Aktualisiert das Diagramm basierend auf den abgerufenen Filterdaten.
+        Args:
+            view (ProjectView): Das Ergebnis des aktuellen Filterzustands.
+        """
+        if view.state.project_number == self.project_number:
+            self.update_chart(view)
+
+    def update_chart(self, view=None):
+        """
+        Aktualisiert das Diagramm basierend auf einem Ergebnis des Datenmodells.
+
+        Args:
+            view (ProjectView, optional): Das Ergebnis; ohne Ergebnis wird ein leeres Diagramm gezeichnet.
 
         - Zeichnet ein Balkendiagramm mit Sollstunden und tatsächlichen Arbeitsstunden pro Phase und Benutzer.
         - Verwendet verschiedene Farben, um Benutzer im Diagramm zu unterscheiden.
+        - Erstellt Figur und Zeichenfläche beim ersten Aufruf; danach werden nur die Achsen geleert und neu gezeichnet.
         """
-        data = self.fetch_filtered_data()
-        
-        # Datenverarbeitung (wie zuvor)
-        phases = []
-        users = set()
-        hours_by_user = {}
-        soll_hours = {}
-        user_names = {}
-
-        for row in data:
-            phase_name, phase_number, soll, user_id, username, user_hours = row
-            if phase_name not in phases:
-                phases.append(phase_name)
-            if user_id:
-                users.add(user_id)
-                user_names[user_id] = username
-            if phase_name not in hours_by_user:
-                hours_by_user[phase_name] = {}
-            if user_id:
-                hours_by_user[phase_name][user_id] = user_hours
-            soll_hours[phase_name] = soll
+        # Verzögerter Import: Matplotlib erst laden, wenn ein Diagramm gezeichnet wird
+        import matplotlib.pyplot as plt
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+
+        data = phase_user_hours(view) if view else []
+
+        # Phase -> Sollstunden bzw. {Benutzername: Stunden}
+        phases = [phase_name for phase_name, _, _ in data]
+        soll_hours = {phase_name: soll or 0 for phase_name, soll, _ in data}
+        hours_by_user = {phase_name: user_hours for phase_name, _, user_hours in data}
+        users = sorted({username for _, _, user_hours in data for username in user_hours})
 
         # Farbzuteilung für Benutzer
         user_colors = {user: plt.cm.tab20(i % 20) for i, user in enumerate(users)}
 
-        fig, ax = plt.subplots(figsize=(6, 4))
-        fig.patch.set_facecolor(self.colors["background"])
+        if self.figure is None:
+            self.figure, self.ax = plt.subplots(figsize=(6, 4))
+            self.figure.patch.set_facecolor(self.colors["background"])
+            self.canvas = FigureCanvasTkAgg(self.figure, self)
+            self.canvas.get_tk_widget().pack(fill="both", expand=True)
+        ax = self.ax
+        ax.clear()
         ax.set_facecolor(self.colors["background"])
         bar_width = 0.8
         x = range(len(phases))
@@ -190,20 +141,20 @@ class AdminProjectDiagram(ctk.CTkFrame):
          # Nutzerstunden innerhalb desselben Balkens gestapelt darstellen
         y_offset = [0] * len(phases) 
         added_labels = set()
-        for user_id in users:
+        for username in users:
             for i, phase in enumerate(phases):
-                user_hours = hours_by_user[phase].get(user_id, 0)
+                user_hours = hours_by_user[phase].get(username, 0)
                 ax.bar(
                     i,
                     user_hours,
                     bar_width,
                     bottom=y_offset[i],
-                    color=user_colors[user_id],
-                    label=user_names[user_id] if user_id not in added_labels else "",
+                    color=user_colors[username],
+                    label=username if username not in added_labels else "",
                     zorder=2,
                 )
                 y_offset[i] += user_hours
-            added_labels.add(user_id)
+            added_labels.add(username)
 
         ax.set_xticks(x)
         ax.set_xticklabels(phases, fontsize=10, fontweight="bold", color=self.colors["text_light"])
@@ -217,25 +168,38 @@ class AdminProjectDiagram(ctk.CTkFrame):
         unique_handles_labels = dict(zip(labels, handles))
         ax.legend(unique_handles_labels.values(), unique_handles_labels.keys())
 
-        if self.canvas:
-            self.canvas.get_tk_widget().destroy()
-
-        self.canvas = FigureCanvasTkAgg(fig, self)
-        self.canvas.get_tk_widget().pack(fill="both", expand=True)
-        self.canvas.draw()
+        self.canvas.draw_idle()
     
     def create_widgets(self):
         """
-        Erstellt die initialen Widgets und generiert das erste Diagramm.
+        Erstellt die initialen Widgets und zeichnet das aktuelle Ergebnis (bzw. ein leeres Diagramm).
         """
-        self.update_chart()
+        self.update_chart(self.current_view())
     
     def refresh_chart(self):
         """
-        Aktualisiert das Diagramm, um Änderungen durch Filter oder Daten widerzuspiegeln.
+        Zeichnet das aktuelle Ergebnis des Datenmodells neu.
         """
-        self.update_chart()
+        self.update_chart(self.current_view())
 
-        
-        
+    def rebind(self, project_number):
+        """
+        Zeigt das Diagramm für ein anderes Projekt an, ohne Figur und Zeichenfläche neu zu erstellen.
 
+        Args:
+            project_number (str): Die neue Projektnummer.
+
+        - Liegt das Ergebnis des neuen Projekts noch nicht vor, wird es gezeichnet, sobald das Datenmodell es liefert.
+        """
+        self.project_number = project_number
+        self.update_chart(self.current_view())
+
+    def destroy(self):
+        """
+        Schliesst die Matplotlib-Figur, bevor das Widget zerstört wird.
+        """
+        if self.figure is not None:
+            import matplotlib.pyplot as plt
+            plt.close(self.figure)
+            self.figure = None
+        super().destroy()
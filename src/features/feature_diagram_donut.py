@@ -0,0 +1,121 @@
+"""
+Modul: Ringdiagramm für die Kennzahl-Diagramme in TimeArch.
+
+Dieses Modul stellt ein Ringdiagramm (Donut) mit Text in der Mitte als natives `tk.Canvas`-Widget bereit, wie es
+die Diagramme für Tagesstunden, Stundenbilanz, Stellenprozente und Ferien verwenden. Die Diagramme zeigen nur
+einen Ring und eine Zahl und benötigen dafür weder eine Matplotlib-Figur noch `FigureCanvasTkAgg`; Matplotlib
+bleibt den Balkendiagrammen vorbehalten.
+
+Segmente und Text werden einmal erstellt; bei einer Aktualisierung werden nur Winkel, Farben und Text der
+bestehenden Canvas-Elemente geändert. Tk zeichnet geänderte Elemente gesammelt beim nächsten Leerlauf neu.
+
+Konstanten:
+-----------
+- DONUT_SIZE: Standardgrösse des Widgets in Pixeln (entspricht der bisherigen 5×5-Zoll-Figur bei 100 dpi).
+- RING_RATIO: Breite des Rings im Verhältnis zum Aussenradius.
+
+Klassen:
+--------
+- DonutCanvas: Ringdiagramm mit fester Anzahl Segmente und Text in der Mitte.
+
+Verwendung:
+-----------
+    from features.feature_diagram_donut import DonutCanvas
+
+    self.donut = DonutCanvas(self, self.colors["background"], self.colors["text_light"], segments=3)
+    self.donut.pack(fill="both", expand=True)
+    self.donut.update_ring([2, 6, 0], [rot, blau, gruen], "-2.0h\\nTagesziel")
+    self.donut.show_message("Lädt...")
+"""
+
+import tkinter as tk
+
+DONUT_SIZE = 500
+RING_RATIO = 0.4 / 1.5      # Wie bisher: Ringbreite 0.4 bei Radius 1.5
+
+class DonutCanvas(tk.Canvas):
+    """
+    Ringdiagramm mit fester Anzahl Segmente und Text in der Mitte.
+
+    Funktionen:
+    - Einmaliges Erstellen der Segmente (Bögen) und des Texts
+    - Aktualisieren von Werten, Farben und Text über `itemconfigure`
+    - Anpassung an die Widgetgrösse bei `<Configure>`
+    """
+    def __init__(self, master, background, text_color, segments=1, counterclock=True, size=DONUT_SIZE):
+        """
+        Erstellt das Widget mit den Segmenten und dem Text.
+
+        Args:
+            master (tk.Misc): Das übergeordnete Widget.
+            background (str): Die Hintergrundfarbe.
+            text_color (str): Die Farbe des Texts in der Mitte.
+            segments (int): Die Anzahl Segmente.
+            counterclock (bool): Ob die Segmente im Gegenuhrzeigersinn angeordnet werden (wie bei `ax.pie`).
+            size (int): Die gewünschte Breite und Höhe in Pixeln.
+        """
+        super().__init__(master, width=size, height=size, bg=background, highlightthickness=0, bd=0)
+        self.counterclock = counterclock
+
+        self.arcs = [self.create_arc(0, 0, 0, 0, style="arc", state="hidden") for _ in range(segments)]
+        self.label = self.create_text(0, 0, text="", fill=text_color, justify="center")
+        self.bind("<Configure>", lambda event: self.layout())
+        self.layout()
+
+    def layout(self):
+        """
+        Berechnet Position und Grösse von Ring und Text für die aktuelle Widgetgrösse.
+        """
+        width, height = self.winfo_width(), self.winfo_height()
+        if width <= 1 or height <= 1:
+            width = height = int(self["width"])
+        radius = min(width, height) / 2 * 0.9
+        ring = max(1, radius * RING_RATIO)
+        center_x, center_y = width / 2, height / 2
+        inner = radius - ring / 2   # Bögen werden mittig auf ihrer Linie gezeichnet
+
+        for arc in self.arcs:
+            self.coords(arc, center_x - inner, center_y - inner, center_x + inner, center_y + inner)
+            self.itemconfigure(arc, width=ring)
+        self.coords(self.label, center_x, center_y)
+
+    def update_ring(self, values, colors, text):
+        """
+        Setzt die Segmente und den Text.
+
+        (Heisst nicht `update`, um `tk.Misc.update` nicht zu überschreiben.)
+
+        Args:
+            values (list): Die Werte der Segmente (gleich viele wie `segments`); negative Werte zählen als 0.
+            colors (list): Die Farben der Segmente.
+            text (str): Der Text in der Mitte.
+
+        Hinweis:
+        --------
+        - Ist die Summe der Werte 0, wird nur der Text angezeigt.
+        """
+        values = [max(0, float(value)) for value in values]
+        total = sum(values)
+        angle = 90.0
+        for arc, value, color in zip(self.arcs, values, colors):
+            sweep = 360.0 * value / total if total > 0 else 0.0
+            if sweep <= 0:
+                self.itemconfigure(arc, state="hidden")
+                continue
+            # Tk zeichnet bei einer Ausdehnung von genau 360° nichts
+            extent = min(sweep, 359.99) if self.counterclock else -min(sweep, 359.99)
+            self.itemconfigure(arc, start=angle, extent=extent, outline=color, state="normal")
+            angle += extent
+
+        self.itemconfigure(self.label, text=text, font=("Arial", 18, "bold"))
+
+    def show_message(self, text):
+        """
+        Blendet die Segmente aus und zeigt nur einen Text an.
+
+        Args:
+            text (str): Der anzuzeigende Text (leer für ein leeres Diagramm).
+        """
+        for arc in self.arcs:
+            self.itemconfigure(arc, state="hidden")
+        self.itemconfigure(self.label, text=text, font=("Arial", 14))
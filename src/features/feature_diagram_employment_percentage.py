@@ -2,8 +2,8 @@
 Modul: Diagramm für Beschäftigungsprozentsatz in TimeArch.
 
 Dieses Modul erstellt ein Diagramm, das den tatsächlichen Beschäftigungsprozentsatz eines Benutzers
-im Vergleich zum erwarteten Beschäftigungsprozentsatz darstellt. Die Daten werden aus der Datenbank abgerufen,
-und die Visualisierung erfolgt mit Matplotlib.
+im Vergleich zum erwarteten Beschäftigungsprozentsatz darstellt. Die Daten stammen aus der gemeinsamen Stundenbilanz (`db_balance`),
+und die Visualisierung erfolgt als Ringdiagramm (`DonutCanvas`).
 
 Klassen:
 --------
@@ -12,9 +12,14 @@ Klassen:
 Funktionen innerhalb der Klasse:
 --------------------------------
 - __init__(self, master, user_id): Initialisiert das Diagramm mit dem Benutzerkontext.
-- init_diagram(self): Erstellt das Matplotlib-Diagramm und bindet es in die GUI ein.
-- load_data(self): Lädt Daten aus der Datenbank, berechnet Soll- und Ist-Werte und aktualisiert das Diagramm.
+- init_diagram(self): Erstellt das Ringdiagramm-Widget (`DonutCanvas`).
+- load_data(self): Lädt die Stellenprozente im Hintergrund und aktualisiert anschliessend das Diagramm.
+- fetch_percentages(self): Liest effektive und erwartete Stellenprozente aus `db_balance` (läuft im Hintergrund).
+- apply_percentages(self, percentages): Übernimmt die geladenen Stellenprozente.
+- show_placeholder(self, text): Zeigt einen Platzhaltertext anstelle des Diagramms an.
+- on_load_error(self, error): Gibt den Fehler aus und leert das Diagramm.
 - update_diagram(self, actual_percentage, expected_percentage): Aktualisiert das Diagramm mit neuen Daten.
+- rebind(self, user_id): Zeigt das Diagramm für einen anderen Benutzer an (gleiches Widget, neue Daten).
 
 Verwendung:
 -----------
@@ -24,17 +29,16 @@ Verwendung:
     diagram.pack()
 """
 import customtkinter as ctk
-import datetime
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-from db.db_connection import create_connection
+from db.db_balance import fetch_balance
+from db.db_executor import submit
+from features.feature_diagram_donut import DonutCanvas
 from gui.gui_appearance_color import appearance_color, get_default_styles
 
 class EmploymentPercentageDiagram(ctk.CTkFrame):
     """
     Eine Klasse, die ein Diagramm zur Analyse des Beschäftigungsprozentsatzes erstellt.
 
-    Die Klasse verwendet Matplotlib, um eine visuelle Darstellung des effektiven
+    Die Klasse verwendet ein Ringdiagramm, um eine visuelle Darstellung des effektiven
     Beschäftigungsprozentsatzes im Vergleich zum erwarteten Prozentsatz zu liefern.
     """
     def __init__(self, master, user_id):
@@ -55,82 +59,79 @@ class EmploymentPercentageDiagram(ctk.CTkFrame):
 
     def init_diagram(self):
         """
-        Erstellt und initialisiert die Diagramm-Widgets.
+        Erstellt das Ringdiagramm-Widget (`DonutCanvas`).
 
-        - Bindet Matplotlib in die GUI ein.
-        - Setzt Farben und Hintergrund für das Diagramm.
+        - Setzt die Farben und das Layout für das Diagramm.
+        - Bindet das Diagramm in die GUI ein.
+        - Segmente und Text werden einmalig erstellt; Aktualisierungen ändern nur Winkel, Farben und Text.
         """
-        self.figure = plt.Figure(figsize=(5, 5), dpi=100)
-        self.figure.set_facecolor(self.colors["background"])
-        self.ax = self.figure.add_subplot(111)
-        self.ax.set_facecolor(self.colors["background"])
-        self.canvas = FigureCanvasTkAgg(self.figure, self)
-        self.canvas.get_tk_widget().pack(fill="both", expand=True)
+        self.donut = DonutCanvas(self, self.colors["background"], self.colors["text_light"])
+        self.donut.pack(fill="both", expand=True)
 
     def load_data(self):
         """
-        Lädt die Daten aus der Datenbank, berechnet Soll- und Ist-Werte
-        und aktualisiert das Diagramm.
+        Lädt die effektiven und erwarteten Stellenprozente im Hintergrund und aktualisiert anschliessend das Diagramm.
 
-        Datenbankabfragen:
-        -------------------
-        - Ruft die Sollstunden und den erwarteten Prozentsatz aus `user_settings` ab.
-        - Berechnet die tatsächlich geleisteten Stunden aus `time_entries`.
+        - Zeigt bis zum Eintreffen der Daten einen Platzhalter an.
+        - Die Abfrage selbst erfolgt in `fetch_percentages`.
 
         Fehlerbehandlung:
         ------------------
-        - Zeigt eine Fehlermeldung an, falls die Daten nicht geladen werden können.
-        """
-        connection = create_connection()
-        if connection:
-            cursor = connection.cursor()
-            try:
-                # Abfrage der Benutzerdaten
-                cursor.execute("""
-                    SELECT default_hours_per_day, employment_percentage, start_date
-                    FROM user_settings
-                    WHERE user_id = %s
-                """, (self.user_id,))
-                result = cursor.fetchone()
-
-                if not result:
-                    print("Fehler: Keine Benutzerdaten gefunden.")
-                    return
-
-                default_hours_per_day, expected_percentage, start_date = result
-                today = datetime.date.today()
-                if start_date is None:
-                    start_date = datetime.date(today.year, 1, 1)
-                elif isinstance(start_date, str):
-                    start_date = datetime.date.fromisoformat(start_date)
-
-                # Arbeitstage seit Startdatum
-                total_work_days = sum(1 for day in range((today - start_date).days + 1)
-                                      if (start_date + datetime.timedelta(days=day)).weekday() < 5)
-
-                # Soll-Stunden
-                expected_hours = (default_hours_per_day * expected_percentage / 100) * total_work_days
-
-                # Ist-Stunden
-                current_year = datetime.date.today().year
-                cursor.execute("""
-                    SELECT COALESCE(SUM(hours), 0)
-                    FROM time_entries
-                    WHERE user_id = %s AND EXTRACT(YEAR FROM entry_date) = %s
-                """, (self.user_id, current_year))
-                actual_hours = cursor.fetchone()[0] or 0
-
-                # Tatsächlicher Prozentsatz
-                actual_percentage = (actual_hours / expected_hours) * 100 if expected_hours > 0 else 0
-
-                # Diagramm aktualisieren
-                self.update_diagram(actual_percentage, expected_percentage)
-
-            except Exception as e:
-                print(f"Fehler beim Laden der Daten: {e}")
-            finally:
-                cursor.close()
-                connection.close()
+        - Gibt eine Fehlermeldung aus, falls die Daten nicht geladen werden können.
+        """
+        self.show_placeholder("Lädt...")
+        submit(
+            self.fetch_percentages,
+            key=("employment_percentage", id(self)),
+            on_success=self.apply_percentages,
+            on_error=self.on_load_error,
+        )
+
+    def fetch_percentages(self):
+        """
+        Liest die Stellenprozente des Benutzers aus der gemeinsamen Stundenbilanz (`db_balance`).
+
+        Returns:
+            tuple: (effektive Stellenprozente, erwartete Stellenprozente) oder None,
+                   falls keine Benutzereinstellungen vorhanden sind.
+
+        Hinweis:
+        --------
+        - Läuft über `db_executor.submit` in einem Worker-Thread und greift nicht auf Tk zu.
+        """
+        balance = fetch_balance(self.user_id)
+        if balance is None:
+            return None
+        return balance.effective_percentage, balance.employment_percentage
+
+    def apply_percentages(self, percentages):
+        """
+        Übernimmt die geladenen Stellenprozente und aktualisiert das Diagramm.
+
+        Args:
+            percentages (tuple): Ergebnis von `fetch_percentages`.
+        """
+        if percentages is None:
+            print("Fehler: Keine Benutzerdaten gefunden.")
+            self.show_placeholder("")
+            return
+        self.update_diagram(*percentages)
+
+    def show_placeholder(self, text):
+        """
+        Zeigt einen Platzhaltertext anstelle des Diagramms an.
+
+        Args:
+            text (str): Der anzuzeigende Text.
+        """
+        self.donut.show_message(text)
+
+    def on_load_error(self, error):
+        """
+        Gibt den Fehler aus und leert das Diagramm.
+        """
+        print(f"Fehler beim Laden der Daten: {error}")
+        self.show_placeholder("")
 
     def update_diagram(self, actual_percentage, expected_percentage):
         """
@@ -142,31 +143,23 @@ class EmploymentPercentageDiagram(ctk.CTkFrame):
 
         - Passt die Farbe des Diagramms basierend auf dem Vergleich der Prozentsätze an.
         - Zeigt den tatsächlichen Prozentsatz im Diagramm an.
+        - Aktualisiert nur Farbe und Text des bestehenden Rings (`DonutCanvas`).
         """
-        self.ax.clear()
-
         if actual_percentage < expected_percentage:
             color = self.colors["error"]
         else:
             color = self.colors["primary"]
 
-        self.ax.pie(
-            [1],
-            colors=[color],
-            startangle=90,
-            wedgeprops={'width': 0.4},
-            radius=1.5,
-        )
+        self.donut.update_ring([1], [color], f"{actual_percentage:.1f}%\nEffektiver\nStellenprozent")
 
-        self.ax.text(
-            0,
-            0,
-            f"{actual_percentage:.1f}%\nEffektiver\nStellenprozent",
-            ha="center",
-            va="center",
-            fontsize=18,
-            fontweight="bold",
-            color=self.colors["text_light"],
-        )
+    def rebind(self, user_id):
+        """
+        Zeigt das Diagramm für einen anderen Benutzer an, ohne das Ringdiagramm neu zu erstellen.
+
+        Args:
+            user_id (int): Die neue Benutzer-ID.
 
-        self.canvas.draw()
+        - Lädt die Stellenprozente des neuen Benutzers im Hintergrund; eine noch laufende Abfrage wird verworfen.
+        """
+        self.user_id = user_id
+        self.load_data()
@@ -12,9 +12,11 @@ Funktionen innerhalb der Klasse:
 --------------------------------
 - __init__(self, master, user_id, project_number): Initialisiert das Diagramm mit Benutzer- und Projektdetails.
 - fetch_data(self): Ruft die benötigten Daten aus der Datenbank ab.
-- update_widgets(self): Aktualisiert das Diagramm basierend auf den abgerufenen Daten.
+- update_widgets(self, data): Aktualisiert das Diagramm basierend auf den abgerufenen Daten.
 - create_widgets(self): Erstellt die Diagramm-Widgets und zeigt sie an.
-- refresh_chart(self): Aktualisiert das Diagramm, wenn Änderungen vorgenommen werden.
+- refresh_chart(self): Lädt die Daten im Hintergrund und aktualisiert das Diagramm.
+- close_figure(self): Entfernt die Zeichenfläche und schliesst die Matplotlib-Figur (beim Zerstören).
+- destroy(self): Verwirft laufende Abfragen und schliesst die Figur, bevor das Widget zerstört wird.
 
 Verwendung:
 -----------
@@ -22,11 +24,17 @@ Verwendung:
 
     diagram = ProjectPhaseDiagram(master, user_id, project_number)
     diagram.pack()
+
+Hinweis:
+--------
+- Matplotlib wird erst beim ersten Zeichnen eines Diagramms importiert (`update_widgets`), nicht beim Import des Moduls.
+- Figur, Achsen und Zeichenfläche werden einmal erstellt; beim Aktualisieren werden nur die Achsen geleert und
+  neu gezeichnet (`ax.clear()`, `draw_idle()`). Die Figur wird beim Zerstören des Widgets geschlossen, damit
+  `pyplot` keine Figuren verdrängter Ansichten behält.
 """
 import customtkinter as ctk
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-from db.db_connection import create_connection
+from db.db_connection import connection
+from db.db_executor import submit, discard
 from gui.gui_appearance_color import appearance_color, get_default_styles
 
 class ProjectPhaseDiagram(ctk.CTkFrame):
@@ -51,24 +59,31 @@ class ProjectPhaseDiagram(ctk.CTkFrame):
         self.project_number = project_number
         self.user_id = user_id
         self.canvas = None
+        self.figure = None
+        self.ax = None
         self.create_widgets()
         
     def fetch_data(self):
         """
         Ruft die benötigten Daten für das Diagramm aus der Datenbank ab.
 
+        Die Stunden stammen aus dem Rollup `project_phase_user_hours`, sodass nur wenige Zeilen
+        pro Phase gelesen werden, unabhängig von der Anzahl Zeiteinträge.
+
         Returns:
             list: Eine Liste von Tupeln mit Phasenname, Phasennummer, Sollstunden, Gesamtstunden und Benutzerstunden.
 
         Fehlerbehandlung:
         ------------------
         - Gibt None zurück, wenn die Datenbankabfrage fehlschlägt.
-        - Schließt die Datenbankverbindung nach der Abfrage.
+        - Gibt die Datenbankverbindung nach der Abfrage an den Pool zurück.
+
+        Hinweis:
+        --------
+        - Läuft über `db_executor.submit` in einem Worker-Thread und greift nicht auf Tk zu.
         """
-        connection = create_connection()
-        if connection:
-            cursor = connection.cursor()
-            try:
+        try:
+            with connection() as cursor:
                 query = '''
                 SELECT
                     sp.phase_name,
@@ -79,7 +94,7 @@ class ProjectPhaseDiagram(ctk.CTkFrame):
                 FROM sia_phases sp
                 LEFT JOIN project_sia_phases psp
                     ON sp.phase_name = psp.phase_name AND psp.project_number = %s
-                LEFT JOIN time_entries te
+                LEFT JOIN project_phase_user_hours te
                     ON sp.phase_id = te.phase_id AND te.project_number = %s
                 GROUP BY sp.phase_name, sp.phase_number, psp.soll_stunden
                 ORDER BY sp.phase_number;
@@ -87,39 +102,47 @@ class ProjectPhaseDiagram(ctk.CTkFrame):
                 cursor.execute(query, (self.user_id, self.user_id, self.project_number, self.project_number))
                 result = cursor.fetchall()
                 return result
-            except Exception as e:
-                print(f"Fehler beim Laden der Projektphasen: {e}")
-                return None
-            finally:
-                cursor.close()
-                connection.close()
-        else:
-            print("Keine Verbindung zur Datenbank.")
+        except Exception as e:
+            print(f"Fehler beim Laden der Projektphasen: {e}")
             return None
     
-    def update_widgets(self):
+    def update_widgets(self, data):
         """
         Aktualisiert das Diagramm basierend auf den abgerufenen Daten.
 
-        - Ruft die Daten über `fetch_data` ab.
+        Args:
+            data (list): Ergebnis von `fetch_data` oder None.
+
         - Erstellt ein Balkendiagramm mit Sollstunden, Gesamtstunden und Benutzerstunden für jede Phase.
-        - Zeigt eine Nachricht an, wenn keine Daten gefunden werden.
+        - Erstellt Figur und Zeichenfläche beim ersten Aufruf; danach werden nur die Achsen geleert und neu gezeichnet.
+        - Zeigt eine Nachricht an, wenn keine Daten gefunden werden (die Zeichenfläche wird nur ausgeblendet).
         """
-        data = self.fetch_data()
+        if not self.winfo_exists():
+            return
+        self.loading_label.pack_forget()
         if not data:
             if self.canvas:
-                self.canvas.get_tk_widget().destroy()
-            no_data_label = ctk.CTkLabel(self, text="Keine Daten gefunden.", **self.styles["title"])
-            no_data_label.pack(fill="both", expand=True)
+                self.canvas.get_tk_widget().pack_forget()
+            self.loading_label.configure(text="Keine Daten gefunden.")
+            self.loading_label.pack(fill="both", expand=True)
             print(f"Keine Daten für Projekt {self.project_number}, User {self.user_id} gefunden.")
             return
         
+        # Verzögerter Import: Matplotlib erst laden, wenn ein Diagramm gezeichnet wird
+        import matplotlib.pyplot as plt
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+
         phases, phase_number, soll, total, user = zip(*data)
-        
-        width = self.winfo_width()/100
-        height = self.winfo_height()/100
-        fig, ax = plt.subplots(figsize=(max(12, width), max(6, height)))
-        fig.set_facecolor(self.colors["background"])
+
+        if self.figure is None:
+            width = self.winfo_width()/100
+            height = self.winfo_height()/100
+            self.figure, self.ax = plt.subplots(figsize=(max(12, width), max(6, height)))
+            self.figure.set_facecolor(self.colors["background"])
+            self.canvas = FigureCanvasTkAgg(self.figure, self)
+        self.canvas.get_tk_widget().pack(fill="both", padx=10, pady=10, expand=True)
+        ax = self.ax
+        ax.clear()
         ax.set_facecolor(self.colors["background"])
         bar_width = 0.8
         x = range(len(phases))
@@ -162,23 +185,44 @@ class ProjectPhaseDiagram(ctk.CTkFrame):
         ax.spines["right"].set_visible(False)
         ax.spines["left"].set_visible(False)
         ax.spines["bottom"].set_visible(False)
-        
-        if self.canvas:
-            self.canvas.get_tk_widget().destroy()
-        
-        self.canvas = FigureCanvasTkAgg(fig, self)
-        self.canvas.get_tk_widget().pack(fill="both", padx=10, pady=10, expand=True)
-        self.canvas.draw()
+
+        self.canvas.draw_idle()
     
     def create_widgets(self):
         """
         Erstellt die initialen Diagramm-Widgets.
+
+        - Zeigt bis zum Eintreffen der Daten einen Platzhalter an.
         """
-        self.update_widgets()
+        self.loading_label = ctk.CTkLabel(self, text="Lädt...", **self.styles["title"])
+        self.loading_label.pack(fill="both", expand=True)
+        self.refresh_chart()
     
     def refresh_chart(self):
         """
         Aktualisiert das Diagramm, um neue Daten oder Änderungen widerzuspiegeln.
+
+        - Lädt die Daten über `fetch_data` im Hintergrund; veraltete Ergebnisse werden verworfen.
+        """
+        submit(self.fetch_data, key=("project_phase", id(self)), on_success=self.update_widgets)
+
+    def close_figure(self):
+        """
+        Entfernt die Zeichenfläche und schliesst die Matplotlib-Figur (falls vorhanden).
+        """
+        if self.canvas:
+            self.canvas.get_tk_widget().destroy()
+            self.canvas = None
+        if self.figure is not None:
+            import matplotlib.pyplot as plt
+            plt.close(self.figure)
+            self.figure = None
+            self.ax = None
+
+    def destroy(self):
+        """
+        Verwirft laufende Abfragen und schliesst die Figur, bevor das Widget zerstört wird.
         """
-        self.update_widgets()
-        
\ No newline at end of file
+        discard(("project_phase", id(self)))
+        self.close_figure()
+        super().destroy()
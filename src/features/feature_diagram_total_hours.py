@@ -11,9 +11,13 @@ Klassen:
 Funktionen innerhalb der Klasse:
 --------------------------------
 - __init__(self, master, user_id): Initialisiert das Diagramm mit Benutzerkontext.
-- init_diagram(self): Erstellt die Diagramm-Widgets und initialisiert Matplotlib.
-- load_data(self): Lädt Daten aus der Datenbank, berechnet Sollstunden, tatsächliche Stunden und die Stundenbilanz.
+- init_diagram(self): Erstellt das Ringdiagramm-Widget (`DonutCanvas`).
+- load_data(self): Lädt die Stundenbilanz im Hintergrund und aktualisiert anschliessend das Diagramm.
+- show_placeholder(self, text): Zeigt einen Platzhaltertext anstelle des Diagramms an.
+- on_load_error(self, error): Gibt den Fehler aus und leert das Diagramm.
+- fetch_balance(self): Liest die Stundenbilanz aus `db_balance` (läuft im Hintergrund).
 - update_diagram(self, total_hours): Aktualisiert das Diagramm basierend auf der Stundenbilanz.
+- rebind(self, user_id): Zeigt das Diagramm für einen anderen Benutzer an (gleiches Widget, neue Daten).
 
 Verwendung:
 -----------
@@ -24,9 +28,9 @@ Verwendung:
 """
 
 import customtkinter as ctk
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-from db.db_connection import create_connection
+from db.db_balance import fetch_balance
+from db.db_executor import submit
+from features.feature_diagram_donut import DonutCanvas
 from gui.gui_appearance_color import appearance_color, get_default_styles
 
 class DiagramTotalHours(ctk.CTkFrame):
@@ -54,129 +58,102 @@ class DiagramTotalHours(ctk.CTkFrame):
 
     def init_diagram(self):
         """
-        Erstellt die Diagramm-Widgets und initialisiert Matplotlib.
+        Erstellt das Ringdiagramm-Widget (`DonutCanvas`).
 
         - Setzt die Farben und das Layout für das Diagramm.
         - Bindet das Diagramm in die GUI ein.
+        - Segmente und Text werden einmalig erstellt; Aktualisierungen ändern nur Winkel, Farben und Text.
         """
-        self.figure = plt.Figure(figsize=(5, 5), dpi=100)
-        self.figure.set_facecolor(self.colors["background"])
-        self.ax = self.figure.add_subplot(111)
-        self.ax.set_facecolor(self.colors["background"])
-        self.canvas = FigureCanvasTkAgg(self.figure, self)
-        self.canvas.get_tk_widget().pack(fill="both", expand=True)
+        self.donut = DonutCanvas(self, self.colors["background"], self.colors["text_light"])
+        self.donut.pack(fill="both", expand=True)
 
     def load_data(self):
         """
-        Lädt Daten aus der Datenbank, berechnet Sollstunden, tatsächliche Stunden und die Stundenbilanz.
+        Lädt die Stundenbilanz im Hintergrund und aktualisiert anschliessend das Diagramm.
 
-        Datenbankabfragen:
-        -------------------
-        - Ruft Sollstunden und tatsächliche Stunden für den Benutzer ab.
+        - Zeigt bis zum Eintreffen der Daten einen Platzhalter an.
+        - Die Abfrage selbst erfolgt in `fetch_balance`.
+
+        Fehlerbehandlung:
+        ------------------
+        - Zeigt ein leeres Diagramm an, falls die Daten nicht geladen werden können.
+        """
+        self.show_placeholder("Lädt...")
+        submit(
+            self.fetch_balance,
+            key=("total_hours", id(self)),
+            on_success=self.update_diagram,
+            on_error=self.on_load_error,
+        )
+
+    def show_placeholder(self, text):
+        """
+        Zeigt einen Platzhaltertext anstelle des Diagramms an.
+
+        Args:
+            text (str): Der anzuzeigende Text.
+        """
+        self.donut.show_message(text)
+
+    def on_load_error(self, error):
+        """
+        Gibt den Fehler aus und leert das Diagramm.
+        """
+        print(f"Fehler beim Laden der Daten: {error}")
+        self.update_diagram(None)
+
+    def fetch_balance(self):
+        """
+        Liest die Stundenbilanz des Benutzers aus der gemeinsamen Stundenbilanz (`db_balance`).
+
+        Returns:
+            float: Die Stundenbilanz oder None, falls keine Benutzereinstellungen vorhanden sind.
 
         Berechnungen:
         --------------
-        - Sollstunden: Basierend auf dem Beschäftigungsprozentsatz und der Arbeitszeit.
-        - Tatsächliche Stunden: Summiert die Stunden aus `time_entries`.
+        - Erfolgen in der SQL-Funktion `user_balance` (Sollstunden, tatsächliche Stunden und Differenz).
 
-        Fehlerbehandlung:
-        ------------------
-        - Zeigt eine Fehlermeldung an, falls die Daten nicht geladen werden können.
-        """
-        connection = create_connection()
-        if connection:
-            cursor = connection.cursor()
-            try:
-                # Abfrage: Stunden pro Tag, Beschäftigungsprozentsatz, und tatsächliche Stunden
-                cursor.execute("""
-                    SELECT default_hours_per_day, employment_percentage, start_date
-                    FROM user_settings
-                    WHERE user_id = %s
-                """, (self.user_id,))
-                result = cursor.fetchone()
-
-                if not result:
-                    print("Keine Daten für diesen Benutzer gefunden.")
-                    self.update_diagram(None)
-                    return
-
-                default_hours_per_day, employment_percentage, start_date = result
-
-                # Arbeitstage seit Startdatum berechnen
-                import datetime
-                today = datetime.date.today()
-                if start_date is None:
-                    start_date = datetime.date(today.year, 1, 1)
-                elif isinstance(start_date, str):
-                    start_date = datetime.date.fromisoformat(start_date)
-
-                total_work_days = [(start_date + datetime.timedelta(days=day)) for day in range((today - start_date).days + 1) if (start_date + datetime.timedelta(days=day)).weekday() < 5]
-
-                # Sollstunden berechnen
-                expected_hours = (default_hours_per_day * employment_percentage / 100) * len(total_work_days)
-
-                # Tatsächliche Arbeitsstunden abrufen
-                cursor.execute("""
-                    SELECT entry_date, COALESCE(SUM(hours), 0)
-                    FROM time_entries
-                    WHERE user_id = %s AND entry_date >= %s
-                    GROUP BY entry_date
-                """, (self.user_id, start_date))
-                entries = dict(cursor.fetchall())
-                
-                actual_hours = sum(entries.get(day, 0) for day in total_work_days)
-
-                # Differenz berechnen
-                total_hours = actual_hours - expected_hours
-
-                # Diagramm aktualisieren
-                self.update_diagram(total_hours)
-
-            except Exception as e:
-                print(f"Fehler beim Laden der Daten: {e}")
-                self.update_diagram(None)
-            finally:
-                cursor.close()
-                connection.close()
+        Hinweis:
+        --------
+        - Läuft über `db_executor.submit` in einem Worker-Thread und greift nicht auf Tk zu.
+        """
+        balance = fetch_balance(self.user_id)
+        if balance is None:
+            print("Keine Daten für diesen Benutzer gefunden.")
+            return None
+
+        return balance.balance
 
     def update_diagram(self, total_hours):
         """
-        Aktualisiert das Diagramm basierend auf den tatsächlichen und erwarteten Stunden.
+        Aktualisiert das Diagramm basierend auf der Stundenbilanz.
 
         Args:
-            total_hours (float): Die tatsächlich geleisteten Stunden.
-            expected_hours (float): Die erwarteten Sollstunden.
+            total_hours (float): Die Stundenbilanz (tatsächliche minus Sollstunden) oder None.
 
         - Zeigt die Stundenbilanz im Diagramm an.
         - Passt die Farben basierend auf der Differenz an (positiv/negativ).
+        - Aktualisiert nur Farbe und Text des bestehenden Rings (`DonutCanvas`).
         """
-        self.ax.clear()
-
         if total_hours is None:
-            return  # Diagramm bleibt leer
+            self.donut.show_message("")  # Diagramm bleibt leer
+            return
 
         if total_hours < 0:
             color = self.colors["error"]  # Rot für Minus
         else:
             color = self.colors["primary"]  # Grün für 0 oder mehr
 
-        self.ax.pie(
-            [1],
-            colors=[color],
-            startangle=90,
-            wedgeprops={'width': 0.4},
-            radius=1.5,
-        )
+        self.donut.update_ring([1], [color], f"{total_hours:+.2f}h\nStundenbilanz")
 
-        self.ax.text(
-            0,
-            0,
-            f"{total_hours:+.2f}h\nStundenbilanz",
-            ha="center",
-            va="center",
-            fontsize=18,
-            fontweight="bold",
-            color=self.colors["text_light"],
-        )
+    def rebind(self, user_id):
+        """
+        Zeigt das Diagramm für einen anderen Benutzer an, ohne das Ringdiagramm neu zu erstellen.
+
+        Args:
+            user_id (int): Die neue Benutzer-ID.
 
-        self.canvas.draw()
+        - Lädt die Stundenbilanz des neuen Benutzers im Hintergrund; eine noch laufende Abfrage wird verworfen.
+        """
+        self.user_id = user_id
+        self.load_data()
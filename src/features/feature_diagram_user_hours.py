@@ -8,14 +8,23 @@ Klassen:
 --------
 - UserHoursDiagram: Erstellt und verwaltet das Diagramm für die Benutzerstunden.
 
+Funktionen:
+-----------
+- fetch_daily_target(user_id): Liest die Sollstunden pro Tag (läuft im Hintergrund).
+- fetch_day_balance(user_id, selected_date): Liest die erfassten Stunden eines Tages und das Tagesziel (läuft im Hintergrund).
+
 Funktionen innerhalb der Klasse:
 --------------------------------
 - __init__(self, master, user_id): Initialisiert das Diagramm mit Benutzerkontext.
-- init_diagram(self): Erstellt die Diagramm-Widgets und initialisiert Matplotlib.
+- init_diagram(self): Erstellt das Ringdiagramm-Widget (`DonutCanvas`).
 - show_diagram(self): Zeigt das Diagramm-Widget an.
 - hide_diagram(self): Versteckt das Diagramm-Widget.
-- load_daily_target(self): Lädt das Tagesziel (Sollstunden) aus der Datenbank.
-- load_hours_from_db(self, selected_date): Lädt die Stunden eines Benutzers für ein bestimmtes Datum aus der Datenbank.
+- load_daily_target(self): Lädt das Tagesziel (Sollstunden) im Hintergrund.
+- set_daily_target(self, daily_target): Übernimmt das geladene Tagesziel.
+- load_hours_from_db(self, selected_date): Lädt die Stunden eines Benutzers für ein bestimmtes Datum im Hintergrund.
+- show_day(self, selected_date, balance): Zeigt die Tagesbilanz mit bereits geladenen Stunden an (Monats-Cache des Kalenders).
+- show_day_balance(self, result): Berechnet die Tagesdifferenz und aktualisiert das Diagramm.
+- show_load_error(self, error): Zeigt an, dass die Stunden nicht geladen werden konnten.
 - update_diagram(self, hours): Aktualisiert das Diagramm basierend auf den geladenen Stunden.
 - refresh_diagram(self, selected_date=None): Aktualisiert das Diagramm basierend auf dem ausgewählten Datum.
 
@@ -28,11 +37,43 @@ Verwendung:
 """
 
 import customtkinter as ctk
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-from db.db_connection import create_connection
+from db.db_connection import connection
+from db.db_executor import submit, discard
+from features.feature_diagram_donut import DonutCanvas
+from features import feature_reference_cache as reference_cache
 from gui.gui_appearance_color import appearance_color, get_default_styles
 
+def fetch_daily_target(user_id):
+    """
+    Liest die Sollstunden pro Tag eines Benutzers.
+
+    Args:
+        user_id (int): Die Benutzer-ID.
+
+    Returns:
+        Decimal: Die Sollstunden pro Tag oder None, falls keine Einstellungen vorhanden sind.
+    """
+    settings = reference_cache.user_settings(user_id)
+    return settings.default_hours_per_day if settings else None
+
+def fetch_day_balance(user_id, selected_date):
+    """
+    Liest die erfassten Stunden eines Tages und das Tagesziel eines Benutzers.
+
+    Args:
+        user_id (int): Die Benutzer-ID.
+        selected_date (str): Das Datum im Format YYYY-MM-DD.
+
+    Returns:
+        tuple: (erfasste Stunden, Sollstunden pro Tag oder None).
+    """
+    with connection() as cursor:
+        cursor.execute("""
+            SELECT COALESCE((SELECT hours FROM user_daily_totals WHERE user_id = %s AND entry_date = %s), 0)
+        """, (user_id, selected_date))
+        total_hours = cursor.fetchone()[0]
+    return total_hours, fetch_daily_target(user_id)
+
 class UserHoursDiagram(ctk.CTkFrame):
     """
     Eine Klasse, die ein Diagramm zur Visualisierung der Tagesstunden eines Benutzers erstellt.
@@ -67,115 +108,138 @@ class UserHoursDiagram(ctk.CTkFrame):
                 
     def init_diagram(self):
         """
-        Erstellt die Diagramm-Widgets und initialisiert Matplotlib.
+        Erstellt das Ringdiagramm-Widget (`DonutCanvas`).
 
         - Setzt die Farben und das Layout für das Diagramm.
-        - Bindet das Diagramm in die GUI ein.
+        - Das Widget wird erst mit `show_diagram` angezeigt.
+        - Segmente und Text werden einmalig erstellt; Aktualisierungen ändern nur Winkel, Farben und Text.
         """
-        self.figure = plt.Figure(figsize=(5, 5), dpi=100)
-        self.figure.set_facecolor(self.colors["background"])
-        self.ax = self.figure.add_subplot(111)
-        self.ax.set_facecolor(self.colors["background"])
-        self.canvas = FigureCanvasTkAgg(self.figure, self)
+        self.donut = DonutCanvas(self, self.colors["background"], self.colors["text_light"], segments=3)
     
     def show_diagram(self):
         """
         Zeigt das Diagramm an und versteckt den "Keine Daten"-Text.
         """
         self.no_data_label.pack_forget()
-        self.canvas.get_tk_widget().pack(fill="both", expand=True)
+        self.donut.pack(fill="both", expand=True)
         
     def hide_diagram(self):
         """
         Versteckt das Diagramm und zeigt den "Keine Daten"-Text.
         """
-        self.canvas.get_tk_widget().pack_forget()
+        self.donut.pack_forget()
         self.no_data_label.pack(fill="both", expand=True)
     
     def load_daily_target(self):
         """
-        Lädt die Stunden eines Benutzers für ein bestimmtes Datum aus der Datenbank.
+        Lädt das Tagesziel (Sollstunden) des Benutzers im Hintergrund.
+
+        - Setzt `daily_target`, sobald die Daten eingetroffen sind.
+        """
+        submit(
+            fetch_daily_target,
+            self.user_id,
+            key=("daily_target", id(self)),
+            on_success=self.set_daily_target,
+            on_error=lambda e: print(f"Fehler beim Laden des Daily Target: {e}"),
+        )
+
+    def set_daily_target(self, daily_target):
+        """
+        Übernimmt das geladene Tagesziel.
 
         Args:
-            selected_date (str): Das ausgewählte Datum im Format YYYY-MM-DD.
+            daily_target (Decimal): Die Sollstunden pro Tag oder None.
+        """
+        if daily_target is None:
+            print(f"Fehler: Kein Daily Target für Benutzer {self.user_id} in der Datenbank gefunden.")
+            return
 
-        - Berechnet die Differenz zwischen Sollstunden und tatsächlich erfassten Stunden.
-        - Aktualisiert das Diagramm basierend auf den geladenen Stunden.
-        """
-        connection = create_connection()
-        if connection:
-            cursor = connection.cursor()
-            try:
-                query = """
-                SELECT default_hours_per_day
-                FROM user_settings
-                WHERE user_id = %s
-                """
-                cursor.execute(query, (self.user_id,))
-                result = cursor.fetchone()
-                
-                if result is None or result[0] is None:
-                    print(f"Fehler: Kein Daily Target für Benutzer {self.user_id} in der Datenbank gefunden.")
-                    return
-                
-                self.daily_target = result[0]
-                print(f"DEBUG: Daily target für Benutzer {self.user_id}: {self.daily_target}")
-            except Exception as e:
-                print(f"Fehler beim Laden des Daily Target: {e}")
-            finally:
-                cursor.close()
-                connection.close()
+        self.daily_target = daily_target
+        print(f"DEBUG: Daily target für Benutzer {self.user_id}: {self.daily_target}")
 
     def load_hours_from_db(self, selected_date):
         """
-        Aktualisiert das Diagramm basierend auf den übergebenen Stunden.
+        Lädt die Stunden eines Benutzers für ein bestimmtes Datum im Hintergrund.
 
         Args:
-            hours (float): Die Differenz zwischen Sollstunden und tatsächlich erfassten Stunden.
-
-        - Passt die Farben des Diagramms basierend auf der Differenz an.
-        - Zeigt den Stundenwert im Diagramm an.
-        """
-        connection = create_connection()
-        if connection:
-            cursor = connection.cursor()
-            try:
-                query = """
-                SELECT COALESCE(SUM(hours), 0)
-                FROM time_entries
-                WHERE user_id = %s AND entry_date = %s
-                """
-                cursor.execute(query, (self.user_id, selected_date))
-                total_hours = cursor.fetchone()[0]
-                print(f"DEBUG: Geladene Stunden für {selected_date}: {total_hours}")
-                
-                self.current_hours = total_hours - self.daily_target
-                print(f"DEBUG: Aktualisiere Stunden auf {self.current_hours}")
-                
-                self.show_diagram()
-                self.update_diagram(self.current_hours)
-            except Exception as e:
-                print(f"Fehler beim Laden der Stunden: {e}")
-                self.hide_diagram()
-            finally:
-                cursor.close()
-                connection.close()
+            selected_date (str): Das ausgewählte Datum im Format YYYY-MM-DD.
+
+        - Zeigt bis zum Eintreffen der Daten einen Platzhalter an.
+        - Wird vorher ein anderes Datum gewählt, wird das veraltete Ergebnis verworfen.
+        """
+        self.no_data_label.configure(text="Lädt...")
+        self.hide_diagram()
+        submit(
+            fetch_day_balance,
+            self.user_id,
+            selected_date,
+            key=("user_hours", id(self)),
+            on_success=self.show_day_balance,
+            on_error=self.show_load_error,
+        )
+
+    def show_day(self, selected_date, balance):
+        """
+        Zeigt die Tagesbilanz mit bereits geladenen Stunden an (z.B. aus dem Monats-Cache des Kalenders).
+
+        Args:
+            selected_date (str): Das ausgewählte Datum im Format YYYY-MM-DD.
+            balance (tuple): (erfasste Stunden, Tagesziel) oder None, solange die Daten noch geladen werden.
+
+        - Eine noch laufende Abfrage aus `load_hours_from_db` wird verworfen, damit sie die Anzeige nicht überschreibt.
+        """
+        discard(("user_hours", id(self)))
+        if balance is None:
+            self.no_data_label.configure(text="Lädt...")
+            self.hide_diagram()
+        else:
+            self.show_day_balance(balance)
+
+    def show_day_balance(self, result):
+        """
+        Berechnet die Differenz zwischen Sollstunden und erfassten Stunden und aktualisiert das Diagramm.
+
+        Args:
+            result (tuple): (erfasste Stunden, Tagesziel) aus `fetch_day_balance`.
+        """
+        total_hours, daily_target = result
+        print(f"DEBUG: Geladene Stunden: {total_hours}")
+        self.set_daily_target(daily_target)
+        if self.daily_target is None:
+            self.show_load_error("Daily Target nicht geladen.")
+            return
+
+        self.current_hours = total_hours - self.daily_target
+        print(f"DEBUG: Aktualisiere Stunden auf {self.current_hours}")
+
+        self.show_diagram()
+        self.update_diagram(self.current_hours)
+
+    def show_load_error(self, error):
+        """
+        Zeigt an, dass die Stunden nicht geladen werden konnten.
+
+        Args:
+            error (Exception | str): Der aufgetretene Fehler.
+        """
+        print(f"Fehler beim Laden der Stunden: {error}")
+        self.no_data_label.configure(text="Fehler beim Laden")
+        self.hide_diagram()
 
     def update_diagram(self, hours):
         """
-        Aktualisiert das Diagramm basierend auf dem ausgewählten Datum.
+        Aktualisiert das Diagramm mit der Differenz zum Tagesziel.
 
         Args:
-            selected_date (str, optional): Das Datum, für das die Stunden angezeigt werden sollen.
+            hours (Decimal): Die erfassten Stunden minus Tagesziel.
 
-        - Lädt die Stunden für das angegebene Datum und aktualisiert das Diagramm.
-        - Zeigt eine Fehlermeldung, falls kein Datum angegeben wird.
+        - Aktualisiert nur Winkel, Farben und Text des bestehenden Rings (`DonutCanvas`).
+        - Tk zeichnet die geänderten Elemente beim nächsten Leerlauf; schnelle Klicks ergeben nur ein Neuzeichnen.
         """
         if self.daily_target is None:
             print("Fehler: Daily Target nicht geladen.")
-            self.ax.clear()
-            self.ax.text(0, 0, "Fehler", ha='center', va='center', fontsize=14)
-            self.canvas.draw()
+            self.donut.show_message("Fehler")
             return
         
         print(f"DEBUG: Stunden für Diagramm: {hours}")
@@ -200,32 +264,11 @@ class UserHoursDiagram(ctk.CTkFrame):
             data = [max(0,red), max(0,blue), max(0,green)]
             colors = [self.colors["error"], self.colors["secondary"], self.colors["primary"]]
             
-            # Kreisdiagramm erstellen
-            self.ax.clear()
-            self.ax.pie(
-                data,
-                colors=colors,
-                startangle=90,
-                wedgeprops={'width': 0.4},
-                radius=1.5,
-            )
-            # Text in der Mitte
-            self.ax.text(
-                0,
-                0,
-                f"{self.current_hours:+.1f}h\nTagesziel",
-                ha='center',
-                va='center',
-                fontsize=18,
-                fontweight='bold',
-                color=self.colors["text_light"],
-            )
+            self.donut.update_ring(data, colors, f"{self.current_hours:+.1f}h\nTagesziel")
 
         except Exception as e:
             print(f"Fehler beim Erstellen des Diagramms: {e}")
-            self.ax.text(0, 0, "Fehler", ha='center', va='center', fontsize=14)
-
-        self.canvas.draw()
+            self.donut.show_message("Fehler")
         
     def refresh_diagram(self, selected_date=None):
         if selected_date:
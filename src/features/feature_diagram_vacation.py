@@ -11,9 +11,14 @@ Klassen:
 Funktionen innerhalb der Klasse:
 --------------------------------
 - __init__(self, master, user_id): Initialisiert die Diagrammklasse mit Benutzerkontext.
-- init_diagram(self): Erstellt die Diagramm-Widgets und initialisiert Matplotlib.
-- load_vacation_data(self): Lädt die Urlaubsdaten (zugewiesen, genutzt, verbleibend) aus der Datenbank.
+- init_diagram(self): Erstellt das Ringdiagramm-Widget (`DonutCanvas`).
+- load_vacation_data(self): Lädt die Urlaubsdaten (zugewiesen, genutzt, verbleibend) im Hintergrund.
+- fetch_vacation_data(self): Liest die Urlaubsdaten aus `db_balance` (läuft im Hintergrund).
+- apply_vacation_data(self, data): Übernimmt die geladenen Urlaubsdaten.
+- on_load_error(self, error): Zeigt einen Ladefehler im Diagramm an.
+- show_message(self, text): Zeigt einen Text anstelle des Diagramms an.
 - update_diagram(self): Aktualisiert das Diagramm basierend auf den geladenen Urlaubsdaten.
+- rebind(self, user_id): Zeigt das Diagramm für einen anderen Benutzer an (gleiches Widget, neue Daten).
 
 Verwendung:
 -----------
@@ -24,9 +29,9 @@ Verwendung:
 """
 
 import customtkinter as ctk
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-from db.db_connection import create_connection
+from db.db_balance import fetch_balance
+from db.db_executor import submit
+from features.feature_diagram_donut import DonutCanvas
 from gui.gui_appearance_color import appearance_color, get_default_styles
 
 class VacationDiagram(ctk.CTkFrame):
@@ -57,81 +62,93 @@ class VacationDiagram(ctk.CTkFrame):
 
     def init_diagram(self):
         """
-        Erstellt die Diagramm-Widgets und initialisiert Matplotlib.
+        Erstellt das Ringdiagramm-Widget (`DonutCanvas`).
 
         - Setzt die Farben und das Layout für das Diagramm.
         - Bindet das Diagramm in die GUI ein.
+        - Segmente und Text werden einmalig erstellt; Aktualisierungen ändern nur Winkel, Farben und Text.
         """
-        self.figure = plt.Figure(figsize=(5, 5), dpi=100)
-        self.figure.set_facecolor(self.colors["background"])
-        self.ax = self.figure.add_subplot(111)
-        self.ax.set_facecolor(self.colors["background"])
-
-        # Matplotlib Canvas erstellen
-        self.canvas = FigureCanvasTkAgg(self.figure, self)
-        self.canvas_widget = self.canvas.get_tk_widget()
-        self.canvas_widget.pack(fill="both", expand=True)
+        self.donut = DonutCanvas(
+            self, self.colors["background"], self.colors["text_light"], segments=3, counterclock=False
+        )
+        self.donut.pack(fill="both", expand=True)
 
     def load_vacation_data(self):
         """
-        Lädt die Urlaubsdaten (zugewiesen, genutzt, verbleibend) für den Benutzer aus der Datenbank.
+        Lädt die Urlaubsdaten (zugewiesen, genutzt, verbleibend) im Hintergrund.
 
-        - Zuweisung der Urlaubstage: Wird aus `user_settings` abgerufen.
-        - Genutzte Urlaubstage: Summiert die Stunden aus `time_entries` mit der Aktivität 'Ferien'.
-        - Berechnet verbleibende oder überschrittene Urlaubstage.
+        - Zeigt bis zum Eintreffen der Daten einen Platzhalter an.
+        - Die Abfrage selbst erfolgt in `fetch_vacation_data`.
 
         Fehlerbehandlung:
         ------------------
         - Zeigt eine Fehlermeldung im Diagramm an, falls die Daten nicht geladen werden können.
         """
-        connection = create_connection()
-        if connection:
-            cursor = connection.cursor()
-            try:
-                # Abfrage: Default Stunden pro Tag
-                cursor.execute("""
-                    SELECT default_hours_per_day
-                    FROM user_settings
-                    WHERE user_id = %s
-                """, (self.user_id,))
-                self.default_hours_per_day = cursor.fetchone()[0]
-                # Abfrage: Zuweisung von Urlaubstagen
-                cursor.execute("""
-                    SELECT vacation_hours
-                    FROM user_settings
-                    WHERE user_id = %s
-                """, (self.user_id,))
-                self.assigned_vacation = cursor.fetchone()[0]
-
-                # Abfrage: Genutzte Urlaubstage
-                cursor.execute("""
-                    SELECT COALESCE(SUM(hours), 0)
-                    FROM time_entries
-                    WHERE user_id = %s AND activity = 'Ferien'
-                """, (self.user_id,))
-                self.used_vacation = cursor.fetchone()[0] or 0
-
-                self.update_diagram()
-
-            except Exception as e:
-                print(f"Fehler beim Laden der Urlaubsdaten: {e}")
-                self.ax.clear()
-                self.ax.text(0.5, 0.5, "Fehler beim Laden", ha="center", va="center", fontsize=12)
-                self.canvas.draw()
-            finally:
-                cursor.close()
-                connection.close()
+        self.show_message("Lädt...")
+        submit(
+            self.fetch_vacation_data,
+            key=("vacation", id(self)),
+            on_success=self.apply_vacation_data,
+            on_error=self.on_load_error,
+        )
+
+    def fetch_vacation_data(self):
+        """
+        Liest die Urlaubsdaten des Benutzers aus der gemeinsamen Stundenbilanz (`db_balance`).
+
+        - Zuweisung der Urlaubstage: Ferienstunden aus den Benutzereinstellungen.
+        - Genutzte Urlaubstage: Summe der Ferienstunden aus `user_daily_totals`.
+
+        Returns:
+            tuple: (Sollstunden pro Tag, zugewiesene Ferienstunden, genutzte Ferienstunden).
+
+        Hinweis:
+        --------
+        - Läuft über `db_executor.submit` in einem Worker-Thread und greift nicht auf Tk zu.
+        """
+        balance = fetch_balance(self.user_id)
+        if balance is None:
+            raise ValueError(f"Keine Einstellungen für Benutzer {self.user_id} gefunden.")
+
+        return balance.default_hours_per_day, balance.vacation_hours, balance.vacation_used_hours
+
+    def apply_vacation_data(self, data):
+        """
+        Übernimmt die geladenen Urlaubsdaten und aktualisiert das Diagramm.
+
+        Args:
+            data (tuple): Ergebnis von `fetch_vacation_data`.
+        """
+        self.default_hours_per_day, self.assigned_vacation, self.used_vacation = data
+        self.update_diagram()
+
+    def on_load_error(self, error):
+        """
+        Gibt den Fehler aus und zeigt ihn im Diagramm an.
+        """
+        print(f"Fehler beim Laden der Urlaubsdaten: {error}")
+        self.show_message("Fehler beim Laden")
+
+    def show_message(self, text):
+        """
+        Zeigt einen Text anstelle des Diagramms an.
+
+        Args:
+            text (str): Der anzuzeigende Text.
+        """
+        self.donut.show_message(text)
 
     def update_diagram(self):
         """
         Aktualisiert das Diagramm basierend auf den geladenen Urlaubsdaten.
 
-        - Zeichnet ein Kreisdiagramm mit genutzten, verbleibenden und überschrittenen Urlaubstagen.
+        - Zeigt genutzte, verbleibende und überschrittene Urlaubstage als Segmente des Rings an.
         - Zeigt die Differenz (gesamt genutzte Urlaubstage - zugewiesene Urlaubstage) im Diagrammzentrum an.
+        - Aktualisiert nur Winkel, Farben und Text des bestehenden Rings (`DonutCanvas`).
         """
         assigned_vacation_days = self.assigned_vacation / self.default_hours_per_day
         used_vacation_days = self.used_vacation / self.default_hours_per_day
-        
+
         overused = max(0, used_vacation_days - assigned_vacation_days)
         remaining = max(0, assigned_vacation_days - used_vacation_days)
         total_vacation = used_vacation_days - assigned_vacation_days
@@ -139,28 +156,17 @@ class VacationDiagram(ctk.CTkFrame):
         sizes = [used_vacation_days, overused, remaining]
         colors = [self.colors["secondary"], self.colors["error"], self.colors["primary"]]
 
-        # Diagramm zeichnen
-        self.ax.clear()
-        self.ax.pie(
-            sizes,
-            colors=colors,
-            startangle=90,
-            counterclock=False,
-            wedgeprops={'width': 0.4},
-            radius=1.5,
-        )
-        
         rounded_vacation = round(total_vacation, 1)
-        self.ax.text(
-            0,
-            0,
-            f"{rounded_vacation}\nUrlaubstage",
-            ha="center",
-            va="center",
-            fontsize=18,
-            fontweight="bold",
-            color=self.colors["text_light"],
-        )
-        
-        # Aktualisiere das Canvas
-        self.canvas.draw()
+        self.donut.update_ring(sizes, colors, f"{rounded_vacation}\nUrlaubstage")
+
+    def rebind(self, user_id):
+        """
+        Zeigt das Diagramm für einen anderen Benutzer an, ohne das Ringdiagramm neu zu erstellen.
+
+        Args:
+            user_id (int): Die neue Benutzer-ID.
+
+        - Lädt die Urlaubsdaten des neuen Benutzers im Hintergrund; eine noch laufende Abfrage wird verworfen.
+        """
+        self.user_id = user_id
+        self.load_vacation_data()
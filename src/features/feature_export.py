@@ -2,13 +2,30 @@
 Modul: Datenexport für TimeArch.
 
 Dieses Modul exportiert Daten aus der Datenbank in eine Excel-Datei. Es unterstützt die Exporte
-von Benutzerdaten und Projektdaten und integriert zusätzliche Informationen wie Benutzereinstellungen
-oder Projektphasen.
+von Benutzerdaten und Projektdaten und integriert zusätzliche Informationen wie Benutzereinstellungen,
+Projektphasen und die Stundenbilanz aus der SQL-Funktion `user_balance` (siehe `db_balance`).
+
+Die Zeiteinträge werden über einen serverseitigen Cursor in Blöcken gelesen und direkt in eine
+Write-only-Arbeitsmappe geschrieben. Der Speicherbedarf bleibt dadurch unabhängig von der Anzahl
+exportierter Zeilen konstant.
+
+Konstanten:
+-----------
+- EXPORT_BATCH_SIZE: Anzahl Zeilen, die pro Block vom Server gelesen werden.
+- WIDTH_SAMPLE_ROWS: Anzahl Zeilen, aus denen die Spaltenbreiten berechnet werden.
 
 Funktionen:
 -----------
 - export_to_excel(export_type, identifier): Exportiert Daten basierend auf dem Exporttyp und der ID (Benutzer oder Projekt).
-- format_sheet(worksheet, df, start_row=2, apply_filter=False): Wendet Formatierungen auf ein Excel-Arbeitsblatt an.
+- ask_export_path(): Fragt nach dem Speicherort der Excel-Datei.
+- write_export(file_path, export_type, identifier, progress=None, cancel_event=None, on_connection=None): Schreibt den Export in eine Datei
+  und gibt die Anzahl Datensätze zurück.
+- estimate_row_count(cursor, query, params): Gibt die vom Planer geschätzte Anzahl Zeilen einer Abfrage zurück.
+- format_sheet(worksheet, columns, rows): Setzt die Spaltenbreiten eines Arbeitsblatts anhand einer Stichprobe.
+
+Klassen:
+--------
+- ExportCancelled: Ausnahme, wenn ein laufender Export abgebrochen wurde.
 
 Verwendung:
 -----------
@@ -16,14 +33,339 @@ Verwendung:
 
     export_to_excel("user", user_id)  # Exportiert Benutzerdaten
     export_to_excel("project", project_number)  # Exportiert Projektdaten
+
+Hinweis:
+--------
+- `export_to_excel` blockiert den aufrufenden Thread. Die Admin-GUI exportiert über
+  `gui.admin.gui_export_window.ExportWindow` im Hintergrund.
+- openpyxl wird erst beim ersten Export importiert, nicht beim Import des Moduls (schnellerer Programmstart).
 """
 
-import pandas as pd
+import datetime
 from tkinter.filedialog import asksaveasfilename
 from tkinter import messagebox
-from db.db_connection import create_connection
-from openpyxl.utils import get_column_letter
-from openpyxl.styles import Font, PatternFill, Alignment
+from psycopg2.extensions import QueryCanceledError
+from db.db_connection import pooled_connection
+
+EXPORT_BATCH_SIZE = 2000     # Zeilen pro Block beim Lesen über den serverseitigen Cursor
+WIDTH_SAMPLE_ROWS = 500      # Zeilen, aus denen die Spaltenbreiten berechnet werden
+
+EXPORT_QUERIES = {
+    "user": {
+        "data": """
+            SELECT
+                p.project_number AS projektnummer,
+                p.project_name AS projektname,
+                s.phase_name AS phase,
+                te.hours AS stunden,
+                te.entry_date AS datum,
+                te.activity AS aktivität,
+                te.note AS notiz
+            FROM time_entries te
+            JOIN projects p ON te.project_number = p.project_number
+            LEFT JOIN sia_phases s ON te.phase_id = s.phase_id
+            WHERE te.user_id = %s
+            ORDER BY te.entry_date;
+        """,
+        "title": "SELECT 'Benutzer: ' || username FROM users WHERE user_id = %s;",
+        "sheets": [
+            ("Benutzereinstellungen", """
+                SELECT
+                    username AS benutzername,
+                    role AS rolle,
+                    default_hours_per_day AS sollstunden_pro_Tag,
+                    employment_percentage AS stellenprozent,
+                    vacation_hours AS ferien,
+                    start_date AS startdatum
+                FROM user_settings
+                JOIN users ON users.user_id = user_settings.user_id
+                WHERE users.user_id = %s;
+            """),
+            ("Stundenbilanz", """
+                SELECT
+                    start_date AS startdatum,
+                    work_days AS arbeitstage,
+                    expected_hours AS sollstunden,
+                    actual_hours AS iststunden,
+                    balance AS stundenbilanz,
+                    effective_percentage AS effektive_stellenprozent,
+                    vacation_hours AS ferien,
+                    vacation_used_hours AS ferien_bezogen,
+                    vacation_remaining_hours AS ferien_verbleibend
+                FROM user_balance(ARRAY[%s]::integer[]);
+            """),
+        ],
+    },
+    "project": {
+        "data": """
+            SELECT
+                u.username AS benutzername,
+                s.phase_name AS phase,
+                te.hours AS stunden,
+                te.entry_date AS datum,
+                te.activity AS aktivität,
+                te.note AS notiz
+            FROM time_entries te
+            JOIN users u ON te.user_id = u.user_id
+            LEFT JOIN sia_phases s ON te.phase_id = s.phase_id
+            WHERE te.project_number = %s
+            ORDER BY te.entry_date;
+        """,
+        "title": "SELECT 'Projekt: ' || project_number || ' - ' || project_name FROM projects WHERE project_number = %s;",
+        "sheets": [
+            ("Projektphasen", """
+                SELECT
+                    phase_name AS phase,
+                    soll_stunden AS sollstunden
+                FROM project_sia_phases
+                WHERE project_number = %s;
+            """),
+            ("Projektbenutzer", """
+                WITH members AS (
+                    SELECT user_id FROM user_projects WHERE project_number = %s
+                )
+                SELECT
+                    u.username AS benutzername,
+                    u.role AS rolle,
+                    b.balance AS stundenbilanz,
+                    b.effective_percentage AS effektive_stellenprozent
+                FROM members m
+                JOIN users u ON m.user_id = u.user_id
+                LEFT JOIN user_balance((SELECT array_agg(user_id) FROM members)) b ON b.user_id = m.user_id;
+            """),
+        ],
+    },
+}
+
+class ExportCancelled(Exception):
+    """
+    Wird ausgelöst, wenn ein laufender Export über `cancel_event` abgebrochen wurde.
+    """
+
+def format_sheet(worksheet, columns, rows):
+    """
+    Setzt die Spaltenbreiten eines Arbeitsblatts anhand einer Stichprobe.
+
+    Args:
+        worksheet (openpyxl.worksheet._write_only.WriteOnlyWorksheet): Das Arbeitsblatt.
+        columns (list): Die Spaltennamen.
+        rows (list): Stichprobe der Zeilen (höchstens `WIDTH_SAMPLE_ROWS`).
+
+    Hinweis:
+    --------
+    - In einer Write-only-Arbeitsmappe müssen die Spaltenbreiten vor der ersten Zeile gesetzt werden.
+    """
+    from openpyxl.utils import get_column_letter
+
+    for col_num, column_title in enumerate(columns, 1):
+        values = (len(str(row[col_num - 1])) for row in rows[:WIDTH_SAMPLE_ROWS] if row[col_num - 1] is not None)
+        column_width = max(max(values, default=0), len(column_title)) + 2
+        worksheet.column_dimensions[get_column_letter(col_num)].width = column_width
+
+def _header_cells(worksheet, columns):
+    """
+    Erstellt die formatierten Kopfzeilen-Zellen eines Arbeitsblatts.
+    """
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.styles import Font, PatternFill, Alignment
+
+    header_font = Font(bold=True, color="FFFFFF")
+    header_fill = PatternFill(start_color="0F8100", end_color="0F8100", fill_type="solid")
+    cells = []
+    for column_title in columns:
+        cell = WriteOnlyCell(worksheet, value=column_title)
+        cell.font = header_font
+        cell.fill = header_fill
+        cell.alignment = Alignment(horizontal="center", vertical="center")
+        cells.append(cell)
+    return cells
+
+def _write_small_sheet(workbook, sheet_name, columns, rows):
+    """
+    Schreibt ein kleines Zusatzblatt (Einstellungen, Phasen, Benutzer, Metadaten).
+    """
+    worksheet = workbook.create_sheet(sheet_name)
+    format_sheet(worksheet, columns, rows)
+    worksheet.append([])
+    worksheet.append(_header_cells(worksheet, columns))
+    for row in rows:
+        worksheet.append(list(row))
+
+def ask_export_path():
+    """
+    Fragt nach dem Speicherort der Excel-Datei.
+
+    Returns:
+        str: Der gewählte Pfad oder ein leerer String, wenn abgebrochen wurde.
+    """
+    return asksaveasfilename(
+        defaultextension=".xlsx",
+        filetypes=[("Excel-Dateien", "*.xlsx")],
+        title="Speichern unter..."
+    )
+
+def estimate_row_count(cursor, query, params):
+    """
+    Gibt die vom Planer geschätzte Anzahl Zeilen einer Abfrage zurück.
+
+    Args:
+        cursor (psycopg2.extensions.cursor): Der Datenbank-Cursor.
+        query (str): Die Abfrage.
+        params (tuple): Die Parameter der Abfrage.
+
+    Returns:
+        int: Die Schätzung oder None, falls keine verfügbar ist.
+
+    Hinweis:
+    --------
+    - `EXPLAIN` plant die Abfrage nur, ohne sie auszuführen; die Schätzung beruht auf den Tabellenstatistiken
+      und kann von der tatsächlichen Anzahl abweichen.
+    """
+    cursor.execute(f"EXPLAIN (FORMAT JSON) {query.strip().rstrip(';')}", params)
+    plan = cursor.fetchone()[0]
+    rows = int(plan[0]["Plan"].get("Plan Rows", 0))
+    return rows or None
+
+def write_export(file_path, export_type, identifier, progress=None, cancel_event=None, on_connection=None):
+    """
+    Schreibt den Export eines Benutzers oder Projekts in eine Excel-Datei.
+
+    Args:
+        file_path (str): Pfad der Zieldatei.
+        export_type (str): Typ des Exports ('user' oder 'project').
+        identifier (str): Benutzer-ID oder Projektnummer.
+        progress (callable, optional): Wird nach jedem Block mit (gelesen, geschrieben, geschätzte Gesamtzahl oder None)
+                                       aufgerufen.
+        cancel_event (threading.Event, optional): Bricht den Export beim nächsten Block ab, sobald es gesetzt ist.
+        on_connection (callable, optional): Wird mit der verwendeten Verbindung aufgerufen, bevor die Abfragen starten,
+                                            und mit None, bevor sie in den Pool zurückgeht. Damit kann ein anderer
+                                            Thread eine laufende Abfrage mit `conn.cancel()` abbrechen.
+
+    Returns:
+        int: Die Anzahl exportierter Zeiteinträge.
+
+    Details:
+    --------
+    - Zusatzblätter und Titel werden vorab gelesen, die Zeiteinträge anschliessend über einen
+      serverseitigen Cursor (`itersize`) blockweise gelesen und sofort geschrieben.
+    - Die Spaltenbreiten werden aus den ersten `WIDTH_SAMPLE_ROWS` Zeilen berechnet.
+    - Die Gesamtzahl für `progress` ist eine Schätzung des Planers (`estimate_row_count`); die Zeiteinträge
+      werden dafür nicht gezählt.
+    - Die Datei wird erst am Ende gespeichert; bei einem Fehler oder Abbruch entsteht keine unvollständige Datei.
+    - Die Funktion verwendet keine Tk-Objekte und kann in einem Hintergrund-Thread laufen; `progress`
+      wird dabei im Hintergrund-Thread aufgerufen.
+
+    Fehlerbehandlung:
+    ------------------
+    - Wirft einen `ValueError` bei einem ungültigen Exporttyp; Datenbank- und Dateifehler werden weitergegeben.
+    - Wirft `ExportCancelled`, wenn `cancel_event` gesetzt wurde; auch, wenn eine laufende Abfrage dabei über
+      `conn.cancel()` abgebrochen wurde.
+    """
+    queries = EXPORT_QUERIES.get(export_type)
+    if queries is None:
+        raise ValueError("Ungültiger Export-Typ.")
+
+    # Verzögerter Import: openpyxl erst laden, wenn ein Export startet
+    from openpyxl import Workbook
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.utils import get_column_letter
+    from openpyxl.styles import Font
+
+    workbook = Workbook(write_only=True)
+
+    try:
+        with pooled_connection(commit=False) as conn:
+            if on_connection:
+                on_connection(conn)
+            try:
+                # Titel und Zusatzinformationen (wenige Zeilen)
+                with conn.cursor() as cursor:
+                    cursor.execute(queries["title"], (identifier,))
+                    result = cursor.fetchone()
+                    title = result[0] if result else str(identifier)
+
+                    extra_sheets = []
+                    for sheet_name, query in queries["sheets"]:
+                        cursor.execute(query, (identifier,))
+                        rows = cursor.fetchall()
+                        extra_sheets.append((sheet_name, [desc[0] for desc in cursor.description], rows))
+
+                    # Geschätzte Gesamtzahl für die Fortschrittsanzeige (ohne die Abfrage auszuführen)
+                    total = None
+                    if progress:
+                        total = estimate_row_count(cursor, queries["data"], (identifier,))
+
+                # Hauptdaten über serverseitigen Cursor streamen
+                with conn.cursor(name="export_time_entries") as cursor:
+                    cursor.itersize = EXPORT_BATCH_SIZE
+                    cursor.execute(queries["data"], (identifier,))
+                    sample = cursor.fetchmany(WIDTH_SAMPLE_ROWS)
+                    columns = [desc[0].lower() for desc in cursor.description]
+
+                    worksheet = workbook.create_sheet("Daten")
+                    format_sheet(worksheet, columns, sample)
+
+                    # Titel einfügen
+                    title_cell = WriteOnlyCell(worksheet, value=title)
+                    title_cell.font = Font(bold=True, size=14)
+                    worksheet.append([title_cell])
+                    worksheet.append(_header_cells(worksheet, columns))
+
+                    row_count = 0
+                    fetched = len(sample)
+                    rows = sample
+                    while rows:
+                        if cancel_event is not None and cancel_event.is_set():
+                            raise ExportCancelled()
+                        for row in rows:
+                            worksheet.append(list(row))
+                        row_count += len(rows)
+                        if progress:
+                            progress(fetched, row_count, total)
+                        rows = cursor.fetchmany(EXPORT_BATCH_SIZE)
+                        fetched += len(rows)
+            finally:
+                if on_connection:
+                    on_connection(None)
+    except QueryCanceledError:
+        # Abfrage wurde über `conn.cancel()` abgebrochen (Abbrechen-Button)
+        if cancel_event is not None and cancel_event.is_set():
+            raise ExportCancelled() from None
+        raise
+
+    # Summenzeile mit Excel-Formel hinzufügen
+    last_row_index = row_count + 2
+    if "stunden" in columns:
+        hours_column_index = columns.index("stunden") + 1
+        hours_letter = get_column_letter(hours_column_index)
+        total_row = [None] * len(columns)
+        total_row[0] = WriteOnlyCell(worksheet, value="Gesamt")
+        total_row[0].font = Font(bold=True)
+        total_row[hours_column_index - 1] = WriteOnlyCell(worksheet, value=f"=SUM({hours_letter}3:{hours_letter}{last_row_index})")
+        total_row[hours_column_index - 1].font = Font(bold=True)
+        worksheet.append([])
+        worksheet.append(total_row)
+
+    # Filter nur auf Hauptblatt anwenden
+    worksheet.auto_filter.ref = f"A2:{get_column_letter(len(columns))}{last_row_index}"
+
+    # Zusätzliche Informationen hinzufügen
+    for sheet_name, sheet_columns, rows in extra_sheets:
+        _write_small_sheet(workbook, sheet_name, sheet_columns, rows)
+
+    # Metadaten-Blatt
+    metadata = [
+        ("Export-Typ", export_type),
+        ("Identifikator", identifier),
+        ("Anzahl Datensätze", row_count),
+        ("Exportdatum", datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")),
+    ]
+    _write_small_sheet(workbook, "Metadaten", ["Attribut", "Wert"], metadata)
+
+    if cancel_event is not None and cancel_event.is_set():
+        raise ExportCancelled()
+    workbook.save(file_path)
+    return row_count
 
 def export_to_excel(export_type, identifier):
     """
@@ -33,12 +375,9 @@ def export_to_excel(export_type, identifier):
         export_type (str): Typ des Exports ('user' oder 'project').
         identifier (str): Benutzer-ID oder Projektnummer.
 
-    Datenbankabfragen:
-    -------------------
-    - Ruft Hauptdaten und zusätzliche Informationen ab, abhängig vom Exporttyp.
-
     Excel-Export:
     --------------
+    - Fragt zuerst nach dem Speicherort und schreibt anschliessend mit `write_export`.
     - Schreibt Daten in eine Excel-Datei mit formatierter Kopfzeile, Summenzeile und Metadatenblatt.
     - Erstellt separate Blätter für Benutzereinstellungen oder Projektphasen.
 
@@ -46,206 +385,15 @@ def export_to_excel(export_type, identifier):
     ------------------
     - Zeigt eine Fehlermeldung an, falls die Datenbankabfrage oder der Datei-Export fehlschlägt.
     """
-    connection = create_connection()
-    if connection:
-        cursor = connection.cursor()
-        try:
-            # SQL-Abfrage basierend auf Export-Typ
-            if export_type == "user":
-                query = """
-                    SELECT 
-                        p.project_number AS projektnummer, 
-                        p.project_name AS projektname,
-                        s.phase_name AS phase,
-                        te.hours AS stunden,
-                        te.entry_date AS datum,
-                        te.activity AS aktivität,
-                        te.note AS notiz
-                    FROM time_entries te
-                    JOIN projects p ON te.project_number = p.project_number
-                    LEFT JOIN sia_phases s ON te.phase_id = s.phase_id
-                    WHERE te.user_id = %s
-                    ORDER BY te.entry_date;
-                """
-
-                user_settings_query = """
-                    SELECT 
-                        username AS benutzername, 
-                        role AS rolle, 
-                        default_hours_per_day AS sollstunden_pro_Tag,
-                        employment_percentage AS stellenprozent,
-                        vacation_hours AS ferien,
-                        start_date AS startdatum
-                    FROM user_settings
-                    JOIN users ON users.user_id = user_settings.user_id
-                    WHERE users.user_id = %s;
-                """
-
-            elif export_type == "project":
-                query = """
-                    SELECT 
-                        u.username AS benutzername,
-                        s.phase_name AS phase,
-                        te.hours AS stunden,
-                        te.entry_date AS datum,
-                        te.activity AS aktivität,
-                        te.note AS notiz
-                    FROM time_entries te
-                    JOIN users u ON te.user_id = u.user_id
-                    LEFT JOIN sia_phases s ON te.phase_id = s.phase_id
-                    WHERE te.project_number = %s
-                    ORDER BY te.entry_date;
-                """
-
-                project_phases_query = """
-                    SELECT 
-                        phase_name AS phase,
-                        soll_stunden AS sollstunden
-                    FROM project_sia_phases
-                    WHERE project_number = %s;
-                """
-
-                project_users_query = """
-                    SELECT 
-                        u.username AS benutzername,
-                        u.role AS rolle
-                    FROM user_projects up
-                    JOIN users u ON up.user_id = u.user_id
-                    WHERE up.project_number = %s;
-                """
-
-            else:
-                raise ValueError("Ungültiger Export-Typ.")
-
-            # Hauptdaten abfragen
-            cursor.execute(query, (identifier,))
-            data = cursor.fetchall()
-            columns = [desc[0].lower() for desc in cursor.description]
-            df = pd.DataFrame(data, columns=columns)
-            
-            if "stunden" in df.columns:
-                df["stunden"] = pd.to_numeric(df["stunden"], errors="coerce")
-
-            # Zusätzliche Informationen abfragen
-            if export_type == "user":
-                cursor.execute(user_settings_query, (identifier,))
-                user_settings = cursor.fetchone()
-                user_settings_columns = [desc[0] for desc in cursor.description]
-                user_settings_df = pd.DataFrame([user_settings], columns=user_settings_columns)
-                title = f"Benutzer: {user_settings_df.loc[0, 'benutzername']}"
-
-            elif export_type == "project":
-                cursor.execute(project_phases_query, (identifier,))
-                project_phases = cursor.fetchall()
-                project_phases_columns = [desc[0] for desc in cursor.description]
-                project_phases_df = pd.DataFrame(project_phases, columns=project_phases_columns)
-
-                cursor.execute(project_users_query, (identifier,))
-                project_users = cursor.fetchall()
-                project_users_columns = [desc[0] for desc in cursor.description]
-                project_users_df = pd.DataFrame(project_users, columns=project_users_columns)
-
-                project_name_query = "SELECT project_name FROM projects WHERE project_number = %s;"
-                cursor.execute(project_name_query, (identifier,))
-                project_name = cursor.fetchone()[0]
-                title = f"Projekt: {identifier} - {project_name}"
-
-            # Datei speichern
-            file_path = asksaveasfilename(
-                defaultextension=".xlsx",
-                filetypes=[("Excel-Dateien", "*.xlsx")],
-                title="Speichern unter..."
-            )
-
-            if not file_path:
-                return  # Abbrechen
-
-            def format_sheet(worksheet, df, start_row=2, apply_filter=False):
-                """
-                Wendet Formatierungen auf ein Excel-Arbeitsblatt an.
-
-                Args:
-                    worksheet (openpyxl.worksheet.worksheet.Worksheet): Das zu formatierende Arbeitsblatt.
-                    df (pandas.DataFrame): Die Daten, die in das Arbeitsblatt geschrieben wurden.
-                    start_row (int, optional): Die Zeile, in der die Formatierung beginnt. Standard ist 2.
-                    apply_filter (bool, optional): Gibt an, ob ein AutoFilter auf die Kopfzeile angewendet werden soll.
-
-                Formatierungen:
-                ----------------
-                - Setzt Kopfzeilenfarben und -schriftart.
-                - Passt die Spaltenbreiten automatisch an.
-                - Fügt bei Bedarf Filter für die Kopfzeilen hinzu.
-                """
-                # Filter nur auf Hauptblatt anwenden
-                if apply_filter:
-                    worksheet.auto_filter.ref = f"A{start_row}:{get_column_letter(len(df.columns))}{worksheet.max_row}"
-
-                # Kopfzeilen anpassen
-                header_font = Font(bold=True, color="FFFFFF")
-                header_fill = PatternFill(start_color="0F8100", end_color="0F8100", fill_type="solid")
-                for col_num, column_title in enumerate(df.columns, 1):
-                    cell = worksheet[f"{get_column_letter(col_num)}{start_row}"]
-                    cell.font = header_font
-                    cell.fill = header_fill
-                    cell.alignment = Alignment(horizontal="center", vertical="center")
-                for col_num, column_title in enumerate(df.columns, 1):
-                    column_width = max(df[column_title].astype(str).map(len).max(), len(column_title)) + 2
-                    worksheet.column_dimensions[get_column_letter(col_num)].width = column_width
-
-            # Excel schreiben
-            with pd.ExcelWriter(file_path, engine="openpyxl") as writer:
-                # Hauptdaten
-                df.to_excel(writer, index=False, sheet_name="Daten", startrow=1)
-                worksheet = writer.sheets["Daten"]
-
-                # Titel einfügen
-                worksheet.merge_cells(start_row=1, start_column=1, end_row=1, end_column=len(columns))
-                title_cell = worksheet.cell(row=1, column=1)
-                title_cell.value = title
-                title_cell.font = Font(bold=True, size=14)
-                title_cell.alignment = Alignment(horizontal="center")
-                
-                # Summenzeile mit Excel-Formel hinzufügen
-                if "stunden" in df.columns:
-                    total_row_index = len(df) + 4
-                    total_cell_label = worksheet.cell(row=total_row_index, column=1)
-                    total_cell_label.value = "Gesamt"
-                    total_cell_label.font = Font(bold=True)
-
-                    hours_column_index = df.columns.get_loc("stunden") + 1
-                    total_cell_formula = worksheet.cell(row=total_row_index, column=hours_column_index)
-                    total_cell_formula.value = f"=SUM({get_column_letter(hours_column_index)}3:{get_column_letter(hours_column_index)}{total_row_index - 1})"
-                    total_cell_formula.font = Font(bold=True)
-                    
-                format_sheet(worksheet, df, start_row=2, apply_filter=True)
-
-                # Zusätzliche Informationen hinzufügen
-                if export_type == "user":
-                    user_settings_df.to_excel(writer, index=False, sheet_name="Benutzereinstellungen", startrow=1)
-                    format_sheet(writer.sheets["Benutzereinstellungen"], user_settings_df, start_row=2, apply_filter=False)
-                elif export_type == "project":
-                    project_phases_df.to_excel(writer, index=False, sheet_name="Projektphasen", startrow=1)
-                    format_sheet(writer.sheets["Projektphasen"], project_phases_df, start_row=2, apply_filter=False)
-
-                    project_users_df.to_excel(writer, index=False, sheet_name="Projektbenutzer", startrow=1)
-                    format_sheet(writer.sheets["Projektbenutzer"], project_users_df, start_row=2, apply_filter=False)
-
-                # Metadaten-Blatt
-                metadata = {
-                    "Export-Typ": export_type,
-                    "Identifikator": identifier,
-                    "Anzahl Datensätze": len(df),
-                    "Exportdatum": pd.Timestamp.now().strftime("%Y-%m-%d %H:%M:%S")
-                }
-                metadata_df = pd.DataFrame(metadata.items(), columns=["Attribut", "Wert"])
-                metadata_df.to_excel(writer, index=False, sheet_name="Metadaten", startrow=1)
-                format_sheet(writer.sheets["Metadaten"], metadata_df, start_row=2, apply_filter=False)
-
-            messagebox.showinfo("Erfolg", f"Daten erfolgreich exportiert: {file_path}")
-
-        except Exception as e:
-            messagebox.showerror("Fehler", f"Fehler beim Exportieren: {e}")
-
-        finally:
-            cursor.close()
-            connection.close()
+    # Datei speichern
+    file_path = ask_export_path()
+
+    if not file_path:
+        return  # Abbrechen
+
+    try:
+        write_export(file_path, export_type, identifier)
+        messagebox.showinfo("Erfolg", f"Daten erfolgreich exportiert: {file_path}")
+
+    except Exception as e:
+        messagebox.showerror("Fehler", f"Fehler beim Exportieren: {e}")
@@ -0,0 +1,388 @@
+"""
+Modul: Gruppierte Stundenübersicht (ROLLUP) für TimeArch.
+
+Dieses Modul zeigt die Stunden eines Projekts oder Benutzers als Baum Projekt → Phase → Benutzer → Monat mit
+Zwischensummen an. Alle Zwischensummen und die Filtersumme stammen aus einer einzigen Abfrage mit
+`GROUP BY ROLLUP`; die ungefilterte Gesamtsumme (Projekt bzw. Benutzer) aus einer separaten, indexgestützten
+Summe. Die einzelnen Zeiteinträge eines Monats werden erst geladen, wenn der Monat aufgeklappt wird; auch die
+Knoten der tieferen Ebenen werden erst beim Aufklappen eingefügt.
+
+Konstanten:
+-----------
+- OVERVIEW_FROM: Gemeinsamer FROM-Teil der Stundenübersichten (Zeiteinträge `te`, Projekte `p`, Benutzer `u`,
+  Phasen `s`).
+- MONTH_EXPRESSION: SQL-Ausdruck für den Monatsanfang eines Zeiteintrags.
+- MONTHLY_SOURCE: Monatssummen aus `project_phase_user_hours` plus Zeiteinträge ohne Phase, mit denselben
+  Spaltennamen wie `time_entries` (`entry_date` ist der Monatsanfang).
+- GROUP_LEVELS: Bezeichnungen der Ebenen.
+
+Klassen:
+--------
+- RollupTreeview: Füllt eine Treeview mit den Knoten einer ROLLUP-Abfrage und lädt Zeiteinträge beim Aufklappen.
+
+Funktionen:
+-----------
+- fetch_hour_rollup(scope_sql, scope_params, filter_sql, filter_params, month_aligned=False): Liest alle Zwischensummen mit einer Abfrage.
+- fetch_project_total(project_number): Liest die ungefilterte Gesamtsumme eines Projekts.
+- fetch_user_total(user_id): Liest die ungefilterte Gesamtsumme eines Benutzers.
+- fetch_rollup_leaves(select, scope_sql, scope_params, filter_sql, filter_params, key): Liest die Zeiteinträge eines Monatsknotens.
+
+Verwendung:
+-----------
+    from features.feature_hour_rollup import RollupTreeview, fetch_hour_rollup, fetch_project_total, fetch_rollup_leaves
+
+    self.groups = RollupTreeview(self.group_treeview)
+
+    def fetch_groups():
+        filtered_hours, nodes = fetch_hour_rollup("te.project_number = %s", [project_number], filter_sql, filter_params)
+        return filtered_hours, fetch_project_total(project_number), nodes
+
+    self.groups.load(
+        fetch_groups,
+        lambda key: fetch_rollup_leaves(select, "te.project_number = %s", [project_number], filter_sql, filter_params, key),
+        ("Projekt:", "project_total"),
+    )
+
+Hinweis:
+--------
+- `filter_sql` besteht aus Bedingungen, die jeweils mit ` AND ` beginnen (wie bei `date_range_clause`).
+- Umfang und Filter stehen im `WHERE`, damit der Index auf `entry_date` und das Partition Pruning greifen.
+- Umfasst der Zeitraum nur ganze Monate (`is_month_aligned`), wird der ROLLUP über `MONTHLY_SOURCE` statt über
+  die einzelnen Zeiteinträge gerechnet; die Anzahl Einträge pro Knoten ist dann nicht bekannt (None).
+"""
+
+from datetime import date
+from db.db_connection import connection
+from db.db_executor import submit
+
+OVERVIEW_FROM = """
+    FROM time_entries te
+    JOIN projects p ON te.project_number = p.project_number
+    JOIN users u ON te.user_id = u.user_id
+    LEFT JOIN sia_phases s ON te.phase_id = s.phase_id
+"""
+
+MONTH_EXPRESSION = "date_trunc('month', te.entry_date)::date"
+
+GROUP_LEVELS = ("Projekt", "Phase", "Benutzer", "Monat")
+LEAF_LEVEL = len(GROUP_LEVELS)
+
+# Monatssummen aus dem Rollup; Zeiteinträge ohne Phase fehlen dort und werden direkt ergänzt.
+# Der Monatsanfang heisst `entry_date`, damit dieselben Datumsfilter gelten (bei ganzen Monaten gleichwertig).
+MONTHLY_SOURCE = """(
+        SELECT project_number, phase_id, user_id, month AS entry_date, hours
+        FROM project_phase_user_hours
+        UNION ALL
+        SELECT project_number, phase_id, user_id, entry_date, hours
+        FROM time_entries
+        WHERE phase_id IS NULL
+    )"""
+
+def fetch_hour_rollup(scope_sql, scope_params, filter_sql, filter_params, month_aligned=False):
+    """
+    Liest alle Zwischensummen Projekt → Phase → Benutzer → Monat mit einer Abfrage.
+
+    Args:
+        scope_sql (str): Bedingung für den Umfang (z.B. "te.project_number = %s").
+        scope_params (list): Die Parameter für `scope_sql`.
+        filter_sql (str): Zusätzliche Filterbedingungen, jeweils beginnend mit " AND ".
+        filter_params (list): Die Parameter für `filter_sql`.
+        month_aligned (bool): True, wenn der Zeitraum nur ganze Monate umfasst; dann werden die Monatssummen
+                              (`MONTHLY_SOURCE`) statt der Zeiteinträge gelesen.
+
+    Returns:
+        tuple: (Filtersumme, Knoten). Jeder Knoten ist ein Tupel (Schlüssel, Stunden, Anzahl Einträge oder None);
+               der Schlüssel enthält je Ebene einen Wert ((Projektnummer, Projektname), Phase, Benutzername, Monat).
+               Übergeordnete Knoten stehen vor ihren Unterknoten.
+    """
+    if month_aligned:
+        source, entry_count = MONTHLY_SOURCE, "NULL::bigint"
+    else:
+        source, entry_count = "time_entries", "COUNT(*)"
+
+    query = f"""
+        SELECT p.project_number,
+               p.project_name,
+               s.phase_name,
+               u.username,
+               {MONTH_EXPRESSION} AS month,
+               GROUPING(p.project_number, s.phase_name, u.username, {MONTH_EXPRESSION}) AS grouping_mask,
+               COALESCE(SUM(te.hours), 0) AS hours,
+               {entry_count} AS entries
+        FROM {source} te
+        JOIN projects p ON te.project_number = p.project_number
+        JOIN users u ON te.user_id = u.user_id
+        LEFT JOIN sia_phases s ON te.phase_id = s.phase_id
+        WHERE {scope_sql} {filter_sql}
+        GROUP BY ROLLUP ((p.project_number, p.project_name), s.phase_name, u.username, {MONTH_EXPRESSION})
+        ORDER BY grouping_mask DESC, p.project_number, s.phase_name NULLS LAST, u.username, month
+    """
+    with connection() as cursor:
+        cursor.execute(query, list(scope_params) + list(filter_params))
+        rows = cursor.fetchall()
+
+    filtered_total, nodes = 0, []
+    for project_number, project_name, phase_name, username, month, mask, hours, entries in rows:
+        # Anzahl gruppierter Ebenen: Maske 0b1111 = Gesamtsumme, 0b0111 = Projekt, ..., 0 = Monat
+        level = LEAF_LEVEL - bin(mask).count("1")
+        if level == 0:
+            filtered_total = hours
+        else:
+            key = ((project_number, project_name), phase_name, username, month)[:level]
+            nodes.append((key, hours, entries))
+    return filtered_total, nodes
+
+def fetch_project_total(project_number):
+    """
+    Liest die ungefilterte Gesamtsumme eines Projekts.
+
+    Args:
+        project_number (str): Die Projektnummer.
+
+    Returns:
+        Decimal: Die Summe aus den Monatssummen (`project_phase_user_hours`) und den Zeiteinträgen ohne Phase.
+    """
+    with connection() as cursor:
+        cursor.execute("""
+            SELECT (SELECT COALESCE(SUM(hours), 0) FROM project_phase_user_hours WHERE project_number = %s)
+                 + (SELECT COALESCE(SUM(hours), 0) FROM time_entries WHERE project_number = %s AND phase_id IS NULL)
+        """, (project_number, project_number))
+        return cursor.fetchone()[0]
+
+def fetch_user_total(user_id):
+    """
+    Liest die ungefilterte Gesamtsumme eines Benutzers.
+
+    Args:
+        user_id (int): Die Benutzer-ID.
+
+    Returns:
+        Decimal: Die Summe aller Stunden (Index-Only-Scan über `idx_time_entries_user_date`).
+    """
+    with connection() as cursor:
+        cursor.execute("SELECT COALESCE(SUM(hours), 0) FROM time_entries WHERE user_id = %s", (user_id,))
+        return cursor.fetchone()[0]
+
+def fetch_rollup_leaves(select, scope_sql, scope_params, filter_sql, filter_params, key):
+    """
+    Liest die Zeiteinträge eines Monatsknotens.
+
+    Args:
+        select (str): Der SELECT-Teil mit den anzuzeigenden Spalten (Aliase wie in `OVERVIEW_FROM`).
+        scope_sql (str): Bedingung für den Umfang.
+        scope_params (list): Die Parameter für `scope_sql`.
+        filter_sql (str): Zusätzliche Filterbedingungen, jeweils beginnend mit " AND ".
+        filter_params (list): Die Parameter für `filter_sql`.
+        key (tuple): Der Schlüssel des Monatsknotens aus `fetch_hour_rollup`.
+
+    Returns:
+        list: Die Zeiteinträge nach Datum sortiert.
+    """
+    (project_number, _), phase_name, username, month = key
+    next_month = date(month.year + month.month // 12, month.month % 12 + 1, 1)
+    query = f"""
+        {select}
+        {OVERVIEW_FROM}
+        WHERE {scope_sql} {filter_sql}
+          AND te.project_number = %s
+          AND s.phase_name IS NOT DISTINCT FROM %s
+          AND u.username = %s
+          AND te.entry_date >= %s AND te.entry_date < %s
+        ORDER BY te.entry_date, te.entry_id
+    """
+    params = list(scope_params) + list(filter_params) + [project_number, phase_name, username, month, next_month]
+    with connection() as cursor:
+        cursor.execute(query, params)
+        return cursor.fetchall()
+
+def node_label(key):
+    """
+    Gibt die Beschriftung eines Knotens zurück.
+    """
+    value = key[-1]
+    level = len(key)
+    if level == 1:
+        return f"{value[0]} - {value[1]}"
+    if level == 2:
+        return value or "Ohne Phase"
+    if level == LEAF_LEVEL:
+        return value.strftime("%m.%Y")
+    return value
+
+class RollupTreeview:
+    """
+    Füllt eine Treeview (`show="tree headings"`) mit den Knoten einer ROLLUP-Abfrage.
+
+    Funktionen:
+    - Nur die Projektknoten werden sofort eingefügt; Unterknoten erst beim Aufklappen
+    - Zeiteinträge eines Monats werden beim Aufklappen im Hintergrund geladen
+    - Nach dem Neuladen werden zuvor aufgeklappte Knoten wieder aufgeklappt
+    - Filtersumme und Gesamtsumme werden als Summenzeilen am Ende angezeigt
+    """
+    def __init__(self, treeview):
+        """
+        Verbindet die Treeview mit dem Modell.
+
+        Args:
+            treeview (ttk.Treeview): Die Treeview; die letzte Spalte enthält die Stunden.
+        """
+        self.tree = treeview
+        self.generation = 0
+        self.leaf_func = None
+        self.children = {}          # Schlüssel -> Unterknoten
+        self.unloaded = {}          # Element-ID -> Schlüssel der noch nicht eingefügten Unterknoten
+        self.opened = set()         # Schlüssel der aufgeklappten Knoten
+        self.items = {}             # Schlüssel -> Element-ID
+        self.keys = {}              # Element-ID -> Schlüssel
+        self.tree.bind("<<TreeviewOpen>>", self.on_open, add="+")
+        self.tree.bind("<<TreeviewClose>>", self.on_close, add="+")
+
+    def row_values(self, label, hours):
+        """
+        Gibt die Spaltenwerte einer Knoten- oder Summenzeile zurück (Text in der vorletzten, Stunden in der letzten Spalte).
+        """
+        return ("",) * (len(self.tree["columns"]) - 2) + (label, hours)
+
+    def load(self, rollup_func, leaf_func, scope_total):
+        """
+        Lädt die Knoten neu.
+
+        Args:
+            rollup_func (callable): Liefert (Filtersumme, Gesamtsumme, Knoten von `fetch_hour_rollup`). Läuft im Hintergrund.
+            leaf_func (callable): Liefert mit dem Schlüssel eines Monatsknotens dessen Zeiteinträge. Läuft im Hintergrund.
+            scope_total (tuple): Beschriftung und Tag der Gesamtsummenzeile (z.B. ("Projekt:", "project_total")).
+        """
+        self.generation += 1
+        generation = self.generation
+        self.leaf_func = leaf_func
+        submit(
+            rollup_func,
+            key=("rollup", id(self)),
+            on_success=lambda result: self.on_rollup(generation, result, scope_total),
+            on_error=lambda error: self.on_error(generation, "", error),
+        )
+
+    def on_rollup(self, generation, result, scope_total):
+        """
+        Übernimmt das Ergebnis der ROLLUP-Abfrage, sofern es zur letzten Anfrage gehört.
+        """
+        if generation != self.generation or not self.tree.winfo_exists():
+            return
+        self.build(result, scope_total)
+
+    def show(self, result, leaf_func, scope_total):
+        """
+        Zeigt ein bereits geladenes Ergebnis von `fetch_hour_rollup` an (z.B. aus `feature_project_view`).
+
+        Args:
+            result (tuple): (Filtersumme, Gesamtsumme, Knoten von `fetch_hour_rollup`).
+            leaf_func (callable): Liefert mit dem Schlüssel eines Monatsknotens dessen Zeiteinträge. Läuft im Hintergrund.
+            scope_total (tuple): Beschriftung und Tag der Gesamtsummenzeile.
+        """
+        self.generation += 1
+        self.leaf_func = leaf_func
+        self.build(result, scope_total)
+
+    def build(self, result, scope_total):
+        """
+        Fügt die Projektknoten und die Summenzeilen ein und klappt zuvor aufgeklappte Knoten wieder auf.
+        """
+        filtered_total, total, nodes = result
+
+        self.children = {}
+        for key, hours, entries in nodes:
+            self.children.setdefault(key[:-1], []).append((key, hours, entries))
+
+        self.tree.delete(*self.tree.get_children())
+        self.items = {}
+        self.keys = {}
+        self.unloaded = {}
+        self.insert_children("", ())
+
+        label, tag = scope_total
+        self.tree.insert("", "end", values=self.row_values("Filter:", filtered_total), tags=("filter_total",))
+        self.tree.insert("", "end", values=self.row_values(label, total), tags=(tag,))
+
+        # Zuvor aufgeklappte Knoten wieder aufklappen (übergeordnete zuerst)
+        for key in sorted(self.opened, key=len):
+            iid = self.items.get(key)
+            if iid is None:
+                self.opened.discard(key)
+            else:
+                self.tree.item(iid, open=True)
+                self.expand(iid)
+
+    def insert_children(self, parent, key):
+        """
+        Fügt die Unterknoten eines Knotens ein; Knoten mit Unterknoten erhalten einen Platzhalter.
+        """
+        for child_key, hours, entries in self.children.get(key, []):
+            iid = self.tree.insert(
+                parent, "end",
+                text=node_label(child_key),
+                values=self.row_values(f"{entries} Einträge" if entries is not None else "", hours),
+            )
+            self.items[child_key] = iid
+            self.keys[iid] = child_key
+            self.unloaded[iid] = child_key
+            self.tree.insert(iid, "end", text="Lädt...")
+
+    def on_open(self, event):
+        """
+        Fügt beim Aufklappen die Unterknoten ein bzw. lädt die Zeiteinträge eines Monats.
+        """
+        iid = self.tree.focus()
+        key = self.keys.get(iid)
+        if key is not None:
+            self.opened.add(key)
+            self.expand(iid)
+
+    def on_close(self, event):
+        """
+        Merkt sich, dass ein Knoten zugeklappt wurde.
+        """
+        self.opened.discard(self.keys.get(self.tree.focus()))
+
+    def expand(self, iid):
+        """
+        Ersetzt den Platzhalter eines Knotens durch seine Unterknoten oder lädt die Zeiteinträge.
+        """
+        key = self.unloaded.pop(iid, None)
+        if key is None:
+            return
+        if len(key) < LEAF_LEVEL:
+            self.tree.delete(*self.tree.get_children(iid))
+            self.insert_children(iid, key)
+            return
+
+        generation = self.generation
+        submit(
+            self.leaf_func,
+            key,
+            key=("rollup_leaves", id(self), iid),
+            on_success=lambda rows: self.on_leaves(generation, iid, rows),
+            on_error=lambda error: self.on_error(generation, iid, error),
+        )
+
+    def on_leaves(self, generation, iid, rows):
+        """
+        Ersetzt den Platzhalter eines Monatsknotens durch die geladenen Zeiteinträge.
+        """
+        if generation != self.generation or not self.tree.exists(iid):
+            return
+        self.tree.delete(*self.tree.get_children(iid))
+        for row in rows:
+            self.tree.insert(iid, "end", values=row)
+
+    def on_error(self, generation, iid, error):
+        """
+        Gibt einen Ladefehler aus und zeigt ihn in der Treeview an.
+        """
+        print(f"Fehler beim Laden der Stundengruppen: {error}")
+        if generation != self.generation or not self.tree.winfo_exists():
+            return
+        if iid:
+            if not self.tree.exists(iid):
+                return
+            self.tree.delete(*self.tree.get_children(iid))
+        self.tree.insert(iid, "end", text="Fehler beim Laden")
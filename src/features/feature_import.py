@@ -0,0 +1,379 @@
+"""
+Modul: Datenimport für TimeArch.
+
+Dieses Modul importiert Zeiteinträge aus einer CSV-Datei in die Tabelle `time_entries`. Die Datei wird
+zeilenweise gelesen und über `COPY ... FROM STDIN` in eine temporäre Staging-Tabelle geladen. Benutzernamen,
+Projektnummern und Phasennamen werden anschliessend mengenbasiert über Joins in Schlüssel aufgelöst und alle
+gültigen Zeilen mit einem einzigen INSERT übernommen.
+
+Funktionen:
+-----------
+- import_time_entries(file_path, default_username=None, default_project=None): Importiert eine CSV-Datei.
+- write_rejects(file_path, rejects): Schreibt die abgewiesenen Zeilen in eine CSV-Datei.
+- import_time_entries_dialog(default_project=None, on_imported=None, parent=None): Import mit Dateiauswahl, Fortschritts-
+  fenster und Meldungen (Admin-GUI); der Import läuft im Hintergrund.
+
+Spalten:
+--------
+- `benutzername`, `projektnummer`, `phase`, `stunden`, `datum`, `aktivität`, `notiz` (wie `export_to_excel`).
+- Weitere Spalten (z.B. `projektname`) werden ignoriert. Fehlt `benutzername` oder `projektnummer`
+  (Benutzer- bzw. Projektexport), wird `default_username` bzw. `default_project` verwendet.
+- Trennzeichen (Komma, Semikolon oder Tabulator) werden automatisch erkannt.
+
+Verwendung:
+-----------
+    python -m features.feature_import zeiten.csv
+    python -m features.feature_import projekt.csv --project 2401 --rejects abgewiesen.csv
+
+Hinweis:
+--------
+- Ungültige Zeilen (Datum, Stunden, unbekannter Benutzer, Projekt oder Phase) werden nicht importiert,
+  sondern mit Zeilennummer und Grund zurückgegeben.
+- Der Import prüft keine Duplikate; dieselbe Datei zweimal zu importieren, erfasst die Stunden doppelt.
+- `import_time_entries` blockiert den aufrufenden Thread. Die Admin-GUI importiert über
+  `import_time_entries_dialog` im Hintergrund (`db_executor`).
+"""
+
+import argparse
+import csv
+import io
+import os
+from tkinter import messagebox
+from tkinter.filedialog import askopenfilename, asksaveasfilename
+from db.db_connection import connection
+from db.db_executor import submit
+from db.db_partitions import ensure_partitions, is_partitioned
+from db.db_work_calendar import ensure_work_calendar
+from features.feature_date_range import parse_date
+from features.feature_save_time_entry import parse_hours
+
+IMPORT_COLUMNS = ["benutzername", "projektnummer", "phase", "stunden", "datum", "aktivität", "notiz"]
+COLUMN_ALIASES = {
+    "username": "benutzername",
+    "project_number": "projektnummer",
+    "phase_name": "phase",
+    "hours": "stunden",
+    "entry_date": "datum",
+    "activity": "aktivität",
+    "aktivitaet": "aktivität",
+    "tätigkeit": "aktivität",
+    "note": "notiz",
+}
+
+class _StagingStream:
+    """
+    Dateiähnliches Objekt, das die CSV-Zeilen für `copy_expert` normalisiert.
+
+    Liest die Quelldatei zeilenweise, ordnet die Spalten der Staging-Tabelle zu, prüft Datum und Stunden
+    und liefert gültige Zeilen als CSV-Text. Ungültige Zeilen werden in `rejects` gesammelt.
+    """
+    def __init__(self, reader, column_index, defaults, rejects):
+        self.reader = reader
+        self.column_index = column_index
+        self.defaults = defaults
+        self.rejects = rejects
+        self.years = set()
+        self.buffer = ""
+        self.output = io.StringIO()
+        self.writer = csv.writer(self.output, lineterminator="\n")
+
+    def _value(self, row, column):
+        index = self.column_index.get(column)
+        if index is None or index >= len(row):
+            return self.defaults.get(column) or ""
+        return row[index].strip() or self.defaults.get(column) or ""
+
+    def _next_line(self):
+        for row in self.reader:
+            if not any(cell.strip() for cell in row):
+                continue
+            line_no = self.reader.line_num
+            try:
+                entry_date = parse_date(self._value(row, "datum"))
+                hours = parse_hours(self._value(row, "stunden"))
+                if entry_date is None or hours is None:
+                    raise ValueError("Datum oder Stunden fehlen")
+            except ValueError as e:
+                self.rejects.append((line_no, str(e)))
+                continue
+            self.years.add(entry_date.year)
+            self.writer.writerow([
+                line_no,
+                self._value(row, "benutzername"),
+                self._value(row, "projektnummer"),
+                self._value(row, "phase"),
+                hours,
+                entry_date.isoformat(),
+                self._value(row, "aktivität"),
+                self._value(row, "notiz"),
+            ])
+            line = self.output.getvalue()
+            self.output.seek(0)
+            self.output.truncate()
+            return line
+        return ""
+
+    def read(self, size=-1):
+        while size < 0 or len(self.buffer) < size:
+            line = self._next_line()
+            if not line:
+                break
+            self.buffer += line
+        if size < 0:
+            size = len(self.buffer)
+        chunk, self.buffer = self.buffer[:size], self.buffer[size:]
+        return chunk
+
+def _open_reader(file):
+    """
+    Erkennt das Trennzeichen und gibt einen CSV-Reader samt Spaltenzuordnung zurück.
+
+    Fehlerbehandlung:
+    ------------------
+    - Wirft einen `ValueError`, wenn die Kopfzeile fehlt oder Pflichtspalten nicht vorhanden sind.
+    """
+    sample = file.read(4096)
+    file.seek(0)
+    try:
+        dialect = csv.Sniffer().sniff(sample, delimiters=",;\t")
+    except csv.Error:
+        dialect = csv.excel
+    reader = csv.reader(file, dialect)
+
+    header = next(reader, None)
+    if not header:
+        raise ValueError("Die Datei enthält keine Kopfzeile.")
+    column_index = {}
+    for index, name in enumerate(header):
+        name = name.strip().lower()
+        name = COLUMN_ALIASES.get(name, name)
+        if name in IMPORT_COLUMNS and name not in column_index:
+            column_index[name] = index
+
+    missing = [column for column in ("stunden", "datum", "aktivität") if column not in column_index]
+    if missing:
+        raise ValueError(f"Fehlende Spalten: {', '.join(missing)}")
+    return reader, column_index
+
+def import_time_entries(file_path, default_username=None, default_project=None):
+    """
+    Importiert Zeiteinträge aus einer CSV-Datei in die Tabelle `time_entries`.
+
+    Args:
+        file_path (str): Pfad zur CSV-Datei (UTF-8, mit Kopfzeile).
+        default_username (str, optional): Benutzername für Zeilen ohne Spalte bzw. Wert `benutzername`.
+        default_project (str, optional): Projektnummer für Zeilen ohne Spalte bzw. Wert `projektnummer`.
+
+    Returns:
+        tuple: (Anzahl importierter Einträge, Liste der abgewiesenen Zeilen als (Zeilennummer, Grund)).
+
+    Datenbankintegration:
+    ----------------------
+    - Lädt die Datei mit `COPY FROM STDIN` in die temporäre Tabelle `time_entry_import`.
+    - Löst Benutzer, Projekte und Phasen mit LEFT JOINs auf und ermittelt die abgewiesenen Zeilen in einer Abfrage.
+    - Legt fehlende Jahrespartitionen an und übernimmt alle gültigen Zeilen mit einem einzigen INSERT,
+      sodass die Trigger für Tagessummen und Projekt-Rollup nur einmal ausgeführt werden.
+
+    Fehlerbehandlung:
+    ------------------
+    - Wirft einen `ValueError` bei ungültiger Kopfzeile. Datenbankfehler werden weitergegeben;
+      die Transaktion wird zurückgerollt und es wird nichts importiert.
+    """
+    rejects = []
+    defaults = {"benutzername": default_username, "projektnummer": default_project}
+
+    with open(file_path, newline="", encoding="utf-8-sig") as file:
+        reader, column_index = _open_reader(file)
+        if "benutzername" not in column_index and not default_username:
+            raise ValueError("Die Datei enthält keine Spalte 'benutzername' und es wurde kein Benutzer angegeben.")
+        if "projektnummer" not in column_index and not default_project:
+            raise ValueError("Die Datei enthält keine Spalte 'projektnummer' und es wurde kein Projekt angegeben.")
+        stream = _StagingStream(reader, column_index, defaults, rejects)
+
+        with connection() as cursor:
+            cursor.execute('''
+                CREATE TEMP TABLE time_entry_import (
+                    line_no INTEGER,
+                    username TEXT,
+                    project_number TEXT,
+                    phase_name TEXT,
+                    hours DECIMAL(5, 2),
+                    entry_date DATE,
+                    activity TEXT,
+                    note TEXT
+                ) ON COMMIT DROP
+            ''')
+            cursor.copy_expert("COPY time_entry_import FROM STDIN WITH (FORMAT csv)", stream)
+            cursor.execute("ANALYZE time_entry_import")
+
+            resolved = '''
+                FROM time_entry_import s
+                LEFT JOIN users u ON u.username = s.username
+                LEFT JOIN projects p ON p.project_number = s.project_number
+                LEFT JOIN sia_phases sp ON sp.phase_name = s.phase_name
+            '''
+            cursor.execute(f'''
+                SELECT s.line_no,
+                       CASE
+                           WHEN u.user_id IS NULL THEN 'Unbekannter Benutzer: ' || COALESCE(s.username, '')
+                           WHEN p.project_number IS NULL THEN 'Unbekanntes Projekt: ' || COALESCE(s.project_number, '')
+                           WHEN s.phase_name IS NOT NULL AND sp.phase_id IS NULL THEN 'Unbekannte Phase: ' || s.phase_name
+                           WHEN s.phase_name IS NULL AND p.project_number <> '0000' THEN 'Phase fehlt'
+                           ELSE 'Tätigkeit fehlt'
+                       END
+                {resolved}
+                WHERE u.user_id IS NULL
+                   OR p.project_number IS NULL
+                   OR (s.phase_name IS NOT NULL AND sp.phase_id IS NULL)
+                   OR (s.phase_name IS NULL AND p.project_number <> '0000')
+                   OR s.activity IS NULL
+            ''')
+            rejects.extend(cursor.fetchall())
+
+            if is_partitioned(cursor):
+                ensure_partitions(cursor, extra_years=stream.years)
+            ensure_work_calendar(cursor, extra_years=stream.years)
+
+            cursor.execute(f'''
+                INSERT INTO time_entries (user_id, project_number, phase_id, hours, entry_date, activity, note)
+                SELECT u.user_id, p.project_number, sp.phase_id, s.hours, s.entry_date, s.activity, s.note
+                {resolved}
+                WHERE u.user_id IS NOT NULL
+                  AND p.project_number IS NOT NULL
+                  AND (s.phase_name IS NULL OR sp.phase_id IS NOT NULL)
+                  AND (s.phase_name IS NOT NULL OR p.project_number = '0000')
+                  AND s.activity IS NOT NULL
+                ORDER BY s.entry_date
+            ''')
+            imported = cursor.rowcount
+
+    rejects.sort()
+    print(f"Import abgeschlossen: {imported} Einträge importiert, {len(rejects)} abgewiesen")
+    return imported, rejects
+
+def write_rejects(file_path, rejects):
+    """
+    Schreibt die abgewiesenen Zeilen in eine CSV-Datei.
+
+    Args:
+        file_path (str): Pfad der Zieldatei.
+        rejects (list): Liste von (Zeilennummer, Grund).
+    """
+    with open(file_path, "w", newline="", encoding="utf-8-sig") as file:
+        writer = csv.writer(file, delimiter=";")
+        writer.writerow(["zeile", "grund"])
+        writer.writerows(rejects)
+
+def _busy_window(parent, file_path):
+    """
+    Zeigt ein Fenster mit laufendem Fortschrittsbalken an, solange ein Import im Hintergrund läuft.
+
+    Returns:
+        ctk.CTkToplevel: Das Fenster; wird nach dem Import zerstört.
+    """
+    import customtkinter as ctk
+    from gui.gui_appearance_color import appearance_color, get_default_styles
+
+    colors = appearance_color()
+    styles = get_default_styles()
+    window = ctk.CTkToplevel(parent)
+    window.title("Import")
+    window.geometry("400x150")
+    window.configure(fg_color=colors["background"])
+    # Der Import lässt sich nicht abbrechen; das Fenster schliesst sich, sobald er beendet ist
+    window.protocol("WM_DELETE_WINDOW", lambda: None)
+
+    ctk.CTkLabel(window, text="Import läuft...", **styles["subtitle"]).pack(padx=10, pady=10)
+    ctk.CTkLabel(window, text=os.path.basename(file_path), **styles["text"]).pack(padx=10, pady=5)
+    progress_bar = ctk.CTkProgressBar(window, mode="indeterminate", progress_color=colors["primary"])
+    progress_bar.pack(padx=20, pady=5, fill="x")
+    progress_bar.start()
+    return window
+
+def _show_import_result(imported, rejects, parent=None):
+    """
+    Meldet das Ergebnis eines Imports; bei abgewiesenen Zeilen kann ein Bericht gespeichert werden.
+    """
+    if not rejects:
+        messagebox.showinfo("Erfolg", f"{imported} Einträge erfolgreich importiert.", parent=parent)
+        return
+
+    preview = "\n".join(f"Zeile {line_no}: {reason}" for line_no, reason in rejects[:10])
+    save_report = messagebox.askyesno(
+        "Import abgeschlossen",
+        f"{imported} Einträge importiert, {len(rejects)} abgewiesen:\n\n{preview}\n\nBericht speichern?",
+        parent=parent,
+    )
+    if save_report:
+        report_path = asksaveasfilename(
+            defaultextension=".csv",
+            filetypes=[("CSV-Dateien", "*.csv")],
+            title="Bericht speichern unter...",
+            parent=parent,
+        )
+        if report_path:
+            write_rejects(report_path, rejects)
+
+def import_time_entries_dialog(default_project=None, on_imported=None, parent=None):
+    """
+    Importiert eine CSV-Datei mit Dateiauswahl im Hintergrund und zeigt das Ergebnis an.
+
+    Args:
+        default_project (str, optional): Projektnummer für Dateien ohne Spalte `projektnummer` (Projektexport).
+        on_imported (callable, optional): Wird nach einem erfolgreichen Import im Tk-Thread aufgerufen.
+        parent (tk.Misc, optional): Das übergeordnete Widget für Dialoge und das Fortschrittsfenster.
+
+    Details:
+    --------
+    - COPY, Auflösung und INSERT laufen über `db_executor.submit` in einem Worker-Thread; bis dahin zeigt ein
+      Fenster einen laufenden Fortschrittsbalken an. Die Admin-GUI bleibt bedienbar.
+    - Ergebnis und Bericht der abgewiesenen Zeilen werden im Tk-Thread gemeldet, sobald der Import beendet ist.
+
+    Fehlerbehandlung:
+    ------------------
+    - Zeigt eine Fehlermeldung an, falls die Datei oder der Import fehlschlägt.
+    - Bei abgewiesenen Zeilen kann ein Bericht als CSV gespeichert werden.
+    """
+    file_path = askopenfilename(
+        filetypes=[("CSV-Dateien", "*.csv"), ("Alle Dateien", "*.*")],
+        title="Zeiteinträge importieren...",
+        parent=parent,
+    )
+    if not file_path:
+        return  # Abbrechen
+
+    busy = _busy_window(parent, file_path)
+
+    def on_success(result):
+        busy.destroy()
+        imported, rejects = result
+        if on_imported:
+            on_imported()
+        _show_import_result(imported, rejects, parent)
+
+    def on_error(error):
+        busy.destroy()
+        messagebox.showerror("Fehler", f"Fehler beim Importieren: {error}", parent=parent)
+
+    submit(
+        import_time_entries,
+        file_path,
+        default_project=default_project,
+        on_success=on_success,
+        on_error=on_error,
+    )
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Zeiteinträge aus einer CSV-Datei importieren.")
+    parser.add_argument("file", help="Pfad zur CSV-Datei")
+    parser.add_argument("--user", help="Benutzername für Dateien ohne Spalte 'benutzername'")
+    parser.add_argument("--project", help="Projektnummer für Dateien ohne Spalte 'projektnummer'")
+    parser.add_argument("--rejects", help="Pfad für den Bericht der abgewiesenen Zeilen")
+    args = parser.parse_args()
+
+    imported, rejects = import_time_entries(args.file, args.user, args.project)
+    for line_no, reason in rejects[:20]:
+        print(f"Zeile {line_no}: {reason}")
+    if args.rejects and rejects:
+        write_rejects(args.rejects, rejects)
+        print(f"Bericht gespeichert: {args.rejects}")
@@ -16,7 +16,7 @@ Verwendung:
         print(f"Benutzer-ID: {user_id}, Benutzername: {username}")
 """
 
-from db.db_connection import create_connection
+from features import feature_reference_cache as reference_cache
 
 def load_project_users(project_number):
     """
@@ -31,7 +31,7 @@ def load_project_users(project_number):
     Datenbankabfrage:
     -----------------
     - Ruft Benutzerinformationen (user_id und username) aus der Tabelle `user_projects` ab,
-      die mit der Tabelle `users` verknüpft ist.
+      die mit der Tabelle `users` verknüpft ist. Das Ergebnis wird im Referenzdaten-Cache gehalten.
 
     Fehlerbehandlung:
     ------------------
@@ -43,19 +43,7 @@ def load_project_users(project_number):
         # Ergebnis: [(1, "user1"), (2, "user2")]
     """
     try:
-        connection = create_connection()
-        if connection:
-            cursor = connection.cursor()
-            cursor.execute("""
-                SELECT u.user_id, u.username 
-                FROM user_projects up
-                JOIN users u ON up.user_id = u.user_id
-                WHERE up.project_number = %s
-            """, (project_number,))
-            results = cursor.fetchall()
-            cursor.close()
-            connection.close()
-            return results
+        return reference_cache.project_users(project_number)
     except Exception as e:
         print(f"Fehler beim Laden der Benutzer für das Projekt: {e}")
         return []
\ No newline at end of file
@@ -16,7 +16,7 @@ Verwendung:
         print(f"Benutzer-ID: {user_id}, Benutzername: {username}")
 """
 
-from db.db_connection import create_connection
+from features import feature_reference_cache as reference_cache
 from tkinter import messagebox
 
 def load_users():
@@ -28,7 +28,7 @@ def load_users():
 
     Datenbankabfrage:
     -----------------
-    - Ruft die Spalten `user_id` und `username` aus der Tabelle `users` ab.
+    - Liest `user_id` und `username` über den Referenzdaten-Cache (`feature_reference_cache`).
 
     Fehlerbehandlung:
     ------------------
@@ -40,16 +40,9 @@ def load_users():
         # Ergebnis: [(1, "user1"), (2, "user2")]
     """
     users = []
-    connection = create_connection()
-    if connection:
-        cursor = connection.cursor()
-        try:
-            cursor.execute("SELECT user_id, username FROM users")
-            users = cursor.fetchall()
-        except Exception as e:
-            messagebox.showerror("Fehler", f"Fehler beim Laden der Benutzer: {e}")
-        finally:
-            cursor.close()
-            connection.close()
+    try:
+        users = reference_cache.users()
+    except Exception as e:
+        messagebox.showerror("Fehler", f"Fehler beim Laden der Benutzer: {e}")
     
     return users
@@ -0,0 +1,276 @@
+"""
+Modul: Monats-Cache der Zeiteinträge für TimeArch.
+
+Dieses Modul lädt die Zeiteinträge eines Benutzers monatsweise mit einer einzigen Abfrage und hält sie im
+Speicher. Der Kalender bedient Klicks auf einzelne Tage aus diesem Cache, statt pro Klick die Einträge und
+die Tagessumme neu abzufragen, und leitet daraus den Status jedes Tages für die Markierung im Kalender ab.
+
+Konstanten:
+-----------
+- MONTH_CACHE_SIZE: Maximale Anzahl Monate, die pro Benutzer im Speicher gehalten werden.
+- VACATION_ACTIVITY: Tätigkeit, deren Stunden als Ferien zählen (wie in `user_daily_totals`).
+- STATUS_MET, STATUS_UNDER, STATUS_EMPTY, STATUS_VACATION: Status eines Tages.
+
+Klassen:
+--------
+- MonthData: Daten eines Monats (Einträge und Summen pro Tag, Tagesziel).
+- MonthCache: Cache der geladenen Monate eines Benutzers mit Laden im Hintergrund.
+
+Funktionen:
+-----------
+- fetch_month(user_id, year, month): Liest alle Zeiteinträge eines Benutzers in einem Monat (läuft im Hintergrund).
+- day_status(day, hours, vacation_hours, daily_target, today=None, holiday=False): Bestimmt den Status eines Tages.
+- adjacent_months(year, month): Gibt den Vor- und den Folgemonat zurück.
+
+Verwendung:
+-----------
+    from features.feature_month_entries import MonthCache
+
+    cache = MonthCache(user_id)
+    cache.load(2025, 3, on_loaded=self.show_month)
+    entries = cache.day_entries(datetime.date(2025, 3, 14))
+
+Hinweis:
+--------
+- `fetch_month` läuft über `db_executor.submit` in einem Worker-Thread und greift nicht auf Tk zu.
+- Nach Änderungen an Zeiteinträgen muss der Cache über `clear` verworfen und neu geladen werden.
+"""
+
+import datetime
+from collections import OrderedDict, namedtuple
+from decimal import Decimal
+from db.db_connection import connection
+from db.db_executor import submit
+from features import feature_reference_cache as reference_cache
+from features.feature_date_range import month_range
+
+MONTH_CACHE_SIZE = 12       # Maximale Anzahl Monate im Cache
+VACATION_ACTIVITY = "Ferien"
+
+STATUS_MET = "erfuellt"
+STATUS_UNDER = "unter"
+STATUS_EMPTY = "leer"
+STATUS_VACATION = "ferien"
+
+# entries: Datum -> [(Projektnummer, Phase, Tätigkeit, Stunden)], totals: Datum -> (Stunden, Ferienstunden),
+# holidays: Datum -> Name des Feiertags bzw. der Betriebsschliessung (aus `work_calendar`)
+MonthData = namedtuple("MonthData", "year month entries totals daily_target holidays")
+
+def fetch_month(user_id, year, month):
+    """
+    Liest alle Zeiteinträge eines Benutzers in einem Monat.
+
+    Args:
+        user_id (int): Die Benutzer-ID.
+        year (int): Das Jahr.
+        month (int): Der Monat (1-12).
+
+    Returns:
+        MonthData: Die Einträge und Summen pro Tag, das Tagesziel des Benutzers und die Feiertage des Monats.
+    """
+    start, end = month_range(year, month)
+    with connection() as cursor:
+        cursor.execute("""
+            SELECT te.entry_date, te.project_number, COALESCE(s.phase_name, '') AS phase_name, te.activity, te.hours
+            FROM time_entries te
+            LEFT JOIN sia_phases s ON te.phase_id = s.phase_id
+            WHERE te.user_id = %s AND te.entry_date >= %s AND te.entry_date < %s
+            ORDER BY te.entry_date, te.entry_id
+        """, (user_id, start, end))
+        rows = cursor.fetchall()
+
+        cursor.execute("""
+            SELECT calendar_date, holiday_name
+            FROM work_calendar
+            WHERE calendar_date >= %s AND calendar_date < %s AND holiday_name IS NOT NULL
+        """, (start, end))
+        holidays = dict(cursor.fetchall())
+
+    entries = {}
+    totals = {}
+    for entry_date, project_number, phase_name, activity, hours in rows:
+        hours = hours or Decimal(0)
+        entries.setdefault(entry_date, []).append((project_number, phase_name, activity, hours))
+        total, vacation = totals.get(entry_date, (Decimal(0), Decimal(0)))
+        totals[entry_date] = (total + hours, vacation + (hours if activity == VACATION_ACTIVITY else 0))
+
+    settings = reference_cache.user_settings(user_id)
+    daily_target = settings.default_hours_per_day if settings else None
+    return MonthData(year, month, entries, totals, daily_target, holidays)
+
+def day_status(day, hours, vacation_hours, daily_target, today=None, holiday=False):
+    """
+    Bestimmt den Status eines Tages für die Markierung im Kalender.
+
+    Args:
+        day (datetime.date): Der Tag.
+        hours (Decimal): Die erfassten Stunden.
+        vacation_hours (Decimal): Die davon als Ferien erfassten Stunden.
+        daily_target (Decimal): Die Sollstunden pro Tag oder None.
+        today (datetime.date, optional): Das heutige Datum. Standard ist `datetime.date.today()`.
+        holiday (bool): Ob der Tag ein Feiertag bzw. eine Betriebsschliessung ist.
+
+    Returns:
+        str: `STATUS_VACATION`, `STATUS_MET`, `STATUS_UNDER`, `STATUS_EMPTY` oder None (keine Markierung).
+
+    Details:
+    --------
+    - Vergangene Arbeitstage ohne Stunden gelten als leer; Wochenenden, Feiertage und zukünftige Tage ohne Stunden
+      werden nicht markiert.
+    - Ohne Tagesziel gilt jeder Tag mit Stunden als erfüllt.
+    """
+    today = today or datetime.date.today()
+    if vacation_hours > 0:
+        return STATUS_VACATION
+    if hours > 0:
+        if daily_target is None or hours >= daily_target:
+            return STATUS_MET
+        return STATUS_UNDER
+    if day < today and day.weekday() < 5 and not holiday:
+        return STATUS_EMPTY
+    return None
+
+def adjacent_months(year, month):
+    """
+    Gibt den Vor- und den Folgemonat zurück.
+
+    Returns:
+        list: [(Jahr, Monat) des Vormonats, (Jahr, Monat) des Folgemonats].
+    """
+    previous_month = (year - 1, 12) if month == 1 else (year, month - 1)
+    next_month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return [previous_month, next_month]
+
+class MonthCache:
+    """
+    Cache der geladenen Monate eines Benutzers.
+
+    Funktionen:
+    - Laden einzelner Monate im Hintergrund (pro Monat höchstens eine laufende Abfrage)
+    - Zugriff auf Einträge und Summen einzelner Tage ohne Datenbankabfrage
+    - Begrenzung auf `MONTH_CACHE_SIZE` Monate (zuletzt verwendete bleiben erhalten)
+    """
+    def __init__(self, user_id):
+        """
+        Initialisiert einen leeren Cache.
+
+        Args:
+            user_id (int): Die Benutzer-ID.
+        """
+        self.user_id = user_id
+        self.months = OrderedDict()     # (Jahr, Monat) -> MonthData
+        self.callbacks = {}             # (Jahr, Monat) -> Callbacks der laufenden Abfrage
+
+    def get(self, year, month):
+        """
+        Gibt einen geladenen Monat zurück.
+
+        Returns:
+            MonthData: Die Daten oder None, falls der Monat nicht geladen ist.
+        """
+        data = self.months.get((year, month))
+        if data is not None:
+            self.months.move_to_end((year, month))
+        return data
+
+    def day_entries(self, day):
+        """
+        Gibt die Einträge eines Tages zurück.
+
+        Args:
+            day (datetime.date): Der Tag.
+
+        Returns:
+            list: Tupel (Projektnummer, Phase, Tätigkeit, Stunden) oder None, falls der Monat nicht geladen ist.
+        """
+        data = self.get(day.year, day.month)
+        return None if data is None else data.entries.get(day, [])
+
+    def day_total(self, day):
+        """
+        Gibt die erfassten Stunden eines Tages und das Tagesziel zurück.
+
+        Args:
+            day (datetime.date): Der Tag.
+
+        Returns:
+            tuple: (Stunden, Tagesziel) oder None, falls der Monat nicht geladen ist.
+        """
+        data = self.get(day.year, day.month)
+        if data is None:
+            return None
+        return data.totals.get(day, (Decimal(0), Decimal(0)))[0], data.daily_target
+
+    def load(self, year, month, on_loaded=None, force=False):
+        """
+        Lädt einen Monat im Hintergrund.
+
+        Args:
+            year (int): Das Jahr.
+            month (int): Der Monat (1-12).
+            on_loaded (callable, optional): Wird im Tk-Thread mit den `MonthData` aufgerufen.
+            force (bool): Lädt den Monat neu, auch wenn er bereits im Cache ist.
+
+        Hinweis:
+        --------
+        - Ist der Monat geladen und `force` nicht gesetzt, wird `on_loaded` sofort aufgerufen.
+        - Läuft für den Monat bereits eine Abfrage, wird nur der Callback angehängt.
+        """
+        month_key = (year, month)
+        if not force and month_key not in self.callbacks:
+            data = self.get(year, month)
+            if data is not None:
+                if on_loaded:
+                    on_loaded(data)
+                return
+
+        pending = month_key in self.callbacks
+        callbacks = self.callbacks.setdefault(month_key, [])
+        if on_loaded:
+            callbacks.append(on_loaded)
+        if pending and not force:
+            return
+
+        submit(
+            fetch_month,
+            self.user_id,
+            year,
+            month,
+            key=("month_entries", id(self), year, month),
+            on_success=self.store,
+            on_error=lambda e: self.load_failed(month_key, e),
+        )
+
+    def store(self, data):
+        """
+        Übernimmt einen geladenen Monat und ruft die wartenden Callbacks auf.
+
+        Args:
+            data (MonthData): Der geladene Monat.
+        """
+        month_key = (data.year, data.month)
+        self.months[month_key] = data
+        self.months.move_to_end(month_key)
+        while len(self.months) > MONTH_CACHE_SIZE:
+            self.months.popitem(last=False)
+
+        for callback in self.callbacks.pop(month_key, []):
+            callback(data)
+
+    def load_failed(self, month_key, error):
+        """
+        Verwirft die wartenden Callbacks eines Monats, dessen Abfrage fehlgeschlagen ist.
+        """
+        self.callbacks.pop(month_key, None)
+        print(f"Fehler beim Laden der Zeiteinträge für {month_key[1]:02d}.{month_key[0]}: {error}")
+
+    def clear(self):
+        """
+        Verwirft alle geladenen Monate.
+
+        Returns:
+            list: Die bisher geladenen Monate als (Jahr, Monat), z.B. zum Neuladen.
+        """
+        loaded = list(self.months)
+        self.months.clear()
+        return loaded
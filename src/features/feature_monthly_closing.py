@@ -0,0 +1,111 @@
+"""
+Modul: Monatsabschluss für TimeArch.
+
+Dieses Modul führt den Monatsabschluss aus: Für alle Benutzer werden die offenen Monate bis und mit dem Vormonat
+in `monthly_closings` festgehalten (siehe `db_monthly_closing`). Die Stundenbilanz summiert danach nur noch die
+Tage seit dem letzten Abschluss. Der Abschluss kann in der Admin-GUI ausgelöst oder regelmässig als Befehl
+(z.B. per Cron am Monatsanfang) ausgeführt werden.
+
+Funktionen:
+-----------
+- run_monthly_closing(until_month=None, user_ids=None): Schliesst die offenen Monate ab und gibt die Anzahl zurück.
+- monthly_closing_dialog(on_closed=None): Monatsabschluss mit Bestätigung und Meldungen (Admin-GUI, im Hintergrund).
+
+Verwendung:
+-----------
+    python -m features.feature_monthly_closing                  # Alle Benutzer bis zum Vormonat
+    python -m features.feature_monthly_closing --until 2024-12  # Alle Benutzer bis Dezember 2024
+    python -m features.feature_monthly_closing --user anna --reopen 2024-06
+
+Hinweis:
+--------
+- Der Abschluss kann beliebig oft ausgeführt werden; bereits abgeschlossene Monate bleiben unverändert.
+- Nachträgliche Buchungen in abgeschlossenen Monaten verwerfen die betroffenen Abschlüsse automatisch.
+"""
+
+import argparse
+import datetime
+from tkinter import messagebox
+from db.db_connection import connection
+from db.db_executor import submit
+from db.db_monthly_closing import close_months, last_closed_month, reopen_months
+from db.db_work_calendar import ensure_work_calendar
+from features import feature_reference_cache as reference_cache
+
+def run_monthly_closing(until_month=None, user_ids=None):
+    """
+    Schliesst die offenen Monate aller (bzw. der angegebenen) Benutzer ab.
+
+    Args:
+        until_month (datetime.date, optional): Ein Tag im letzten abzuschliessenden Monat. Standard ist der Vormonat.
+        user_ids (iterable, optional): Die Benutzer-IDs. Ohne Angabe werden alle Benutzer abgeschlossen.
+
+    Returns:
+        int: Die Anzahl neu abgeschlossener Monate.
+
+    Hinweis:
+    --------
+    - Stellt vorher sicher, dass der Arbeitstagekalender alle benötigten Jahre enthält.
+    """
+    with connection() as cursor:
+        ensure_work_calendar(cursor)
+        return close_months(cursor, until_month, user_ids)
+
+def monthly_closing_dialog(on_closed=None):
+    """
+    Führt den Monatsabschluss nach einer Bestätigung im Hintergrund aus und zeigt das Ergebnis an.
+
+    Args:
+        on_closed (callable, optional): Wird nach einem erfolgreichen Abschluss aufgerufen.
+
+    Fehlerbehandlung:
+    ------------------
+    - Zeigt eine Fehlermeldung an, falls der Abschluss fehlschlägt.
+    """
+    until_month = last_closed_month()
+    if not messagebox.askyesno(
+        "Monatsabschluss",
+        f"Alle offenen Monate bis und mit {until_month:%m.%Y} für alle Benutzer abschliessen?"
+    ):
+        return
+
+    def on_success(closed):
+        if on_closed:
+            on_closed()
+        messagebox.showinfo("Monatsabschluss", f"{closed} Monate abgeschlossen.")
+
+    submit(
+        run_monthly_closing,
+        until_month,
+        key="monthly_closing",
+        on_success=on_success,
+        on_error=lambda e: messagebox.showerror("Fehler", f"Fehler beim Monatsabschluss: {e}"),
+    )
+
+def _parse_month(value):
+    return datetime.datetime.strptime(value, "%Y-%m").date()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Monatsabschluss der Stundenbilanz ausführen.")
+    parser.add_argument("--until", type=_parse_month, help="Letzter abzuschliessender Monat (JJJJ-MM), Standard: Vormonat")
+    parser.add_argument("--user", help="Nur diesen Benutzer abschliessen (Benutzername)")
+    parser.add_argument("--reopen", type=_parse_month, help="Abschlüsse ab diesem Monat (JJJJ-MM) verwerfen, statt abzuschliessen")
+    args = parser.parse_args()
+
+    user_ids = None
+    if args.user:
+        user_id = reference_cache.user_id(args.user)
+        if user_id is None:
+            parser.error(f"Benutzer '{args.user}' nicht gefunden.")
+        user_ids = [user_id]
+
+    try:
+        if args.reopen:
+            with connection() as cursor:
+                reopened = reopen_months(cursor, user_ids, args.reopen)
+            print(f"{reopened} Monatsabschlüsse verworfen")
+        else:
+            closed = run_monthly_closing(args.until, user_ids)
+            print(f"{closed} Monate abgeschlossen")
+    except Exception as e:
+        print(f"Fehler beim Monatsabschluss: {e}")
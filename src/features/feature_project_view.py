@@ -0,0 +1,306 @@
+"""
+Modul: Gemeinsames Datenmodell der Projektansicht für TimeArch.
+
+Die Stundenübersicht eines Projekts (`StundenUebersichtProjectFrame`) und das Projektdiagramm
+(`AdminProjectDiagram`) zeigen dieselben gefilterten Stunden an. Dieses Modul lädt sie pro Filterzustand mit
+einer einzigen ROLLUP-Abfrage (`fetch_hour_rollup`) und hält das Ergebnis, nach dem Filtertupel geschlüsselt,
+im Speicher. Tabelle (Summenzeilen, gruppierte Ansicht) und Diagramm (Stunden pro Phase und Benutzer) werden
+daraus abgeleitet. Umfasst der Zeitraum nur ganze Monate, wird der ROLLUP über die Monatssummen
+(`project_phase_user_hours`) gerechnet, wie zuvor die eigene Abfrage des Diagramms.
+
+Konstanten:
+-----------
+- CACHE_SIZE: Maximale Anzahl zwischengespeicherter Filterzustände.
+- DEBOUNCE_MS: Wartezeit nach der letzten Filteränderung, bevor neu berechnet wird.
+- PROJECT_SCOPE: Bedingung für den Umfang eines Projekts.
+
+Klassen:
+--------
+- ProjectFilter: Filterzustand (Projektnummer, Jahr, Monat, Von, Bis, Benutzer, Phase); Schlüssel des Caches.
+- ProjectView: Ergebnis eines Filterzustands (Filtersumme, Projektsumme, ROLLUP-Knoten, Sollstunden pro Phase).
+- ProjectViewModel: Verbindet ein Widget mit dem Cache; berechnet verzögert neu und benachrichtigt Tabelle und Diagramm.
+
+Funktionen:
+-----------
+- filter_conditions(state): Gibt die Filter eines Zustands als SQL-Bedingungen zurück.
+- fetch_project_view(state): Gibt das Ergebnis eines Filterzustands zurück (aus dem Cache oder mit einer Abfrage).
+- phase_user_hours(view): Gibt die Stunden pro Phase und Benutzer für das Diagramm zurück.
+- invalidate(*project_numbers): Verwirft die Ergebnisse einzelner oder aller Projekte.
+- on_change(change): Verwirft die von einer Datenbankänderung betroffenen Projekte (Hook für `db_listener`).
+
+Verwendung:
+-----------
+    from features.feature_project_view import ProjectFilter, ProjectViewModel
+
+    self.view_model = ProjectViewModel(self)
+    self.view_model.add_listener(self.show_view)
+    self.view_model.request(ProjectFilter("P123", "2025", "Alle", "", "", "Alle", "Alle"))
+
+Hinweis:
+--------
+- Sollstunden und ungefilterte Projektsumme hängen nur vom Projekt ab und werden pro Projekt einmal gelesen.
+- Die Filter stehen im `WHERE` der ROLLUP-Abfrage; gelesen werden nur die Zeilen des gewählten Zeitraums.
+- Die Zeiteinträge der flachen Liste werden weiterhin seitenweise gelesen (`feature_virtual_treeview`);
+  Anzahl und Summen stammen aus dem gemeinsamen Ergebnis.
+- Die Funktionen sind threadsicher; `fetch_project_view` läuft in der Regel in einem Worker-Thread (`db_executor`).
+"""
+
+import threading
+from collections import OrderedDict, namedtuple
+from db.db_connection import connection
+from db.db_executor import submit
+from db.db_listener import ALL_TABLES, subscribe
+from features import feature_reference_cache as reference_cache
+from features.feature_date_range import date_range_clause, is_month_aligned
+from features.feature_hour_rollup import LEAF_LEVEL, fetch_hour_rollup, fetch_project_total
+
+CACHE_SIZE = 32             # Zwischengespeicherte Filterzustände (alle Projekte zusammen)
+DEBOUNCE_MS = 300           # Wartezeit nach der letzten Filteränderung in Millisekunden
+
+PROJECT_SCOPE = "te.project_number = %s"
+
+# Tabellen, deren Änderungen die Ergebnisse der betroffenen Projekte (bzw. aller Projekte) ungültig machen
+CHANGE_TABLES = ("time_entries", "project_sia_phases", "projects", "users")
+
+ProjectFilter = namedtuple("ProjectFilter", "project_number year month date_from date_to user phase")
+ProjectView = namedtuple("ProjectView", "state filtered_hours project_hours nodes soll_hours")
+
+_lock = threading.RLock()
+_views = OrderedDict()      # ProjectFilter -> ProjectView
+_soll_hours = {}            # Projektnummer -> {Phase: Sollstunden}
+_project_hours = {}         # Projektnummer -> ungefilterte Projektsumme
+_generation = 0             # Wird bei jeder Invalidierung erhöht
+
+def filter_conditions(state):
+    """
+    Gibt die Filter eines Zustands als SQL-Bedingungen zurück.
+
+    Args:
+        state (ProjectFilter): Der Filterzustand.
+
+    Returns:
+        tuple: (Bedingungen, jeweils beginnend mit " AND ", Parameter).
+
+    Fehlerbehandlung:
+    ------------------
+    - Wirft einen `ValueError`, falls der Zeitraum ungültig ist (siehe `date_range_clause`).
+    """
+    # Zeitraum als halboffener Bereich, damit der Index auf entry_date genutzt wird
+    filter_sql, date_params = date_range_clause(
+        "te.entry_date",
+        state.year,
+        state.month,
+        state.date_from,
+        state.date_to,
+    )
+    filter_params = list(date_params)
+
+    # Filter für Benutzername anwenden
+    if state.user != "Alle":
+        filter_sql += " AND u.username = %s"
+        filter_params.append(state.user)
+
+    # Filter für Phase anwenden
+    if state.phase != "Alle":
+        filter_sql += " AND s.phase_name = %s"
+        filter_params.append(state.phase)
+
+    return filter_sql, filter_params
+
+def _load_soll_hours(project_number):
+    with connection() as cursor:
+        cursor.execute(
+            "SELECT phase_name, soll_stunden FROM project_sia_phases WHERE project_number = %s",
+            (project_number,),
+        )
+        return dict(cursor.fetchall())
+
+def fetch_project_view(state):
+    """
+    Gibt das Ergebnis eines Filterzustands zurück.
+
+    Args:
+        state (ProjectFilter): Der Filterzustand.
+
+    Returns:
+        ProjectView: Das Ergebnis aus dem Cache oder aus einer ROLLUP-Abfrage.
+
+    Hinweis:
+    --------
+    - Bei ganzen Monaten (`is_month_aligned`) wird der ROLLUP über die Monatssummen gerechnet.
+    - Wird der Cache während des Ladens invalidiert, wird das Ergebnis zurückgegeben, aber nicht gespeichert.
+    """
+    with _lock:
+        view = _views.get(state)
+        if view is not None:
+            _views.move_to_end(state)
+            return view
+        soll_hours = _soll_hours.get(state.project_number)
+        project_hours = _project_hours.get(state.project_number)
+        generation = _generation
+
+    filter_sql, filter_params = filter_conditions(state)
+    month_aligned = is_month_aligned(state.year, state.month, state.date_from, state.date_to)
+    filtered_hours, nodes = fetch_hour_rollup(
+        PROJECT_SCOPE, [state.project_number], filter_sql, filter_params, month_aligned
+    )
+    if project_hours is None:
+        project_hours = fetch_project_total(state.project_number)
+    if soll_hours is None:
+        soll_hours = _load_soll_hours(state.project_number)
+    view = ProjectView(state, filtered_hours, project_hours, nodes, soll_hours)
+
+    with _lock:
+        if generation == _generation:
+            _soll_hours[state.project_number] = soll_hours
+            _project_hours[state.project_number] = project_hours
+            _views[state] = view
+            while len(_views) > CACHE_SIZE:
+                _views.popitem(last=False)
+    return view
+
+def phase_user_hours(view):
+    """
+    Gibt die Stunden pro Phase und Benutzer für das Diagramm zurück.
+
+    Args:
+        view (ProjectView): Das Ergebnis eines Filterzustands.
+
+    Returns:
+        list: Tupel (Phase, Sollstunden, {Benutzername: Stunden}) für alle SIA-Phasen, sortiert nach Phasennummer.
+    """
+    hours = {}
+    for key, node_hours, _ in view.nodes:
+        # Knoten der Ebene Benutzer: ((Projektnummer, Projektname), Phase, Benutzername)
+        if len(key) == LEAF_LEVEL - 1 and key[1] is not None:
+            hours.setdefault(key[1], {})[key[2]] = node_hours
+    return [
+        (phase.phase_name, view.soll_hours.get(phase.phase_name), hours.get(phase.phase_name, {}))
+        for phase in reference_cache.sia_phases()
+    ]
+
+def invalidate(*project_numbers):
+    """
+    Verwirft die Ergebnisse einzelner oder aller Projekte.
+
+    Args:
+        *project_numbers (str): Die betroffenen Projektnummern. Ohne Angabe wird der ganze Cache geleert.
+    """
+    global _generation
+    with _lock:
+        _generation += 1
+        if not project_numbers:
+            _views.clear()
+            _soll_hours.clear()
+            _project_hours.clear()
+            return
+        for state in [state for state in _views if state.project_number in project_numbers]:
+            del _views[state]
+        for project_number in project_numbers:
+            _soll_hours.pop(project_number, None)
+            _project_hours.pop(project_number, None)
+
+def on_change(change):
+    """
+    Verwirft die von einer Datenbankänderung betroffenen Projekte.
+
+    Args:
+        change (db_listener.Change): Die Änderung; ohne bekannte Projektnummern wird der ganze Cache geleert.
+
+    Hinweis:
+    --------
+    - Wird von `db_listener` im Listener-Thread aufgerufen.
+    """
+    if change.table != ALL_TABLES and change.table not in CHANGE_TABLES:
+        return
+    project_numbers = (change.keys or {}).get("project_number")
+    if change.table in ("time_entries", "project_sia_phases", "projects") and project_numbers:
+        invalidate(*project_numbers)
+    else:
+        invalidate()
+
+class ProjectViewModel:
+    """
+    Verbindet ein Widget mit dem gemeinsamen Cache der Projektansicht.
+
+    Funktionen:
+    - Filteränderungen werden gesammelt; neu berechnet wird erst `DEBOUNCE_MS` nach der letzten Änderung
+    - Eine Abfrage pro Filterzustand, bereits geladene Zustände kommen aus dem Cache
+    - Alle angemeldeten Listener (Tabelle, Diagramm) erhalten dasselbe Ergebnis
+    - Änderungen am aktuellen Projekt (auch von anderen Clients) lösen eine Neuberechnung aus
+    """
+    def __init__(self, widget, debounce_ms=DEBOUNCE_MS):
+        """
+        Initialisiert das Modell.
+
+        Args:
+            widget (tk.Misc): Das Widget, dessen `after()` und Lebensdauer verwendet werden.
+            debounce_ms (int): Wartezeit nach der letzten Filteränderung in Millisekunden.
+        """
+        self.widget = widget
+        self.debounce_ms = debounce_ms
+        self.listeners = []
+        self.state = None           # Zuletzt angeforderter Filterzustand
+        self.view = None            # Zuletzt ausgeliefertes Ergebnis
+        self.job = None
+        subscribe(
+            widget,
+            ["time_entries", "project_sia_phases"],
+            self.refresh,
+            project_number=lambda: self.state.project_number if self.state else None,
+        )
+
+    def add_listener(self, callback):
+        """
+        Meldet eine Funktion an, die im Tk-Thread mit jedem neuen `ProjectView` aufgerufen wird.
+        """
+        if callback not in self.listeners:
+            self.listeners.append(callback)
+
+    def request(self, state, immediate=False):
+        """
+        Fordert das Ergebnis eines Filterzustands an.
+
+        Args:
+            state (ProjectFilter): Der Filterzustand.
+            immediate (bool): True, um ohne Wartezeit zu berechnen (z.B. über die Schaltfläche "Filtern").
+
+        - Weitere Anfragen innerhalb der Wartezeit ersetzen die vorherige; berechnet wird nur der letzte Zustand.
+        """
+        self.state = state
+        if self.job is not None:
+            self.widget.after_cancel(self.job)
+        self.job = self.widget.after(0 if immediate else self.debounce_ms, self.compute)
+
+    def refresh(self):
+        """
+        Verwirft das Ergebnis des aktuellen Projekts und berechnet den aktuellen Filterzustand neu.
+        """
+        if self.state is None:
+            return
+        invalidate(self.state.project_number)
+        self.request(self.state, immediate=True)
+
+    def compute(self):
+        """
+        Lädt das Ergebnis des aktuellen Filterzustands im Hintergrund (bzw. aus dem Cache).
+        """
+        self.job = None
+        state = self.state
+        submit(
+            fetch_project_view,
+            state,
+            key=("project_view", id(self)),
+            on_success=self.deliver,
+            on_error=lambda error: print(f"Fehler beim Laden der Projektansicht: {error}"),
+        )
+
+    def deliver(self, view):
+        """
+        Gibt ein Ergebnis an alle Listener weiter, sofern es zum aktuellen Filterzustand gehört.
+        """
+        if view.state != self.state or not self.widget.winfo_exists():
+            return
+        self.view = view
+        for callback in self.listeners:
+            callback(view)
@@ -0,0 +1,314 @@
+"""
+Modul: Referenzdaten-Cache für TimeArch.
+
+Dieses Modul hält selten geänderte Stammdaten (SIA-Phasen, Projekte, Benutzer, Benutzereinstellungen und
+Projektzuordnungen) während der Sitzung im Speicher. Ansichten und Diagramme lesen diese Daten über die
+Lookup-Funktionen statt bei jedem Aufruf erneut aus der Datenbank.
+
+Konstanten:
+-----------
+- CACHE_TTL_SECONDS: Maximales Alter eines Eintrags, danach wird neu geladen.
+- PHASES, PROJECTS, USERS, USER_SETTINGS, PROJECT_USERS, USER_PROJECTS: Namen der Cache-Bereiche für `invalidate`.
+
+Funktionen:
+-----------
+- sia_phases(): Gibt alle SIA-Phasen als `Phase`-Tupel zurück, sortiert nach Phasennummer.
+- phase_names(): Gibt die Namen aller SIA-Phasen zurück.
+- phase_id(phase_name): Gibt die ID einer Phase zurück.
+- phase_name(phase_id): Gibt den Namen einer Phase zurück.
+- projects(): Gibt alle Projekte als Dictionary Projektnummer -> `Project` zurück.
+- project(project_number): Gibt ein Projekt zurück.
+- users(): Gibt alle Benutzer als Liste von (user_id, username) zurück.
+- username(user_id): Gibt den Benutzernamen zu einer ID zurück.
+- user_id(username): Gibt die ID zu einem Benutzernamen zurück.
+- user_settings(user_id): Gibt die Einstellungen eines Benutzers als `UserSettings` zurück.
+- project_users(project_number): Gibt die einem Projekt zugeordneten Benutzer zurück.
+- user_projects(user_id): Gibt die einem Benutzer zugeordneten Projekte zurück.
+- invalidate(*areas): Verwirft einzelne oder alle Cache-Bereiche.
+- on_change(change): Verwirft die von einer Datenbankänderung betroffenen Bereiche (Hook für `db_listener`).
+
+Verwendung:
+-----------
+    from features import feature_reference_cache as reference_cache
+
+    phase_id = reference_cache.phase_id("Vorprojekt")
+    settings = reference_cache.user_settings(user_id)
+
+    # Nach einer Änderung an den Stammdaten
+    reference_cache.invalidate(reference_cache.USERS)
+
+Hinweis:
+--------
+- Die Funktionen sind threadsicher und können auch in Worker-Threads (`db_executor`) verwendet werden.
+- Änderungen anderer Clients werden über `db_listener` sofort verworfen (siehe `on_change`);
+  `CACHE_TTL_SECONDS` greift nur noch, falls keine Benachrichtigungen ankommen.
+- Datenbankfehler werden an den Aufrufer weitergegeben; es wird nichts zwischengespeichert.
+"""
+
+import threading
+import time
+from collections import namedtuple
+from db.db_connection import connection
+from db.db_listener import ALL_TABLES
+
+CACHE_TTL_SECONDS = 300     # Maximales Alter eines Cache-Eintrags in Sekunden
+
+PHASES = "phases"
+PROJECTS = "projects"
+USERS = "users"
+USER_SETTINGS = "user_settings"
+PROJECT_USERS = "project_users"
+USER_PROJECTS = "user_projects"
+
+# Tabelle (siehe db_notify.NOTIFY_TABLES) -> betroffene Cache-Bereiche
+TABLE_AREAS = {
+    "projects": (PROJECTS, PROJECT_USERS, USER_PROJECTS),
+    "users": (USERS, USER_SETTINGS, PROJECT_USERS, USER_PROJECTS),
+    "user_settings": (USER_SETTINGS,),
+    "user_projects": (PROJECT_USERS, USER_PROJECTS),
+}
+
+Phase = namedtuple("Phase", "phase_id phase_number phase_name")
+Project = namedtuple("Project", "project_number project_name description")
+UserSettings = namedtuple("UserSettings", "default_hours_per_day employment_percentage vacation_hours start_date")
+
+_lock = threading.RLock()
+_entries = {}       # (Bereich, Schlüssel) -> (Ladezeitpunkt, Wert)
+_generation = 0     # Wird bei jeder Invalidierung erhöht
+
+def _cached(area, loader, key=None):
+    """
+    Gibt einen Cache-Eintrag zurück und lädt ihn bei Bedarf neu.
+
+    Args:
+        area (str): Der Cache-Bereich, z.B. `USERS`.
+        loader (callable): Funktion, die den Wert aus der Datenbank lädt.
+        key (hashable, optional): Zusätzlicher Schlüssel innerhalb des Bereichs.
+
+    Hinweis:
+    --------
+    - Wird der Cache während des Ladens invalidiert, wird der geladene Wert zurückgegeben, aber nicht gespeichert.
+    """
+    with _lock:
+        entry = _entries.get((area, key))
+        if entry and time.monotonic() - entry[0] < CACHE_TTL_SECONDS:
+            return entry[1]
+        generation = _generation
+
+    loaded_at = time.monotonic()
+    value = loader()
+    with _lock:
+        if generation == _generation:
+            _entries[(area, key)] = (loaded_at, value)
+    return value
+
+def invalidate(*areas):
+    """
+    Verwirft einzelne oder alle Cache-Bereiche.
+
+    Args:
+        *areas (str): Die zu verwerfenden Bereiche. Ohne Angabe wird der ganze Cache geleert.
+    """
+    global _generation
+    with _lock:
+        _generation += 1
+        if not areas:
+            _entries.clear()
+            return
+        for cache_key in [cache_key for cache_key in _entries if cache_key[0] in areas]:
+            del _entries[cache_key]
+
+def on_change(change):
+    """
+    Verwirft die von einer Datenbankänderung betroffenen Cache-Bereiche.
+
+    Args:
+        change (db_listener.Change): Die Änderung; bei `ALL_TABLES` wird der ganze Cache geleert.
+
+    Hinweis:
+    --------
+    - Wird von `db_listener` im Listener-Thread aufgerufen.
+    """
+    if change.table == ALL_TABLES:
+        invalidate()
+    elif change.table in TABLE_AREAS:
+        invalidate(*TABLE_AREAS[change.table])
+
+def _load_phases():
+    with connection() as cursor:
+        cursor.execute("SELECT phase_id, phase_number, phase_name FROM sia_phases ORDER BY phase_number, phase_id")
+        return [Phase(*row) for row in cursor.fetchall()]
+
+def _load_projects():
+    with connection() as cursor:
+        cursor.execute("SELECT project_number, project_name, description FROM projects ORDER BY project_number")
+        return {row[0]: Project(*row) for row in cursor.fetchall()}
+
+def _load_users():
+    with connection() as cursor:
+        cursor.execute("SELECT user_id, username FROM users ORDER BY user_id")
+        return cursor.fetchall()
+
+def _load_user_settings():
+    with connection() as cursor:
+        cursor.execute("""
+            SELECT DISTINCT ON (user_id)
+                user_id, default_hours_per_day, employment_percentage, vacation_hours, start_date
+            FROM user_settings
+            ORDER BY user_id, id
+        """)
+        return {row[0]: UserSettings(*row[1:]) for row in cursor.fetchall()}
+
+def sia_phases():
+    """
+    Gibt alle SIA-Phasen zurück.
+
+    Returns:
+        list: `Phase`-Tupel (phase_id, phase_number, phase_name), sortiert nach Phasennummer.
+    """
+    return _cached(PHASES, _load_phases)
+
+def phase_names():
+    """
+    Gibt die Namen aller SIA-Phasen zurück.
+
+    Returns:
+        list: Die Phasennamen, sortiert nach Phasennummer.
+    """
+    return [phase.phase_name for phase in sia_phases()]
+
+def phase_id(phase_name):
+    """
+    Gibt die ID einer SIA-Phase zurück.
+
+    Args:
+        phase_name (str): Der Name der Phase.
+
+    Returns:
+        int: Die ID der Phase oder None, falls sie nicht existiert.
+    """
+    return next((phase.phase_id for phase in sia_phases() if phase.phase_name == phase_name), None)
+
+def phase_name(phase_id):
+    """
+    Gibt den Namen einer SIA-Phase zurück.
+
+    Args:
+        phase_id (int): Die ID der Phase.
+
+    Returns:
+        str: Der Name der Phase oder None, falls sie nicht existiert.
+    """
+    return next((phase.phase_name for phase in sia_phases() if phase.phase_id == phase_id), None)
+
+def projects():
+    """
+    Gibt alle Projekte zurück.
+
+    Returns:
+        dict: Projektnummer -> `Project` (project_number, project_name, description).
+    """
+    return _cached(PROJECTS, _load_projects)
+
+def project(project_number):
+    """
+    Gibt ein Projekt zurück.
+
+    Args:
+        project_number (str): Die Projektnummer.
+
+    Returns:
+        Project: Das Projekt oder None, falls es nicht existiert.
+    """
+    return projects().get(project_number)
+
+def users():
+    """
+    Gibt alle Benutzer zurück.
+
+    Returns:
+        list: Tupel (user_id, username), sortiert nach Benutzer-ID.
+    """
+    return _cached(USERS, _load_users)
+
+def username(user_id):
+    """
+    Gibt den Benutzernamen zu einer Benutzer-ID zurück.
+
+    Args:
+        user_id (int): Die Benutzer-ID.
+
+    Returns:
+        str: Der Benutzername oder None, falls der Benutzer nicht existiert.
+    """
+    return next((name for uid, name in users() if uid == int(user_id)), None)
+
+def user_id(username):
+    """
+    Gibt die Benutzer-ID zu einem Benutzernamen zurück.
+
+    Args:
+        username (str): Der Benutzername.
+
+    Returns:
+        int: Die Benutzer-ID oder None, falls der Benutzer nicht existiert.
+    """
+    return next((uid for uid, name in users() if name == username), None)
+
+def user_settings(user_id):
+    """
+    Gibt die Einstellungen eines Benutzers zurück.
+
+    Args:
+        user_id (int): Die Benutzer-ID.
+
+    Returns:
+        UserSettings: (default_hours_per_day, employment_percentage, vacation_hours, start_date)
+                      oder None, falls keine Einstellungen gespeichert sind.
+    """
+    return _cached(USER_SETTINGS, _load_user_settings).get(int(user_id))
+
+def project_users(project_number):
+    """
+    Gibt die einem Projekt zugeordneten Benutzer zurück.
+
+    Args:
+        project_number (str): Die Projektnummer.
+
+    Returns:
+        list: Tupel (user_id, username).
+    """
+    def load():
+        with connection() as cursor:
+            cursor.execute("""
+                SELECT u.user_id, u.username
+                FROM user_projects up
+                JOIN users u ON up.user_id = u.user_id
+                WHERE up.project_number = %s
+            """, (project_number,))
+            return cursor.fetchall()
+
+    return _cached(PROJECT_USERS, load, key=project_number)
+
+def user_projects(user_id):
+    """
+    Gibt die einem Benutzer zugeordneten Projekte zurück.
+
+    Args:
+        user_id (int): Die Benutzer-ID.
+
+    Returns:
+        list: `Project`-Tupel (project_number, project_name, description), sortiert nach Projektnummer.
+    """
+    def load():
+        with connection() as cursor:
+            cursor.execute("""
+                SELECT p.project_number, p.project_name, p.description
+                FROM user_projects up
+                JOIN projects p ON up.project_number = p.project_number
+                WHERE up.user_id = %s
+                ORDER BY p.project_number
+            """, (user_id,))
+            return [Project(*row) for row in cursor.fetchall()]
+
+    return _cached(USER_PROJECTS, load, key=int(user_id))
@@ -15,7 +15,7 @@ Verwendung:
     instance.save_soll_stunden()
 """
 
-from db.db_connection import create_connection
+from db.db_connection import connection
 from tkinter import messagebox
 
 def save_soll_stunden(self):
@@ -43,9 +43,7 @@ def save_soll_stunden(self):
         instance.save_soll_stunden()
     """
     try:
-        connection = create_connection()
-        if connection:
-            cursor = connection.cursor()
+        with connection() as cursor:
             for phase, entry in self.soll_stunden_entries.items():
                 soll_stunden = entry.get()
                 cursor.execute('''
@@ -53,11 +51,8 @@ def save_soll_stunden(self):
                     VALUES (%s, %s, %s)
                     ON CONFLICT (project_number, phase_name) DO UPDATE SET soll_stunden = EXCLUDED.soll_stunden;
                 ''', (self.project_number, phase, soll_stunden))
-            connection.commit()
-            messagebox.showinfo("Erfolg", "Soll-Stunden erfolgreich gespeichert.")
-            cursor.close()
-            connection.close()
-            self.toggle_entries(state="disabled")
-            self.is_editable = False
+        messagebox.showinfo("Erfolg", "Soll-Stunden erfolgreich gespeichert.")
+        self.toggle_entries(state="disabled")
+        self.is_editable = False
     except Exception as e:
         messagebox.showerror("Fehler", f"Ein Fehler ist aufgetreten: {e}")
\ No newline at end of file
@@ -4,9 +4,17 @@ Modul: Zeitbuchung speichern für TimeArch.
 Dieses Modul speichert Zeiteinträge für Benutzer in der Datenbank. Es erfasst Details wie Stunden,
 Projektzuordnung, Phasen, Tätigkeiten und Notizen.
 
+Konstanten:
+-----------
+- INTERN_ACTIVITIES: Tätigkeiten für das Projekt "0000" (Büro Intern).
+- PROJECT_ACTIVITIES: Tätigkeiten für normale Projekte.
+
 Funktionen:
 -----------
+- activities_for_project(project_number): Gibt die Tätigkeiten für ein Projekt zurück.
+- parse_hours(value): Wandelt eine Stundeneingabe (z.B. "7,5") in eine Zahl um.
 - save_hours(user_id, project_number, phase_id, hours, entry_date, activity, note=None): Speichert die Stunden in der Tabelle `time_entries`.
+- save_time_entries(entries): Speichert mehrere Zeiteinträge mit einem einzigen Insert in einer Transaktion.
 
 Verwendung:
 -----------
@@ -19,7 +27,47 @@ Verwendung:
         print("Fehler beim Speichern der Stunden.")
 """
 
-from db.db_connection import create_connection
+import math
+from psycopg2.extras import execute_values
+from db.db_connection import connection
+
+INTERN_ACTIVITIES = ["IT Arbeiten", "Besprechung", "Büroadmin", "Event", "Absenz", "Ferien", "Allgemeines", "Acquisition"]
+PROJECT_ACTIVITIES = ["Planung", "Besprechung", "Korrespondenz", "Bauadmin", "Bauleitung", "Verkauf"]
+
+def activities_for_project(project_number):
+    """
+    Gibt die Tätigkeiten zurück, die für ein Projekt gebucht werden können.
+
+    Args:
+        project_number (str): Die Projektnummer.
+
+    Returns:
+        list: `INTERN_ACTIVITIES` für "0000", sonst `PROJECT_ACTIVITIES`.
+    """
+    return INTERN_ACTIVITIES if project_number == "0000" else PROJECT_ACTIVITIES
+
+def parse_hours(value):
+    """
+    Wandelt eine Stundeneingabe in eine Zahl um.
+
+    Args:
+        value (str): Die Eingabe, Dezimaltrennzeichen Punkt oder Komma (z.B. "7,5").
+
+    Returns:
+        float: Die Stunden oder None, falls die Eingabe leer ist.
+
+    Fehlerbehandlung:
+    ------------------
+    - Wirft einen `ValueError`, wenn die Eingabe keine endliche Zahl zwischen 0 und 24 ist (auch bei "nan").
+    """
+    value = (value or "").strip().replace(",", ".")
+    if not value:
+        return None
+    hours = float(value)
+    # NaN scheitert an jedem Vergleich und würde die Bereichsprüfung sonst passieren
+    if not math.isfinite(hours) or not 0 < hours <= 24:
+        raise ValueError(f"Ungültige Stundenzahl: {value}")
+    return hours
 
 def save_hours(user_id, project_number, phase_id, hours, entry_date, activity, note=None):
     """
@@ -56,20 +104,60 @@ def save_hours(user_id, project_number, phase_id, hours, entry_date, activity, n
         return False
 
     try:
-        connection = create_connection()
-        cursor = connection.cursor()
-        query = """
-        INSERT INTO time_entries (user_id, project_number, phase_id, hours, entry_date, activity, note)
-        VALUES (%s, %s, %s, %s, %s, %s, %s)
-        """
-        cursor.execute(query,(user_id, project_number, phase_id, hours, entry_date, activity, note))
-        connection.commit()
+        with connection() as cursor:
+            query = """
+            INSERT INTO time_entries (user_id, project_number, phase_id, hours, entry_date, activity, note)
+            VALUES (%s, %s, %s, %s, %s, %s, %s)
+            """
+            cursor.execute(query,(user_id, project_number, phase_id, hours, entry_date, activity, note))
         print(f"Stunden erfolgreich gespeichert: {hours} Stunden für {entry_date}, Tätigkeit: {activity}")
         return True
     except Exception as e:
         print(f"Fehler beim Speichern der Stunden: {e}")
         return False
-    finally:
-        if connection:
-            cursor.close()
-            connection.close()
+
+def save_time_entries(entries):
+    """
+    Speichert mehrere Zeiteinträge mit einem einzigen Insert in einer Transaktion.
+
+    Args:
+        entries (list): Eine Liste von Tupeln
+                        (user_id, project_number, phase_id, hours, entry_date, activity, note).
+
+    Returns:
+        bool: True, wenn alle Einträge gespeichert wurden, andernfalls False.
+
+    Datenbankintegration:
+    ----------------------
+    - Fügt alle Einträge mit `execute_values` als ein einziges INSERT-Statement ein, sodass auch
+      die Trigger für Tagessummen und Projekt-Rollup nur einmal ausgeführt werden.
+
+    Fehlerbehandlung:
+    ------------------
+    - Schlägt ein Eintrag fehl, wird die ganze Transaktion zurückgerollt und es wird nichts gespeichert.
+    """
+    if not entries:
+        print("Fehler: Keine Einträge zum Speichern.")
+        return False
+
+    for user_id, project_number, phase_id, hours, entry_date, activity, note in entries:
+        if not all([user_id, project_number, hours, entry_date, activity]):
+            print("Fehler: Unvollständige Informationen zum Speichern der Stunden.")
+            return False
+
+    try:
+        with connection() as cursor:
+            execute_values(
+                cursor,
+                """
+                INSERT INTO time_entries (user_id, project_number, phase_id, hours, entry_date, activity, note)
+                VALUES %s
+                """,
+                entries,
+                page_size=len(entries),
+            )
+        print(f"{len(entries)} Zeiteinträge erfolgreich gespeichert.")
+        return True
+    except Exception as e:
+        print(f"Fehler beim Speichern der Zeiteinträge: {e}")
+        return False
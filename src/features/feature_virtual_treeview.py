@@ -0,0 +1,413 @@
+"""
+Modul: Virtuelle Treeview-Zeilen für TimeArch.
+
+Dieses Modul zeigt grosse Ergebnislisten (z.B. die Stundenübersichten mit zehntausenden Zeiteinträgen) in einem
+`ttk.Treeview` an, ohne alle Zeilen zu laden. Die Treeview enthält nur so viele Elemente, wie sichtbar sind; beim
+Scrollen werden deren Werte ersetzt. Die Zeilen werden seitenweise mit Keyset-Pagination vom Server gelesen
+(`WHERE (te.entry_date, te.entry_id) > (...) ORDER BY ... LIMIT`), und zwar nur für den sichtbaren Bereich und
+einen Vorlauf davor und danach. Die Scrollbar entspricht der Gesamtzahl der Zeilen.
+
+Die Seitengrenzen (Schlüssel jeder `PAGE_SIZE`-ten Zeile) werden zusammen mit Anzahl und Stundensumme mit einer
+einzigen Abfrage ermittelt. Damit kann jede Seite direkt gelesen werden, auch wenn die Scrollbar ans Ende gezogen
+wird, ohne `OFFSET` und ohne die Seiten davor zu lesen.
+
+Konstanten:
+-----------
+- PAGE_SIZE: Anzahl Zeilen pro Seite.
+- PREFETCH_ROWS: Anzahl Zeilen, die vor und nach dem sichtbaren Bereich vorab geladen werden.
+- ROW_HEIGHT: Zeilenhöhe der Treeview in Pixeln (siehe `apply_treeview_style`).
+- KEYSET_COLUMNS: Sortier- und Schlüsselspalten der Zeiteinträge.
+
+Klassen:
+--------
+- VirtualTreeview: Verbindet eine Treeview und eine Scrollbar mit einem seitenweise geladenen Zeilenmodell.
+
+Funktionen:
+-----------
+- fetch_keyset_index(from_where, params, page_size=PAGE_SIZE, with_hours=True): Liest Anzahl, Stundensumme und Seitengrenzen.
+- fetch_keyset_page(select, from_where, params, after_key, limit=PAGE_SIZE): Liest eine Seite nach einem Schlüssel.
+
+Verwendung:
+-----------
+    from features.feature_virtual_treeview import VirtualTreeview, fetch_keyset_index, fetch_keyset_page
+
+    self.rows = VirtualTreeview(self.stunden_treeview, scrollbar)
+
+    def fetch_summary():
+        total, hours, boundaries = fetch_keyset_index(from_where, params)
+        return total, boundaries, [(("", "Summe:", hours), ("filter_total",))]
+
+    self.rows.load(fetch_summary, lambda after_key, limit: fetch_keyset_page(select, from_where, params, after_key, limit))
+
+Hinweis:
+--------
+- `from_where` beginnt mit `FROM` und muss die Zeiteinträge unter dem Alias `te` enthalten.
+- Die Abfragefunktionen laufen über `db_executor.submit` in einem Worker-Thread und dürfen nicht auf Tk zugreifen.
+- Zeilen nach der letzten Datenzeile (z.B. Summenzeilen) werden als Fusszeilen übergeben.
+"""
+
+from db.db_connection import connection
+from db.db_executor import submit
+
+PAGE_SIZE = 200             # Zeilen pro Seite (eine Abfrage)
+PREFETCH_ROWS = 100         # Vorab geladene Zeilen vor und nach dem sichtbaren Bereich
+ROW_HEIGHT = 25             # Zeilenhöhe aus apply_treeview_style
+
+KEYSET_COLUMNS = "te.entry_date, te.entry_id"
+LOADING_VALUES = ("Lädt...",)
+ERROR_VALUES = ("Fehler beim Laden",)
+
+def fetch_keyset_index(from_where, params, page_size=PAGE_SIZE, with_hours=True):
+    """
+    Liest Anzahl und Stundensumme der Zeilen sowie die Schlüssel der Seitengrenzen.
+
+    Args:
+        from_where (str): FROM- und WHERE-Teil der Abfrage (Zeiteinträge als `te`).
+        params (list): Die Parameter für `from_where`.
+        page_size (int): Anzahl Zeilen pro Seite.
+        with_hours (bool): False, wenn die Stundensumme nicht benötigt wird (z.B. weil sie bereits bekannt ist).
+
+    Returns:
+        tuple: (Anzahl Zeilen, Summe der Stunden oder None, Liste der Schlüssel (Datum, ID) der letzten Zeile
+               jeder vollen Seite).
+
+    Hinweis:
+    --------
+    - Eine einzige Abfrage: Die Zeilen werden nummeriert, zurückgegeben werden nur jede `page_size`-te und die letzte.
+    """
+    with connection() as cursor:
+        cursor.execute(f"""
+            SELECT rn, total, total_hours, entry_date, entry_id
+            FROM (
+                SELECT te.entry_date,
+                       te.entry_id,
+                       row_number() OVER (ORDER BY {KEYSET_COLUMNS}) AS rn,
+                       count(*) OVER () AS total,
+                       {"COALESCE(sum(te.hours) OVER (), 0)" if with_hours else "NULL::numeric"} AS total_hours
+                {from_where}
+            ) numbered
+            WHERE mod(rn, %s) = 0 OR rn = total
+            ORDER BY rn
+        """, list(params) + [page_size])
+        rows = cursor.fetchall()
+
+    if not rows:
+        return 0, 0 if with_hours else None, []
+    total, total_hours = rows[0][1], rows[0][2]
+    boundaries = [(entry_date, entry_id) for rn, _, _, entry_date, entry_id in rows if rn % page_size == 0]
+    return total, total_hours, boundaries
+
+def fetch_keyset_page(select, from_where, params, after_key, limit=PAGE_SIZE):
+    """
+    Liest die Zeilen nach einem Schlüssel (Keyset-Pagination).
+
+    Args:
+        select (str): Der SELECT-Teil mit den anzuzeigenden Spalten.
+        from_where (str): FROM- und WHERE-Teil der Abfrage (Zeiteinträge als `te`).
+        params (list): Die Parameter für `from_where`.
+        after_key (tuple): Schlüssel (Datum, ID) der letzten Zeile der vorherigen Seite oder None für die erste Seite.
+        limit (int): Anzahl Zeilen.
+
+    Returns:
+        list: Die Zeilen in der Reihenfolge von `KEYSET_COLUMNS`.
+    """
+    query = f"{select} {from_where}"
+    params = list(params)
+    if after_key is not None:
+        query += f" AND ({KEYSET_COLUMNS}) > (%s, %s)"
+        params.extend(after_key)
+    query += f" ORDER BY {KEYSET_COLUMNS} LIMIT %s"
+    params.append(limit)
+
+    with connection() as cursor:
+        cursor.execute(query, params)
+        return cursor.fetchall()
+
+class VirtualTreeview:
+    """
+    Verbindet eine Treeview und eine Scrollbar mit einem seitenweise geladenen Zeilenmodell.
+
+    Funktionen:
+    - Nur die sichtbaren Zeilen existieren als Treeview-Elemente; beim Scrollen werden ihre Werte ersetzt
+    - Seiten werden im Hintergrund geladen (sichtbarer Bereich plus Vorlauf), entfernte Seiten verworfen
+    - Die Scrollbar entspricht der Gesamtzahl der Zeilen
+    - Aktualisierungen der Anzeige werden gesammelt mit `after_idle` ausgeführt
+    """
+    def __init__(self, treeview, scrollbar, page_size=PAGE_SIZE, prefetch=PREFETCH_ROWS):
+        """
+        Verbindet Treeview und Scrollbar mit dem Zeilenmodell.
+
+        Args:
+            treeview (ttk.Treeview): Die Treeview (ohne eigene Elemente).
+            scrollbar (ctk.CTkScrollbar): Die vertikale Scrollbar der Treeview.
+            page_size (int): Anzahl Zeilen pro Seite.
+            prefetch (int): Anzahl Zeilen, die vor und nach dem sichtbaren Bereich geladen werden.
+        """
+        self.tree = treeview
+        self.scrollbar = scrollbar
+        self.page_size = page_size
+        self.prefetch = prefetch
+
+        self.generation = 0         # Erhöht bei jedem `load`; ältere Ergebnisse werden verworfen
+        self.page_func = None
+        self.total = 0
+        self.boundaries = []
+        self.footer = []
+        self.pages = {}             # Seitennummer -> Zeilen
+        self.pending = set()
+        self.failed = set()         # Seiten, deren Laden fehlgeschlagen ist (erneuter Versuch beim nächsten Rendern)
+        self.offset = 0
+        self.visible = int(treeview.cget("height"))
+        self.render_job = None
+
+        # Die Treeview scrollt nicht selbst; Scrollbar und Mausrad verschieben den sichtbaren Ausschnitt
+        self.tree.configure(yscrollcommand="")
+        self.scrollbar.configure(command=self.yview)
+        self.tree.bind("<Configure>", self.on_resize, add="+")
+        for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            self.tree.bind(sequence, self.on_mouse_wheel)
+        for sequence in ("<Up>", "<Down>", "<Prior>", "<Next>"):
+            self.tree.bind(sequence, self.on_key)
+
+    def load(self, summary_func, page_func):
+        """
+        Lädt eine neue Ergebnisliste.
+
+        Args:
+            summary_func (callable): Liefert (Anzahl Zeilen, Seitengrenzen, Fusszeilen); Fusszeilen sind Tupel
+                                     (Werte, Tags). Läuft im Hintergrund.
+            page_func (callable): Liefert mit (Schlüssel, Anzahl) die Zeilen einer Seite. Läuft im Hintergrund.
+
+        - Bis die Anzahl bekannt ist, zeigt die Treeview einen Platzhalter an.
+        """
+        self.generation += 1
+        generation = self.generation
+        self.page_func = page_func
+        self.pages.clear()
+        self.pending.clear()
+        self.failed.clear()
+        self.total = 0
+        self.boundaries = []
+        self.footer = [(LOADING_VALUES, ())]
+        self.offset = 0
+        self.schedule_render()
+
+        submit(
+            summary_func,
+            key=("virtual_summary", id(self)),
+            on_success=lambda summary: self.on_summary(generation, summary),
+            on_error=lambda error: self.on_error(generation, error),
+        )
+
+    def on_summary(self, generation, summary):
+        """
+        Übernimmt Anzahl, Seitengrenzen und Fusszeilen und lädt die sichtbaren Seiten.
+        """
+        if generation != self.generation:
+            return
+        self.total, self.boundaries, self.footer = summary
+        self.schedule_render()
+
+    def on_error(self, generation, error):
+        """
+        Gibt einen Ladefehler aus und zeigt ihn in der Treeview an.
+        """
+        print(f"Fehler beim Laden der Zeilen: {error}")
+        if generation != self.generation:
+            return
+        self.footer = [(("Fehler beim Laden",), ())]
+        self.schedule_render()
+
+    @property
+    def length(self):
+        """
+        Gesamtzahl der Zeilen inklusive Fusszeilen.
+        """
+        return self.total + len(self.footer)
+
+    def row(self, index):
+        """
+        Gibt Werte und Tags einer Zeile zurück (Platzhalter, solange ihre Seite noch nicht geladen ist).
+        """
+        if index >= self.total:
+            return self.footer[index - self.total]
+        page = index // self.page_size
+        rows = self.pages.get(page)
+        if rows is None or index % self.page_size >= len(rows):
+            return (ERROR_VALUES if page in self.failed else LOADING_VALUES), ()
+        return rows[index % self.page_size], ()
+
+    def schedule_render(self):
+        """
+        Plant eine Aktualisierung der Anzeige; mehrere Aufrufe werden zu einer zusammengefasst.
+        """
+        if self.render_job is None:
+            self.render_job = self.tree.after_idle(self.render)
+
+    def render(self):
+        """
+        Schreibt die sichtbaren Zeilen in die Treeview, setzt die Scrollbar und lädt fehlende Seiten.
+
+        - Bestehende Elemente werden wiederverwendet; nur bei einer geänderten Anzahl sichtbarer Zeilen werden
+          Elemente ergänzt oder entfernt.
+        - Fehlgeschlagene Seiten im sichtbaren Bereich werden erst beim nächsten Scrollen erneut geladen.
+        """
+        self.render_job = None
+        if not self.tree.winfo_exists():
+            return
+
+        length = self.length
+        self.offset = max(0, min(self.offset, length - self.visible))
+        count = max(0, min(self.visible, length - self.offset))
+
+        items = self.tree.get_children()
+        for position in range(count):
+            values, tags = self.row(self.offset + position)
+            if position < len(items):
+                self.tree.item(items[position], values=values, tags=tags)
+            else:
+                self.tree.insert("", "end", values=values, tags=tags)
+        if len(items) > count:
+            self.tree.delete(*items[count:])
+
+        if length:
+            self.scrollbar.set(self.offset / length, (self.offset + count) / length)
+        else:
+            self.scrollbar.set(0, 1)
+        self.request_pages()
+
+    def request_pages(self):
+        """
+        Lädt die Seiten des sichtbaren Bereichs und des Vorlaufs und verwirft weit entfernte Seiten.
+        """
+        if not self.total or self.page_func is None:
+            return
+        first = max(0, self.offset - self.prefetch) // self.page_size
+        last = min(self.total - 1, self.offset + self.visible + self.prefetch) // self.page_size
+
+        for page in [page for page in self.pages if page < first - 1 or page > last + 1]:
+            del self.pages[page]
+
+        for page in range(first, last + 1):
+            if page not in self.pages and page not in self.pending:
+                self.fetch_page(page)
+
+    def fetch_page(self, page):
+        """
+        Lädt eine Seite im Hintergrund.
+
+        Args:
+            page (int): Die Seitennummer.
+        """
+        generation = self.generation
+        after_key = self.boundaries[page - 1] if page > 0 else None
+        self.pending.add(page)
+        submit(
+            self.page_func,
+            after_key,
+            self.page_size,
+            key=("virtual_page", id(self), page),
+            on_success=lambda rows: self.on_page(generation, page, rows),
+            on_error=lambda error: self.on_page_error(generation, page, error),
+        )
+
+    def on_page(self, generation, page, rows):
+        """
+        Übernimmt eine geladene Seite und aktualisiert die Anzeige.
+        """
+        if generation != self.generation:
+            return
+        self.pending.discard(page)
+        self.failed.discard(page)
+        self.pages[page] = rows
+        self.schedule_render()
+
+    def on_page_error(self, generation, page, error):
+        """
+        Gibt einen Fehler beim Laden einer Seite aus und markiert ihre Zeilen.
+
+        - Die Seite gilt nicht mehr als ausstehend und wird beim nächsten Rendern (z.B. nach dem Scrollen) erneut
+          angefordert; die Fusszeilen bleiben erhalten.
+        """
+        print(f"Fehler beim Laden der Seite {page}: {error}")
+        if generation != self.generation:
+            return
+        self.pending.discard(page)
+        self.failed.add(page)
+        self.render_rows()
+
+    def render_rows(self):
+        """
+        Schreibt die Werte der sichtbaren Zeilen neu, ohne Seiten anzufordern.
+        """
+        if not self.tree.winfo_exists():
+            return
+        for position, item in enumerate(self.tree.get_children()):
+            values, tags = self.row(self.offset + position)
+            self.tree.item(item, values=values, tags=tags)
+
+    def scroll_to(self, offset):
+        """
+        Verschiebt den sichtbaren Ausschnitt auf eine Zeile.
+
+        Args:
+            offset (int): Index der obersten sichtbaren Zeile.
+        """
+        offset = max(0, min(int(offset), self.length - self.visible))
+        if offset != self.offset:
+            self.offset = offset
+            self.tree.selection_remove(self.tree.selection())
+            self.schedule_render()
+
+    def yview(self, *args):
+        """
+        Verarbeitet die Befehle der Scrollbar (`moveto` und `scroll`).
+        """
+        if not args:
+            return
+        if args[0] == "moveto":
+            self.scroll_to(float(args[1]) * self.length)
+        elif args[0] == "scroll":
+            step = self.visible if len(args) > 2 and args[2] == "pages" else 1
+            self.scroll_to(self.offset + int(float(args[1])) * step)
+
+    def on_resize(self, event):
+        """
+        Passt die Anzahl sichtbarer Zeilen an die Höhe der Treeview an.
+        """
+        visible = max(1, event.height // ROW_HEIGHT - 1)    # Eine Zeile für die Überschriften
+        if visible != self.visible:
+            self.visible = visible
+            self.schedule_render()
+
+    def on_mouse_wheel(self, event):
+        """
+        Scrollt mit dem Mausrad um drei Zeilen.
+        """
+        if event.num == 4 or getattr(event, "delta", 0) > 0:
+            self.scroll_to(self.offset - 3)
+        else:
+            self.scroll_to(self.offset + 3)
+        return "break"
+
+    def on_key(self, event):
+        """
+        Scrollt mit den Pfeil- und Bildtasten, sobald die Auswahl den Rand des sichtbaren Bereichs erreicht.
+        """
+        items = self.tree.get_children()
+        focus = self.tree.focus()
+        if event.keysym == "Prior":
+            self.scroll_to(self.offset - self.visible)
+            return "break"
+        if event.keysym == "Next":
+            self.scroll_to(self.offset + self.visible)
+            return "break"
+        if not items:
+            return None
+        if event.keysym == "Up" and focus == items[0]:
+            self.scroll_to(self.offset - 1)
+            return "break"
+        if event.keysym == "Down" and focus == items[-1]:
+            self.scroll_to(self.offset + 1)
+            return "break"
+        return None
@@ -15,7 +15,7 @@ Verwendung:
     print(sia_phases)
 """
 
-from db.db_connection import create_connection
+from features import feature_reference_cache as reference_cache
 
 def load_sia_phases():
     """
@@ -26,7 +26,7 @@ def load_sia_phases():
 
     Datenbankabfrage:
     -----------------
-    - Ruft die Spalte `phase_name` aus der Tabelle `sia_phases` ab.
+    - Liest die Phasen über den Referenzdaten-Cache (`feature_reference_cache`), sortiert nach Phasennummer.
 
     Fehlerbehandlung:
     ------------------
@@ -37,12 +37,8 @@ def load_sia_phases():
         sia_phases = load_sia_phases()
         # Ergebnis: ["Vorstudien", "Projektierung", "Ausschreibung", "Realisierung"]
     """
-    connection = create_connection()
-    phases = []
-    if connection:
-        cursor = connection.cursor()
-        cursor.execute("SELECT phase_name FROM sia_phases")
-        phases = cursor.fetchall()
-        cursor.close()
-        connection.close()
-    return [phase[0] for phase in phases]  # Rückgabe einer Liste von Phasen
\ No newline at end of file
+    try:
+        return reference_cache.phase_names()  # Rückgabe einer Liste von Phasen
+    except Exception as e:
+        print(f"Fehler beim Laden der SIA-Phasen: {e}")
+        return []
\ No newline at end of file
@@ -24,6 +24,8 @@ Verwendung:
 """
 
 import customtkinter as ctk
+from db.db_executor import init_executor
+from db.db_listener import start_listener
 from gui.admin.gui_project_frame import ProjectFrame
 from gui.admin.gui_users_frame import UserFrame
 from gui.admin.gui_admin_selected_frame import SelectedFrame
@@ -124,6 +126,8 @@ def start_admin_gui(username, user_id):
     """
     try:
         root = ctk.CTk()
+        init_executor(root)     # Executor und Listener vom zerstörten Login-Fenster übernehmen
+        start_listener(root)
         admin_gui = AdminGUI(root, username, user_id)
         root.mainloop()
     except Exception as e:
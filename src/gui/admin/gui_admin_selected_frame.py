@@ -3,6 +3,9 @@ Modul: SelectedFrame für TimeArch.
 
 Dieses Modul stellt die grafische Benutzeroberfläche für die Anzeige und Bearbeitung von Projekten oder Benutzerdetails bereit.
 Es unterstützt die Anzeige von Projektphasen, zugehörigen Benutzern und Diagrammen sowie die Verwaltung von Benutzergrundinformationen.
+Die Frames der Projekt- und der Benutzeransicht werden beim ersten Gebrauch einmal erstellt. Bei jeder weiteren
+Auswahl werden sie nur an die neue Projektnummer bzw. Benutzer-ID gebunden (`rebind`) und laden ihre Daten neu;
+Widgets und Diagramm-Figuren bleiben erhalten.
 
 Klassen:
 --------
@@ -11,12 +14,15 @@ Klassen:
 Methoden:
 ---------
 - __init__(self, master, user_id=None, selected_id=None, selected_name=None, description=None): Initialisiert das SelectedFrame mit den übergebenen Parametern.
-- clear_widgets(self): Entfernt alle Widgets im Frame.
+- show_content(self, *widgets): Blendet die angegebenen Frames ein und alle übrigen Inhalts-Frames aus.
 - create_widgets(self): Erstellt die Standard-Widgets (Titel und Beschreibung).
 - create_title_label(self): Erstellt das Titel-Label für das SelectedFrame.
 - create_description_label(self): Erstellt das Beschreibungs-Label für das SelectedFrame.
 - update_project_details(self, selected_id, selected_name, description=None): Aktualisiert die Details und Widgets für ein ausgewähltes Projekt.
 - update_user_details(self, selected_user_id, selected_username): Aktualisiert die Details und Widgets für einen ausgewählten Benutzer.
+- create_project_widgets(self, project_number): Erstellt die Frames der Projektansicht.
+- create_user_widgets(self, user_id): Erstellt die Frames der Benutzeransicht.
+- refresh_user_diagrams(self): Lädt die Diagramme des ausgewählten Benutzers neu.
 
 Verwendung:
 -----------
@@ -37,6 +43,7 @@ from features.feature_diagram_vacation import VacationDiagram
 from features.feature_diagram_employment_percentage import EmploymentPercentageDiagram
 from features.feature_diagram_total_hours import DiagramTotalHours
 from gui.gui_appearance_color import appearance_color, get_default_styles
+from db.db_listener import subscribe
 
 class SelectedFrame(ctk.CTkFrame):
     """
@@ -65,8 +72,16 @@ class SelectedFrame(ctk.CTkFrame):
         self.selected_name = selected_name
         self.description = description
         self.soll_stunden_entries = {}
+        self.selected_user_id = None
+        self.content_widgets = []   # Einmal erstellte Frames der Projekt- und Benutzeransicht
+        self.diagram_frame = None   # Diagramm der aktuellen Ansicht (None, falls keines angezeigt wird)
         self.sia_phases_frame = None
+        self.sia_placeholder_frame = None
         self.user_to_project_frame = None
+        self.stunden_uebersicht_project_frame = None
+        self.project_diagram = None
+        self.grundinfos_user_frame = None
+        self.user_diagram_frame = None
         
         self.create_widgets()
         
@@ -79,12 +94,20 @@ class SelectedFrame(ctk.CTkFrame):
             self.grid_columnconfigure(col, weight=1)
             
 
-    def clear_widgets(self):
+    def show_content(self, *widgets):
         """
-        Entfernt alle Widgets aus dem Frame.
+        Blendet die angegebenen Frames ein und alle übrigen Inhalts-Frames aus.
+
+        Args:
+            *widgets: Die anzuzeigenden Frames (aus `content_widgets`).
+
+        - Ausgeblendete Frames behalten ihre Grid-Optionen (`grid_remove`) und werden nicht zerstört.
         """
-        for widget in self.winfo_children():
-            widget.destroy()
+        for widget in self.content_widgets:
+            if widget not in widgets:
+                widget.grid_remove()
+        for widget in widgets:
+            widget.grid()
 
     def create_widgets(self):
         """
@@ -124,10 +147,10 @@ class SelectedFrame(ctk.CTkFrame):
             selected_id (str): Die Projektnummer des ausgewählten Projekts.
             selected_name (str): Der Name des ausgewählten Projekts.
             description (str, optional): Die Beschreibung des ausgewählten Projekts.
+
+        - Beim ersten Aufruf werden die Frames erstellt, danach nur an das neue Projekt gebunden.
+        - Für "0000" (interne Aufgaben) werden keine Soll-Stunden und kein Projektdiagramm angezeigt.
         """
-        self.clear_widgets()
-        self.create_widgets()
-        
         self.selected_id = selected_id
         self.selected_name = selected_name
         self.description = description        
@@ -135,24 +158,65 @@ class SelectedFrame(ctk.CTkFrame):
         self.title_label.configure(text=f"{selected_id} - {selected_name}")
         self.description_label.configure(text=self.description if self.description else "")
 
+        if self.stunden_uebersicht_project_frame is None:
+            self.create_project_widgets(selected_id)
+        else:
+            self.user_to_project_frame.rebind(selected_id)
+            self.stunden_uebersicht_project_frame.rebind(selected_id)
+
         if selected_id != "0000":
-            self.sia_phases_frame = SIAPhasenSollStundenFrame(self, project_number=selected_id)
-            self.sia_phases_frame.grid(row=2, columnspan=4, padx=10, pady=10, sticky="nsew")
+            if self.sia_phases_frame is None:
+                self.sia_phases_frame = SIAPhasenSollStundenFrame(self, project_number=selected_id)
+                self.sia_phases_frame.grid(row=2, columnspan=4, padx=10, pady=10, sticky="nsew")
+                self.content_widgets.append(self.sia_phases_frame)
+            else:
+                self.sia_phases_frame.rebind(selected_id)
+
+            if self.project_diagram is None:
+                self.project_diagram = AdminProjectDiagram(self, project_number=selected_id, filter_frame=self.stunden_uebersicht_project_frame)
+                self.project_diagram.grid(row=4, columnspan=4, padx=10, pady=10, sticky="nsew")
+                self.content_widgets.append(self.project_diagram)
+            else:
+                self.project_diagram.rebind(selected_id)
+
+            self.diagram_frame = self.project_diagram
+            self.show_content(
+                self.sia_phases_frame,
+                self.user_to_project_frame,
+                self.stunden_uebersicht_project_frame,
+                self.project_diagram,
+            )
         else:
-            self.sia_phases_frame = ctk.CTkFrame(self, fg_color=self.colors["alt_background"])
-            self.sia_phases_frame.grid(row=2, columnspan=4, padx=10, pady=10, sticky="nsew")
-        
-        self.user_to_project_frame = UserToProjectFrame(self, project_number=selected_id)
+            self.diagram_frame = None
+            self.show_content(
+                self.sia_placeholder_frame,
+                self.user_to_project_frame,
+                self.stunden_uebersicht_project_frame,
+            )
+
+    def create_project_widgets(self, project_number):
+        """
+        Erstellt die Frames der Projektansicht, die unabhängig von der Projektnummer immer angezeigt werden.
+
+        Args:
+            project_number (str): Die Projektnummer des ersten ausgewählten Projekts.
+
+        - Soll-Stunden-Frame und Projektdiagramm werden erst für das erste Projekt ausser "0000" erstellt.
+        """
+        self.sia_placeholder_frame = ctk.CTkFrame(self, fg_color=self.colors["alt_background"])
+        self.sia_placeholder_frame.grid(row=2, columnspan=4, padx=10, pady=10, sticky="nsew")
+
+        self.user_to_project_frame = UserToProjectFrame(self, project_number=project_number)
         self.user_to_project_frame.grid(row=3, column=0, padx=10, pady=10, sticky="nsew")
         
-        self.stunden_uebersicht_project_frame = StundenUebersichtProjectFrame(self, project_number=selected_id)
+        self.stunden_uebersicht_project_frame = StundenUebersichtProjectFrame(self, project_number=project_number)
         self.stunden_uebersicht_project_frame.grid(row=3, column=1, columnspan=3, padx=10, pady=10, sticky="nsew")
-        
-        if selected_id != "0000":
-            self.diagram_frame = AdminProjectDiagram(self, project_number=selected_id, filter_frame=self.stunden_uebersicht_project_frame)
-            self.diagram_frame.grid(row=4, columnspan=4, padx=10, pady=10, sticky="nsew")
-        else:
-            self.diagram_frame = ctk.CTkFrame(self, fg_color=self.colors["alt_background"])
+
+        self.content_widgets.extend([
+            self.sia_placeholder_frame,
+            self.user_to_project_frame,
+            self.stunden_uebersicht_project_frame,
+        ])
 
     def update_user_details(self, selected_user_id, selected_username):
         """
@@ -161,37 +225,76 @@ class SelectedFrame(ctk.CTkFrame):
         Args:
             selected_user_id (int): Die Benutzer-ID des ausgewählten Benutzers.
             selected_username (str): Der Name des ausgewählten Benutzers.
-        """
-        self.clear_widgets()
-        self.create_widgets()
 
+        - Beim ersten Aufruf werden die Frames erstellt, danach nur an den neuen Benutzer gebunden.
+        """
         self.selected_id = selected_user_id
         self.selected_name = selected_username
+        self.selected_user_id = selected_user_id
 
         self.title_label.configure(text=f"{selected_username}")
         self.description_label.configure(text="")
 
-        self.grundinfos_user_frame = GrundInfosUser(self, user_id=selected_user_id)
+        if self.grundinfos_user_frame is None:
+            self.create_user_widgets(selected_user_id)
+        else:
+            self.grundinfos_user_frame.rebind(selected_user_id)
+            self.stunden_uebersicht_user_frame.rebind(selected_user_id)
+            self.vacation_diagram.rebind(selected_user_id)
+            self.employment_percentage_diagram.rebind(selected_user_id)
+            self.total_hours_diagram.rebind(selected_user_id)
+
+        self.diagram_frame = self.user_diagram_frame
+        self.show_content(self.grundinfos_user_frame, self.stunden_uebersicht_user_frame, self.user_diagram_frame)
+
+    def create_user_widgets(self, user_id):
+        """
+        Erstellt die Frames der Benutzeransicht.
+
+        Args:
+            user_id (int): Die Benutzer-ID des ersten ausgewählten Benutzers.
+        """
+        self.grundinfos_user_frame = GrundInfosUser(self, user_id=user_id)
         self.grundinfos_user_frame.grid(row=2, columnspan=4, padx=10, pady=10, sticky="nsew")
 
-        self.stunden_uebersicht_user_frame = StundenUebersichtUserFrame(self, user_id=selected_user_id)
+        self.stunden_uebersicht_user_frame = StundenUebersichtUserFrame(self, user_id=user_id)
         self.stunden_uebersicht_user_frame.grid(row=3, columnspan=4, padx=10, pady=10, sticky="nsew")
 
-        self.diagram_frame = ctk.CTkFrame(self, fg_color=self.colors["background"])
-        self.diagram_frame.grid(row=4, columnspan=4, padx=10, pady=10, sticky="nsew")
+        self.user_diagram_frame = ctk.CTkFrame(self, fg_color=self.colors["background"])
+        self.user_diagram_frame.grid(row=4, columnspan=4, padx=10, pady=10, sticky="nsew")
         
-        self.vacation_diagram = VacationDiagram(self.diagram_frame, user_id=selected_user_id)
+        self.vacation_diagram = VacationDiagram(self.user_diagram_frame, user_id=user_id)
         self.vacation_diagram.grid(row=0, column=0, sticky="nsew")
         
-        self.employment_percentage_diagram = EmploymentPercentageDiagram(self.diagram_frame, user_id=selected_user_id)
+        self.employment_percentage_diagram = EmploymentPercentageDiagram(self.user_diagram_frame, user_id=user_id)
         self.employment_percentage_diagram.grid(row=0, column=1, sticky="nsew")
         
-        self.total_hours_diagram = DiagramTotalHours(self.diagram_frame, user_id=selected_user_id)
+        self.total_hours_diagram = DiagramTotalHours(self.user_diagram_frame, user_id=user_id)
         self.total_hours_diagram.grid(row=0, column=2, sticky="nsew")
         
-        self.diagram_frame.grid_rowconfigure(0, weight=1)
+        self.user_diagram_frame.grid_rowconfigure(0, weight=1)
         for col in range(3):
-            self.diagram_frame.grid_columnconfigure(col, weight=1)
-        
-            
-            
+            self.user_diagram_frame.grid_columnconfigure(col, weight=1)
+
+        self.content_widgets.extend([
+            self.grundinfos_user_frame,
+            self.stunden_uebersicht_user_frame,
+            self.user_diagram_frame,
+        ])
+
+        # Diagramme bei Änderungen anderer Clients neu laden
+        subscribe(self.user_diagram_frame, ["time_entries", "user_settings"], self.refresh_user_diagrams, user_id=lambda: self.selected_user_id)
+
+    def refresh_user_diagrams(self):
+        """
+        Lädt die Diagramme des ausgewählten Benutzers neu.
+
+        - Wird von `db_listener` aufgerufen, wenn sich Zeiteinträge oder Einstellungen des Benutzers ändern,
+          und nach dem Speichern der Grundinformationen.
+        - Ist die Benutzeransicht ausgeblendet, wird nichts geladen; die Diagramme laden beim nächsten `rebind`.
+        """
+        if self.diagram_frame is not self.user_diagram_frame:
+            return
+        self.vacation_diagram.load_vacation_data()
+        self.employment_percentage_diagram.load_data()
+        self.total_hours_diagram.load_data()
@@ -0,0 +1,212 @@
+"""
+Modul: Export-Fortschrittsfenster für TimeArch.
+
+Dieses Modul führt einen Excel-Export in einem Hintergrund-Thread aus und zeigt dessen Fortschritt an.
+Die Admin-GUI bleibt während grosser Exporte bedienbar; der Export kann jederzeit abgebrochen werden.
+
+Klassen:
+--------
+- ExportWindow: Fenster mit Fortschrittsanzeige und Abbrechen-Button für einen laufenden Export.
+
+Methoden:
+---------
+- __init__(self, master, export_type, identifier, file_path): Initialisiert das Fenster und startet den Export.
+- create_widgets(self): Erstellt Beschriftungen, Fortschrittsbalken und Abbrechen-Button.
+- run_export(self): Führt den Export im Hintergrund-Thread aus.
+- poll_queue(self): Übernimmt Fortschritt und Ergebnis des Hintergrund-Threads im Tk-Hauptthread.
+- finish(self, kind, value): Schliesst das Fenster und meldet das Ergebnis.
+- set_connection(self, conn): Merkt sich die Verbindung des Hintergrund-Threads (für den Abbruch).
+- cancel_export(self): Bricht den laufenden Export ab.
+
+Verwendung:
+-----------
+    from gui.admin.gui_export_window import ExportWindow
+    from features.feature_export import ask_export_path
+
+    file_path = ask_export_path()
+    if file_path:
+        ExportWindow(master, "user", user_id, file_path)
+
+Hinweis:
+--------
+- Der Hintergrund-Thread greift nie auf Tk-Objekte zu. Fortschritt und Ergebnis werden über eine Queue
+  übergeben und mit `after()` im Hauptthread ausgewertet.
+- Abbrechen unterbricht auch eine laufende Abfrage (`conn.cancel()`), nicht erst den nächsten Block.
+"""
+
+import queue
+import threading
+import customtkinter as ctk
+from tkinter import messagebox
+from features.feature_export import write_export, ExportCancelled
+from gui.gui_appearance_color import appearance_color, get_default_styles
+
+POLL_INTERVAL_MS = 100      # Intervall, in dem der Hauptthread die Queue abfragt
+
+class ExportWindow(ctk.CTkToplevel):
+    """
+    Fenster, das einen Excel-Export im Hintergrund ausführt.
+
+    Funktionen:
+    - Anzeige der gelesenen und geschriebenen Zeilen
+    - Abbrechen des laufenden Exports
+    """
+    def __init__(self, master, export_type, identifier, file_path):
+        """
+        Initialisiert das Fenster und startet den Export im Hintergrund.
+
+        Args:
+            master (ctk.CTkFrame): Das übergeordnete Widget.
+            export_type (str): Typ des Exports ('user' oder 'project').
+            identifier (str): Benutzer-ID oder Projektnummer.
+            file_path (str): Pfad der Zieldatei.
+        """
+        self.colors = appearance_color()
+        self.styles = get_default_styles()
+
+        super().__init__(master)
+        self.title("Export")
+        self.geometry("400x200")
+        self.configure(fg_color=self.colors["background"])
+        self.protocol("WM_DELETE_WINDOW", self.cancel_export)
+
+        self.export_type = export_type
+        self.identifier = identifier
+        self.file_path = file_path
+        self.messages = queue.Queue()
+        self.cancel_event = threading.Event()
+        self.connection = None                  # Verbindung des Hintergrund-Threads, solange sie ausgeliehen ist
+        self.connection_lock = threading.Lock()
+
+        self.create_widgets()
+
+        self.worker = threading.Thread(target=self.run_export, daemon=True)
+        self.worker.start()
+        self.after(POLL_INTERVAL_MS, self.poll_queue)
+
+    def create_widgets(self):
+        """
+        Erstellt Beschriftungen, Fortschrittsbalken und Abbrechen-Button.
+        """
+        title_label = ctk.CTkLabel(self, text="Export läuft...", **self.styles["subtitle"])
+        title_label.pack(padx=10, pady=10)
+
+        self.progress_bar = ctk.CTkProgressBar(self, progress_color=self.colors["primary"])
+        self.progress_bar.set(0)
+        self.progress_bar.pack(padx=20, pady=5, fill="x")
+
+        self.status_label = ctk.CTkLabel(self, text="Abfrage wird ausgeführt...", **self.styles["text"])
+        self.status_label.pack(padx=10, pady=5)
+
+        self.cancel_button = ctk.CTkButton(
+            self,
+            text="Abbrechen",
+            command=self.cancel_export,
+            **self.styles["button_error"],
+        )
+        self.cancel_button.pack(padx=10, pady=10)
+
+    def run_export(self):
+        """
+        Führt den Export im Hintergrund-Thread aus.
+
+        Details:
+        --------
+        - Legt Fortschritt ("progress"), Ergebnis ("done"), Abbruch ("cancelled") und Fehler ("error")
+          als Nachrichten in die Queue.
+        """
+        try:
+            row_count = write_export(
+                self.file_path,
+                self.export_type,
+                self.identifier,
+                progress=lambda fetched, written, total: self.messages.put(("progress", (fetched, written, total))),
+                cancel_event=self.cancel_event,
+                on_connection=self.set_connection,
+            )
+            self.messages.put(("done", row_count))
+        except ExportCancelled:
+            self.messages.put(("cancelled", None))
+        except Exception as e:
+            # Nach `conn.cancel()` kann auch ein Folgefehler der abgebrochenen Abfrage ankommen
+            self.messages.put(("cancelled", None) if self.cancel_event.is_set() else ("error", e))
+
+    def set_connection(self, conn):
+        """
+        Merkt sich die Verbindung des Hintergrund-Threads (None, sobald sie in den Pool zurückgeht).
+
+        Args:
+            conn (psycopg2.extensions.connection): Die Verbindung oder None.
+        """
+        with self.connection_lock:
+            self.connection = conn
+
+    def poll_queue(self):
+        """
+        Übernimmt Fortschritt und Ergebnis des Hintergrund-Threads im Tk-Hauptthread.
+
+        Fehlerbehandlung:
+        ------------------
+        - Zeigt eine Fehlermeldung an, falls der Export fehlgeschlagen ist.
+        """
+        progress = None
+        try:
+            while True:
+                kind, value = self.messages.get_nowait()
+                if kind == "progress":
+                    progress = value
+                    continue
+                self.finish(kind, value)
+                return
+        except queue.Empty:
+            pass
+
+        # Nur den neuesten Fortschritt anzeigen; die Gesamtzahl ist eine Schätzung und kann überschritten werden
+        if progress:
+            fetched, written, total = progress
+            if total:
+                self.progress_bar.set(min(written / total, 1))
+                self.status_label.configure(text=f"Gelesen: {fetched} / ca. {max(total, fetched)}   Geschrieben: {written}")
+            else:
+                self.status_label.configure(text=f"Gelesen: {fetched} Zeilen   Geschrieben: {written}")
+
+        self.after(POLL_INTERVAL_MS, self.poll_queue)
+
+    def finish(self, kind, value):
+        """
+        Schliesst das Fenster und meldet das Ergebnis des Exports.
+
+        Args:
+            kind (str): "done", "cancelled" oder "error".
+            value: Anzahl exportierter Zeilen bzw. die aufgetretene Ausnahme.
+        """
+        self.destroy()
+        if kind == "done":
+            messagebox.showinfo("Erfolg", f"{value} Datensätze erfolgreich exportiert: {self.file_path}")
+        elif kind == "cancelled":
+            messagebox.showinfo("Abgebrochen", "Der Export wurde abgebrochen.")
+        else:
+            messagebox.showerror("Fehler", f"Fehler beim Exportieren: {value}")
+
+    def cancel_export(self):
+        """
+        Bricht den laufenden Export ab.
+
+        - Eine laufende Abfrage wird über `conn.cancel()` abgebrochen (psycopg2 erlaubt das aus einem anderen
+          Thread); sonst beendet der Hintergrund-Thread den Export nach dem aktuellen Block.
+        - Es wird keine Datei gespeichert.
+
+        Fehlerbehandlung:
+        ------------------
+        - Gibt eine Meldung aus, falls die Abbruchanfrage nicht gesendet werden kann; der Export endet dann
+          nach der aktuellen Abfrage.
+        """
+        self.cancel_event.set()
+        with self.connection_lock:
+            if self.connection is not None:
+                try:
+                    self.connection.cancel()
+                except Exception as e:
+                    print(f"Fehler beim Abbrechen der Exportabfrage: {e}")
+        self.cancel_button.configure(state="disabled")
+        self.status_label.configure(text="Export wird abgebrochen...")
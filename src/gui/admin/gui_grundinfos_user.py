@@ -9,14 +9,26 @@ Klassen:
 --------
 - GrundInfosUser: Hauptklasse für die Anzeige und Bearbeitung der Benutzergrundinformationen.
 
+Funktionen:
+-----------
+- fetch_user_settings(user_id): Liest die Einstellungen eines Benutzers (läuft im Hintergrund).
+- store_user_settings(user_id, default_hours, percentage, vacation_hours, start_date): Speichert die Einstellungen
+  eines Benutzers (läuft im Hintergrund).
+
 Methoden:
 ---------
 - __init__(self, master, user_id=None): Initialisiert das Grundinformationen-Frame mit dem übergeordneten Fenster und Benutzer-ID.
 - create_widgets(self): Erstellt die Widgets für die Anzeige und Bearbeitung der Benutzergrundinformationen.
-- save_user_settings(self): Speichert die aktualisierten Benutzerinformationen in der Datenbank.
-- load_user_settings(self): Lädt die Benutzerinformationen aus der Datenbank.
+- save_user_settings(self): Speichert die aktualisierten Benutzerinformationen im Hintergrund.
+- on_settings_saved(self, error): Meldet das Ergebnis des Speicherns.
+- load_user_settings(self): Lädt die Benutzerinformationen im Hintergrund.
+- show_user_settings(self, result): Zeigt die geladenen Benutzerinformationen an.
+- on_load_error(self, error): Meldet einen Fehler beim Laden.
+- set_busy(self, busy, text=""): Zeigt an, dass Daten geladen oder gespeichert werden.
+- on_database_change(self): Lädt die Benutzerinformationen nach einer Änderung in der Datenbank neu.
 - toggle_entries(self, state="normal"): Aktiviert oder deaktiviert die Eingabefelder.
 - edit_user_settings(self): Aktiviert die Bearbeitung der Benutzerinformationen.
+- rebind(self, user_id): Zeigt die Grundinformationen eines anderen Benutzers in den bestehenden Widgets an.
 
 Verwendung:
 -----------
@@ -29,8 +41,78 @@ Verwendung:
 import customtkinter as ctk
 from datetime import date
 from tkinter import messagebox
-from db.db_connection import create_connection
+from db.db_connection import connection
+from db.db_work_calendar import ensure_work_calendar
+from features.feature_date_range import parse_date
+from features import feature_reference_cache as reference_cache
 from gui.gui_appearance_color import appearance_color, get_default_styles
+from db.db_listener import subscribe
+from db.db_executor import submit
+
+def fetch_user_settings(user_id):
+    """
+    Liest die Einstellungen eines Benutzers.
+
+    Args:
+        user_id (int): Die Benutzer-ID.
+
+    Returns:
+        tuple: (Stunden pro Tag, Stellenprozent, Ferienstunden, Startdatum) oder None, falls keine Einstellungen existieren.
+
+    Hinweis:
+    --------
+    - Wird über `db_executor.submit` in einem Worker-Thread ausgeführt und greift nicht auf Tk zu.
+    """
+    with connection() as cursor:
+        query = """
+        SELECT default_hours_per_day, employment_percentage, vacation_hours, start_date
+        FROM user_settings
+        WHERE user_id = %s
+        """
+        cursor.execute(query, (user_id,))
+        return cursor.fetchone()
+
+def store_user_settings(user_id, default_hours, percentage, vacation_hours, start_date):
+    """
+    Aktualisiert die Einstellungen eines Benutzers oder legt sie an.
+
+    Args:
+        user_id (int): Die Benutzer-ID.
+        default_hours (float): Arbeitsstunden pro Tag.
+        percentage (float): Stellenprozent.
+        vacation_hours (float): Ferienstunden pro Jahr.
+        start_date (date): Das Startdatum.
+
+    Hinweis:
+    --------
+    - Wird über `db_executor.submit` in einem Worker-Thread ausgeführt und greift nicht auf Tk zu.
+    - Ergänzt den Arbeitskalender um das Jahr des Startdatums und verwirft die zwischengespeicherten Einstellungen.
+    """
+    with connection() as cursor:
+        check_query = "SELECT COUNT (*) FROM user_settings WHERE user_id = %s"
+        cursor.execute(check_query, (user_id,))
+        exists = cursor.fetchone()[0] > 0
+        if exists:
+            update_query = """
+            UPDATE user_settings
+            SET default_hours_per_day = %s,
+                employment_percentage = %s,
+                vacation_hours = %s,
+                start_date = %s
+            WHERE user_id = %s
+            """
+            cursor.execute(update_query, (default_hours, percentage, vacation_hours, start_date, user_id))
+        else:
+            insert_query = """
+            INSERT INTO user_settings (user_id, default_hours_per_day, employment_percentage, vacation_hours, start_date)
+            VALUES (%s, %s, %s, %s, %s)
+            """
+            cursor.execute(insert_query, (user_id, default_hours, percentage, vacation_hours, start_date))
+
+        # Kalender um das Jahr des Startdatums ergänzen, sonst fehlen der Stundenbilanz die Arbeitstage
+        ensure_work_calendar(cursor, extra_years=[start_date.year])
+
+    reference_cache.invalidate(reference_cache.USER_SETTINGS)
 
 class GrundInfosUser(ctk.CTkFrame):
     """
@@ -55,9 +137,11 @@ class GrundInfosUser(ctk.CTkFrame):
         super().__init__(master, corner_radius=10, fg_color=self.colors["alt_background"])
         
         self.user_id = user_id
+        self.is_editable = False
         self.create_widgets()
         if self.user_id:
             self.load_user_settings()   # Vorhandene Daten laden oder Standardwerte setzen
+        subscribe(self, ["user_settings"], self.on_database_change, user_id=lambda: self.user_id)
         
     def create_widgets(self):
         """
@@ -122,64 +206,62 @@ class GrundInfosUser(ctk.CTkFrame):
     
     def save_user_settings(self):
         """
-        Speichert die Benutzerinformationen in der Datenbank.
+        Speichert die Benutzerinformationen im Hintergrund in der Datenbank.
 
-        - Aktualisiert oder fügt neue Einträge in der Tabelle `user_settings` hinzu.
-        - Berechnet Ferientage in Stunden und speichert sie entsprechend.
-        - Zeigt eine Erfolgsmeldung bei erfolgreichem Speichern an.
+        - Aktualisiert oder fügt neue Einträge in der Tabelle `user_settings` hinzu (`store_user_settings`).
+        - Bis zum Abschluss sind die Buttons deaktiviert und der Titel zeigt einen Platzhalter an.
 
         Fehlerbehandlung:
         ------------------
-        - Zeigt eine Fehlermeldung an, falls ein Fehler bei der Datenbankabfrage auftritt.
+        - Zeigt eine Fehlermeldung an, falls das Startdatum ungültig ist oder ein Fehler bei der Datenbankabfrage auftritt.
         """
         default_hours = self.hours_entry.get() or 8.5
         percentage = self.percentage_entry.get() or 100
         vacation_days = self.vacation_entry.get() or 20
         vacation_hours = float(vacation_days) * float(default_hours)
-        start_date = self.start_date_entry.get() or date(date.today().year, 1, 1)
-        
-        connection = create_connection()
-        if connection:
-            cursor = connection.cursor()
-            try:
-                check_query = "SELECT COUNT (*) FROM user_settings WHERE user_id = %s"
-                cursor.execute(check_query, (self.user_id,))
-                exists = cursor.fetchone()[0] > 0
-                if exists:
-                    update_query = """
-                    UPDATE user_settings
-                    SET default_hours_per_day = %s,
-                        employment_percentage = %s,
-                        vacation_hours = %s,
-                        start_date = %s
-                    WHERE user_id = %s
-                    """
-                    cursor.execute(update_query, (default_hours, percentage, vacation_hours, start_date, self.user_id))
-                else:
-                    insert_query = """
-                    INSERT INTO user_settings (user_id, default_hours_per_day, employment_percentage, vacation_hours, start_date)
-                    VALUES (%s, %s, %s, %s, %s)
-                    """
-                    cursor.execute(insert_query, (self.user_id, default_hours, percentage, vacation_hours, start_date))
-                    
-                connection.commit()
-                self.toggle_entries(state="normal")
-                messagebox.showinfo("Erfolg", "Einstellungen wurden gespeichert.")
-            except Exception as e:
-                messagebox.showerror("Fehler", str(e))
-            finally:
-                cursor.close()
-                connection.close()
+        try:
+            start_date = parse_date(self.start_date_entry.get()) or date(date.today().year, 1, 1)
+        except Exception as e:
+            messagebox.showerror("Fehler", str(e))
+            return
+
+        self.set_busy(True, "Speichert...")
+        submit(
+            store_user_settings,
+            self.user_id,
+            default_hours,
+            percentage,
+            vacation_hours,
+            start_date,
+            on_success=lambda _: self.on_settings_saved(None),
+            on_error=self.on_settings_saved,
+        )
+
+    def on_settings_saved(self, error):
+        """
+        Meldet das Ergebnis des Speicherns und sperrt die Eingabefelder wieder.
+
+        Args:
+            error (Exception): Die Ausnahme aus `store_user_settings` oder None bei Erfolg.
+        """
+        self.set_busy(False)
+        if error is None:
+            messagebox.showinfo("Erfolg", "Einstellungen wurden gespeichert.")
+        else:
+            messagebox.showerror("Fehler", str(error))
         self.toggle_entries(state="disabled")
-        if self.master.diagram_frame:
-            self.master.diagram_frame.update_chart()
+        self.is_editable = False
+        refresh_user_diagrams = getattr(self.master, "refresh_user_diagrams", None)
+        if refresh_user_diagrams:
+            refresh_user_diagrams()
     
     def load_user_settings(self):
         """
-        Lädt die Benutzerinformationen aus der Datenbank und zeigt sie in den Eingabefeldern an.
+        Lädt die Benutzerinformationen im Hintergrund und zeigt sie in den Eingabefeldern an.
 
-        - Ruft Daten aus der Tabelle `user_settings` ab.
-        - Zeigt Standardwerte an, wenn keine Informationen in der Datenbank gefunden werden.
+        - Ruft Daten aus der Tabelle `user_settings` ab (`fetch_user_settings`).
+        - Bis zum Eintreffen der Daten zeigt der Titel einen Platzhalter an.
+        - Wechselt der Benutzer vor dem Eintreffen, wird das veraltete Ergebnis verworfen.
 
         Fehlerbehandlung:
         ------------------
@@ -188,41 +270,87 @@ class GrundInfosUser(ctk.CTkFrame):
         if not self.user_id:
             messagebox.showerror("Fehler", "Keine Benutzer-ID angegeben.")
             return
-        
-        connection = create_connection()
-        if connection:
-            cursor = connection.cursor()
-            try:
-                query = """
-                SELECT default_hours_per_day, employment_percentage, vacation_hours, start_date
-                FROM user_settings
-                WHERE user_id = %s
-                """
-                cursor.execute(query, (self.user_id,))
-                result = cursor.fetchone()
-                print(f"Result: {result}")
-
-                if result:
-                    start_date = result[3]
-                    # Daten aus der Datenbank anzeigen
-                    self.start_date_entry.insert(0, start_date.strftime("%Y-%m-%d"))
-                    self.hours_entry.insert(0, str(result[0]))
-                    self.percentage_entry.insert(0, str(result[1]))
-                    vacation_days = float(result[2]) / float(result[0])  # Stunden in Tage umrechnen
-                    self.vacation_entry.insert(0, str(vacation_days))
-                else:
-                    # Standardwerte anzeigen
-                    self.start_date_entry.insert(0, date(date.today().year, 1, 1).strftime("%Y-%m-%d"))
-                    self.hours_entry.insert(0, "8.5")
-                    self.percentage_entry.insert(0, "100")
-                    self.vacation_entry.insert(0, "20")
-            except Exception as e:
-                messagebox.showerror("Fehler", str(e))
-            finally:
-                cursor.close()
-                connection.close()
+
+        self.set_busy(True, "Lädt...")
+        submit(
+            fetch_user_settings,
+            self.user_id,
+            key=("user_settings", id(self)),
+            on_success=self.show_user_settings,
+            on_error=self.on_load_error,
+        )
+
+    def show_user_settings(self, result):
+        """
+        Zeigt die geladenen Benutzerinformationen in den Eingabefeldern an.
+
+        Args:
+            result (tuple): (Stunden pro Tag, Stellenprozent, Ferienstunden, Startdatum) oder None.
+
+        - Zeigt Standardwerte an, wenn keine Informationen in der Datenbank gefunden werden.
+        """
+        self.set_busy(False)
+        self.toggle_entries(state="normal")
+        for entry in (self.start_date_entry, self.hours_entry, self.percentage_entry, self.vacation_entry):
+            entry.delete(0, "end")
+
+        if result:
+            start_date = result[3]
+            # Daten aus der Datenbank anzeigen
+            self.start_date_entry.insert(0, start_date.strftime("%Y-%m-%d"))
+            self.hours_entry.insert(0, str(result[0]))
+            self.percentage_entry.insert(0, str(result[1]))
+            vacation_days = float(result[2]) / float(result[0])  # Stunden in Tage umrechnen
+            self.vacation_entry.insert(0, str(vacation_days))
+        else:
+            # Standardwerte anzeigen
+            self.start_date_entry.insert(0, date(date.today().year, 1, 1).strftime("%Y-%m-%d"))
+            self.hours_entry.insert(0, "8.5")
+            self.percentage_entry.insert(0, "100")
+            self.vacation_entry.insert(0, "20")
+        self.toggle_entries(state="disabled")
+
+    def on_load_error(self, error):
+        """
+        Entfernt den Platzhalter und zeigt eine Fehlermeldung an, falls das Laden fehlschlägt.
+
+        Args:
+            error (Exception): Die Ausnahme aus `fetch_user_settings`.
+        """
+        self.set_busy(False)
+        messagebox.showerror("Fehler", str(error))
         self.toggle_entries(state="disabled")
+
+    def set_busy(self, busy, text=""):
+        """
+        Zeigt an, dass Daten im Hintergrund geladen oder gespeichert werden.
+
+        Args:
+            busy (bool): True, solange die Abfrage läuft.
+            text (str): Platzhalter, der hinter dem Titel angezeigt wird.
+
+        - Speichern und Bearbeiten sind währenddessen deaktiviert.
+        """
+        state = "disabled" if busy else "normal"
+        self.save_button.configure(state=state)
+        self.edit_button.configure(state=state)
+        self.title_label.configure(text=f"Grundinformationen ({text})" if busy else "Grundinformationen")
     
+    def on_database_change(self):
+        """
+        Lädt die Benutzerinformationen neu, nachdem sie in der Datenbank geändert wurden.
+
+        - Wird von `db_listener` aufgerufen, z.B. wenn ein anderer Admin die Einstellungen gespeichert hat.
+        - Während der Bearbeitung werden die Eingaben nicht überschrieben.
+        """
+        if self.is_editable or not self.user_id:
+            return
+        self.toggle_entries(state="normal")
+        for entry in (self.start_date_entry, self.hours_entry, self.percentage_entry, self.vacation_entry):
+            entry.delete(0, "end")
+        self.toggle_entries(state="disabled")
+        self.load_user_settings()
+
     def toggle_entries(self, state="normal"):
         """
         Aktiviert oder deaktiviert die Eingabefelder.
@@ -244,3 +372,15 @@ class GrundInfosUser(ctk.CTkFrame):
         self.toggle_entries(state="normal")
         self.is_editable = True
 
+    def rebind(self, user_id):
+        """
+        Zeigt die Grundinformationen eines anderen Benutzers in den bestehenden Widgets an.
+
+        Args:
+            user_id (int): Die neue Benutzer-ID.
+
+        - Eine laufende Bearbeitung wird verworfen; die Eingabefelder werden geleert und neu geladen.
+        """
+        self.user_id = user_id
+        self.is_editable = False
+        self.on_database_change()
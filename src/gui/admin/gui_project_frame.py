@@ -9,13 +9,20 @@ Klassen:
 --------
 - ProjectFrame: Hauptklasse für die Verwaltung von Projekten in der Admin-GUI.
 
+Funktionen:
+-----------
+- fetch_projects(): Liest alle Projekte aus der Datenbank (läuft im Hintergrund).
+
 Methoden:
 ---------
 - __init__(self, master): Initialisiert das Projekt-Frame mit allen erforderlichen Widgets und Layouts.
 - get_selected_project_number(self): Gibt die Nummer und den Namen des aktuell ausgewählten Projekts zurück.
-- load_projects(self): Lädt alle Projekte aus der Datenbank und zeigt sie in der Tabelle an.
+- load_projects(self): Lädt alle Projekte im Hintergrund und zeigt sie in der Tabelle an.
+- show_projects(self, projects): Zeigt die geladenen Projekte in der Tabelle an.
+- on_projects_error(self, error): Entfernt den Platzhalter und meldet einen Fehler beim Laden.
 - open_add_project_window(self): Öffnet das Fenster zum Hinzufügen eines neuen Projekts.
 - open_delete_project_window(self): Öffnet das Fenster zum Löschen eines Projekts und bestätigt die Aktion.
+- open_import_window(self): Importiert Zeiteinträge aus einer CSV-Datei.
 
 Verwendung:
 -----------
@@ -27,11 +34,31 @@ Verwendung:
 
 import customtkinter as ctk
 from tkinter import messagebox, ttk
-from db.db_connection import create_connection
+from db.db_connection import connection
 from features.feature_add_projects import add_project
 from features.feature_delete_project import delete_project, get_selected_project_number
+from features.feature_import import import_time_entries_dialog
 from gui.gui_appearance_color import appearance_color, get_default_styles, apply_treeview_style
+from db.db_listener import subscribe
+from db.db_executor import submit
  
+def fetch_projects():
+    """
+    Liest alle Projekte, sortiert nach Projektnummer.
+
+    Returns:
+        list: Tupel (Projektnummer, Projektname, Beschreibung).
+
+    Hinweis:
+    --------
+    - Wird über `db_executor.submit` in einem Worker-Thread ausgeführt und greift nicht auf Tk zu.
+    """
+    with connection() as cursor:
+        cursor.execute("SELECT project_number, project_name, description FROM projects")
+        projects = cursor.fetchall()
+    projects.sort(key=lambda x: x[0])
+    return projects
+
 class ProjectFrame(ctk.CTkFrame):
     """
     Eine Klasse, die ein GUI-Frame zur Verwaltung von Projekten bereitstellt.
@@ -107,8 +134,18 @@ class ProjectFrame(ctk.CTkFrame):
             **self.styles["button_error"],
         )
         delete_project_button.pack(pady=10, anchor="s")
+
+        # Button zum Importieren von Zeiteinträgen
+        import_button = ctk.CTkButton(
+            master=self,
+            text="Stunden importieren",
+            command=self.open_import_window,
+            **self.styles["button"],
+        )
+        import_button.pack(pady=10, anchor="s")
         
         self.load_projects()
+        subscribe(self, ["projects"], self.load_projects)
         
     def get_selected_project_number(self):
         """
@@ -133,38 +170,48 @@ class ProjectFrame(ctk.CTkFrame):
         
     def load_projects(self):
         """
-        Lädt die Projekte aus der Datenbank und zeigt sie im Treeview an.
+        Lädt die Projekte im Hintergrund und zeigt sie im Treeview an.
 
-        Datenbankabfrage:
-        -----------------
-        - Ruft die Projektnummer, den Projektnamen und die Beschreibung aus der Tabelle `projects` ab.
+        - Bis zum Eintreffen der Daten zeigt das Treeview einen nicht auswählbaren Platzhalter an.
+        - Die Abfrage läuft über `db_executor.submit` (`fetch_projects`); neuere Anfragen ersetzen ältere.
 
         Fehlerbehandlung:
         ------------------
         - Zeigt eine Fehlermeldung an, falls die Datenbankverbindung oder Abfrage fehlschlägt.
         """
+        self.show_projects([("Lädt...", "", "")])
+        self.project_treeview.configure(selectmode="none")  # Platzhalter kann nicht ausgewählt werden
+        submit(
+            fetch_projects,
+            key=("projects", id(self)),
+            on_success=self.show_projects,
+            on_error=self.on_projects_error,
+        )
+
+    def show_projects(self, projects):
+        """
+        Zeigt die geladenen Projekte im Treeview an.
+
+        Args:
+            projects (list): Tupel (Projektnummer, Projektname, Beschreibung).
+        """
         for item in self.project_treeview.get_children():
             self.project_treeview.delete(item)
-            
-        connection = create_connection()
-        if connection:
-            cursor = connection.cursor()
-            try:
-                cursor.execute("SELECT project_number, project_name, description FROM projects")
-                projects = cursor.fetchall()
-                
-                projects.sort(key=lambda x: x[0])
-                
-                for project in projects:
-                    self.project_treeview.insert("", "end", values=(project[0], project[1], project[2]))
-                    
-            except Exception as e:
-                messagebox.showerror("Fehler", f"Fehler beim Laden der Projekte {e}")
-                
-            finally:
-                cursor.close()
-                connection.close()
+        self.project_treeview.configure(selectmode="extended")
+
+        for project in projects:
+            self.project_treeview.insert("", "end", values=(project[0], project[1], project[2]))
                 
+    def on_projects_error(self, error):
+        """
+        Entfernt den Platzhalter und zeigt eine Fehlermeldung an, falls das Laden der Projekte fehlschlägt.
+
+        Args:
+            error (Exception): Die Ausnahme aus der Abfrage.
+        """
+        self.show_projects([])
+        messagebox.showerror("Fehler", f"Fehler beim Laden der Projekte {error}", parent=self)
+
     def open_add_project_window(self):
         """
         Öffnet das Fenster zum Hinzufügen eines neuen Projekts.
@@ -193,4 +240,15 @@ class ProjectFrame(ctk.CTkFrame):
         
         confirmation = messagebox.askyesno("Bestätigung", "Sind Sie sicher, dass Sie dieses Projekt löschen möchten?")
         if confirmation:
-            delete_project(project_number, self.load_projects)
\ No newline at end of file
+            delete_project(project_number, self.load_projects)
+            
+    def open_import_window(self):
+        """
+        Importiert Zeiteinträge aus einer CSV-Datei.
+
+        - Ist ein Projekt ausgewählt, wird es für Dateien ohne Spalte `projektnummer` (Projektexport) verwendet.
+        - Verwendet die Funktion `import_time_entries_dialog` für Dateiauswahl und Rückmeldung; der Import läuft
+          im Hintergrund.
+        """
+        project_number = get_selected_project_number(self.project_treeview)
+        import_time_entries_dialog(default_project=project_number, parent=self)
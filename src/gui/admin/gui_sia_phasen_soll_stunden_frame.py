@@ -14,8 +14,10 @@ Methoden:
 - create_widgets(self): Erstellt die Widgets zur Anzeige und Bearbeitung der Soll-Stunden.
 - save_soll_stunden(self): Speichert die Soll-Stunden in der Datenbank.
 - load_soll_stunden(self): Lädt die Soll-Stunden aus der Datenbank und zeigt sie in den Eingabefeldern an.
+- on_database_change(self): Lädt die Soll-Stunden nach einer Änderung in der Datenbank neu.
 - edit_soll_stunden(self): Aktiviert die Bearbeitung der Soll-Stunden.
 - toggle_entries(self, state="normal"): Aktiviert oder deaktiviert die Eingabefelder basierend auf dem angegebenen Zustand.
+- rebind(self, project_number): Zeigt die Soll-Stunden eines anderen Projekts in den bestehenden Widgets an.
 
 Verwendung:
 -----------
@@ -30,6 +32,7 @@ from features.features_load_sia_phases import load_sia_phases
 from features.feature_save_soll_stunden import save_soll_stunden
 from features.feature_load_soll_stunden import load_soll_stunden
 from gui.gui_appearance_color import appearance_color, get_default_styles
+from db.db_listener import subscribe
 
 class SIAPhasenSollStundenFrame(ctk.CTkFrame):
     """
@@ -54,6 +57,7 @@ class SIAPhasenSollStundenFrame(ctk.CTkFrame):
         self.create_widgets()
         self.is_editable = False
         self.load_soll_stunden()
+        subscribe(self, ["project_sia_phases"], self.on_database_change, project_number=lambda: self.project_number)
 
     def create_widgets(self):
         """
@@ -122,6 +126,18 @@ class SIAPhasenSollStundenFrame(ctk.CTkFrame):
         load_soll_stunden(self)
         self.toggle_entries(state="disabled")
         
+    def on_database_change(self):
+        """
+        Lädt die Soll-Stunden neu, nachdem sie in der Datenbank geändert wurden.
+
+        - Wird von `db_listener` aufgerufen, z.B. wenn ein anderer Admin die Soll-Stunden gespeichert hat.
+        - Während der Bearbeitung werden die Eingaben nicht überschrieben.
+        """
+        if self.is_editable:
+            return
+        self.toggle_entries(state="normal")
+        self.load_soll_stunden()
+
     def edit_soll_stunden(self):
         """
         Aktiviert die Bearbeitung der Soll-Stunden.
@@ -141,3 +157,18 @@ class SIAPhasenSollStundenFrame(ctk.CTkFrame):
         for entry in self.soll_stunden_entries.values():
             entry.configure(state=state)
 
+    def rebind(self, project_number):
+        """
+        Zeigt die Soll-Stunden eines anderen Projekts in den bestehenden Widgets an.
+
+        Args:
+            project_number (str): Die neue Projektnummer.
+
+        - Eine laufende Bearbeitung wird verworfen; die Eingabefelder werden geleert und neu geladen.
+        """
+        self.project_number = project_number
+        self.is_editable = False
+        self.toggle_entries(state="normal")
+        for entry in self.soll_stunden_entries.values():
+            entry.delete(0, "end")
+        self.load_soll_stunden()
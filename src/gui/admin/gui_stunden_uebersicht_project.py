@@ -1,18 +1,39 @@
 """
 Modul: Stundenübersicht für Projekte in TimeArch.
 
-Dieses Modul stellt eine grafische Benutzeroberfläche zur Verwaltung und Anzeige der Stundenübersicht für ein spezifisches Projekt bereit. Es bietet Filtermöglichkeiten für Monat, Jahr, Benutzer und Phase sowie Exportfunktionen.
+Dieses Modul stellt eine grafische Benutzeroberfläche zur Verwaltung und Anzeige der Stundenübersicht für ein spezifisches Projekt bereit. Es bietet Filtermöglichkeiten für Monat, Jahr, Zeitraum (Von/Bis), Benutzer und Phase sowie Exportfunktionen.
 
 Klassen:
 --------
 - StundenUebersichtProjectFrame: Hauptklasse zur Darstellung und Verwaltung der Stundenübersicht.
 
+Funktionen:
+-----------
+- fetch_filter_values(project_number): Liest die Benutzer des Projekts und die Phasen für die Filter (läuft im Hintergrund).
+
 Methoden:
 ---------
 - __init__(self, master, project_number=None): Initialisiert das Frame mit dem Projektkontext.
 - create_widgets(self): Erstellt die Widgets für die Filter- und Stundenanzeige sowie die Exportfunktion.
-- load_filter_values(self): Lädt die Werte für die Filter (Benutzer und Phasen) aus der Datenbank.
-- update_stunden(self): Aktualisiert die Stundenübersicht basierend auf den ausgewählten Filterwerten.
+- load_filter_values(self): Lädt die Werte für die Filter (Benutzer und Phasen) im Hintergrund.
+- show_filter_values(self, values): Füllt die Filter-Comboboxen mit den geladenen Werten.
+- on_filter_values_error(self, error): Gibt die Filter nach einem Fehler beim Laden wieder frei.
+- filter_state(self): Gibt die gewählten Filter als `ProjectFilter` zurück.
+- apply_filter(self, immediate=True): Fordert das Ergebnis der gewählten Filter beim gemeinsamen Datenmodell an.
+- on_filter_change(self, value): Wendet eine geänderte Auswahl verzögert an.
+- on_view_change(self, value): Zeigt das aktuelle Ergebnis in der gewählten Ansicht an.
+- show_view(self, view): Zeigt ein Ergebnis des Datenmodells als Liste oder gruppiert an.
+- export_data(self): Startet den Export im Hintergrund mit Fortschrittsanzeige.
+- rebind(self, project_number): Zeigt die Stunden eines anderen Projekts in den bestehenden Widgets an.
+
+Hinweis:
+--------
+- Die Treeview wird über `VirtualTreeview` seitenweise gefüllt; auch bei zehntausenden Einträgen existieren nur
+  die sichtbaren Zeilen als Treeview-Elemente.
+- In der Ansicht "Gruppiert" zeigt eine zweite Treeview die Zwischensummen (`RollupTreeview`); Zeiteinträge werden
+  erst beim Aufklappen eines Monats geladen.
+- Summen und Zwischensummen stammen aus dem gemeinsamen Datenmodell (`ProjectViewModel`), aus dem auch das
+  Projektdiagramm (`AdminProjectDiagram`) gezeichnet wird: eine Abfrage pro Filterzustand für Tabelle und Diagramm.
 
 Verwendung:
 -----------
@@ -23,12 +44,35 @@ Verwendung:
 """
 
 import customtkinter as ctk
-from db.db_connection import create_connection
+from db.db_executor import submit
+from features import feature_reference_cache as reference_cache
 from gui.gui_appearance_color import appearance_color, get_default_styles, apply_treeview_style
-from features.feature_export import export_to_excel
+from features.feature_export import ask_export_path
+from gui.admin.gui_export_window import ExportWindow
+from features.feature_virtual_treeview import VirtualTreeview, fetch_keyset_index, fetch_keyset_page
+from features.feature_hour_rollup import RollupTreeview, OVERVIEW_FROM, fetch_rollup_leaves
+from features.feature_project_view import PROJECT_SCOPE, ProjectFilter, ProjectViewModel, filter_conditions
 import calendar
 from datetime import datetime
-from tkinter import ttk
+from tkinter import ttk, messagebox
+
+def fetch_filter_values(project_number):
+    """
+    Liest die Werte der Filter für ein Projekt.
+
+    Args:
+        project_number (str): Die Projektnummer.
+
+    Returns:
+        tuple: (Benutzernamen des Projekts, Phasennamen).
+
+    Hinweis:
+    --------
+    - Wird über `db_executor.submit` in einem Worker-Thread ausgeführt und greift nicht auf Tk zu.
+    - Liest über den Referenzdaten-Cache (`feature_reference_cache`).
+    """
+    user_names = sorted({username for _, username in reference_cache.project_users(project_number)})
+    return user_names, reference_cache.phase_names()
 
 class StundenUebersichtProjectFrame(ctk.CTkFrame):
     """
@@ -57,7 +101,7 @@ class StundenUebersichtProjectFrame(ctk.CTkFrame):
         """
         Erstellt die Widgets für die Stundenübersicht.
 
-        - Fügt Filter-Widgets für Monat, Jahr, Benutzer und Phase hinzu.
+        - Fügt Filter-Widgets für Monat, Jahr, Zeitraum (Von/Bis), Benutzer und Phase hinzu.
         - Erstellt ein Treeview zur Anzeige der Stundenübersicht.
         - Fügt Buttons für das Aktualisieren und Exportieren hinzu.
         """
@@ -75,6 +119,7 @@ class StundenUebersichtProjectFrame(ctk.CTkFrame):
         self.month_combo = ctk.CTkComboBox(
             filter_frame,
             values=["Alle"] + list(calendar.month_name)[1:],
+            command=self.on_filter_change,
             **self.styles["combobox"],
         )
         self.month_combo.set("Alle")
@@ -87,6 +132,7 @@ class StundenUebersichtProjectFrame(ctk.CTkFrame):
         self.year_combo = ctk.CTkComboBox(
             filter_frame,
             values= ["Alle"] + [str(year) for year in range(2024, datetime.now().year + 1)],
+            command=self.on_filter_change,
             **self.styles["combobox"],
         )
         self.year_combo.set(str(self.selected_year))
@@ -96,191 +142,283 @@ class StundenUebersichtProjectFrame(ctk.CTkFrame):
         user_label = ctk.CTkLabel(filter_frame, text="Benutzername", **self.styles["text"])
         user_label.grid(row=0, column=2, padx=10, sticky="s")
 
-        self.user_combo = ctk.CTkComboBox(filter_frame, **self.styles["combobox"])
+        self.user_combo = ctk.CTkComboBox(filter_frame, command=self.on_filter_change, **self.styles["combobox"])
         self.user_combo.grid(row=1, column=2, padx=10, pady=10, sticky="nsew")
         
         # Phase-Auswahl
         phase_label = ctk.CTkLabel(filter_frame, text="Phase", **self.styles["text"])
         phase_label.grid(row=0, column=3, padx=10, sticky="s")
 
-        self.phase_combo = ctk.CTkComboBox(filter_frame, **self.styles["combobox"])
+        self.phase_combo = ctk.CTkComboBox(filter_frame, command=self.on_filter_change, **self.styles["combobox"])
         self.phase_combo.grid(row=1, column=3, padx=10, pady=10, sticky="nsew")
 
+        # Von/Bis-Auswahl für beliebige Zeiträume
+        from_label = ctk.CTkLabel(filter_frame, text="Von", **self.styles["text"])
+        from_label.grid(row=2, column=0, padx=10, sticky="s")
+
+        self.from_entry = ctk.CTkEntry(filter_frame, placeholder_text="YYYY-MM-DD", **self.styles["entry"])
+        self.from_entry.grid(row=3, column=0, padx=10, pady=10, sticky="nsew")
+
+        to_label = ctk.CTkLabel(filter_frame, text="Bis", **self.styles["text"])
+        to_label.grid(row=2, column=1, padx=10, sticky="s")
+
+        self.to_entry = ctk.CTkEntry(filter_frame, placeholder_text="YYYY-MM-DD", **self.styles["entry"])
+        self.to_entry.grid(row=3, column=1, padx=10, pady=10, sticky="nsew")
+
+        # Ansicht: flache Liste oder gruppiert mit Zwischensummen
+        view_label = ctk.CTkLabel(filter_frame, text="Ansicht", **self.styles["text"])
+        view_label.grid(row=2, column=2, padx=10, sticky="s")
+
+        self.view_combo = ctk.CTkComboBox(
+            filter_frame,
+            values=["Liste", "Gruppiert"],
+            command=self.on_view_change,
+            **self.styles["combobox"],
+        )
+        self.view_combo.set("Liste")
+        self.view_combo.grid(row=3, column=2, padx=10, pady=10, sticky="nsew")
+
         # Aktualisieren-Button
         filter_button = ctk.CTkButton(
             filter_frame,
             text="Filtern",
-            command= lambda: [self.update_stunden(), self.master.diagram_frame.refresh_chart()],
+            command=self.apply_filter,
             **self.styles["button"],
         )
-        filter_button.grid(row=2, column=0, columnspan=2, padx=10, sticky="e")
+        filter_button.grid(row=4, column=0, columnspan=2, padx=10, sticky="e")
         
         export_button = ctk.CTkButton(
             filter_frame,
             text="Exportieren",
-            command=lambda: export_to_excel("project", self.project_number),
+            command=self.export_data,
             **self.styles["button_secondary"],
         )
-        export_button.grid(row=2, column=2, columnspan=2, padx=10, sticky="w")
+        export_button.grid(row=4, column=2, columnspan=2, padx=10, sticky="w")
 
         # Treeview für die Stundenübersicht mit Filter-Möglichkeit
         tree_frame = ctk.CTkFrame(self, fg_color=self.colors["alt_background"])
         tree_frame.pack(padx=10, pady=(0,10), fill="both", expand=True)
         
         columns = ("Benutzername", "Datum", "Phase", "Aktivität", "Notiz", "Stunden")
-        self.stunden_treeview = ttk.Treeview(tree_frame, columns=columns, show="headings", height=6)
+
+        # Flache Liste, seitenweise über das virtuelle Zeilenmodell gefüllt
+        self.list_frame = ctk.CTkFrame(tree_frame, fg_color=self.colors["alt_background"])
+        self.list_frame.pack(fill="both", expand=True)
+
+        self.stunden_treeview = ttk.Treeview(self.list_frame, columns=columns, show="headings", height=6)
         apply_treeview_style(self.colors)
-        
+
         for col in columns:
             self.stunden_treeview.heading(col, text=col)
             self.stunden_treeview.column(col, width=0, stretch=True)
         self.stunden_treeview.pack(side="left", fill="both", expand=True, padx=10, pady=10)
 
-        # Scrollbar hinzufügen
+        # Scrollbar hinzufügen; gescrollt wird über das virtuelle Zeilenmodell
         scrollbar = ctk.CTkScrollbar(
-            tree_frame,
-            command=self.stunden_treeview.yview,
+            self.list_frame,
             height=6,
             fg_color=self.colors["alt_background"],
             button_color=self.colors["background_light"],
         )
-        self.stunden_treeview.configure(yscrollc=scrollbar.set)
         scrollbar.pack(side="right", fill="y", anchor="e")
+        self.rows = VirtualTreeview(self.stunden_treeview, scrollbar)
+
+        # Gruppierte Ansicht Projekt → Phase → Benutzer → Monat, wird erst bei Auswahl angezeigt
+        self.group_frame = ctk.CTkFrame(tree_frame, fg_color=self.colors["alt_background"])
+
+        self.group_treeview = ttk.Treeview(self.group_frame, columns=columns, show="tree headings", height=6)
+        self.group_treeview.heading("#0", text="Gruppe")
+        self.group_treeview.column("#0", width=0, stretch=True)
+        for col in columns:
+            self.group_treeview.heading(col, text=col)
+            self.group_treeview.column(col, width=0, stretch=True)
+        self.group_treeview.pack(side="left", fill="both", expand=True, padx=10, pady=10)
+
+        group_scrollbar = ctk.CTkScrollbar(
+            self.group_frame,
+            command=self.group_treeview.yview,
+            height=6,
+            fg_color=self.colors["alt_background"],
+            button_color=self.colors["background_light"],
+        )
+        self.group_treeview.configure(yscrollcommand=group_scrollbar.set)
+        group_scrollbar.pack(side="right", fill="y", anchor="e")
+        self.groups = RollupTreeview(self.group_treeview)
+
+        # Styling für die Gesamtzeilen
+        for treeview in (self.stunden_treeview, self.group_treeview):
+            treeview.tag_configure('filter_total', background='#d1d1d1', font=('', 14, 'bold'))
+            treeview.tag_configure('project_total', background='#b0b0b0', font=('', 14, 'bold'))
 
         # Filterwerte laden
         self.load_filter_values()
 
-        # Initiale Ansicht aktualisieren
-        self.update_stunden()
+        # Gemeinsames Datenmodell für Tabelle und Projektdiagramm; lädt bei Änderungen anderer Clients neu
+        self.view_model = ProjectViewModel(self)
+        self.view_model.add_listener(self.show_view)
+        self.apply_filter()
 
     def load_filter_values(self):
         """
-        Lädt die Werte für die Filter aus der Datenbank.
+        Lädt die Werte für die Filter im Hintergrund.
 
-        - Ruft alle Benutzer und Phasen ab, die mit dem Projekt verknüpft sind.
-        - Füllt die Filter-Comboboxen mit den abgerufenen Werten.
+        - Ruft alle Benutzer des Projekts und alle Phasen im Hintergrund ab (`fetch_filter_values`).
+        - Bis zum Eintreffen stehen die Filter auf "Alle" und sind deaktiviert.
+        - Wechselt das Projekt vor dem Eintreffen, wird das veraltete Ergebnis verworfen.
 
         Fehlerbehandlung:
         ------------------
-        - Zeigt eine Fehlermeldung an, falls die Datenbankabfrage fehlschlägt.
+        - Gibt eine Fehlermeldung aus und gibt die Filter wieder frei, falls die Datenbankabfrage fehlschlägt.
+        """
+        for combo in (self.user_combo, self.phase_combo):
+            combo.configure(values=["Alle"], state="normal")
+            combo.set("Alle")
+            combo.configure(state="disabled")  # Bis die Werte geladen sind
+        submit(
+            fetch_filter_values,
+            self.project_number,
+            key=("filter_values", id(self)),
+            on_success=self.show_filter_values,
+            on_error=self.on_filter_values_error,
+        )
+
+    def show_filter_values(self, values):
+        """
+        Füllt die Filter-Comboboxen mit den geladenen Werten.
+
+        Args:
+            values (tuple): (Benutzernamen, Phasennamen) aus `fetch_filter_values`.
         """
-        # Benutzername-Dropdown mit Werten füllen, die nur die Benutzer des aktuellen Projekts anzeigen
-        connection = create_connection()
-        if connection:
-            cursor = connection.cursor()
-            try:
-                cursor.execute("""
-                    SELECT DISTINCT u.username 
-                    FROM users u
-                    JOIN user_projects up ON u.user_id = up.user_id
-                    WHERE up.project_number = %s
-                """, (self.project_number,))
-                users = cursor.fetchall()
-                user_names = [user[0] for user in users]
-                self.user_combo.configure(values=["Alle"] + user_names)
-                self.user_combo.set("Alle")
-                
-                # Phase-Dropdown mit Werten füllen
-                cursor.execute("SELECT DISTINCT phase_name FROM sia_phases")
-                phases = cursor.fetchall()
-                phase_names = [phase[0] for phase in phases]
-                self.phase_combo.configure(values=["Alle"] + phase_names)
-                self.phase_combo.set("Alle")
-                
-            except Exception as e:
-                print(f"Fehler beim Laden der Filterwerte: {e}")
-            finally:
-                cursor.close()
-                connection.close()
-
-    def update_stunden(self):
+        names, phase_names = values
+        self.user_combo.configure(values=["Alle"] + names, state="normal")
+        self.phase_combo.configure(values=["Alle"] + phase_names, state="normal")
+
+    def on_filter_values_error(self, error):
+        """
+        Gibt die Filter wieder frei, falls das Laden der Filterwerte fehlschlägt.
+
+        Args:
+            error (Exception): Die Ausnahme aus `fetch_filter_values`.
+        """
+        print(f"Fehler beim Laden der Filterwerte: {error}")
+        self.user_combo.configure(state="normal")
+        self.phase_combo.configure(state="normal")
+
+    def filter_state(self):
+        """
+        Gibt die gewählten Filter als `ProjectFilter` zurück (Schlüssel des gemeinsamen Datenmodells).
         """
-        Aktualisiert die Stundenübersicht basierend auf den ausgewählten Filtern.
+        return ProjectFilter(
+            self.project_number,
+            self.year_combo.get(),
+            self.month_combo.get(),
+            self.from_entry.get(),
+            self.to_entry.get(),
+            self.user_combo.get(),
+            self.phase_combo.get(),
+        )
 
-        - Lädt die gefilterten Stunden aus der Datenbank.
-        - Füllt das Treeview mit den abgerufenen Daten.
+    def apply_filter(self, immediate=True):
+        """
+        Fordert das Ergebnis der gewählten Filter beim gemeinsamen Datenmodell an.
+
+        Args:
+            immediate (bool): True, um ohne Wartezeit zu laden (Schaltfläche "Filtern"); sonst wird erst nach der
+                              letzten von mehreren schnellen Änderungen geladen.
+
+        - Tabelle und Projektdiagramm werden aktualisiert, sobald das Ergebnis vorliegt (siehe `show_view`).
 
         Fehlerbehandlung:
         ------------------
-        - Zeigt eine Fehlermeldung an, falls keine Daten gefunden werden oder die Abfrage fehlschlägt.
+        - Zeigt eine Fehlermeldung an, falls der Zeitraum ungültig ist.
         """
-        # Alte Daten entfernen
-        for item in self.stunden_treeview.get_children():
-            self.stunden_treeview.delete(item)
-        
-        # Monat, Jahr, Benutzername und Phase aus den Dropdowns abrufen
-        selected_month = self.month_combo.get()
-        selected_year = self.year_combo.get()
-        selected_user = self.user_combo.get()
-        selected_phase = self.phase_combo.get()
-
-        # Datenbankabfrage zur Abrufung der Stunden basierend auf Jahr, Monat, Benutzer und Phase
-        connection = create_connection()
-        if connection:
-            cursor = connection.cursor()
-            try:
-                query = """
-                SELECT u.username, s.phase_name, te.hours, te.entry_date, te.activity, te.note
-                FROM time_entries te
-                JOIN users u ON te.user_id = u.user_id
-                LEFT JOIN sia_phases s ON te.phase_id = s.phase_id
-                WHERE te.project_number = %s
-                """
-                params = [self.project_number]
-                
-                if selected_year != "Alle":
-                    query += " AND EXTRACT(YEAR FROM te.entry_date) = %s"
-                    params.append(int(selected_year))
-                
-                if selected_month != "Alle":
-                    query += " AND EXTRACT(MONTH FROM te.entry_date) = %s"
-                    month_index = list(calendar.month_name).index(selected_month)
-                    params.append(month_index)
-
-                # Filter für Benutzername anwenden
-                if selected_user != "Alle":
-                    query += " AND u.username = %s"
-                    params.append(selected_user)
-
-                # Filter für Phase anwenden
-                if selected_phase != "Alle":
-                    query += " AND s.phase_name = %s"
-                    params.append(selected_phase)
-
-                cursor.execute(query, params)
-                
-                entries = cursor.fetchall()
-                
-                # Sortieren der Einträge nach Datum (entry_date)
-                entries.sort(key=lambda x: x[3])
-                
-                total_filtered_hours = 0
-
-                # Daten in die Treeview einfügen
-                for entry in entries:
-                    self.stunden_treeview.insert("", "end", values=(entry[0], entry[3], entry[1], entry[4], entry[5], entry[2]))
-                    total_filtered_hours += entry[2]
-                
-                # Gesamtstunden für den Filter anzeigen
-                self.stunden_treeview.insert("", "end", values=("", "", "", "", "Filter:", total_filtered_hours), tags=('filter_total',))
-                
-                # Gesamtstunden für das gesamte Projekt abrufen
-                cursor.execute("""
-                    SELECT SUM(te.hours)
-                    FROM time_entries te
-                    WHERE te.project_number = %s
-                """, (self.project_number,))
-                
-                total_project_hours = cursor.fetchone()[0] or 0
-                self.stunden_treeview.insert("", "end", values=("", "", "", "", "Projekt:", total_project_hours), tags=('project_total',))
-
-                # Styling für die Gesamtzeilen
-                self.stunden_treeview.tag_configure('filter_total', background='#d1d1d1', font=('', 14, 'bold'))
-                self.stunden_treeview.tag_configure('project_total', background='#b0b0b0', font=('', 14, 'bold'))
-                    
-            except Exception as e:
-                print(f"Fehler beim Laden der Stunden: {e}")
-            
-            finally:
-                cursor.close()
-                connection.close()
+        state = self.filter_state()
+        try:
+            filter_conditions(state)
+        except ValueError as e:
+            messagebox.showerror("Fehler", str(e))
+            return
+        self.view_model.request(state, immediate=immediate)
+
+    def on_filter_change(self, value):
+        """
+        Wendet eine geänderte Auswahl in einer Combobox verzögert an.
+        """
+        self.apply_filter(immediate=False)
+
+    def on_view_change(self, value):
+        """
+        Zeigt das aktuelle Ergebnis in der gewählten Ansicht (Liste oder Gruppiert) an, ohne es neu zu laden.
+        """
+        if self.view_model.view is not None:
+            self.show_view(self.view_model.view)
+
+    def show_view(self, view):
+        """
+        Zeigt ein Ergebnis des Datenmodells in der gewählten Ansicht an.
+
+        Args:
+            view (ProjectView): Das Ergebnis des aktuellen Filterzustands.
+
+        - Liste: Die Zeiteinträge werden seitenweise über das virtuelle Zeilenmodell (`VirtualTreeview`) geladen;
+          Filter- und Projektsumme stammen aus dem Ergebnis.
+        - Gruppiert: Die Zwischensummen Projekt → Phase → Benutzer → Monat stammen aus dem Ergebnis
+          (`RollupTreeview`); Zeiteinträge werden erst beim Aufklappen eines Monats geladen.
+        """
+        filter_sql, filter_params = filter_conditions(view.state)
+        scope_params = [view.state.project_number]
+        select = "SELECT u.username, te.entry_date, s.phase_name, te.activity, te.note, te.hours"
+
+        if self.view_combo.get() == "Gruppiert":
+            self.list_frame.pack_forget()
+            self.group_frame.pack(fill="both", expand=True)
+            self.groups.show(
+                (view.filtered_hours, view.project_hours, view.nodes),
+                lambda key: fetch_rollup_leaves(select, PROJECT_SCOPE, scope_params, filter_sql, filter_params, key),
+                ("Projekt:", "project_total"),
+            )
+            return
+
+        self.group_frame.pack_forget()
+        self.list_frame.pack(fill="both", expand=True)
+        from_where = f"{OVERVIEW_FROM} WHERE {PROJECT_SCOPE} {filter_sql}"
+        params = scope_params + filter_params
+        footer = [
+            (("", "", "", "", "Filter:", view.filtered_hours), ("filter_total",)),
+            (("", "", "", "", "Projekt:", view.project_hours), ("project_total",)),
+        ]
+
+        def fetch_summary():
+            # Läuft im Hintergrund: Anzahl und Seitengrenzen (Summen stammen aus dem Datenmodell)
+            total, _, boundaries = fetch_keyset_index(from_where, params, with_hours=False)
+            return total, boundaries, footer
+
+        self.rows.load(
+            fetch_summary,
+            lambda after_key, limit: fetch_keyset_page(select, from_where, params, after_key, limit),
+        )
+
+    def rebind(self, project_number):
+        """
+        Zeigt die Stunden eines anderen Projekts in den bestehenden Widgets an.
+
+        Args:
+            project_number (str): Die neue Projektnummer.
+
+        - Der gewählte Zeitraum (Monat, Jahr, Von/Bis) bleibt erhalten.
+        - Benutzer- und Phasenfilter werden für das neue Projekt neu geladen und auf "Alle" gesetzt.
+        """
+        self.project_number = project_number
+        self.load_filter_values()
+        self.apply_filter()
+
+    def export_data(self):
+        """
+        Exportiert die Daten in eine Excel-Datei, ohne die Oberfläche zu blockieren.
+
+        - Fragt nach dem Speicherort und startet den Export in einem `ExportWindow` im Hintergrund.
+        - Das Fenster gehört zum Hauptfenster, damit der Export beim Wechsel der Ansicht weiterläuft.
+        """
+        file_path = ask_export_path()
+        if file_path:
+            ExportWindow(self.winfo_toplevel(), "project", self.project_number, file_path)
@@ -1,18 +1,34 @@
 """
 Modul: Stundenübersicht für Benutzer in TimeArch.
 
-Dieses Modul stellt eine grafische Benutzeroberfläche bereit, um die Stundenübersicht für einen spezifischen Benutzer anzuzeigen. Es umfasst Funktionen wie Filtern nach Monat, Jahr, Projekt und Phase sowie das Exportieren der angezeigten Daten.
+Dieses Modul stellt eine grafische Benutzeroberfläche bereit, um die Stundenübersicht für einen spezifischen Benutzer anzuzeigen. Es umfasst Funktionen wie Filtern nach Monat, Jahr, Zeitraum (Von/Bis), Projekt und Phase sowie das Exportieren der angezeigten Daten.
 
 Klassen:
 --------
 - StundenUebersichtUserFrame: Hauptklasse zur Darstellung und Verwaltung der Stundenübersicht für Benutzer.
 
+Funktionen:
+-----------
+- fetch_filter_values(user_id): Liest die Projekte des Benutzers und die Phasen für die Filter (läuft im Hintergrund).
+
 Methoden:
 ---------
 - __init__(self, master, user_id=None): Initialisiert das Frame mit dem Benutzerkontext.
 - create_widgets(self): Erstellt die Widgets für die Filter- und Stundenanzeige sowie die Exportfunktion.
-- load_filter_values(self): Lädt die Werte für die Filter (Projekte und Phasen) aus der Datenbank.
+- load_filter_values(self): Lädt die Werte für die Filter (Projekte und Phasen) im Hintergrund.
+- show_filter_values(self, values): Füllt die Filter-Comboboxen mit den geladenen Werten.
+- on_filter_values_error(self, error): Gibt die Filter nach einem Fehler beim Laden wieder frei.
+- overview_filters(self): Gibt die gewählten Filter als SQL-Bedingungen zurück.
 - update_projects(self): Aktualisiert die Stundenübersicht basierend auf den ausgewählten Filtern.
+- export_data(self): Startet den Export im Hintergrund mit Fortschrittsanzeige.
+- rebind(self, user_id): Zeigt die Stunden eines anderen Benutzers in den bestehenden Widgets an.
+
+Hinweis:
+--------
+- Die Treeview wird über `VirtualTreeview` seitenweise gefüllt; auch bei zehntausenden Einträgen existieren nur
+  die sichtbaren Zeilen als Treeview-Elemente.
+- In der Ansicht "Gruppiert" zeigt eine zweite Treeview die Zwischensummen (`RollupTreeview`); Zeiteinträge werden
+  erst beim Aufklappen eines Monats geladen.
 
 Verwendung:
 -----------
@@ -23,12 +39,36 @@ Verwendung:
 """
 
 import customtkinter as ctk
-from db.db_connection import create_connection
+from db.db_executor import submit
+from features import feature_reference_cache as reference_cache
 from gui.gui_appearance_color import appearance_color, get_default_styles, apply_treeview_style
-from features.feature_export import export_to_excel
+from features.feature_export import ask_export_path
+from gui.admin.gui_export_window import ExportWindow
+from features.feature_date_range import date_range_clause, is_month_aligned
+from features.feature_virtual_treeview import VirtualTreeview, fetch_keyset_index, fetch_keyset_page
+from features.feature_hour_rollup import RollupTreeview, OVERVIEW_FROM, fetch_hour_rollup, fetch_rollup_leaves, fetch_user_total
 import calendar
 from datetime import datetime
-from tkinter import ttk
+from tkinter import ttk, messagebox
+from db.db_listener import subscribe
+
+def fetch_filter_values(user_id):
+    """
+    Liest die Werte der Filter für einen Benutzer.
+
+    Args:
+        user_id (int): Die Benutzer-ID.
+
+    Returns:
+        tuple: (Projekte des Benutzers als "Nummer - Name", Phasennamen).
+
+    Hinweis:
+    --------
+    - Wird über `db_executor.submit` in einem Worker-Thread ausgeführt und greift nicht auf Tk zu.
+    - Liest über den Referenzdaten-Cache (`feature_reference_cache`).
+    """
+    project_names = [f"{project.project_number} - {project.project_name}" for project in reference_cache.user_projects(user_id)]
+    return project_names, reference_cache.phase_names()
 
 class StundenUebersichtUserFrame(ctk.CTkFrame):
     """
@@ -58,7 +98,7 @@ class StundenUebersichtUserFrame(ctk.CTkFrame):
         """
         Erstellt die Widgets für die Filter- und Stundenanzeige sowie die Exportfunktion.
 
-        - Fügt Filter-Widgets für Monat, Jahr, Projekt und Phase hinzu.
+        - Fügt Filter-Widgets für Monat, Jahr, Zeitraum (Von/Bis), Projekt und Phase hinzu.
         - Erstellt ein Treeview zur Anzeige der Stundenübersicht.
         - Fügt Buttons für das Aktualisieren und Exportieren hinzu.
         """
@@ -107,6 +147,32 @@ class StundenUebersichtUserFrame(ctk.CTkFrame):
         self.phase_combo = ctk.CTkComboBox(filter_frame, **self.styles["combobox"])
         self.phase_combo.grid(row=1, column=3, padx=10, pady=10, sticky="nsew")
 
+        # Von/Bis-Auswahl für beliebige Zeiträume
+        from_label = ctk.CTkLabel(filter_frame, text="Von", **self.styles["text"])
+        from_label.grid(row=2, column=0, padx=10, sticky="s")
+
+        self.from_entry = ctk.CTkEntry(filter_frame, placeholder_text="YYYY-MM-DD", **self.styles["entry"])
+        self.from_entry.grid(row=3, column=0, padx=10, pady=10, sticky="nsew")
+
+        to_label = ctk.CTkLabel(filter_frame, text="Bis", **self.styles["text"])
+        to_label.grid(row=2, column=1, padx=10, sticky="s")
+
+        self.to_entry = ctk.CTkEntry(filter_frame, placeholder_text="YYYY-MM-DD", **self.styles["entry"])
+        self.to_entry.grid(row=3, column=1, padx=10, pady=10, sticky="nsew")
+
+        # Ansicht: flache Liste oder gruppiert mit Zwischensummen
+        view_label = ctk.CTkLabel(filter_frame, text="Ansicht", **self.styles["text"])
+        view_label.grid(row=2, column=2, padx=10, sticky="s")
+
+        self.view_combo = ctk.CTkComboBox(
+            filter_frame,
+            values=["Liste", "Gruppiert"],
+            command=lambda _: self.update_projects(),
+            **self.styles["combobox"],
+        )
+        self.view_combo.set("Liste")
+        self.view_combo.grid(row=3, column=2, padx=10, pady=10, sticky="nsew")
+
         # Aktualisieren-Button
         filter_button = ctk.CTkButton(
             filter_frame,
@@ -114,177 +180,251 @@ class StundenUebersichtUserFrame(ctk.CTkFrame):
             command=self.update_projects,
             **self.styles["button"],
         )
-        filter_button.grid(row=2, column=0, columnspan=2, padx=10, sticky="e")
+        filter_button.grid(row=4, column=0, columnspan=2, padx=10, sticky="e")
         
         export_button = ctk.CTkButton(
             filter_frame,
             text="Exportieren",
-            command=lambda: export_to_excel("user", self.user_id),
+            command=self.export_data,
             **self.styles["button_secondary"],
         )
-        export_button.grid(row=2, column=2, columnspan=2, padx=10, sticky="w")
+        export_button.grid(row=4, column=2, columnspan=2, padx=10, sticky="w")
 
         # Treeview für die Projekteübersicht
         tree_frame = ctk.CTkFrame(self, fg_color=self.colors["alt_background"])
         tree_frame.pack(padx=10, pady=10, fill="both", expand=True)
         
         columns = ("Projekt", "Datum", "Phase", "Aktivität", "Notiz", "Stunden")
-        self.project_treeview = ttk.Treeview(tree_frame, columns=columns, show="headings", height=6)
+
+        # Flache Liste, seitenweise über das virtuelle Zeilenmodell gefüllt
+        self.list_frame = ctk.CTkFrame(tree_frame, fg_color=self.colors["alt_background"])
+        self.list_frame.pack(fill="both", expand=True)
+
+        self.project_treeview = ttk.Treeview(self.list_frame, columns=columns, show="headings", height=6)
         apply_treeview_style(self.colors)
-        
+
         for col in columns:
             self.project_treeview.heading(col, text=col)
             self.project_treeview.column(col, width=0, stretch=True)
         self.project_treeview.pack(side="left", fill="both", expand=True, padx=10, pady=10)
 
-        # Scrollbar hinzufügen
+        # Scrollbar hinzufügen; gescrollt wird über das virtuelle Zeilenmodell
         scrollbar = ctk.CTkScrollbar(
-            tree_frame,
-            command=self.project_treeview.yview,
+            self.list_frame,
             height=6,
             fg_color=self.colors["alt_background"],
             button_color=self.colors["background_light"],
         )
-        self.project_treeview.configure(yscrollcommand=scrollbar.set)
         scrollbar.pack(side="right", fill="y", anchor="e")
+        self.rows = VirtualTreeview(self.project_treeview, scrollbar)
+
+        # Gruppierte Ansicht Projekt → Phase → Benutzer → Monat, wird erst bei Auswahl angezeigt
+        self.group_frame = ctk.CTkFrame(tree_frame, fg_color=self.colors["alt_background"])
+
+        self.group_treeview = ttk.Treeview(self.group_frame, columns=columns, show="tree headings", height=6)
+        self.group_treeview.heading("#0", text="Gruppe")
+        self.group_treeview.column("#0", width=0, stretch=True)
+        for col in columns:
+            self.group_treeview.heading(col, text=col)
+            self.group_treeview.column(col, width=0, stretch=True)
+        self.group_treeview.pack(side="left", fill="both", expand=True, padx=10, pady=10)
+
+        group_scrollbar = ctk.CTkScrollbar(
+            self.group_frame,
+            command=self.group_treeview.yview,
+            height=6,
+            fg_color=self.colors["alt_background"],
+            button_color=self.colors["background_light"],
+        )
+        self.group_treeview.configure(yscrollcommand=group_scrollbar.set)
+        group_scrollbar.pack(side="right", fill="y", anchor="e")
+        self.groups = RollupTreeview(self.group_treeview)
+
+        # Styling für die Gesamtzeilen
+        for treeview in (self.project_treeview, self.group_treeview):
+            treeview.tag_configure('filter_total', background='#d1d1d1', font=('', 14, 'bold'))
+            treeview.tag_configure('user_total', background='#b0b0b0', font=('', 14, 'bold'))
 
         # Filterwerte laden
         self.load_filter_values()
 
-        # Initiale Ansicht aktualisieren
+        # Initiale Ansicht aktualisieren und bei Änderungen anderer Clients neu laden
         self.update_projects()
+        subscribe(self, ["time_entries"], self.update_projects, user_id=lambda: self.user_id)
 
     def load_filter_values(self):
         """
-        Lädt die Werte für die Filter aus der Datenbank.
+        Lädt die Werte für die Filter im Hintergrund.
 
-        - Ruft alle Projekte und Phasen ab, die dem Benutzer zugeordnet sind.
-        - Füllt die Filter-Comboboxen mit den abgerufenen Werten.
+        - Ruft alle Projekte des Benutzers und alle Phasen im Hintergrund ab (`fetch_filter_values`).
+        - Bis zum Eintreffen stehen die Filter auf "Alle" und sind deaktiviert.
+        - Wechselt der Benutzer vor dem Eintreffen, wird das veraltete Ergebnis verworfen.
 
         Fehlerbehandlung:
         ------------------
-        - Zeigt eine Fehlermeldung an, falls die Datenbankabfrage fehlschlägt.
+        - Gibt eine Fehlermeldung aus und gibt die Filter wieder frei, falls die Datenbankabfrage fehlschlägt.
         """
-        # Projekte-Dropdown mit Projekten des aktuellen Benutzers füllen
-        connection = create_connection()
-        if connection:
-            cursor = connection.cursor()
-            try:
-                cursor.execute("""
-                    SELECT DISTINCT p.project_number, p.project_name 
-                    FROM projects p
-                    JOIN user_projects up ON p.project_number = up.project_number
-                    WHERE up.user_id = %s
-                """, (self.user_id,))
-                projects = cursor.fetchall()
-                project_names = [f"{project[0]} - {project[1]}" for project in projects]
-                self.project_combo.configure(values=["Alle"] + project_names)
-                self.project_combo.set("Alle")
-                
-                # Phase-Dropdown mit Werten füllen
-                cursor.execute("SELECT DISTINCT phase_name FROM sia_phases")
-                phases = cursor.fetchall()
-                phase_names = [phase[0] for phase in phases]
-                self.phase_combo.configure(values=["Alle"] + phase_names)
-                self.phase_combo.set("Alle")
-                
-            except Exception as e:
-                print(f"Fehler beim Laden der Filterwerte: {e}")
-            finally:
-                cursor.close()
-                connection.close()
+        for combo in (self.project_combo, self.phase_combo):
+            combo.configure(values=["Alle"], state="normal")
+            combo.set("Alle")
+            combo.configure(state="disabled")  # Bis die Werte geladen sind
+        submit(
+            fetch_filter_values,
+            self.user_id,
+            key=("filter_values", id(self)),
+            on_success=self.show_filter_values,
+            on_error=self.on_filter_values_error,
+        )
 
-    def update_projects(self):
+    def show_filter_values(self, values):
         """
-        Aktualisiert die Stundenübersicht basierend auf den ausgewählten Filtern.
+        Füllt die Filter-Comboboxen mit den geladenen Werten.
 
-        - Lädt die gefilterten Stunden aus der Datenbank.
-        - Füllt das Treeview mit den abgerufenen Daten.
+        Args:
+            values (tuple): (Projekte, Phasennamen) aus `fetch_filter_values`.
+        """
+        names, phase_names = values
+        self.project_combo.configure(values=["Alle"] + names, state="normal")
+        self.phase_combo.configure(values=["Alle"] + phase_names, state="normal")
+
+    def on_filter_values_error(self, error):
+        """
+        Gibt die Filter wieder frei, falls das Laden der Filterwerte fehlschlägt.
+
+        Args:
+            error (Exception): Die Ausnahme aus `fetch_filter_values`.
+        """
+        print(f"Fehler beim Laden der Filterwerte: {error}")
+        self.project_combo.configure(state="normal")
+        self.phase_combo.configure(state="normal")
+
+    def overview_filters(self):
+        """
+        Gibt die gewählten Filter als SQL-Bedingungen zurück.
+
+        Returns:
+            tuple: (Bedingungen, jeweils beginnend mit " AND ", Parameter).
 
         Fehlerbehandlung:
         ------------------
-        - Zeigt eine Fehlermeldung an, falls keine Daten gefunden werden oder die Abfrage fehlschlägt.
+        - Wirft einen `ValueError`, falls der Zeitraum ungültig ist (siehe `date_range_clause`).
         """
-        # Alte Daten entfernen
-        for item in self.project_treeview.get_children():
-            self.project_treeview.delete(item)
-        
         # Monat, Jahr, Projektname und Phase aus den Dropdowns abrufen
         selected_month = self.month_combo.get()
         selected_year = self.year_combo.get()
         selected_project = self.project_combo.get()
         selected_phase = self.phase_combo.get()
 
-        # Datenbankabfrage zur Abrufung der Projekte basierend auf Jahr, Monat, Projektname und Phase
-        connection = create_connection()
-        if connection:
-            cursor = connection.cursor()
-            try:
-                query = """
-                    SELECT p.project_number, p.project_name, s.phase_name, te.hours, te.entry_date, te.activity, te.note
-                    FROM time_entries te
-                    JOIN projects p ON te.project_number = p.project_number
-                    LEFT JOIN sia_phases s ON te.phase_id = s.phase_id
-                    WHERE te.user_id = %s
-                """
-                params = [self.user_id]
-                
-                if selected_year != "Alle":
-                    query += " AND EXTRACT(YEAR FROM te.entry_date) = %s"
-                    params.append(int(selected_year))
-                
-                if selected_month != "Alle":
-                    query += " AND EXTRACT(MONTH FROM te.entry_date) = %s"
-                    month_index = list(calendar.month_name).index(selected_month)
-                    params.append(month_index)
-
-                # Filter für Projekt anwenden
-                if selected_project != "Alle":
-                    project_number = selected_project.split(" - ")[0]
-                    query += " AND p.project_number = %s"
-                    params.append(project_number)
-
-                # Filter für Phase anwenden
-                if selected_phase != "Alle":
-                    query += " AND s.phase_name = %s"
-                    params.append(selected_phase)
-
-                cursor.execute(query, params)
-                
-                entries = cursor.fetchall()
-                
-                # Sortieren der Einträge nach Datum (entry_date)
-                entries.sort(key=lambda x: x[4])  # x[4] ist das Datum
-            
-                total_filtered_hours = 0
-
-                # Daten in die Treeview einfügen
-                for entry in entries:
-                    print(f"Inserting into Treeview: {entry}")
-                    combined_project = f"{entry[0]} - {entry[1]}"
-                    self.project_treeview.insert("", "end", values=(combined_project, entry[4], entry[2], entry[5], entry[6], entry[3]))
-                    total_filtered_hours += entry[3]
-                
-                # Gesamtstunden für den Filter anzeigen
-                self.project_treeview.insert("", "end", values=("", "", "", "", "Filter:", total_filtered_hours), tags=('filter_total',))
-                
-                # Gesamtstunden für alle Projekte des Benutzers abrufen
-                cursor.execute("""
-                    SELECT SUM(te.hours)
-                    FROM time_entries te
-                    WHERE te.user_id = %s
-                """, (self.user_id,))
-                
-                total_user_hours = cursor.fetchone()[0] or 0
-                self.project_treeview.insert("", "end", values=("", "", "", "", "Benutzer:", total_user_hours), tags=('user_total',))
-
-                # Styling für die Gesamtzeilen
-                self.project_treeview.tag_configure('filter_total', background='#d1d1d1', font=('', 14, 'bold'))
-                self.project_treeview.tag_configure('user_total', background='#b0b0b0', font=('', 14, 'bold'))
-                    
-            except Exception as e:
-                print(f"Fehler beim Laden der Projekte: {e}")
-            
-            finally:
-                cursor.close()
-                connection.close()
+        # Zeitraum als halboffener Bereich, damit der Index auf entry_date genutzt wird
+        filter_sql, date_params = date_range_clause(
+            "te.entry_date",
+            selected_year,
+            selected_month,
+            self.from_entry.get(),
+            self.to_entry.get(),
+        )
+        filter_params = list(date_params)
+
+        # Filter für Projekt anwenden
+        if selected_project != "Alle":
+            filter_sql += " AND te.project_number = %s"
+            filter_params.append(selected_project.split(" - ")[0])
+
+        # Filter für Phase anwenden
+        if selected_phase != "Alle":
+            filter_sql += " AND s.phase_name = %s"
+            filter_params.append(selected_phase)
+
+        return filter_sql, filter_params
+
+    def update_projects(self):
+        """
+        Aktualisiert die Stundenübersicht basierend auf den ausgewählten Filtern und der gewählten Ansicht.
+
+        - Liste: Die Abfrage wird an das virtuelle Zeilenmodell (`VirtualTreeview`) übergeben; Anzahl, Filtersumme
+          und Benutzersumme werden im Hintergrund geladen, die Zeilen seitenweise beim Scrollen.
+        - Gruppiert: Zwischensummen Projekt → Phase → Benutzer → Monat und Filtersumme stammen aus einer
+          ROLLUP-Abfrage (`RollupTreeview`), bei ganzen Monaten über die Monatssummen; Zeiteinträge werden erst
+          beim Aufklappen eines Monats geladen.
+        - Die Benutzersumme stammt aus einer separaten Summe über den Index (`fetch_user_total`).
+
+        Fehlerbehandlung:
+        ------------------
+        - Zeigt eine Fehlermeldung an, falls der Zeitraum ungültig ist; Datenbankfehler werden in der Treeview angezeigt.
+        """
+        try:
+            filter_sql, filter_params = self.overview_filters()
+        except ValueError as e:
+            messagebox.showerror("Fehler", str(e))
+            return
+
+        user_id = self.user_id
+        scope_sql = "te.user_id = %s"
+        scope_params = [user_id]
+        select = "SELECT p.project_number || ' - ' || p.project_name, te.entry_date, s.phase_name, te.activity, te.note, te.hours"
+
+        if self.view_combo.get() == "Gruppiert":
+            self.list_frame.pack_forget()
+            self.group_frame.pack(fill="both", expand=True)
+            month_aligned = is_month_aligned(
+                self.year_combo.get(),
+                self.month_combo.get(),
+                self.from_entry.get(),
+                self.to_entry.get(),
+            )
+
+            def fetch_groups():
+                # Läuft im Hintergrund: Zwischensummen (nur gefilterte Zeilen) und Benutzersumme
+                filtered_hours, nodes = fetch_hour_rollup(scope_sql, scope_params, filter_sql, filter_params, month_aligned)
+                return filtered_hours, fetch_user_total(user_id), nodes
+
+            self.groups.load(
+                fetch_groups,
+                lambda key: fetch_rollup_leaves(select, scope_sql, scope_params, filter_sql, filter_params, key),
+                ("Benutzer:", "user_total"),
+            )
+            return
+
+        self.group_frame.pack_forget()
+        self.list_frame.pack(fill="both", expand=True)
+        from_where = f"{OVERVIEW_FROM} WHERE {scope_sql} {filter_sql}"
+        params = scope_params + filter_params
+
+        def fetch_summary():
+            # Läuft im Hintergrund: Anzahl, Seitengrenzen und Summen
+            total, total_filtered_hours, boundaries = fetch_keyset_index(from_where, params)
+            footer = [
+                (("", "", "", "", "Filter:", total_filtered_hours), ("filter_total",)),
+                (("", "", "", "", "Benutzer:", fetch_user_total(user_id)), ("user_total",)),
+            ]
+            return total, boundaries, footer
+
+        self.rows.load(
+            fetch_summary,
+            lambda after_key, limit: fetch_keyset_page(select, from_where, params, after_key, limit),
+        )
+
+    def rebind(self, user_id):
+        """
+        Zeigt die Stunden eines anderen Benutzers in den bestehenden Widgets an.
+
+        Args:
+            user_id (int): Die neue Benutzer-ID.
+
+        - Der gewählte Zeitraum (Monat, Jahr, Von/Bis) bleibt erhalten.
+        - Projekt- und Phasenfilter werden für den neuen Benutzer neu geladen und auf "Alle" gesetzt.
+        """
+        self.user_id = user_id
+        self.load_filter_values()
+        self.update_projects()
+
+    def export_data(self):
+        """
+        Exportiert die Daten in eine Excel-Datei, ohne die Oberfläche zu blockieren.
+
+        - Fragt nach dem Speicherort und startet den Export in einem `ExportWindow` im Hintergrund.
+        - Das Fenster gehört zum Hauptfenster, damit der Export beim Wechsel der Ansicht weiterläuft.
+        """
+        file_path = ask_export_path()
+        if file_path:
+            ExportWindow(self.winfo_toplevel(), "user", self.user_id, file_path)
@@ -7,15 +7,30 @@ Klassen:
 --------
 - UserToProjectFrame: Hauptklasse für die Verwaltung der Benutzer eines Projekts.
 
+Konstanten:
+-----------
+- LOADING_TEXT: Platzhalter, solange Benutzer oder Projektbenutzer geladen werden.
+
+Funktionen:
+-----------
+- assign_user(user_id, project_number): Weist einen Benutzer einem Projekt zu (läuft im Hintergrund).
+- remove_user(user_id, project_number): Entfernt einen Benutzer aus einem Projekt (läuft im Hintergrund).
+
 Methoden:
 ---------
 - __init__(self, master, project_number): Initialisiert das Frame mit dem Projektkontext.
 - create_widgets(self): Erstellt die Widgets zur Benutzerzuweisung und -verwaltung.
-- load_users(self): Lädt die Liste aller verfügbaren Benutzer aus der Datenbank.
-- load_project_users(self): Lädt die Liste der Benutzer, die einem bestimmten Projekt zugeordnet sind.
+- load_users(self): Lädt die Liste aller verfügbaren Benutzer im Hintergrund.
+- show_users(self, users): Füllt das Dropdown-Menü mit den geladenen Benutzern.
+- load_project_users(self): Lädt die Liste der Benutzer, die einem bestimmten Projekt zugeordnet sind, im Hintergrund.
+- show_project_users(self, users): Zeigt die geladenen Projektbenutzer an.
+- on_project_users_error(self, error): Entfernt den Platzhalter, falls das Laden fehlschlägt.
 - update_users_treeview(self): Aktualisiert die Anzeige der Benutzer im Projekt in der Treeview.
+- on_database_change(self): Lädt Benutzerliste und Projektbenutzer nach einer Änderung in der Datenbank neu.
 - assign_user_to_project(self): Weist den ausgewählten Benutzer dem Projekt zu.
 - delete_user_from_project(self): Entfernt den ausgewählten Benutzer aus dem Projekt.
+- run_change(self, func, user_id, success_text, error_text): Führt eine Änderung der Zuweisungen im Hintergrund aus.
+- rebind(self, project_number): Zeigt die Benutzer eines anderen Projekts in den bestehenden Widgets an.
 
 Verwendung:
 -----------
@@ -26,11 +41,53 @@ Verwendung:
 """
 
 import customtkinter as ctk
-from db.db_connection import create_connection
+from db.db_connection import connection
 from tkinter import messagebox, ttk
-from features.feature_load_users import load_users
-from features.feature_load_project_users import load_project_users
+from features import feature_reference_cache as reference_cache
 from gui.gui_appearance_color import appearance_color, get_default_styles, apply_treeview_style
+from db.db_listener import subscribe
+from db.db_executor import submit
+
+LOADING_TEXT = "Lädt..."    # Platzhalter, solange die Daten im Hintergrund geladen werden
+
+def assign_user(user_id, project_number):
+    """
+    Weist einen Benutzer einem Projekt zu.
+
+    Args:
+        user_id (int): Die Benutzer-ID.
+        project_number (str): Die Projektnummer.
+
+    Hinweis:
+    --------
+    - Wird über `db_executor.submit` in einem Worker-Thread ausgeführt und greift nicht auf Tk zu.
+    """
+    with connection() as cursor:
+        cursor.execute(
+            "INSERT INTO user_projects (user_id, project_number) VALUES (%s, %s) "
+            "ON CONFLICT (user_id, project_number) DO NOTHING",
+            (user_id, project_number)
+        )
+    reference_cache.invalidate(reference_cache.PROJECT_USERS, reference_cache.USER_PROJECTS)
+
+def remove_user(user_id, project_number):
+    """
+    Entfernt einen Benutzer aus einem Projekt.
+
+    Args:
+        user_id (int): Die Benutzer-ID.
+        project_number (str): Die Projektnummer.
+
+    Hinweis:
+    --------
+    - Wird über `db_executor.submit` in einem Worker-Thread ausgeführt und greift nicht auf Tk zu.
+    """
+    with connection() as cursor:
+        cursor.execute(
+            "DELETE FROM user_projects WHERE user_id = %s AND project_number = %s",
+            (user_id, project_number)
+        )
+    reference_cache.invalidate(reference_cache.PROJECT_USERS, reference_cache.USER_PROJECTS)
 
 class UserToProjectFrame(ctk.CTkFrame):
     """
@@ -56,6 +113,7 @@ class UserToProjectFrame(ctk.CTkFrame):
         self.create_widgets()
         self.load_users()
         self.load_project_users()
+        subscribe(self, ["users", "user_projects"], self.on_database_change, project_number=lambda: self.project_number)
 
     def create_widgets(self):
         """
@@ -117,35 +175,79 @@ class UserToProjectFrame(ctk.CTkFrame):
 
     def load_users(self):
         """
-        Lädt die Liste aller verfügbaren Benutzer aus der Datenbank.
+        Lädt die Liste aller verfügbaren Benutzer im Hintergrund.
 
-        - Verwendet die Funktion `load_users` aus den Features.
-        - Füllt das Dropdown-Menü mit den abgerufenen Benutzern.
+        - Liest die Benutzer über den Referenzdaten-Cache (`reference_cache.users`) in einem Worker-Thread.
+        - Solange noch keine Benutzer geladen sind, zeigt das Dropdown einen Platzhalter an und ist deaktiviert.
 
         Fehlerbehandlung:
         ------------------
         - Zeigt eine Fehlermeldung an, falls die Datenbankabfrage fehlschlägt.
         """
-        # Verwende die ausgelagerte Funktion `load_users`
-        users = load_users()
+        if not self.available_users:
+            self.user_dropdown.set(LOADING_TEXT)
+            self.user_dropdown.configure(state="disabled")
+        submit(
+            reference_cache.users,
+            key=("available_users", id(self)),
+            on_success=self.show_users,
+            on_error=lambda e: messagebox.showerror("Fehler", f"Fehler beim Laden der Benutzer: {e}", parent=self),
+        )
+
+    def show_users(self, users):
+        """
+        Füllt das Dropdown-Menü mit den geladenen Benutzern.
+
+        Args:
+            users (list): Tupel (user_id, username).
+        """
         self.available_users = [f"{user[0]} - {user[1]}" for user in users]
-        self.user_dropdown.configure(values=self.available_users)
+        self.user_dropdown.configure(values=self.available_users, state="normal")
+        if self.user_dropdown.get() == LOADING_TEXT:
+            self.user_dropdown.set("")
         
     def load_project_users(self):
         """
-        Lädt die Liste der Benutzer, die dem aktuellen Projekt zugeordnet sind.
+        Lädt die Liste der Benutzer, die dem aktuellen Projekt zugeordnet sind, im Hintergrund.
 
-        - Verwendet die Funktion `load_project_users` aus den Features.
-        - Aktualisiert die Treeview mit den Benutzerdaten.
+        - Liest die Benutzer über den Referenzdaten-Cache (`reference_cache.project_users`) in einem Worker-Thread.
+        - Bis zum Eintreffen der Daten zeigt die Treeview einen nicht auswählbaren Platzhalter an.
+        - Wechselt das Projekt vor dem Eintreffen, wird das veraltete Ergebnis verworfen.
 
         Fehlerbehandlung:
         ------------------
-        - Zeigt eine Fehlermeldung an, falls die Datenbankabfrage fehlschlägt.
+        - Gibt eine Fehlermeldung aus und leert die Treeview, falls die Datenbankabfrage fehlschlägt.
+        """
+        self.project_users = [(LOADING_TEXT, "")]
+        self.update_users_treeview()
+        self.users_treeview.configure(selectmode="none")  # Platzhalter kann nicht ausgewählt werden
+        submit(
+            reference_cache.project_users,
+            self.project_number,
+            key=("project_users", id(self)),
+            on_success=self.show_project_users,
+            on_error=self.on_project_users_error,
+        )
+
+    def show_project_users(self, users):
+        """
+        Zeigt die geladenen Projektbenutzer in der Treeview an.
+
+        Args:
+            users (list): Tupel (user_id, username).
         """
-        # Benutzer, die bereits dem Projekt zugeordnet sind, aus der Datenbank laden
-        users = load_project_users(self.project_number)
         self.project_users = users
         self.update_users_treeview()
+
+    def on_project_users_error(self, error):
+        """
+        Entfernt den Platzhalter, falls das Laden der Projektbenutzer fehlschlägt.
+
+        Args:
+            error (Exception): Die Ausnahme aus der Abfrage.
+        """
+        print(f"Fehler beim Laden der Benutzer für das Projekt: {error}")
+        self.show_project_users([])
     
     def update_users_treeview(self):
         """
@@ -157,14 +259,22 @@ class UserToProjectFrame(ctk.CTkFrame):
         # Die Liste der Benutzer im Projekt aktualisieren
         for item in self.users_treeview.get_children():
             self.users_treeview.delete(item)
+        self.users_treeview.configure(selectmode="extended")
         for user in self.project_users:
             self.users_treeview.insert("", "end", values=(user[0], user[1]))        
     
+    def on_database_change(self):
+        """
+        Lädt Benutzerliste und Projektbenutzer neu, nachdem sie in der Datenbank geändert wurden.
+        """
+        self.load_users()
+        self.load_project_users()
+
     def assign_user_to_project(self):
         """
         Weist den ausgewählten Benutzer dem Projekt zu.
 
-        - Führt eine Datenbankabfrage durch, um die Zuweisung zu speichern.
+        - Speichert die Zuweisung im Hintergrund (`assign_user`); die Buttons sind bis zum Abschluss deaktiviert.
         - Aktualisiert die Treeview nach der erfolgreichen Zuweisung.
 
         Fehlerbehandlung:
@@ -173,34 +283,18 @@ class UserToProjectFrame(ctk.CTkFrame):
         """
         # Weisen Sie den ausgewählten Benutzer dem aktuell ausgewählten Projekt zu
         user_selection = self.user_dropdown.get()
-        if not user_selection:
+        if not user_selection or user_selection == LOADING_TEXT:
             messagebox.showerror("Fehler", "Bitte wählen Sie einen Benutzer aus")
             return
         
         user_id = int(user_selection.split(" - ")[0])
-        
-        connection = create_connection()
-        if connection:
-            cursor = connection.cursor()
-            try:
-                cursor.execute(
-                    "INSERT INTO user_projects (user_id, project_number) VALUES (%s, %s)",
-                    (user_id, self.project_number)
-                )
-                connection.commit()
-                messagebox.showinfo("Erfolg", "Benutzer erfolgreich zugewiesen")
-                self.load_project_users()  # Aktualisiere die Liste der Projekt-Benutzer
-            except Exception as e:
-                messagebox.showerror("Fehler", f"Fehler bei der Zuweisung des Benutzers: {e}")
-            finally:
-                cursor.close()
-                connection.close()
+        self.run_change(assign_user, user_id, "Benutzer erfolgreich zugewiesen", "Fehler bei der Zuweisung des Benutzers")
     
     def delete_user_from_project(self):
         """
         Entfernt den ausgewählten Benutzer aus dem Projekt.
 
-        - Führt eine Datenbankabfrage durch, um die Zuweisung zu löschen.
+        - Löscht die Zuweisung im Hintergrund (`remove_user`); die Buttons sind bis zum Abschluss deaktiviert.
         - Aktualisiert die Treeview nach dem erfolgreichen Entfernen.
 
         Fehlerbehandlung:
@@ -214,19 +308,43 @@ class UserToProjectFrame(ctk.CTkFrame):
             return
 
         user_id = self.users_treeview.item(selected_item, "values")[0]
-        connection = create_connection()
-        if connection:
-            cursor = connection.cursor()
-            try:
-                cursor.execute(
-                    "DELETE FROM user_projects WHERE user_id = %s AND project_number = %s",
-                    (user_id, self.project_number)
-                )
-                connection.commit()
-                messagebox.showinfo("Erfolg", "Benutzer erfolgreich entfernt")
-                self.load_project_users()  # Aktualisiere die Liste der Projekt-Benutzer
-            except Exception as e:
-                messagebox.showerror("Fehler", f"Fehler beim Entfernen des Benutzers: {e}")
-            finally:
-                cursor.close()
-                connection.close()
+        self.run_change(remove_user, user_id, "Benutzer erfolgreich entfernt", "Fehler beim Entfernen des Benutzers")
+
+    def run_change(self, func, user_id, success_text, error_text):
+        """
+        Führt eine Änderung der Zuweisungen im Hintergrund aus und meldet das Ergebnis.
+
+        Args:
+            func (callable): `assign_user` oder `remove_user`.
+            user_id (int): Die Benutzer-ID.
+            success_text (str): Meldung nach erfolgreicher Änderung.
+            error_text (str): Einleitung der Fehlermeldung.
+        """
+        self.assign_button.configure(state="disabled")
+        self.delete_button.configure(state="disabled")
+
+        def on_success(_):
+            self.assign_button.configure(state="normal")
+            self.delete_button.configure(state="normal")
+            messagebox.showinfo("Erfolg", success_text, parent=self)
+            self.load_project_users()  # Aktualisiere die Liste der Projekt-Benutzer
+
+        def on_error(error):
+            self.assign_button.configure(state="normal")
+            self.delete_button.configure(state="normal")
+            messagebox.showerror("Fehler", f"{error_text}: {error}", parent=self)
+
+        submit(func, user_id, self.project_number, on_success=on_success, on_error=on_error)
+
+    def rebind(self, project_number):
+        """
+        Zeigt die Benutzer eines anderen Projekts in den bestehenden Widgets an.
+
+        Args:
+            project_number (str): Die neue Projektnummer.
+
+        - Die Liste aller Benutzer bleibt erhalten; nur die Projektbenutzer werden neu geladen.
+        """
+        self.project_number = project_number
+        self.user_dropdown.set("")
+        self.load_project_users()
@@ -7,13 +7,20 @@ Klassen:
 --------
 - UserFrame: Hauptklasse für die Verwaltung der Benutzer.
 
+Funktionen:
+-----------
+- fetch_users(): Liest alle Benutzer aus der Datenbank (läuft im Hintergrund).
+
 Methoden:
 ---------
 - __init__(self, master): Initialisiert den Benutzer-Frame und erstellt die Widgets.
 - get_selected_user(self): Gibt die ID und den Benutzernamen des ausgewählten Benutzers zurück.
-- load_users(self): Lädt die Benutzer aus der Datenbank und zeigt sie in der Tabelle an.
+- load_users(self): Lädt die Benutzer im Hintergrund und zeigt sie in der Tabelle an.
+- show_users(self, users): Zeigt die geladenen Benutzer in der Tabelle an.
+- on_users_error(self, error): Entfernt den Platzhalter und meldet einen Fehler beim Laden.
 - open_add_user_window(self): Öffnet ein Fenster zum Hinzufügen eines neuen Benutzers.
 - open_delete_user_window(self): Öffnet ein Bestätigungsfenster zum Löschen eines Benutzers.
+- open_monthly_closing(self): Führt nach einer Bestätigung den Monatsabschluss für alle Benutzer aus.
 
 Verwendung:
 -----------
@@ -25,10 +32,28 @@ Verwendung:
 
 import customtkinter as ctk
 from tkinter import messagebox, ttk
-from db.db_connection import create_connection
+from db.db_connection import connection
 from features.feature_add_users import add_user
 from features.feature_delete_users import delete_user, get_selected_user_id
+from features.feature_monthly_closing import monthly_closing_dialog
 from gui.gui_appearance_color import appearance_color, get_default_styles, apply_treeview_style
+from db.db_listener import subscribe
+from db.db_executor import submit
+
+def fetch_users():
+    """
+    Liest alle Benutzer mit Passwort und Rolle.
+
+    Returns:
+        list: Tupel (Benutzer-ID, Benutzername, Passwort, Rolle).
+
+    Hinweis:
+    --------
+    - Wird über `db_executor.submit` in einem Worker-Thread ausgeführt und greift nicht auf Tk zu.
+    """
+    with connection() as cursor:
+        cursor.execute("SELECT user_id, username, password, role FROM users")
+        return cursor.fetchall()
 
 class UserFrame(ctk.CTkFrame):
     """
@@ -38,6 +63,7 @@ class UserFrame(ctk.CTkFrame):
     - Benutzer anzeigen
     - Benutzer hinzufügen
     - Benutzer löschen
+    - Monatsabschluss ausführen
     """
     def __init__(self, master):
         """
@@ -106,7 +132,16 @@ class UserFrame(ctk.CTkFrame):
         )
         delete_button.pack(pady=10, anchor="s")
         
+        closing_button = ctk.CTkButton(
+            self,
+            text="Monatsabschluss",
+            command=self.open_monthly_closing,
+            **self.styles["button"]
+        )
+        closing_button.pack(pady=10, anchor="s")
+        
         self.load_users()
+        subscribe(self, ["users"], self.load_users)
         
     def get_selected_user(self):
         """
@@ -131,34 +166,48 @@ class UserFrame(ctk.CTkFrame):
         
     def load_users(self):
         """
-        Lädt die Benutzer aus der Datenbank und zeigt sie in der Tabelle an.
+        Lädt die Benutzer im Hintergrund und zeigt sie in der Tabelle an.
 
-        - Ruft die Benutzerinformationen (ID, Benutzername, Passwort, Rolle) aus der Datenbank ab.
-        - Füllt das Treeview mit den abgerufenen Benutzerdaten.
+        - Bis zum Eintreffen der Daten zeigt das Treeview einen nicht auswählbaren Platzhalter an.
+        - Die Abfrage läuft über `db_executor.submit` (`fetch_users`); neuere Anfragen ersetzen ältere.
 
         Fehlerbehandlung:
         ------------------
         - Zeigt eine Fehlermeldung an, falls die Datenbankabfrage fehlschlägt.
         """
+        self.show_users([("Lädt...", "", "", "")])
+        self.user_treeview.configure(selectmode="none")  # Platzhalter kann nicht ausgewählt werden
+        submit(
+            fetch_users,
+            key=("users", id(self)),
+            on_success=self.show_users,
+            on_error=self.on_users_error,
+        )
+
+    def show_users(self, users):
+        """
+        Zeigt die geladenen Benutzer in der Tabelle an.
+
+        Args:
+            users (list): Tupel (Benutzer-ID, Benutzername, Passwort, Rolle).
+        """
         for item in self.user_treeview.get_children():
             self.user_treeview.delete(item)
-            
-        connection = create_connection()
-        if connection:
-            cursor = connection.cursor()
-            try:
-                cursor.execute("SELECT user_id, username, password, role FROM users")
-                users = cursor.fetchall()
-                for user in users:
-                    self.user_treeview.insert("", "end", values=(user[0], user[1], user[2], user[3]))
-                    
-            except Exception as e:
-                messagebox.showerror("Fehler", f"Fehler beim Laden der Projekte {e}")
-                
-            finally:
-                cursor.close()
-                connection.close()
+        self.user_treeview.configure(selectmode="extended")
+
+        for user in users:
+            self.user_treeview.insert("", "end", values=(user[0], user[1], user[2], user[3]))
     
+    def on_users_error(self, error):
+        """
+        Entfernt den Platzhalter und zeigt eine Fehlermeldung an, falls das Laden der Benutzer fehlschlägt.
+
+        Args:
+            error (Exception): Die Ausnahme aus der Abfrage.
+        """
+        self.show_users([])
+        messagebox.showerror("Fehler", f"Fehler beim Laden der Benutzer {error}", parent=self)
+
     def open_add_user_window(self):
         """
         Öffnet ein Fenster zum Hinzufügen eines neuen Benutzers.
@@ -183,4 +232,13 @@ class UserFrame(ctk.CTkFrame):
         
         confirmation = messagebox.askyesno("Bestätigung", "Sind Sie sicher, dass Sie diesen Benutzer löschen möchten?")
         if confirmation:
-            delete_user(user_id, self.load_users)
\ No newline at end of file
+            delete_user(user_id, self.load_users)
+
+    def open_monthly_closing(self):
+        """
+        Führt nach einer Bestätigung den Monatsabschluss für alle Benutzer aus.
+
+        - Verwendet die Funktion `monthly_closing_dialog` aus den Features.
+        - Die Stundenbilanz liest danach nur noch die Tage seit dem letzten abgeschlossenen Monat.
+        """
+        monthly_closing_dialog()
@@ -7,10 +7,17 @@ Klassen:
 --------
 - LoginGUI: Hauptklasse zur Verwaltung des Login-Interfaces.
 
+Funktionen:
+-----------
+- fetch_login(username, password): Sucht Rolle und ID eines Benutzers (läuft im Hintergrund).
+
 Methoden:
 ---------
 - __init__(self, master): Initialisiert die Login-GUI mit Benutzereingabe- und Steuerungsfeldern.
-- login(self): Authentifiziert den Benutzer anhand von Benutzername und Passwort.
+- login(self): Authentifiziert den Benutzer anhand von Benutzername und Passwort im Hintergrund.
+- on_login_result(self, username, user): Meldet das Ergebnis und startet die GUI der Benutzerrolle.
+- on_login_error(self, error): Zeigt einen Datenbankfehler beim Login an.
+- start_gui(self, username, role, user_id): Schliesst das Login-Fenster und startet die GUI der Benutzerrolle.
 - on_closing(self): Schließt die Anwendung.
 
 Verwendung:
@@ -25,10 +32,30 @@ import os
 import customtkinter as ctk
 from tkinter import messagebox, PhotoImage
 from PIL import Image, ImageTk
-from db.db_connection import create_connection
+from db.db_connection import connection
+from db.db_executor import submit
 from gui.gui_appearance_color import appearance_color, get_default_styles
 from features.get_resource_path import get_resource_path
 
+def fetch_login(username, password):
+    """
+    Sucht Rolle und ID eines Benutzers anhand seiner Anmeldedaten.
+
+    Args:
+        username (str): Der Benutzername.
+        password (str): Das Passwort.
+
+    Returns:
+        tuple: (Rolle, Benutzer-ID) oder None, falls die Anmeldedaten ungültig sind.
+
+    Hinweis:
+    --------
+    - Wird über `db_executor.submit` in einem Worker-Thread ausgeführt und greift nicht auf Tk zu.
+    """
+    with connection() as cursor:
+        cursor.execute("SELECT role, user_id FROM users WHERE username = %s AND password = %s", (username, password))
+        return cursor.fetchone()
+
 class LoginGUI:
     """
     Eine Klasse zur Verwaltung des Login-Interfaces.
@@ -75,8 +102,8 @@ class LoginGUI:
         Authentifiziert den Benutzer anhand von Benutzername und Passwort.
 
         - Überprüft, ob alle Felder ausgefüllt sind.
-        - Führt eine Datenbankabfrage durch, um die Benutzerrolle und ID zu ermitteln.
-        - Startet die entsprechende GUI basierend auf der Benutzerrolle.
+        - Ermittelt Benutzerrolle und ID im Hintergrund (`fetch_login`); bis dahin ist der Login-Button deaktiviert.
+        - Startet die entsprechende GUI basierend auf der Benutzerrolle (siehe `on_login_result`).
 
         Fehlerbehandlung:
         ------------------
@@ -88,36 +115,68 @@ class LoginGUI:
         if not username or not password:
             messagebox.showwarning("Warnung", "Bitte Benutzername und Passwort eingeben.")
             return
-        try:
-            connection = create_connection()
-            if connection:
-                cursor = connection.cursor()
-                cursor.execute("SELECT role, user_id FROM users WHERE username = %s AND password = %s", (username, password))
-                user = cursor.fetchone()
-                if user:
-                    role, user_id = user
-                    messagebox.showinfo("Erfolg", f"Login erfolgreich als {role}")
-                    
-                    self.master.destroy()
-                    
-                    if role == "user":
-                        from gui.user.gui_users import start_user_gui
-                        start_user_gui(username, user_id)
-                    elif role == "admin":
-                        from gui.admin.gui_admin import start_admin_gui
-                        start_admin_gui(username, user_id)
-                    else:
-                        messagebox.showerror("Fehler", f"Unbekannte Benutzerrolle: Die Rolle '{role}' ist nicht definiert.")
-                else:
-                    messagebox.showerror("Fehler", "Falscher Benutzername oder Passwort")
-                    
-        except Exception as e:
-            messagebox.showerror("Fehler", str(e))
+
+        self.login_button.configure(state="disabled", text="Anmelden...")
+        submit(
+            fetch_login,
+            username,
+            password,
+            key="login",
+            on_success=lambda user: self.on_login_result(username, user),
+            on_error=self.on_login_error,
+        )
+
+    def on_login_result(self, username, user):
+        """
+        Startet nach erfolgreicher Anmeldung die GUI der Benutzerrolle.
+
+        Args:
+            username (str): Der eingegebene Benutzername.
+            user (tuple): (Rolle, Benutzer-ID) oder None bei ungültigen Anmeldedaten.
+
+        Hinweis:
+        --------
+        - Die neue GUI wird über `after_idle` gestartet, damit ihre Ereignisschleife nicht innerhalb der
+          Ergebnisauslieferung des Executors läuft.
+        """
+        self.login_button.configure(state="normal", text="Login")
+        if not user:
+            messagebox.showerror("Fehler", "Falscher Benutzername oder Passwort")
+            return
+
+        role, user_id = user
+        messagebox.showinfo("Erfolg", f"Login erfolgreich als {role}")
+        self.master.after_idle(lambda: self.start_gui(username, role, user_id))
+
+    def on_login_error(self, error):
+        """
+        Gibt den Login-Button wieder frei und zeigt den Datenbankfehler an.
+
+        Args:
+            error (Exception): Die Ausnahme aus `fetch_login`.
+        """
+        self.login_button.configure(state="normal", text="Login")
+        messagebox.showerror("Fehler", str(error))
+
+    def start_gui(self, username, role, user_id):
+        """
+        Schliesst das Login-Fenster und startet die GUI der Benutzerrolle.
+
+        Args:
+            username (str): Der Benutzername.
+            role (str): Die Rolle ("user" oder "admin").
+            user_id (int): Die Benutzer-ID.
+        """
+        self.master.destroy()
         
-        finally:
-            if connection:   
-                cursor.close()
-                connection.close()
+        if role == "user":
+            from gui.user.gui_users import start_user_gui
+            start_user_gui(username, user_id)
+        elif role == "admin":
+            from gui.admin.gui_admin import start_admin_gui
+            start_admin_gui(username, user_id)
+        else:
+            messagebox.showerror("Fehler", f"Unbekannte Benutzerrolle: Die Rolle '{role}' ist nicht definiert.")
     
     def on_closing(self):
         """
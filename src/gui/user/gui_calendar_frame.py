@@ -2,6 +2,8 @@
 Modul: Kalender-Frame für TimeArch.
 
 Dieses Modul stellt ein grafisches Kalender-Widget bereit, das die Auswahl von Daten ermöglicht. Es aktualisiert die angezeigten Daten und Diagramme basierend auf der Auswahl im Kalender.
+Die Zeiteinträge des angezeigten Monats werden mit einer Abfrage geladen (die Nachbarmonate im Hintergrund);
+Klicks auf einzelne Tage werden aus diesem Monats-Cache bedient, und jeder Tag wird nach seinem Status markiert.
 
 Klassen:
 --------
@@ -13,6 +15,17 @@ Methoden:
 - create_widgets(self): Erstellt das Kalender-Widget und bindet Ereignisse.
 - load_for_today(self): Lädt die Daten für das aktuelle Datum und aktualisiert verbundene Frames.
 - on_date_selected(self, event=None): Verarbeitet die Auswahl eines Datums und aktualisiert die verbundene Benutzeroberfläche.
+- show_selected_day(self): Zeigt Einträge und Tagesbilanz des ausgewählten Tages aus dem Monats-Cache an.
+- on_month_changed(self, event=None): Lädt den angezeigten Monat und die Nachbarmonate.
+- on_month_loaded(self, data): Markiert die Tage eines geladenen Monats und aktualisiert den ausgewählten Tag.
+- render_markers(self, data): Markiert die Tage eines Monats nach ihrem Status (calevents).
+- reload_months(self): Verwirft den Monats-Cache und lädt die angezeigten Monate neu.
+- on_database_change(self): Lädt die Monate nach einer Änderung neu, sofern die Projektansicht sichtbar ist.
+- visible_months(self): Gibt die Monate zurück, die geladen sein sollen.
+
+Hinweis:
+--------
+- Markierungen: erfüllt (grün), unter dem Tagesziel (rot), leerer Werktag (grau), Ferien (blau).
 
 Verwendung:
 -----------
@@ -22,10 +35,24 @@ Verwendung:
     frame.pack()
 """
 
+import datetime
 import customtkinter as ctk
-from tkcalendar import Calendar
+from features.feature_date_range import month_range
+from features.feature_month_entries import (
+    MonthCache, adjacent_months, day_status,
+    STATUS_MET, STATUS_UNDER, STATUS_EMPTY, STATUS_VACATION,
+)
+from db.db_listener import subscribe
 from gui.gui_appearance_color import appearance_color, get_default_styles
 
+# Status -> (Hintergrund-, Schriftfarbe aus appearance_color)
+DAY_STATUS_COLORS = {
+    STATUS_MET: ("primary", "text_light"),
+    STATUS_UNDER: ("error", "text_light"),
+    STATUS_EMPTY: ("disabled", "text_dark"),
+    STATUS_VACATION: ("secondary", "text_light"),
+}
+
 class CalendarFrame(ctk.CTkFrame):
     """
     Eine Klasse, die ein Kalender-Widget bereitstellt und Interaktionen mit anderen GUI-Komponenten ermöglicht.
@@ -49,15 +76,27 @@ class CalendarFrame(ctk.CTkFrame):
         super().__init__(master, corner_radius=10, fg_color=self.colors["alt_background"])
         self.diagram_frame = diagram_frame
         self.time_entry_frame = time_entry_frame
+        self.user_id = master.user_id
+        self.month_cache = MonthCache(self.user_id)
+        self.selected_date = None
+        self.markers = {}   # (Jahr, Monat) -> IDs der calevents
         self.create_widgets()
 
+        # Monate bei Änderungen an Zeiteinträgen oder Einstellungen des Benutzers neu laden
+        subscribe(self, ["time_entries", "user_settings"], self.on_database_change, user_id=self.user_id)
+
     def create_widgets(self):
         """
         Erstellt das Kalender-Widget und bindet Ereignisse.
 
         - Setzt das Design und die Farben basierend auf den GUI-Einstellungen.
         - Bindet das Ereignis `<<CalendarSelected>>`, um die Benutzerinteraktion zu verarbeiten.
+        - Bindet das Ereignis `<<CalendarMonthChanged>>`, um den neu angezeigten Monat zu laden.
+        - Konfiguriert die Farben der Tagesmarkierungen.
         """
+        # Verzögerter Import: tkcalendar erst laden, wenn der Kalender angezeigt wird
+        from tkcalendar import Calendar
+
         # Kalender Widget
         self.calendar = Calendar(
             self, 
@@ -76,20 +115,23 @@ class CalendarFrame(ctk.CTkFrame):
         self.calendar.pack(padx=10, pady=10, fill="both", expand=True)
         
         self.calendar.bind("<<CalendarSelected>>", self.on_date_selected)
+        self.calendar.bind("<<CalendarMonthChanged>>", self.on_month_changed)
+
+        for status, (background, foreground) in DAY_STATUS_COLORS.items():
+            self.calendar.tag_config(status, background=self.colors[background], foreground=self.colors[foreground])
         
     def load_for_today(self):
         """
         Lädt die Daten für das aktuelle Datum und aktualisiert verbundene Frames.
 
         - Ruft das aktuelle Datum ab.
-        - Aktualisiert den Zeitbuchungs-Frame und das Diagramm-Frame, falls vorhanden.
+        - Lädt den aktuellen Monat und die Nachbarmonate.
+        - Aktualisiert den Zeitbuchungs-Frame und das Diagramm-Frame, sobald der Monat geladen ist.
         """
-        today = self.calendar.get_date()
-        if self.master.time_entry_frame:
-            self.master.time_entry_frame.update_date(today)
-        if hasattr(self.master.diagram_frame, "user_hours_diagram"):
-            self.master.diagram_frame.user_hours_diagram.refresh_diagram(today)
-        
+        self.selected_date = self.calendar.get_date()
+        self.show_selected_day()
+        self.on_month_changed()
+
     def on_date_selected(self, event=None):
         """
         Verarbeitet die Auswahl eines Datums.
@@ -98,10 +140,120 @@ class CalendarFrame(ctk.CTkFrame):
             event (Event, optional): Das Ereignis, das durch die Auswahl ausgelöst wurde. Standard ist None.
 
         - Ruft das ausgewählte Datum ab.
-        - Aktualisiert den Zeitbuchungs-Frame und das Diagramm-Frame basierend auf der Auswahl.
+        - Aktualisiert den Zeitbuchungs-Frame und das Diagramm-Frame aus dem Monats-Cache.
+        """
+        self.selected_date = self.calendar.get_date()
+        self.show_selected_day()
+
+    def show_selected_day(self):
         """
-        selected_date = self.calendar.get_date()
+        Zeigt Einträge und Tagesbilanz des ausgewählten Tages aus dem Monats-Cache an.
+
+        - Ist der Monat noch nicht geladen, zeigen die Frames einen Platzhalter an und der Monat wird geladen;
+          der Tag wird danach in `on_month_loaded` angezeigt.
+        """
+        if not self.selected_date:
+            return
+
+        day = datetime.date.fromisoformat(self.selected_date)
+        entries = self.month_cache.day_entries(day)
+        balance = self.month_cache.day_total(day)
+
         if self.master.time_entry_frame:
-            self.master.time_entry_frame.update_date(selected_date)
+            self.master.time_entry_frame.show_day(self.selected_date, entries)
         if hasattr(self.master.diagram_frame, "user_hours_diagram"):
-            self.master.diagram_frame.user_hours_diagram.refresh_diagram(selected_date)
+            self.master.diagram_frame.user_hours_diagram.show_day(self.selected_date, balance)
+
+        if entries is None:
+            self.month_cache.load(day.year, day.month, on_loaded=self.on_month_loaded)
+
+    def on_month_changed(self, event=None):
+        """
+        Lädt den angezeigten Monat und im Hintergrund die Nachbarmonate.
+
+        Args:
+            event (Event, optional): Das Ereignis `<<CalendarMonthChanged>>`. Standard ist None.
+
+        - Bereits geladene Monate werden aus dem Cache markiert, ohne die Datenbank abzufragen.
+        """
+        for load_year, load_month in self.visible_months():
+            self.month_cache.load(load_year, load_month, on_loaded=self.on_month_loaded)
+
+    def on_month_loaded(self, data):
+        """
+        Markiert die Tage eines geladenen Monats und aktualisiert den ausgewählten Tag.
+
+        Args:
+            data (MonthData): Der geladene Monat.
+        """
+        if not self.winfo_exists():
+            return
+        self.render_markers(data)
+        if self.selected_date:
+            day = datetime.date.fromisoformat(self.selected_date)
+            if (day.year, day.month) == (data.year, data.month):
+                self.show_selected_day()
+
+    def render_markers(self, data):
+        """
+        Markiert die Tage eines Monats nach ihrem Status.
+
+        Args:
+            data (MonthData): Der geladene Monat.
+
+        - Ersetzt die bisherigen Markierungen des Monats.
+        - Der Tooltip eines Tages zeigt die erfassten Stunden.
+        """
+        month_key = (data.year, data.month)
+        marker_ids = self.markers.pop(month_key, [])
+        if marker_ids:
+            self.calendar.calevent_remove(*marker_ids)
+
+        today = datetime.date.today()
+        day, end = month_range(data.year, data.month)
+        marker_ids = []
+        while day < end:
+            hours, vacation_hours = data.totals.get(day, (0, 0))
+            status = day_status(day, hours, vacation_hours, data.daily_target, today, day in data.holidays)
+            if status:
+                marker_ids.append(self.calendar.calevent_create(day, f"{hours}h", status))
+            day += datetime.timedelta(days=1)
+        self.markers[month_key] = marker_ids
+
+    def reload_months(self):
+        """
+        Verwirft den Monats-Cache und lädt den angezeigten Monat sowie die Nachbarmonate neu.
+
+        - Wird nach eigenen Buchungen und von `db_listener` bei Änderungen anderer Clients aufgerufen.
+        - Der ausgewählte Tag wird nach dem Laden neu angezeigt.
+        """
+        self.month_cache.clear()
+        for load_year, load_month in self.visible_months():
+            self.month_cache.load(load_year, load_month, on_loaded=self.on_month_loaded, force=True)
+
+    def on_database_change(self):
+        """
+        Lädt die Monate neu, wenn sich Zeiteinträge oder Einstellungen des Benutzers ändern (`db_listener`).
+
+        - In einer ausgeblendeten Projektansicht (`master.hidden`) wird nichts geladen; der Monats-Cache wird nur
+          verworfen und beim erneuten Anzeigen neu geladen.
+        """
+        if getattr(self.master, "hidden", False):
+            self.month_cache.clear()
+            return
+        self.reload_months()
+
+    def visible_months(self):
+        """
+        Gibt die Monate zurück, die geladen sein sollen.
+
+        Returns:
+            list: (Jahr, Monat) des angezeigten Monats, der Nachbarmonate und des Monats des ausgewählten Tages.
+        """
+        month, year = self.calendar.get_displayed_month()
+        months = [(year, month)] + adjacent_months(year, month)
+        if self.selected_date:
+            day = datetime.date.fromisoformat(self.selected_date)
+            if (day.year, day.month) not in months:
+                months.append((day.year, day.month))
+        return months
@@ -7,13 +7,19 @@ Klassen:
 --------
 - ChooseSIAPhaseFrame: Hauptklasse zur Auswahl von SIA-Phasen und Anzeige der zugehörigen Sollstunden.
 
+Funktionen:
+-----------
+- fetch_soll_stunden(project_number): Liest die Sollstunden aller Phasen eines Projekts (läuft im Hintergrund).
+
 Methoden:
 ---------
 - __init__(self, master, project_number=None): Initialisiert das Frame mit Projektkontext und erstellt Widgets.
 - create_widgets(self): Erstellt dynamisch Buttons für SIA-Phasen und Labels für Sollstunden.
 - select_phase(self, phase): Markiert die ausgewählte Phase und aktualisiert die Button-Designs.
 - get_phase_id(self, phase_name): Ruft die ID einer SIA-Phase basierend auf ihrem Namen aus der Datenbank ab.
-- load_soll_stunden(self): Lädt die Sollstunden für jede Phase und zeigt sie in den Labels an.
+- load_soll_stunden(self): Lädt die Sollstunden aller Phasen im Hintergrund und zeigt sie in den Labels an.
+- show_soll_stunden(self, soll_stunden): Zeigt die geladenen Sollstunden in den Labels an.
+- on_soll_stunden_error(self, error): Zeigt einen Fehler in den Labels an.
 
 Verwendung:
 -----------
@@ -24,9 +30,33 @@ Verwendung:
 """
 
 from features.features_load_sia_phases import load_sia_phases
-from db.db_connection import create_connection
+from features import feature_reference_cache as reference_cache
+from db.db_connection import connection
 from gui.gui_appearance_color import appearance_color, get_default_styles
 import customtkinter as ctk
+from db.db_listener import subscribe
+from db.db_executor import submit
+
+def fetch_soll_stunden(project_number):
+    """
+    Liest die Sollstunden aller Phasen eines Projekts mit einer Abfrage.
+
+    Args:
+        project_number (str): Die Projektnummer.
+
+    Returns:
+        dict: Phasenname -> Sollstunden; Phasen ohne Eintrag fehlen.
+
+    Hinweis:
+    --------
+    - Wird über `db_executor.submit` in einem Worker-Thread ausgeführt und greift nicht auf Tk zu.
+    """
+    with connection() as cursor:
+        cursor.execute("""
+            SELECT phase_name, soll_stunden FROM project_sia_phases
+            WHERE project_number = %s
+        """, (project_number,))
+        return dict(cursor.fetchall())
 
 class ChooseSIAPhaseFrame(ctk.CTkFrame):
     """
@@ -54,6 +84,7 @@ class ChooseSIAPhaseFrame(ctk.CTkFrame):
         self.soll_stunden_labels = {}  # Speichert Labels für die Sollstunden
         self.create_widgets()
         self.load_soll_stunden()  # Lade Sollstunden beim Initialisieren
+        subscribe(self, ["project_sia_phases"], self.load_soll_stunden, project_number=lambda: self.project_number)
 
     def create_widgets(self):
         """
@@ -107,7 +138,7 @@ class ChooseSIAPhaseFrame(ctk.CTkFrame):
             
     def get_phase_id(self, phase_name):
         """
-        Ruft die ID einer SIA-Phase basierend auf ihrem Namen aus der Datenbank ab.
+        Ruft die ID einer SIA-Phase basierend auf ihrem Namen aus dem Referenzdaten-Cache ab.
 
         Args:
             phase_name (str): Der Name der Phase.
@@ -119,24 +150,19 @@ class ChooseSIAPhaseFrame(ctk.CTkFrame):
         ------------------
         - Gibt None zurück, falls ein Fehler bei der Datenbankabfrage auftritt.
         """
-        connection = create_connection()
-        if connection:
-            cursor = connection.cursor()
-            try:
-                cursor.execute("SELECT phase_id FROM sia_phases WHERE phase_name = %s", (phase_name,))
-                result = cursor.fetchone()
-                return result[0] if result else None  # Gibt die ID zurück oder None
-            except Exception as e:
-                print(f"Fehler beim Abrufen der Phase ID: {e}")
-                return None
-            finally:
-                cursor.close()
-                connection.close()
-        return None
+        try:
+            return reference_cache.phase_id(phase_name)  # Gibt die ID zurück oder None
+        except Exception as e:
+            print(f"Fehler beim Abrufen der Phase ID: {e}")
+            return None
 
     def load_soll_stunden(self):
         """
-        Lädt die Sollstunden für jede Phase aus der Datenbank und zeigt sie in den Labels an.
+        Lädt die Sollstunden aller Phasen des Projekts im Hintergrund und zeigt sie in den Labels an.
+
+        - Liest alle Phasen mit einer Abfrage (`fetch_soll_stunden`) über `db_executor.submit`.
+        - Bis zum Eintreffen der Daten zeigen die Labels einen Platzhalter an.
+        - Wird auch von `db_listener` aufgerufen; neuere Anfragen ersetzen ältere.
 
         Fehlerbehandlung:
         ------------------
@@ -148,22 +174,33 @@ class ChooseSIAPhaseFrame(ctk.CTkFrame):
                 label.configure(text="")
             return
 
-        connection = create_connection()
-        if connection:
-            cursor = connection.cursor()
-            try:
-                for phase in self.buttons.keys():
-                    query = """
-                    SELECT soll_stunden FROM project_sia_phases
-                    WHERE project_number = %s AND phase_name = %s
-                    """
-                    cursor.execute(query, (self.project_number, phase))
-                    result = cursor.fetchone()
-                    soll_stunden = result[0] if result else "--"
-                    self.soll_stunden_labels[phase].configure(text=f"{soll_stunden}")
-            except Exception as e:
-                for label in self.soll_stunden_labels.values():
-                    label.configure(text="Fehler")
-            finally:
-                cursor.close()
-                connection.close()
+        for label in self.soll_stunden_labels.values():
+            label.configure(text="Lädt...")
+        submit(
+            fetch_soll_stunden,
+            self.project_number,
+            key=("soll_stunden", id(self)),
+            on_success=self.show_soll_stunden,
+            on_error=self.on_soll_stunden_error,
+        )
+
+    def show_soll_stunden(self, soll_stunden):
+        """
+        Zeigt die geladenen Sollstunden in den Labels an.
+
+        Args:
+            soll_stunden (dict): Phasenname -> Sollstunden aus `fetch_soll_stunden`.
+        """
+        for phase, label in self.soll_stunden_labels.items():
+            label.configure(text=f"{soll_stunden.get(phase, '--')}")
+
+    def on_soll_stunden_error(self, error):
+        """
+        Zeigt "Fehler" in allen Labels an, falls das Laden der Sollstunden fehlschlägt.
+
+        Args:
+            error (Exception): Die Ausnahme aus `fetch_soll_stunden`.
+        """
+        print(f"Fehler beim Laden der Sollstunden: {error}")
+        for label in self.soll_stunden_labels.values():
+            label.configure(text="Fehler")
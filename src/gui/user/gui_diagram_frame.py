@@ -12,6 +12,9 @@ Methoden:
 ---------
 - __init__(self, master, user_id, project_number): Initialisiert das Diagram-Frame mit Benutzer- und Projektkontext.
 - create_widgets(self): Erstellt und platziert die Diagramm-Widgets basierend auf den übergebenen Parametern.
+- schedule_refresh(self, selected_date=None): Plant eine gemeinsame Aktualisierung aller Diagramme.
+- refresh_diagrams(self): Aktualisiert alle vorhandenen Diagramme einmal.
+- on_database_change(self): Plant eine Aktualisierung nach einer Änderung, sofern die Projektansicht sichtbar ist.
 
 Verwendung:
 -----------
@@ -27,6 +30,7 @@ from features.feature_diagram_project_phase import ProjectPhaseDiagram
 from features.feature_diagram_vacation import VacationDiagram
 from features.feature_diagram_total_hours import DiagramTotalHours
 from gui.gui_appearance_color import appearance_color
+from db.db_listener import subscribe
 
 class DiagramFrame(ctk.CTkFrame):
     """
@@ -51,7 +55,14 @@ class DiagramFrame(ctk.CTkFrame):
         super().__init__(master,corner_radius=10, fg_color=self.colors["background"])
         self.user_id = user_id
         self.project_number = project_number
+        self.refresh_job = None
+        self.refresh_date = None
         self.create_widgets()
+
+        # Diagramme bei Änderungen anderer Clients neu laden
+        subscribe(self, ["time_entries", "user_settings"], self.on_database_change, user_id=self.user_id)
+        if self.project_number != "0000":
+            subscribe(self, ["time_entries", "project_sia_phases"], self.on_database_change, project_number=self.project_number)
     
     def create_widgets(self):
         """
@@ -81,3 +92,41 @@ class DiagramFrame(ctk.CTkFrame):
         for col in range(3):
             self.grid_columnconfigure(col, weight=1, minsize=300)
         self.grid_rowconfigure(0, weight=1)
+
+    def schedule_refresh(self, selected_date=None):
+        """
+        Plant eine gemeinsame Aktualisierung aller Diagramme.
+
+        Args:
+            selected_date (str, optional): Das Datum für das Tagesdiagramm im Format YYYY-MM-DD.
+
+        - Mehrere Aufrufe vor dem nächsten Leerlauf der Ereignisschleife werden zu einer Aktualisierung zusammengefasst.
+        """
+        if selected_date:
+            self.refresh_date = selected_date
+        if self.refresh_job is None:
+            self.refresh_job = self.after_idle(self.refresh_diagrams)
+
+    def on_database_change(self):
+        """
+        Plant eine Aktualisierung, wenn sich Zeiteinträge, Einstellungen oder Sollstunden ändern (`db_listener`).
+
+        - In einer ausgeblendeten Projektansicht (`master.hidden`) wird nichts geladen; sie aktualisiert die
+          Diagramme beim erneuten Anzeigen.
+        """
+        if not getattr(self.master, "hidden", False):
+            self.schedule_refresh()
+
+    def refresh_diagrams(self):
+        """
+        Aktualisiert alle vorhandenen Diagramme einmal.
+        """
+        self.refresh_job = None
+        if hasattr(self, "project_phase_diagram"):
+            self.project_phase_diagram.refresh_chart()
+        if hasattr(self, "vacation_diagram"):
+            self.vacation_diagram.load_vacation_data()
+        if hasattr(self, "total_hours_diagram"):
+            self.total_hours_diagram.load_data()
+        if self.refresh_date:
+            self.user_hours_diagram.refresh_diagram(self.refresh_date)
@@ -24,8 +24,9 @@ Verwendung:
 import customtkinter as ctk
 from datetime import date
 from tkinter import messagebox
-from db.db_connection import create_connection
+from features import feature_reference_cache as reference_cache
 from gui.gui_appearance_color import appearance_color, get_default_styles
+from db.db_listener import subscribe
 
 class InternInfosFrame(ctk.CTkFrame):
     """
@@ -59,6 +60,7 @@ class InternInfosFrame(ctk.CTkFrame):
         self.create_widgets()
         if self.user_id:
             self.load_user_settings()
+            subscribe(self, ["user_settings"], self.load_user_settings, user_id=self.user_id)
         
     def create_widgets(self):
         """
@@ -89,9 +91,10 @@ class InternInfosFrame(ctk.CTkFrame):
     
     def load_user_settings(self):
         """
-        Lädt die Benutzergrundinformationen aus der Datenbank.
+        Lädt die Benutzergrundinformationen aus dem Referenzdaten-Cache.
 
-        - Ruft Daten wie Arbeitsstunden pro Tag, Beschäftigungsprozentsatz, Ferientage und Startdatum aus `user_settings` ab.
+        - Liest Arbeitsstunden pro Tag, Beschäftigungsprozentsatz, Ferientage und Startdatum aus `user_settings`
+          über `feature_reference_cache`.
         - Aktualisiert die Labels mit den abgerufenen Informationen.
 
         Fehlerbehandlung:
@@ -102,30 +105,17 @@ class InternInfosFrame(ctk.CTkFrame):
             messagebox.showerror("Fehler", "Keine Benutzer-ID angegeben.")
             return
         
-        connection = create_connection()
-        if connection:
-            cursor = connection.cursor()
-            try:
-                query = """
-                SELECT default_hours_per_day, employment_percentage, vacation_hours, start_date
-                FROM user_settings
-                WHERE user_id = %s
-                """
-                cursor.execute(query, (self.user_id,))
-                result = cursor.fetchone()
+        try:
+            result = reference_cache.user_settings(self.user_id)
+            if result:
+                self.default_hours_per_day = result[0]
+                self.employment_percentage = result[1]
+                self.vacation_days = float(result[2])/float(result[0])
+                self.start_date = result[3]
                 
-                if result:
-                    self.default_hours_per_day = result[0]
-                    self.employment_percentage = result[1]
-                    self.vacation_days = float(result[2])/float(result[0])
-                    self.start_date = result[3]
-                    
-                    self.start_date_label.configure(text=f"Startdatum: {self.start_date}")
-                    self.hours_per_day_label.configure(text=f"Stunden pro Tag: {self.default_hours_per_day}")
-                    self.employment_percentage_label.configure(text=f"Stellenprozent: {self.employment_percentage}")
-                    self.vacation_hours_label.configure(text=f"Ferientage: {self.vacation_days}")
-            except Exception as e:
-                messagebox.showerror("Fehler", str(e))
-            finally:
-                cursor.close()
-                connection.close()
\ No newline at end of file
+                self.start_date_label.configure(text=f"Startdatum: {self.start_date}")
+                self.hours_per_day_label.configure(text=f"Stunden pro Tag: {self.default_hours_per_day}")
+                self.employment_percentage_label.configure(text=f"Stellenprozent: {self.employment_percentage}")
+                self.vacation_hours_label.configure(text=f"Ferientage: {self.vacation_days}")
+        except Exception as e:
+            messagebox.showerror("Fehler", str(e))
\ No newline at end of file
@@ -7,14 +7,26 @@ Klassen:
 --------
 - TimeEntryFrame: Hauptklasse zur Verwaltung von Zeitbuchungen.
 
+Funktionen:
+-----------
+- fetch_day_entries(user_id, entry_date): Liest die Zeiteinträge eines Benutzers an einem Tag (läuft im Hintergrund).
+- delete_day_entries(user_id, project_number, entry_date): Löscht die Zeiteinträge eines Tages (läuft im Hintergrund).
+
 Methoden:
 ---------
 - __init__(self, master): Initialisiert das Zeitbuchungs-Frame.
 - create_widgets(self): Erstellt die Widgets zur Zeitbuchung und Anzeige vorhandener Stunden.
 - update_date(self, selected_date): Aktualisiert das ausgewählte Datum und lädt die zugehörigen Stunden.
-- load_hours(self): Lädt vorhandene Stunden für das ausgewählte Datum aus der Datenbank.
-- delete_time_entry(self): Löscht die eingetragenen Stunden für das ausgewählte Datum.
+- show_day(self, selected_date, entries): Zeigt ein Datum mit bereits geladenen Einträgen an (Monats-Cache des Kalenders).
+- load_hours(self): Lädt vorhandene Stunden für das ausgewählte Datum im Hintergrund.
+- show_hours(self, results): Zeigt die geladenen Stunden im Label an.
+- delete_time_entry(self): Löscht die eingetragenen Stunden für das ausgewählte Datum im Hintergrund.
+- on_time_entry_deleted(self, project_number, entry_date): Setzt die Anzeige nach dem Löschen zurück.
+- on_delete_error(self, error): Meldet einen Fehler beim Löschen.
 - save_time_entry(self): Speichert die eingegebenen Stunden in der Datenbank.
+- open_week_sheet(self): Öffnet den Wochenrapport zur Erfassung einer ganzen Woche.
+- on_week_sheet_saved(self): Aktualisiert Anzeige und Diagramme nach dem Speichern des Wochenrapports.
+- refresh_after_change(self): Aktualisiert Anzeige, Kalender und Diagramme nach einer eigenen Buchung.
 
 Verwendung:
 -----------
@@ -26,10 +38,55 @@ Verwendung:
 
 import customtkinter as ctk
 from tkinter import messagebox
-from features.feature_save_time_entry import save_hours
-from db.db_connection import create_connection
+from features.feature_save_time_entry import save_hours, activities_for_project
+from gui.user.gui_week_sheet import WeekSheetWindow
+from db.db_connection import connection
+from db.db_executor import submit, discard
 from gui.gui_appearance_color import appearance_color, get_default_styles
 
+def fetch_day_entries(user_id, entry_date):
+    """
+    Liest die Zeiteinträge eines Benutzers an einem Tag.
+
+    Args:
+        user_id (int): Die Benutzer-ID.
+        entry_date (str): Das Datum im Format YYYY-MM-DD.
+
+    Returns:
+        list: Tupel (Projektnummer, Phase, Tätigkeit, Stunden).
+
+    Hinweis:
+    --------
+    - Wird über `db_executor.submit` in einem Worker-Thread ausgeführt und greift nicht auf Tk zu.
+    """
+    with connection() as cursor:
+        cursor.execute("""
+            SELECT te.project_number, COALESCE (s.phase_name, '') AS phase_name, te.activity, te.hours
+            FROM time_entries te
+            LEFT JOIN sia_phases s ON te.phase_id = s.phase_id
+            WHERE te.user_id = %s AND te.entry_date = %s
+        """, (user_id, entry_date))
+        return cursor.fetchall()
+
+def delete_day_entries(user_id, project_number, entry_date):
+    """
+    Löscht die Zeiteinträge eines Benutzers in einem Projekt an einem Tag.
+
+    Args:
+        user_id (int): Die Benutzer-ID.
+        project_number (str): Die Projektnummer.
+        entry_date (str): Das Datum im Format YYYY-MM-DD.
+
+    Hinweis:
+    --------
+    - Wird über `db_executor.submit` in einem Worker-Thread ausgeführt und greift nicht auf Tk zu.
+    """
+    with connection() as cursor:
+        cursor.execute("""
+            DELETE FROM time_entries
+            WHERE user_id = %s AND project_number = %s AND entry_date = %s
+        """, (user_id, project_number, entry_date))
+
 class TimeEntryFrame(ctk.CTkFrame):
     """
     Eine Klasse zur Verwaltung von Zeitbuchungen.
@@ -81,10 +138,7 @@ class TimeEntryFrame(ctk.CTkFrame):
         self.hours_entry.grid(row=0, column=0, padx=10, pady=10, sticky="ew")
         
         # Dropdown für die Aktivität
-        if self.master.selected_project_number == "0000":
-            activity_options = ["IT Arbeiten", "Besprechung", "Büroadmin", "Event", "Absenz", "Ferien", "Allgemeines", "Acquisition"]
-        else:
-            activity_options = ["Planung", "Besprechung", "Korrespondenz", "Bauadmin", "Bauleitung", "Verkauf"]
+        activity_options = activities_for_project(self.master.selected_project_number)
         
         self.activity_dropdown = ctk.CTkComboBox(eingabe_frame, values=activity_options, **self.styles["combobox"])
         self.activity_dropdown.set(activity_options[0])
@@ -110,7 +164,16 @@ class TimeEntryFrame(ctk.CTkFrame):
             command=self.delete_time_entry,
             **self.styles["button_error"],
         )
-        self.delete_button.pack(pady=10, anchor="n")        
+        self.delete_button.pack(pady=10, anchor="n")
+
+        # Button für die Wochenerfassung
+        week_sheet_button = ctk.CTkButton(
+            time_entry_frame,
+            text="Wochenrapport",
+            command=self.open_week_sheet,
+            **self.styles["button_secondary"],
+        )
+        week_sheet_button.pack(pady=10, anchor="n")
         
         # Label für die Stunden an diesem Tag
         self.phase_hours_label = ctk.CTkLabel(time_entry_frame, text="", justify="left", **self.styles["text"])
@@ -127,56 +190,74 @@ class TimeEntryFrame(ctk.CTkFrame):
         self.date_label.configure(text=f"Datum: {selected_date}")
         self.load_hours()
         
+    def show_day(self, selected_date, entries):
+        """
+        Zeigt ein Datum mit bereits geladenen Einträgen an (z.B. aus dem Monats-Cache des Kalenders).
+
+        Args:
+            selected_date (str): Das ausgewählte Datum im Format YYYY-MM-DD.
+            entries (list): Tupel (Projektnummer, Phase, Tätigkeit, Stunden) oder None, solange sie noch geladen werden.
+
+        - Eine noch laufende Abfrage aus `load_hours` wird verworfen, damit sie die Anzeige nicht überschreibt.
+        """
+        self.selected_date = selected_date
+        self.date_label.configure(text=f"Datum: {selected_date}")
+        discard(("time_entry_day", id(self)))
+        if entries is None:
+            self.phase_hours_label.configure(text="Lädt...")
+        else:
+            self.show_hours(entries)
+
     def load_hours(self):
         """
-        Lädt vorhandene Stunden für das ausgewählte Datum aus der Datenbank.
+        Lädt vorhandene Stunden für das ausgewählte Datum im Hintergrund.
 
-        - Zeigt vorhandene Stunden, Aktivitäten und Projektinformationen im Label an.
+        - Zeigt bis zum Eintreffen der Daten einen Platzhalter an.
+        - Wechselt das Datum vor dem Eintreffen, wird das veraltete Ergebnis verworfen.
         - Gibt eine Fehlermeldung aus, falls die Datenbankabfrage fehlschlägt.
         """
         if not self.selected_date:
             return
 
-        connection = create_connection()
-        if connection:
-            cursor = connection.cursor()
-            try:
-                phase_query = """
-                SELECT te.project_number, COALESCE (s.phase_name, '') AS phase_name, te.activity, te.hours
-                FROM time_entries te
-                LEFT JOIN sia_phases s ON te.phase_id = s.phase_id
-                WHERE te.user_id = %s AND te.entry_date = %s
-                """
-                cursor.execute(phase_query, (self.master.user_id, self.selected_date))
-                results = cursor.fetchall()
-                
-                phase_hours_text = ""
-                if results:
-                    # Erstellen eines Texts mit allen Phasenstunden
-                    for result in results:
-                        project_number = result[0]
-                        phase_name = result[1]
-                        activity = result[2]
-                        hours = result[3]
-                        phase_hours_text += f"{project_number}: {phase_name}    {activity}   {hours}h\n"
-                else:
-                    phase_hours_text += "Keinen Eintrag an diesem Tag."
-
-                # Anzeige des Texts im Label
-                self.phase_hours_label.configure(text=phase_hours_text)
-
-            except Exception as e:
-                print(f"Fehler beim Laden der Stunden: {e}")
-            finally:
-                cursor.close()
-                connection.close()
+        self.phase_hours_label.configure(text="Lädt...")
+        submit(
+            fetch_day_entries,
+            self.master.user_id,
+            self.selected_date,
+            key=("time_entry_day", id(self)),
+            on_success=self.show_hours,
+            on_error=lambda e: print(f"Fehler beim Laden der Stunden: {e}"),
+        )
+
+    def show_hours(self, results):
+        """
+        Zeigt die geladenen Stunden, Aktivitäten und Projektinformationen im Label an.
+
+        Args:
+            results (list): Tupel (Projektnummer, Phase, Tätigkeit, Stunden) aus `fetch_day_entries`.
+        """
+        phase_hours_text = ""
+        if results:
+            # Erstellen eines Texts mit allen Phasenstunden
+            for result in results:
+                project_number = result[0]
+                phase_name = result[1]
+                activity = result[2]
+                hours = result[3]
+                phase_hours_text += f"{project_number}: {phase_name}    {activity}   {hours}h\n"
+        else:
+            phase_hours_text += "Keinen Eintrag an diesem Tag."
+
+        # Anzeige des Texts im Label
+        self.phase_hours_label.configure(text=phase_hours_text)
         
     def delete_time_entry(self):
         """
         Löscht die eingetragenen Stunden für das ausgewählte Datum.
 
         - Fragt den Benutzer zur Bestätigung.
-        - Löscht die Stunden aus der Tabelle `time_entries`.
+        - Löscht die Stunden aus der Tabelle `time_entries` im Hintergrund (`delete_day_entries`).
+        - Bis zum Abschluss zeigt das Label einen Platzhalter an und der Löschen-Button ist deaktiviert.
         - Aktualisiert die Anzeige nach erfolgreichem Löschen.
         """
         if not self.selected_date:
@@ -187,41 +268,49 @@ class TimeEntryFrame(ctk.CTkFrame):
         if not confirm:
             return
 
-        connection = create_connection()
-        if connection:
-            cursor = connection.cursor()
-            try:
-                # Löschen der Stunden für den ausgewählten Tag
-                delete_query = """
-                DELETE FROM time_entries
-                WHERE user_id = %s AND project_number = %s AND entry_date = %s
-                """
-                cursor.execute(delete_query, (self.master.user_id, self.master.selected_project_number, self.selected_date))
-                connection.commit()
-                messagebox.showinfo("Erfolgreich", f"Stunden für {self.master.selected_project_number} am {self.selected_date} erfolgreich gelöscht.")
-                
-                # Eingabefeld und Label nach dem Löschen zurücksetzen
-                self.hours_entry.configure(state="normal")
-                self.hours_entry.delete(0, "end")
-                self.phase_hours_label.configure(text="")
-                self.total_hours_label.configure(text="")
-
-            except Exception as e:
-                messagebox.showerror("Fehler", f"Fehler beim Löschen der Stunden: {e}")
-            finally:
-                cursor.close()
-                connection.close()
-        self.load_hours()
-        # Diagramme aktualisieren
+        user_id = self.master.user_id
         project_number = self.master.selected_project_number
-        if self.master.diagram_frame:
-            if project_number != "0000":
-                if hasattr(self.master.diagram_frame, "project_phase_diagram"):
-                    self.master.diagram_frame.project_phase_diagram.refresh_chart()
-                else:
-                    return
-            if hasattr(self.master.diagram_frame, "user_hours_diagram"):
-                self.master.diagram_frame.user_hours_diagram.refresh_diagram(self.selected_date)
+        entry_date = self.selected_date
+        self.delete_button.configure(state="disabled")
+        self.phase_hours_label.configure(text="Wird gelöscht...")
+        submit(
+            delete_day_entries,
+            user_id,
+            project_number,
+            entry_date,
+            key=("time_entry_delete", id(self)),
+            on_success=lambda _: self.on_time_entry_deleted(project_number, entry_date),
+            on_error=self.on_delete_error,
+        )
+
+    def on_time_entry_deleted(self, project_number, entry_date):
+        """
+        Setzt Eingabefeld und Anzeige zurück, nachdem die Stunden im Hintergrund gelöscht wurden.
+
+        Args:
+            project_number (str): Die Projektnummer der gelöschten Stunden.
+            entry_date (str): Das Datum der gelöschten Stunden im Format YYYY-MM-DD.
+        """
+        self.delete_button.configure(state="normal")
+        messagebox.showinfo("Erfolgreich", f"Stunden für {project_number} am {entry_date} erfolgreich gelöscht.", parent=self)
+
+        # Eingabefeld und Label nach dem Löschen zurücksetzen
+        self.hours_entry.configure(state="normal")
+        self.hours_entry.delete(0, "end")
+        self.phase_hours_label.configure(text="")
+        self.total_hours_label.configure(text="")
+        self.refresh_after_change()
+
+    def on_delete_error(self, error):
+        """
+        Meldet einen Fehler beim Löschen und lädt die Stunden des Tages wieder an.
+
+        Args:
+            error (Exception): Die Ausnahme aus `delete_day_entries`.
+        """
+        self.delete_button.configure(state="normal")
+        messagebox.showerror("Fehler", f"Fehler beim Löschen der Stunden: {error}", parent=self)
+        self.load_hours()
 
     def save_time_entry(self):
         """
@@ -261,20 +350,42 @@ class TimeEntryFrame(ctk.CTkFrame):
             messagebox.showinfo("Erfolgreich", f"Stunden für {self.selected_date} erfolgreich gespeichert.")
             self.hours_entry.delete(0, "end")
             self.notes_entry.delete(0, "end")
-            self.load_hours()
-            
-            # Diagramme aktualisieren
-            if self.master.diagram_frame:
-                if project_number != "0000":
-                    if hasattr(self.master.diagram_frame, "project_phase_diagram"):
-                        self.master.diagram_frame.project_phase_diagram.refresh_chart()
-                    else:
-                        return
-                if hasattr(self.master.diagram_frame, "user_hours_diagram"):
-                    self.master.diagram_frame.user_hours_diagram.refresh_diagram(self.selected_date)
-                if hasattr(self.master.diagram_frame, "total_hours_diagram"):
-                    self.master.diagram_frame.total_hours_diagram.update_diagram()
+            self.refresh_after_change()
         else:
             messagebox.showerror("Fehler", f"Fehler beim Speichern der Stunden für {self.selected_date}.")
-            
-        
+
+    def open_week_sheet(self):
+        """
+        Öffnet den Wochenrapport für die Woche des ausgewählten Datums.
+
+        - Nach dem Speichern werden die Stunden neu geladen und die Diagramme einmal gesammelt aktualisiert.
+        """
+        WeekSheetWindow(
+            self,
+            self.master.user_id,
+            selected_date=self.selected_date,
+            project_number=self.master.selected_project_number,
+            on_saved=self.on_week_sheet_saved,
+        )
+
+    def on_week_sheet_saved(self):
+        """
+        Aktualisiert Anzeige und Diagramme, nachdem der Wochenrapport gespeichert wurde.
+        """
+        self.refresh_after_change()
+
+    def refresh_after_change(self):
+        """
+        Aktualisiert Anzeige, Kalender und Diagramme nach einer eigenen Buchung.
+
+        - Der Kalender lädt seine Monate neu und zeigt danach den ausgewählten Tag und dessen Tagesbilanz an.
+        - Ohne Kalender werden die Stunden des Tages direkt neu geladen.
+        - Die übrigen Diagramme werden einmal gesammelt aktualisiert.
+        """
+        calendar_frame = getattr(self.master, "calendar_frame", None)
+        if calendar_frame:
+            calendar_frame.reload_months()
+        else:
+            self.load_hours()
+        if self.master.diagram_frame:
+            self.master.diagram_frame.schedule_refresh()
@@ -7,10 +7,16 @@ Klassen:
 --------
 - UserProjectFrame: Hauptklasse zur Anzeige der Projekte eines Benutzers.
 
+Funktionen:
+-----------
+- fetch_user_projects(username): Liest die Projekte eines Benutzers (läuft im Hintergrund).
+
 Methoden:
 ---------
 - __init__(self, master, username): Initialisiert den Frame mit dem Benutzernamen und erstellt die Widgets.
-- load_user_projects(self): Lädt die Projekte des Benutzers aus der Datenbank und füllt das Treeview.
+- load_user_projects(self): Lädt die Projekte des Benutzers im Hintergrund und füllt das Treeview.
+- show_user_projects(self, projects): Zeigt die geladenen Projekte im Treeview an.
+- on_user_projects_error(self, error): Entfernt den Platzhalter und meldet einen Fehler beim Laden.
 
 Verwendung:
 -----------
@@ -22,8 +28,30 @@ Verwendung:
 
 import customtkinter as ctk
 from tkinter import ttk, messagebox
-from db.db_connection import create_connection
+from features import feature_reference_cache as reference_cache
 from gui.gui_appearance_color import appearance_color, get_default_styles, apply_treeview_style
+from db.db_listener import subscribe
+from db.db_executor import submit
+
+def fetch_user_projects(username):
+    """
+    Liest die Projekte eines Benutzers, sortiert nach Projektnummer.
+
+    Args:
+        username (str): Der Benutzername.
+
+    Returns:
+        list: `Project`-Tupel (project_number, project_name, description); leer, falls der Benutzer nicht existiert.
+
+    Hinweis:
+    --------
+    - Wird über `db_executor.submit` in einem Worker-Thread ausgeführt und greift nicht auf Tk zu.
+    - Liest über den Referenzdaten-Cache (`feature_reference_cache`).
+    """
+    user_id = reference_cache.user_id(username)
+    if user_id is None:
+        return []
+    return reference_cache.user_projects(user_id)
 
 class UserProjectFrame(ctk.CTkFrame):
     """
@@ -31,7 +59,7 @@ class UserProjectFrame(ctk.CTkFrame):
 
     Funktionen:
     - Projekte in einem Treeview anzeigen
-    - Datenbankverbindung zum Laden der Projekte nutzen
+    - Projekte im Hintergrund laden
     """
     def __init__(self, master, username):
         """
@@ -75,41 +103,52 @@ class UserProjectFrame(ctk.CTkFrame):
         self.project_treeview.configure(yscrollc=scrollbar.set)
         scrollbar.pack(side="right", fill="y", anchor="e")
 
-        # Projekte laden
+        # Projekte laden und bei Änderungen anderer Clients neu laden
         self.load_user_projects()
+        subscribe(self, ["projects", "user_projects"], self.load_user_projects)
         
 
     def load_user_projects(self):
         """
-        Lädt die Projekte des Benutzers aus der Datenbank und füllt das Treeview.
+        Lädt die Projekte des Benutzers im Hintergrund und füllt das Treeview.
 
-        - Verwendet den Benutzernamen, um die mit dem Benutzer verknüpften Projekte zu laden.
-        - Fügt die Projektdaten in das Treeview-Widget ein.
+        - Liest die Projekte über den Referenzdaten-Cache (`fetch_user_projects`) in einem Worker-Thread.
+        - Bis zum Eintreffen der Daten zeigt das Treeview einen nicht auswählbaren Platzhalter an.
 
         Fehlerbehandlung:
         ------------------
         - Zeigt eine Fehlermeldung an, falls die Datenbankabfrage fehlschlägt.
         """
-        connection = create_connection()
-        if connection:
-            cursor = connection.cursor()
-            try:
-                query = """
-                SELECT p.project_number, p.project_name, p.description
-                FROM projects p
-                JOIN user_projects up ON p.project_number = up.project_number
-                JOIN users u ON up.user_id = u.user_id
-                WHERE u.username = %s
-                """
-                cursor.execute(query, (self.username,))
-                projects = cursor.fetchall()
-                
-                projects.sort(key=lambda x: x[0])
-                
-                for project in projects:
-                    self.project_treeview.insert("", "end", values=project)
-            except Exception as e:
-                messagebox.showerror("Fehler", f"Fehler beim Laden der Projekte: {e}")
-            finally:
-                cursor.close()
-                connection.close()
+        self.show_user_projects([("Lädt...", "", "")])
+        self.project_treeview.configure(selectmode="none")  # Platzhalter kann nicht ausgewählt werden
+        submit(
+            fetch_user_projects,
+            self.username,
+            key=("user_projects", id(self)),
+            on_success=self.show_user_projects,
+            on_error=self.on_user_projects_error,
+        )
+
+    def show_user_projects(self, projects):
+        """
+        Zeigt die geladenen Projekte im Treeview an.
+
+        Args:
+            projects (list): Tupel (Projektnummer, Projektname, Beschreibung).
+        """
+        for item in self.project_treeview.get_children():
+            self.project_treeview.delete(item)
+        self.project_treeview.configure(selectmode="extended")
+
+        for project in projects:
+            self.project_treeview.insert("", "end", values=tuple(project))
+
+    def on_user_projects_error(self, error):
+        """
+        Entfernt den Platzhalter und zeigt eine Fehlermeldung an, falls das Laden der Projekte fehlschlägt.
+
+        Args:
+            error (Exception): Die Ausnahme aus `fetch_user_projects`.
+        """
+        self.show_user_projects([])
+        messagebox.showerror("Fehler", f"Fehler beim Laden der Projekte: {error}", parent=self)
@@ -2,19 +2,31 @@
 Modul: Benutzer-Auswahl-Frame für TimeArch.
 
 Dieses Modul stellt eine grafische Benutzeroberfläche bereit, die dem Benutzer die Auswahl eines Projekts oder einer Aufgabe ermöglicht. Es integriert verschiedene Frames, um SIA-Phasen, Kalender, Zeitbuchungen und Diagramme anzuzeigen.
+Die Frames eines Projekts werden in einer Projektansicht (`ProjectView`) zusammengefasst und beim Wechsel zu einem
+anderen Projekt nur ausgeblendet. Die zuletzt verwendeten Ansichten bleiben zwischengespeichert (LRU); beim
+erneuten Anzeigen werden nur ihre Daten neu geladen.
+
+Konstanten:
+-----------
+- PROJECT_VIEW_CACHE_SIZE: Standardanzahl der zwischengespeicherten Projektansichten.
 
 Klassen:
 --------
+- ProjectView: Die Frames eines Projekts (SIA-Phasen bzw. interne Infos, Kalender, Zeitbuchung, Diagramme).
 - UserSelectedFrame: Hauptklasse zur Anzeige und Verwaltung der Benutzer-Auswahlansicht.
 
 Methoden:
 ---------
-- __init__(self, master, user_id, username, selected_id=None, selected_name=None, description=None): Initialisiert den Frame mit Benutzer- und Projektdetails.
-- clear_widgets(self): Entfernt alle Widgets aus dem Frame.
+- __init__(self, master, user_id, username, selected_id=None, selected_name=None, description=None, cache_size=PROJECT_VIEW_CACHE_SIZE):
+  Initialisiert den Frame mit Benutzer- und Projektdetails.
+- clear_views(self): Entfernt alle zwischengespeicherten Projektansichten.
 - create_widgets(self): Erstellt die grundlegenden Widgets wie Titel und Beschreibung.
 - create_title_label(self): Erstellt und gibt das Titel-Label für den Frame zurück.
 - create_description_label(self): Erstellt und gibt das Beschreibungs-Label für den Frame zurück.
-- update_project_details(self, selected_id, selected_name, description=None): Aktualisiert die Widgets und Frames basierend auf der Auswahl eines neuen Projekts.
+- update_project_details(self, selected_id, selected_name, description=None): Zeigt die Ansicht eines Projekts an
+  (aus dem Zwischenspeicher oder neu erstellt).
+- show_view(self, project_number): Zeigt die Ansicht eines Projekts an und verdrängt bei Bedarf die am längsten
+  nicht verwendete Ansicht.
 
 Verwendung:
 -----------
@@ -22,8 +34,15 @@ Verwendung:
 
     frame = UserSelectedFrame(master, user_id=1, username="John Doe", selected_id="P123", selected_name="Projekt A")
     frame.pack()
+
+Hinweis:
+--------
+- Verdrängte Ansichten werden zerstört; ihre Matplotlib-Figuren werden dabei geschlossen (siehe `ProjectPhaseDiagram`).
+- Ausgeblendete Ansichten laden bei Änderungen (`db_listener`) nichts nach; Kalender und Diagramme werden beim
+  erneuten Anzeigen einmal aktualisiert (`ProjectView.show`).
 """
 
+from collections import OrderedDict
 import customtkinter as ctk
 from gui.user.gui_choose_sia_phase_frame import ChooseSIAPhaseFrame
 from gui.user.gui_calendar_frame import CalendarFrame
@@ -32,6 +51,94 @@ from gui.user.gui_diagram_frame import DiagramFrame
 from gui.user.gui_intern_infos import InternInfosFrame
 from gui.gui_appearance_color import appearance_color, get_default_styles
 
+PROJECT_VIEW_CACHE_SIZE = 4     # Anzahl Projektansichten, die beim Projektwechsel erhalten bleiben
+
+class ProjectView(ctk.CTkFrame):
+    """
+    Die Frames eines Projekts in der Benutzer-Auswahlansicht.
+
+    Funktionen:
+    - Erstellt SIA-Phasen (bzw. interne Infos für "0000"), Kalender, Zeitbuchung und Diagramme einmal pro Projekt
+    - Stellt den untergeordneten Frames Benutzer, Projekt und die anderen Frames bereit (über `master`)
+    - Lädt beim erneuten Anzeigen nur die Daten neu
+    - Solange sie ausgeblendet ist (`hidden`), ignorieren Kalender und Diagramme Änderungen aus `db_listener`
+    """
+    def __init__(self, master, user_id, username, project_number):
+        """
+        Erstellt die Frames eines Projekts.
+
+        Args:
+            master (UserSelectedFrame): Die Benutzer-Auswahlansicht.
+            user_id (int): Die ID des aktuellen Benutzers.
+            username (str): Der Benutzername.
+            project_number (str): Die Projektnummer ("0000" für interne Aufgaben).
+        """
+        self.colors = appearance_color()
+        super().__init__(master, corner_radius=0, fg_color=self.colors["background"])
+        self.user_id = user_id
+        self.username = username
+        self.selected_project_number = project_number
+        self.time_entry_frame = None
+        self.choose_sia_phase_frame = None
+        self.calendar_frame = None
+        self.diagram_frame = None
+        self.inter_infos_frame = None
+        self.hidden = False
+        self.create_widgets()
+
+        self.grid_rowconfigure(0, minsize=250, weight=1)
+        self.grid_rowconfigure(1, minsize=450, weight=2)
+        self.grid_rowconfigure(2, minsize=250, weight=2)
+        for col in range(2):
+            self.grid_columnconfigure(col, weight=1)
+
+    def create_widgets(self):
+        """
+        Erstellt die Frames des Projekts und lädt die Daten für das aktuelle Datum.
+        """
+        if self.selected_project_number != "0000":
+            self.choose_sia_phase_frame = ChooseSIAPhaseFrame(self, project_number=self.selected_project_number)
+            self.choose_sia_phase_frame.grid(row=0, columnspan=2, padx=10, pady=10, sticky="nsew")
+        else:
+            self.inter_infos_frame = InternInfosFrame(self, self.user_id, self.username)
+            self.inter_infos_frame.grid(row=0, columnspan=2, padx=10, pady=10, sticky="nsew")
+
+        self.calendar_frame = CalendarFrame(self, time_entry_frame=None, diagram_frame=None)
+        self.calendar_frame.grid(row=1, column=0, padx=10, pady=10, sticky="nsew")
+
+        self.time_entry_frame = TimeEntryFrame(self)
+        self.time_entry_frame.grid(row=1, column=1, padx=10, pady=10, sticky="nsew")
+
+        self.diagram_frame = DiagramFrame(self, self.user_id, project_number=self.selected_project_number)
+        self.diagram_frame.grid(row=2, columnspan=2, padx=10, pady=10, sticky="nsew")
+
+        self.calendar_frame.load_for_today()
+
+    def refresh(self):
+        """
+        Lädt die Daten einer wieder angezeigten Ansicht neu, ohne Widgets neu zu erstellen.
+
+        - Der Kalender lädt seine Monate neu und zeigt danach den ausgewählten Tag an.
+        - Die übrigen Diagramme werden einmal gesammelt aktualisiert (das Tagesdiagramm über den Kalender).
+        """
+        self.calendar_frame.reload_months()
+        self.diagram_frame.schedule_refresh()
+
+    def hide(self):
+        """
+        Blendet die Ansicht aus; Änderungen anderer Clients werden bis zum erneuten Anzeigen nicht geladen.
+        """
+        self.hidden = True
+        self.grid_remove()
+
+    def show(self):
+        """
+        Blendet die Ansicht wieder ein und lädt ihre Daten neu (siehe `refresh`).
+        """
+        self.hidden = False
+        self.grid()
+        self.refresh()
+
 class UserSelectedFrame(ctk.CTkFrame):
     """
     Eine Klasse zur Verwaltung der Benutzer-Auswahlansicht.
@@ -40,7 +147,8 @@ class UserSelectedFrame(ctk.CTkFrame):
     - Anzeige von Projektdetails
     - Integration von SIA-Phasen, Kalender, Zeitbuchungen und Diagrammen
     """
-    def __init__(self, master, user_id, username, selected_id=None, selected_name=None, description=None):
+    def __init__(self, master, user_id, username, selected_id=None, selected_name=None, description=None,
+                 cache_size=PROJECT_VIEW_CACHE_SIZE):
         """
         Initialisiert den Frame mit Benutzer- und Projektdetails.
 
@@ -51,6 +159,7 @@ class UserSelectedFrame(ctk.CTkFrame):
             selected_id (str, optional): Die ID des ausgewählten Projekts. Standard ist None.
             selected_name (str, optional): Der Name des ausgewählten Projekts. Standard ist None.
             description (str, optional): Eine Beschreibung des ausgewählten Projekts. Standard ist None.
+            cache_size (int, optional): Anzahl zwischengespeicherter Projektansichten (mindestens 1).
         """
         self.colors = appearance_color()
         self.styles = get_default_styles()
@@ -62,6 +171,9 @@ class UserSelectedFrame(ctk.CTkFrame):
         self.selected_id = selected_id
         self.selected_name = selected_name
         self.description = description
+        self.cache_size = max(1, int(cache_size))
+        self.views = OrderedDict()  # Projektnummer -> ProjectView, zuletzt verwendete am Ende
+        self.active_view = None
         self.time_entry_frame = None
         self.selected_project_number = None
         self.diagram_frame = None
@@ -75,15 +187,17 @@ class UserSelectedFrame(ctk.CTkFrame):
         for col in range(2):
             self.grid_columnconfigure(col, weight=1)
     
-    def clear_widgets(self):
+    def clear_views(self):
         """
-        Entfernt alle Widgets aus dem Frame.
+        Entfernt alle zwischengespeicherten Projektansichten.
 
-        - Löscht alle untergeordneten Widgets.
+        - Zerstört die Ansichten (inklusive ihrer Diagramm-Figuren).
         - Setzt alle Frame-Attribute auf None.
         """
-        for widget in self.winfo_children():
-            widget.destroy()
+        for view in self.views.values():
+            view.destroy()
+        self.views.clear()
+        self.active_view = None
         self.time_entry_frame = None
         self.choose_sia_phase_frame = None
         self.calendar_frame = None
@@ -124,7 +238,7 @@ class UserSelectedFrame(ctk.CTkFrame):
 
     def update_project_details(self, selected_id, selected_name, description=None):
         """
-        Aktualisiert die Widgets und Frames basierend auf der Auswahl eines neuen Projekts.
+        Aktualisiert Titel und Beschreibung und zeigt die Ansicht des ausgewählten Projekts an.
 
         Args:
             selected_id (str): Die ID des ausgewählten Projekts.
@@ -132,33 +246,52 @@ class UserSelectedFrame(ctk.CTkFrame):
             description (str, optional): Eine Beschreibung des ausgewählten Projekts. Standard ist None.
 
         - Aktualisiert die Titel- und Beschreibungs-Labels.
-        - Integriert die relevanten Frames wie SIA-Phasen, Kalender, Zeitbuchungen und Diagramme.
+        - Zeigt die Frames wie SIA-Phasen, Kalender, Zeitbuchungen und Diagramme des Projekts an; eine
+          zwischengespeicherte Ansicht wird wiederverwendet und lädt nur ihre Daten neu.
         """
-        self.clear_widgets()
-        self.create_widgets()       
         self.selected_id = selected_id
         self.selected_name = selected_name
         self.description = description
         self.selected_project_number = selected_id
-        
+
         self.title_label.configure(text=f"{selected_id} - {selected_name}")
-        self.description_label.configure(text=self.description) 
-        
-        if selected_id != "0000":
-            self.choose_sia_phase_frame = ChooseSIAPhaseFrame(self, project_number=self.selected_id)
-            self.choose_sia_phase_frame.grid(row=2, columnspan=2, padx=10, pady=10, sticky="nsew")
+        self.description_label.configure(text=self.description or "")
+
+        self.show_view(selected_id)
+
+    def show_view(self, project_number):
+        """
+        Zeigt die Ansicht eines Projekts an und blendet die bisherige aus.
+
+        Args:
+            project_number (str): Die Projektnummer.
+
+        - Eine zwischengespeicherte Ansicht wird wieder eingeblendet und aktualisiert ihre Daten.
+        - Sonst wird eine neue Ansicht erstellt; übersteigt der Zwischenspeicher `cache_size`, wird die am längsten
+          nicht verwendete Ansicht zerstört.
+        """
+        view = self.views.get(project_number)
+        if view is self.active_view and view is not None:
+            view.refresh()
+            return
+
+        if self.active_view is not None:
+            self.active_view.hide()
+
+        if view is not None:
+            self.views.move_to_end(project_number)
+            view.show()
         else:
-            self.inter_infos_frame = InternInfosFrame(self, self.user_id, self.username)
-            self.inter_infos_frame.grid(row=2, columnspan=2, padx=10, pady=10, sticky="nsew")
-                
-        self.calendar_frame = CalendarFrame(self, time_entry_frame=None, diagram_frame=None)
-        self.calendar_frame.grid(row=3, column=0, padx=10, pady=10, sticky="nsew")
-        
-        self.time_entry_frame = TimeEntryFrame(self)
-        self.time_entry_frame.grid(row=3, column=1, padx=10, pady=10, sticky="nsew")
-        
-        self.diagram_frame = DiagramFrame(self, self.user_id, project_number=self.selected_id)
-        self.diagram_frame.grid(row=4, columnspan=2, padx=10, pady=10, sticky="nsew")
-        
-        self.calendar_frame.load_for_today()
+            view = ProjectView(self, self.user_id, self.username, project_number)
+            view.grid(row=2, rowspan=3, columnspan=2, sticky="nsew")
+            self.views[project_number] = view
+            while len(self.views) > self.cache_size:
+                _, evicted = self.views.popitem(last=False)
+                evicted.destroy()
 
+        self.active_view = view
+        self.time_entry_frame = view.time_entry_frame
+        self.choose_sia_phase_frame = view.choose_sia_phase_frame
+        self.calendar_frame = view.calendar_frame
+        self.diagram_frame = view.diagram_frame
+        self.inter_infos_frame = view.inter_infos_frame
@@ -26,6 +26,8 @@ Verwendung:
 """
 
 import customtkinter as ctk
+from db.db_executor import init_executor
+from db.db_listener import start_listener
 from tkinter import PhotoImage
 from gui.user.gui_user_project_frame import UserProjectFrame
 from gui.user.gui_user_selected_frame import UserSelectedFrame
@@ -120,6 +122,8 @@ def start_user_gui(username, user_id):
     """
     try:
         root = ctk.CTk()
+        init_executor(root)     # Executor und Listener vom zerstörten Login-Fenster übernehmen
+        start_listener(root)
         user_gui = UserGUI(root, username, user_id)
         root.mainloop()
     except Exception as e:
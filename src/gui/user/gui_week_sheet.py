@@ -0,0 +1,364 @@
+"""
+Modul: Wochenrapport für TimeArch.
+
+Dieses Modul stellt ein Fenster bereit, in dem ein Benutzer die Stunden einer ganzen Woche in einem Raster erfassen kann.
+Jede Zeile steht für eine Kombination aus Projekt, Phase und Tätigkeit, jede Spalte für einen Wochentag.
+Beim Speichern werden alle Einträge mit einem einzigen Insert in einer Transaktion gespeichert.
+
+Klassen:
+--------
+- WeekSheetWindow: Fenster zur Erfassung eines Wochenrapports.
+
+Funktionen:
+-----------
+- fetch_reference_data(user_id): Liest die Projekte des Benutzers und die SIA-Phasen (läuft im Hintergrund).
+
+Methoden:
+---------
+- __init__(self, master, user_id, selected_date=None, project_number=None, on_saved=None): Initialisiert das Fenster.
+- load_reference_data(self, project_number=None): Lädt die Projekte des Benutzers und die SIA-Phasen im Hintergrund.
+- create_widgets(self): Erstellt Wochennavigation, Raster und Buttons.
+- add_row(self, project_number=None): Fügt dem Raster eine neue Zeile hinzu.
+- on_project_changed(self, row, project_value): Passt Phase und Tätigkeiten an das gewählte Projekt an.
+- change_week(self, offset): Wechselt zur vorherigen oder nächsten Woche.
+- update_week_labels(self): Aktualisiert die Beschriftungen der Wochentage.
+- collect_entries(self): Liest alle ausgefüllten Zellen aus und prüft sie.
+- save_week(self): Speichert alle Einträge der Woche.
+
+Verwendung:
+-----------
+    from gui.user.gui_week_sheet import WeekSheetWindow
+
+    WeekSheetWindow(master, user_id=1, selected_date="2025-01-06", on_saved=callback)
+"""
+
+import datetime
+import customtkinter as ctk
+from tkinter import messagebox
+from features import feature_reference_cache as reference_cache
+from features.feature_save_time_entry import save_time_entries, activities_for_project, parse_hours
+from gui.gui_appearance_color import appearance_color, get_default_styles
+from db.db_executor import submit
+
+WEEKDAYS = ["Mo", "Di", "Mi", "Do", "Fr", "Sa", "So"]
+
+def fetch_reference_data(user_id):
+    """
+    Liest die Projekte eines Benutzers und die SIA-Phasen für die Auswahllisten.
+
+    Args:
+        user_id (int): Die ID des Benutzers.
+
+    Returns:
+        tuple: ({"Nummer - Name": Projektnummer}, {Phasenname: Phasen-ID}).
+
+    Hinweis:
+    --------
+    - Wird über `db_executor.submit` in einem Worker-Thread ausgeführt und greift nicht auf Tk zu.
+    - Liest über den Referenzdaten-Cache (`feature_reference_cache`); bei kaltem Cache wird die Datenbank abgefragt.
+    """
+    projects = {
+        f"{project.project_number} - {project.project_name}": project.project_number
+        for project in reference_cache.user_projects(user_id)
+    }
+    phases = {phase.phase_name: phase.phase_id for phase in reference_cache.sia_phases()}
+    return projects, phases
+
+class WeekSheetWindow(ctk.CTkToplevel):
+    """
+    Fenster zur Erfassung eines Wochenrapports.
+
+    Funktionen:
+    - Raster aus Wochentagen × (Projekt, Phase, Tätigkeit)
+    - Navigation zwischen Wochen
+    - Speichern aller Zeilen in einer Transaktion
+    """
+    def __init__(self, master, user_id, selected_date=None, project_number=None, on_saved=None):
+        """
+        Initialisiert das Fenster für den Wochenrapport.
+
+        Args:
+            master (ctk.CTkFrame): Das übergeordnete Widget.
+            user_id (int): Die ID des aktuellen Benutzers.
+            selected_date (str, optional): Ein Datum der gewünschten Woche im Format YYYY-MM-DD. Standard ist heute.
+            project_number (str, optional): Projekt, mit dem die erste Zeile vorbelegt wird.
+            on_saved (function, optional): Funktion, die nach erfolgreichem Speichern einmal aufgerufen wird.
+        """
+        self.colors = appearance_color()
+        self.styles = get_default_styles()
+
+        super().__init__(master)
+        self.title("Wochenrapport")
+        self.geometry("1100x500")
+        self.configure(fg_color=self.colors["background"])
+
+        self.user_id = user_id
+        self.on_saved = on_saved
+        day = datetime.date.fromisoformat(selected_date) if selected_date else datetime.date.today()
+        self.week_start = day - datetime.timedelta(days=day.weekday())
+        self.rows = []
+        self.projects = {}
+        self.phases = {}
+
+        self.create_widgets()
+        self.load_reference_data(project_number)
+
+    def load_reference_data(self, project_number=None):
+        """
+        Lädt die Projekte des Benutzers und die SIA-Phasen im Hintergrund und fügt danach die erste Zeile hinzu.
+
+        Args:
+            project_number (str, optional): Projekt, mit dem die erste Zeile vorbelegt wird.
+
+        - Liest über den Referenzdaten-Cache (`fetch_reference_data`) in einem Worker-Thread.
+        - Bis zum Eintreffen zeigt das Raster einen Platzhalter an und die Buttons sind deaktiviert.
+
+        Fehlerbehandlung:
+        ------------------
+        - Zeigt eine Fehlermeldung an, falls die Datenbankabfrage fehlschlägt.
+        """
+        loading_label = ctk.CTkLabel(self.grid_frame, text="Lädt...", **self.styles["text"])
+        loading_label.grid(row=1, column=0, columnspan=3, padx=5, pady=5, sticky="w")
+        self.add_row_button.configure(state="disabled")
+        self.save_button.configure(state="disabled")
+
+        def on_success(data):
+            loading_label.destroy()
+            self.projects, self.phases = data
+            self.add_row_button.configure(state="normal")
+            self.save_button.configure(state="normal")
+            self.add_row(project_number)
+
+        def on_error(error):
+            loading_label.configure(text="Fehler")
+            messagebox.showerror("Fehler", f"Fehler beim Laden der Projekte und Phasen: {error}", parent=self)
+
+        submit(fetch_reference_data, self.user_id, on_success=on_success, on_error=on_error)
+
+    def create_widgets(self):
+        """
+        Erstellt die Wochennavigation, das Raster und die Buttons.
+        """
+        # Wochennavigation
+        navigation_frame = ctk.CTkFrame(self, fg_color=self.colors["background"])
+        navigation_frame.pack(padx=10, pady=10, fill="x")
+
+        previous_button = ctk.CTkButton(
+            navigation_frame,
+            text="<",
+            width=40,
+            command=lambda: self.change_week(-1),
+            **self.styles["button_secondary"],
+        )
+        previous_button.pack(side="left", padx=10)
+
+        self.week_label = ctk.CTkLabel(navigation_frame, text="", **self.styles["title"])
+        self.week_label.pack(side="left", expand=True)
+
+        next_button = ctk.CTkButton(
+            navigation_frame,
+            text=">",
+            width=40,
+            command=lambda: self.change_week(1),
+            **self.styles["button_secondary"],
+        )
+        next_button.pack(side="right", padx=10)
+
+        # Raster mit Kopfzeile
+        self.grid_frame = ctk.CTkScrollableFrame(self, fg_color=self.colors["alt_background"])
+        self.grid_frame.pack(padx=10, pady=10, fill="both", expand=True)
+
+        headers = ["Projekt", "Phase", "Tätigkeit"] + WEEKDAYS + ["Notiz"]
+        self.header_labels = []
+        for col, header in enumerate(headers):
+            label = ctk.CTkLabel(self.grid_frame, text=header, **self.styles["text"])
+            label.grid(row=0, column=col, padx=5, pady=5)
+            self.header_labels.append(label)
+        for col in range(3):
+            self.grid_frame.grid_columnconfigure(col, weight=2)
+        self.grid_frame.grid_columnconfigure(len(headers) - 1, weight=2)
+        self.update_week_labels()
+
+        # Buttons
+        button_frame = ctk.CTkFrame(self, fg_color=self.colors["background"])
+        button_frame.pack(padx=10, pady=10, fill="x")
+
+        self.add_row_button = ctk.CTkButton(
+            button_frame,
+            text="Zeile hinzufügen",
+            command=self.add_row,
+            **self.styles["button_secondary"],
+        )
+        self.add_row_button.pack(side="left", padx=10)
+
+        self.save_button = ctk.CTkButton(
+            button_frame,
+            text="Speichern",
+            command=self.save_week,
+            **self.styles["button"],
+        )
+        self.save_button.pack(side="right", padx=10)
+
+    def add_row(self, project_number=None):
+        """
+        Fügt dem Raster eine neue Zeile hinzu.
+
+        Args:
+            project_number (str, optional): Projekt, mit dem die Zeile vorbelegt wird.
+        """
+        grid_row = len(self.rows) + 1
+        row = {}
+
+        project_values = list(self.projects.keys())
+        row["project"] = ctk.CTkComboBox(
+            self.grid_frame,
+            values=project_values,
+            command=lambda value, row=row: self.on_project_changed(row, value),
+            **self.styles["combobox"],
+        )
+        row["project"].grid(row=grid_row, column=0, padx=5, pady=5, sticky="ew")
+
+        row["phase"] = ctk.CTkComboBox(self.grid_frame, values=list(self.phases.keys()), **self.styles["combobox"])
+        row["phase"].grid(row=grid_row, column=1, padx=5, pady=5, sticky="ew")
+
+        row["activity"] = ctk.CTkComboBox(self.grid_frame, values=[], **self.styles["combobox"])
+        row["activity"].grid(row=grid_row, column=2, padx=5, pady=5, sticky="ew")
+
+        row["hours"] = []
+        for day in range(len(WEEKDAYS)):
+            entry = ctk.CTkEntry(self.grid_frame, width=50, **self.styles["entry"])
+            entry.grid(row=grid_row, column=3 + day, padx=2, pady=5)
+            row["hours"].append(entry)
+
+        row["note"] = ctk.CTkEntry(self.grid_frame, placeholder_text="Notiz", **self.styles["entry"])
+        row["note"].grid(row=grid_row, column=3 + len(WEEKDAYS), padx=5, pady=5, sticky="ew")
+
+        self.rows.append(row)
+
+        # Vorbelegung mit dem übergebenen Projekt bzw. dem Projekt der vorherigen Zeile
+        initial = next((value for value, number in self.projects.items() if number == project_number), None)
+        if initial is None and len(self.rows) > 1:
+            initial = self.rows[-2]["project"].get()
+        if initial is None and project_values:
+            initial = project_values[0]
+        if initial:
+            row["project"].set(initial)
+            self.on_project_changed(row, initial)
+
+    def on_project_changed(self, row, project_value):
+        """
+        Passt Phase und Tätigkeiten an das gewählte Projekt an.
+
+        Args:
+            row (dict): Die Widgets der Zeile.
+            project_value (str): Der angezeigte Projektwert ("Nummer - Name").
+        """
+        project_number = self.projects.get(project_value)
+        activities = activities_for_project(project_number)
+        row["activity"].configure(values=activities)
+        row["activity"].set(activities[0])
+
+        if project_number == "0000":
+            row["phase"].set("")
+            row["phase"].configure(state="disabled")
+        else:
+            row["phase"].configure(state="normal")
+            if not row["phase"].get() and self.phases:
+                row["phase"].set(next(iter(self.phases)))
+
+    def change_week(self, offset):
+        """
+        Wechselt zur vorherigen oder nächsten Woche.
+
+        Args:
+            offset (int): -1 für die vorherige, 1 für die nächste Woche.
+        """
+        self.week_start += datetime.timedelta(weeks=offset)
+        self.update_week_labels()
+
+    def update_week_labels(self):
+        """
+        Aktualisiert den Wochentitel und die Beschriftungen der Wochentage.
+        """
+        week_end = self.week_start + datetime.timedelta(days=len(WEEKDAYS) - 1)
+        week_number = self.week_start.isocalendar()[1]
+        self.week_label.configure(
+            text=f"KW {week_number}: {self.week_start.strftime('%d.%m.%Y')} – {week_end.strftime('%d.%m.%Y')}"
+        )
+        for day, name in enumerate(WEEKDAYS):
+            date = self.week_start + datetime.timedelta(days=day)
+            self.header_labels[3 + day].configure(text=f"{name}\n{date.strftime('%d.%m.')}")
+
+    def collect_entries(self):
+        """
+        Liest alle ausgefüllten Zellen aus und prüft sie.
+
+        Returns:
+            list: Eine Liste von Tupeln (user_id, project_number, phase_id, hours, entry_date, activity, note).
+
+        Fehlerbehandlung:
+        ------------------
+        - Wirft einen `ValueError` mit einer verständlichen Meldung, falls eine Zeile unvollständig oder ungültig ist.
+        """
+        entries = []
+        for index, row in enumerate(self.rows, start=1):
+            cells = [(day, entry.get()) for day, entry in enumerate(row["hours"]) if entry.get().strip()]
+            if not cells:
+                continue
+
+            project_number = self.projects.get(row["project"].get())
+            if not project_number:
+                raise ValueError(f"Zeile {index}: Bitte wählen Sie ein Projekt aus.")
+
+            phase_id = None
+            if project_number != "0000":
+                phase_id = self.phases.get(row["phase"].get())
+                if not phase_id:
+                    raise ValueError(f"Zeile {index}: Bitte wählen Sie eine SIA Phase aus.")
+
+            activity = row["activity"].get()
+            if not activity:
+                raise ValueError(f"Zeile {index}: Bitte wählen Sie eine Tätigkeit aus.")
+
+            note = row["note"].get() or None
+            for day, value in cells:
+                try:
+                    hours = parse_hours(value)
+                except ValueError:
+                    raise ValueError(f"Zeile {index}, {WEEKDAYS[day]}: Ungültige Stunden '{value}'.")
+                entry_date = self.week_start + datetime.timedelta(days=day)
+                entries.append((self.user_id, project_number, phase_id, hours, entry_date, activity, note))
+        return entries
+
+    def save_week(self):
+        """
+        Speichert alle Einträge der Woche in einer Transaktion.
+
+        - Nach erfolgreichem Speichern werden die Stundenfelder geleert und `on_saved` einmal aufgerufen.
+
+        Fehlerbehandlung:
+        ------------------
+        - Zeigt eine Fehlermeldung an, falls Eingaben ungültig sind oder das Speichern fehlschlägt.
+        """
+        try:
+            entries = self.collect_entries()
+        except ValueError as e:
+            messagebox.showerror("Fehler", str(e), parent=self)
+            return
+
+        if not entries:
+            messagebox.showerror("Fehler", "Keine Stunden eingetragen.", parent=self)
+            return
+
+        if not save_time_entries(entries):
+            messagebox.showerror("Fehler", "Fehler beim Speichern des Wochenrapports.", parent=self)
+            return
+
+        for row in self.rows:
+            for entry in row["hours"]:
+                entry.delete(0, "end")
+
+        total_hours = sum(entry[3] for entry in entries)
+        messagebox.showinfo("Erfolgreich", f"{len(entries)} Einträge ({total_hours:g}h) gespeichert.", parent=self)
+        if self.on_saved:
+            self.on_saved()
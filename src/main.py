@@ -5,6 +5,7 @@ Dieses Modul ist der Einstiegspunkt für die Anwendung. Es startet die Login-GUI
 
 Funktionen:
 -----------
+- ensure_upcoming_years(): Ergänzt fehlende Jahrespartitionen und Kalenderjahre (läuft im Hintergrund).
 - main(): Startet die Login-GUI und verwaltet die Ereignisschleife.
 
 Verwendung:
@@ -14,12 +15,38 @@ Verwendung:
 
 import customtkinter as ctk
 from gui.gui_login import LoginGUI
+from db.db_partitions import ensure_upcoming_partitions
+from db.db_work_calendar import ensure_upcoming_work_calendar
+from db.db_executor import init_executor, shutdown_executor, submit
+from db.db_listener import add_change_hook, start_listener, stop_listener
+from features import feature_reference_cache as reference_cache
+from features import feature_project_view as project_view
+
+def ensure_upcoming_years():
+    """
+    Stellt sicher, dass die Partitionen der Zeiteinträge und der Arbeitstagekalender das aktuelle und die
+    kommenden Jahre abdecken.
+
+    Hinweis:
+    --------
+    - Läuft im Hintergrund (`db_executor`), damit das Login-Fenster nicht auf die DDL-Anweisungen wartet.
+      Bis dahin landen Zeiteinträge eines neuen Jahres in der DEFAULT-Partition und werden beim Anlegen
+      der Jahrespartition verschoben.
+    - Beide Funktionen geben Fehler selbst aus, ohne den Programmstart zu verhindern.
+    """
+    ensure_upcoming_partitions()
+    ensure_upcoming_work_calendar()
 
 def main():
     """
     Startet das Hauptprogramm.
 
     - Initialisiert das Hauptfenster mit der Login-GUI.
+    - Startet den gemeinsamen Executor für Datenbankabfragen im Hintergrund und beendet ihn am Schluss.
+    - Ergänzt über den Executor fehlende Jahrespartitionen und Kalenderjahre (`ensure_upcoming_years`),
+      nachdem das Login-Fenster erstellt ist.
+    - Startet den Listener für Änderungen anderer Clients; der Referenzdaten-Cache und der Cache der
+      Projektansicht werden darüber invalidiert.
     - Verwaltet die Ereignisschleife (mainloop) der Anwendung.
     - Beendet das Programm bei einer KeyboardInterrupt-Ausnahme.
 
@@ -28,11 +55,23 @@ def main():
     - Gibt eine Meldung aus, wenn das Programm durch eine Tastatureingabe beendet wird.
     """
     root = ctk.CTk()
+    init_executor(root)
+    add_change_hook(reference_cache.on_change)
+    add_change_hook(project_view.on_change)
+    start_listener(root)
     login_gui = LoginGUI(master=root)
+    submit(
+        ensure_upcoming_years,
+        key="ensure_upcoming_years",
+        on_error=lambda error: print(f"Fehler beim Ergänzen der Jahrespartitionen und Kalenderjahre: {error}"),
+    )
     try:
         root.mainloop() 
     except KeyboardInterrupt:
         print("Programm beendet.")
+    finally:
+        stop_listener()
+        shutdown_executor()
     
 if __name__ == "__main__":
     main()
\ No newline at end of file